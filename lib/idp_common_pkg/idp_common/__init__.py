@@ -27,6 +27,8 @@ def __getattr__(name):
         "assessment",
         "models",
         "reporting",
+        "clients",
+        "page_assets",
     ]:
         if name not in _submodules:
             _submodules[name] = __import__(f"idp_common.{name}", fromlist=["*"])
@@ -62,6 +64,8 @@ __all__ = [
     "assessment",
     "models",
     "reporting",
+    "clients",
+    "page_assets",
     "get_config",
     "Document",
     "Page",
@@ -3,20 +3,76 @@
 
 """
 AppSync client for executing GraphQL queries and mutations.
+
+Requests go through a process-wide requests.Session, so connections to the
+AppSync endpoint are kept alive and reused instead of paying a TCP and TLS
+handshake per mutation. The payload is serialized once and the exact bytes
+that are sent are the bytes that are signed. Optionally, mutations issued
+concurrently within a short window are coalesced into one GraphQL request.
 """
 
 import json
 import logging
 import os
-from typing import Any, Dict, Optional
+import re
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
 
 import boto3
 import requests
 from botocore.auth import SigV4Auth
 from botocore.awsrequest import AWSRequest
+from requests.adapters import HTTPAdapter
+
+from idp_common.clients import DEFAULT_MAX_POOL_CONNECTIONS
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_TIMEOUT = 30
+
+# Coalescing window in milliseconds; 0 disables coalescing
+DEFAULT_BATCH_WINDOW_MS = int(os.environ.get("APPSYNC_BATCH_WINDOW_MS", "0"))
+DEFAULT_MAX_BATCH_SIZE = int(os.environ.get("APPSYNC_MAX_BATCH_SIZE", "10"))
+
+# A single-operation mutation: "mutation Name($a: T!) { field(...) { ... } }"
+_MUTATION_PATTERN = re.compile(
+    r"^\s*mutation\b\s*(?:\w+)?\s*(?:\((?P<variables>[^)]*)\))?\s*\{(?P<body>.*)\}\s*$",
+    re.DOTALL,
+)
+_VARIABLE_PATTERN = re.compile(r"\$(\w+)")
+_FIELD_PATTERN = re.compile(r"^\s*(\w+)")
+
+_http_session: Optional[requests.Session] = None
+_credentials = None
+_lock = threading.Lock()
+
+
+def _get_http_session() -> requests.Session:
+    """Get the shared keep-alive HTTP session used for all AppSync requests."""
+    global _http_session
+    if _http_session is None:
+        with _lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=DEFAULT_MAX_POOL_CONNECTIONS
+                )
+                session.mount("https://", adapter)
+                _http_session = session
+    return _http_session
+
+
+def _get_credentials():
+    """Get the AWS credentials, resolved once per process (they refresh themselves)."""
+    global _credentials
+    if _credentials is None:
+        with _lock:
+            if _credentials is None:
+                _credentials = boto3.Session().get_credentials()
+    return _credentials
+
 
 class AppSyncError(Exception):
     """Custom exception for AppSync errors"""
@@ -26,6 +82,116 @@ class AppSyncError(Exception):
         self.errors = errors or []
 
 
+def _split_mutation(mutation: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Split a mutation into its variable definitions, top-level field name and field body.
+
+    Returns None for mutations that cannot be coalesced (multiple top-level
+    fields, fragment definitions or unrecognized syntax).
+    """
+    match = _MUTATION_PATTERN.match(mutation)
+    if not match:
+        return None
+    body = match.group("body").strip()
+    field = _FIELD_PATTERN.match(body)
+    if not field:
+        return None
+
+    # The body must consist of exactly one top-level field
+    depth = 0
+    for index, char in enumerate(body):
+        if char in "({":
+            depth += 1
+        elif char in ")}":
+            depth -= 1
+            if depth == 0 and char == "}" and body[index + 1 :].strip():
+                return None
+    if depth != 0:
+        return None
+
+    return (match.group("variables") or "").strip(), field.group(1), body
+
+
+def _combine_mutations(
+    mutations: List[Tuple[str, Dict[str, Any]]],
+) -> Optional[Tuple[str, Dict[str, Any], List[Tuple[str, str]]]]:
+    """
+    Combine mutations into one GraphQL operation with one aliased field per mutation.
+
+    Variables are suffixed with the mutation index so that they cannot collide.
+
+    Returns:
+        Tuple of (mutation, variables, [(alias, field_name)]), or None if any
+        of the mutations cannot be coalesced
+    """
+    definitions = []
+    fields = []
+    variables = {}
+    aliases = []
+    for index, (mutation, mutation_variables) in enumerate(mutations):
+        parts = _split_mutation(mutation)
+        if parts is None:
+            return None
+        variable_definitions, field_name, body = parts
+
+        def rename(match, index=index):
+            return f"${match.group(1)}_{index}"
+
+        alias = f"m{index}"
+        if variable_definitions:
+            definitions.append(_VARIABLE_PATTERN.sub(rename, variable_definitions))
+        fields.append(f"{alias}: {_VARIABLE_PATTERN.sub(rename, body)}")
+        for name, value in (mutation_variables or {}).items():
+            variables[f"{name}_{index}"] = value
+        aliases.append((alias, field_name))
+
+    signature = f"({', '.join(definitions)})" if definitions else ""
+    combined = (
+        f"mutation CoalescedMutations{signature} {{\n" + "\n".join(fields) + "\n}"
+    )
+    return combined, variables, aliases
+
+
+class _MutationBatcher:
+    """
+    Coalesces mutations submitted by concurrent threads.
+
+    The first caller of a batch waits for the window to pass, then sends
+    everything queued in the meantime as one request; the caller that fills
+    a batch sends it immediately. There is no background thread.
+    """
+
+    def __init__(self, client: "AppSyncClient", window: float, max_size: int):
+        self.client = client
+        self.window = window
+        self.max_size = max(1, max_size)
+        self._lock = threading.Lock()
+        self._batch: List[Tuple[str, Dict[str, Any], Future]] = []
+
+    def submit(self, mutation: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        future: Future = Future()
+        with self._lock:
+            batch = self._batch
+            batch.append((mutation, variables, future))
+            is_leader = len(batch) == 1
+            if len(batch) >= self.max_size:
+                self._batch = []
+                ready = batch
+            else:
+                ready = None
+
+        if ready is None and is_leader:
+            time.sleep(self.window)
+            with self._lock:
+                if self._batch is batch:
+                    self._batch = []
+                    ready = batch
+
+        if ready is not None:
+            self.client._send_batch(ready)
+        return future.result()
+
+
 class AppSyncClient:
     """
     Client for executing GraphQL operations against AWS AppSync.
@@ -34,18 +200,30 @@ class AppSyncClient:
     for AWS AppSync GraphQL API calls.
     """
 
-    def __init__(self, api_url: Optional[str] = None, region: Optional[str] = None):
+    def __init__(
+        self,
+        api_url: Optional[str] = None,
+        region: Optional[str] = None,
+        batch_window_ms: Optional[int] = None,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
         """
         Initialize the AppSync client.
 
         Args:
             api_url: Optional AppSync API URL. If not provided, will be read from APPSYNC_API_URL env var.
             region: Optional AWS region. If not provided, will be read from AWS_REGION env var.
+            batch_window_ms: Window in milliseconds within which concurrent mutations
+                are coalesced into one request (default: APPSYNC_BATCH_WINDOW_MS env
+                var, 0 = disabled)
+            max_batch_size: Maximum number of mutations per coalesced request
+            timeout: HTTP request timeout in seconds
         """
-        self.session = boto3.Session()
-        self.credentials = self.session.get_credentials()
+        self.credentials = _get_credentials()
         self.api_url = api_url or os.environ.get("APPSYNC_API_URL")
         self.region = region or os.environ.get("AWS_REGION")
+        self.timeout = timeout
 
         if not self.api_url:
             raise ValueError(
@@ -57,6 +235,16 @@ class AppSyncClient:
                 "AWS region must be provided or set in AWS_REGION environment variable"
             )
 
+        self._signer = SigV4Auth(self.credentials, "appsync", self.region)
+
+        if batch_window_ms is None:
+            batch_window_ms = DEFAULT_BATCH_WINDOW_MS
+        self._batcher = (
+            _MutationBatcher(self, batch_window_ms / 1000.0, max_batch_size)
+            if batch_window_ms > 0 and max_batch_size > 1
+            else None
+        )
+
     def _sign_request(self, request: AWSRequest) -> Dict[str, str]:
         """
         Sign a request with SigV4 authentication.
@@ -67,33 +255,25 @@ class AppSyncClient:
         Returns:
             Dictionary of signed headers
         """
-        auth = SigV4Auth(self.credentials, "appsync", self.region)
-        auth.add_auth(request)
+        self._signer.add_auth(request)
         return dict(request.headers)
 
-    def execute_mutation(
-        self, mutation: str, variables: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    def _post(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Execute a GraphQL mutation with error handling
-
-        Args:
-            mutation: The GraphQL mutation string
-            variables: Variables for the mutation
+        Serialize, sign and send a GraphQL request.
 
         Returns:
-            Dict containing the mutation result data
+            The decoded JSON response
 
         Raises:
-            AppSyncError: If the GraphQL operation fails
             requests.RequestException: If the HTTP request fails
         """
-        data = {"query": mutation, "variables": variables}
+        body = json.dumps(data).encode()
 
         request = AWSRequest(
             method="POST",
             url=self.api_url,
-            data=json.dumps(data).encode(),
+            data=body,
             headers={
                 "Content-Type": "application/json",
                 "Accept": "application/json",
@@ -103,39 +283,112 @@ class AppSyncClient:
         signed_headers = self._sign_request(request)
 
         try:
-            response = requests.post(
-                self.api_url, json=data, headers=signed_headers, timeout=30
+            response = _get_http_session().post(
+                self.api_url, data=body, headers=signed_headers, timeout=self.timeout
             )
             response.raise_for_status()  # Raises HTTPError for bad status codes
+        except requests.RequestException as e:
+            logger.error(f"HTTP request to AppSync failed: {str(e)}")
+            raise
 
-            result = response.json()
-            logger.debug(f"AppSync raw response: {result}")
-
-            # Check for GraphQL errors
-            if "errors" in result:
-                error_messages = [
-                    error.get("message", "Unknown error") for error in result["errors"]
-                ]
-                error_msg = "; ".join(error_messages)
-                logger.error(f"GraphQL errors: {error_msg}")
-                logger.error(f"Full error response: {json.dumps(result['errors'])}")
-                raise AppSyncError(
-                    f"GraphQL operation failed: {error_msg}", result["errors"]
-                )
+        result = response.json()
+        logger.debug(f"AppSync raw response: {result}")
+        return result
 
-            # Verify we got data back
-            if "data" not in result:
-                raise AppSyncError("No data returned from AppSync")
+    def execute_mutation(
+        self, mutation: str, variables: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Execute a GraphQL mutation with error handling
 
-            # Check if the specific mutation returned null
-            operation_name = list(result["data"].keys())[0]
-            if result["data"][operation_name] is None:
-                error_msg = f"Mutation {operation_name} returned null"
-                logger.error(error_msg)
-                raise AppSyncError(error_msg)
+        When coalescing is enabled, the mutation may be sent together with
+        mutations issued concurrently by other threads; the result and errors
+        returned are those of this mutation only.
 
-            return result["data"]
+        Args:
+            mutation: The GraphQL mutation string
+            variables: Variables for the mutation
 
-        except requests.RequestException as e:
-            logger.error(f"HTTP request to AppSync failed: {str(e)}")
-            raise
+        Returns:
+            Dict containing the mutation result data
+
+        Raises:
+            AppSyncError: If the GraphQL operation fails
+            requests.RequestException: If the HTTP request fails
+        """
+        if self._batcher is not None:
+            return self._batcher.submit(mutation, variables)
+
+        result = self._post({"query": mutation, "variables": variables})
+        return self._resolve(result)
+
+    def _send_batch(self, batch: List[Tuple[str, Dict[str, Any], Future]]) -> None:
+        """Send coalesced mutations and resolve each caller's future."""
+        combined = (
+            _combine_mutations([(m, v) for m, v, _ in batch])
+            if len(batch) > 1
+            else None
+        )
+        if combined is None:
+            # Single or non-coalescable mutations are sent one by one
+            for mutation, variables, future in batch:
+                try:
+                    data = {"query": mutation, "variables": variables}
+                    future.set_result(self._resolve(self._post(data)))
+                except Exception as e:
+                    future.set_exception(e)
+            return
+
+        mutation, variables, aliases = combined
+        try:
+            result = self._post({"query": mutation, "variables": variables})
+        except Exception as e:
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        logger.debug(f"Sent {len(batch)} coalesced AppSync mutations in one request")
+        for (alias, field_name), (_, _, future) in zip(aliases, batch):
+            try:
+                future.set_result(self._resolve(result, alias, field_name))
+            except AppSyncError as e:
+                future.set_exception(e)
+
+    def _resolve(
+        self,
+        result: Dict[str, Any],
+        alias: Optional[str] = None,
+        field_name: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Extract one mutation's result from a (possibly coalesced) response.
+
+        Raises:
+            AppSyncError: If the mutation failed or returned null
+        """
+        errors = [
+            error
+            for error in result.get("errors") or []
+            if alias is None or not error.get("path") or error["path"][0] == alias
+        ]
+        if errors:
+            error_messages = [error.get("message", "Unknown error") for error in errors]
+            error_msg = "; ".join(error_messages)
+            logger.error(f"GraphQL errors: {error_msg}")
+            logger.error(f"Full error response: {json.dumps(errors)}")
+            raise AppSyncError(f"GraphQL operation failed: {error_msg}", errors)
+
+        data = result.get("data")
+        if data is None:
+            raise AppSyncError("No data returned from AppSync")
+
+        if alias is None:
+            field_name = next(iter(data), None)
+            value = data.get(field_name) if field_name else None
+        else:
+            value = data.get(alias)
+        if value is None:
+            error_msg = f"Mutation {field_name} returned null"
+            logger.error(error_msg)
+            raise AppSyncError(error_msg)
+        return {field_name: value}
@@ -19,6 +19,9 @@ from idp_common.models import Document, HitlMetadata, Page, Section, Status
 
 logger = logging.getLogger(__name__)
 
+# Attributes sent with every update, even when unchanged
+ALWAYS_UPDATED_ATTRIBUTES = ("ObjectStatus", "WorkflowStatus")
+
 
 class DocumentAppSyncService:
     """
@@ -63,20 +66,17 @@ class DocumentAppSyncService:
             "ExpiresAfter": expires_after,
         }
 
-    def _document_to_update_input(self, document: Document) -> Dict[str, Any]:
+    def _document_to_status_attributes(self, document: Document) -> Dict[str, Any]:
         """
-        Convert a Document object to an UpdateDocumentInput compatible with AppSync.
+        Convert the status and workflow fields of a Document to UpdateDocumentInput fields.
 
         Args:
             document: The Document object to convert
 
         Returns:
-            Dictionary compatible with UpdateDocumentInput GraphQL type
+            Dictionary of UpdateDocumentInput field names to values
         """
-        input_data = {
-            "ObjectKey": document.input_key,
-            "ObjectStatus": document.status.value,
-        }
+        input_data = {"ObjectStatus": document.status.value}
 
         # Add optional fields if they exist
         if document.queued_time:
@@ -98,6 +98,20 @@ class DocumentAppSyncService:
         else:
             input_data["WorkflowStatus"] = "RUNNING"
 
+        return input_data
+
+    def _document_to_attributes(self, document: Document) -> Dict[str, Any]:
+        """
+        Convert a Document object to the full set of UpdateDocumentInput fields (except ObjectKey).
+
+        Args:
+            document: The Document object to convert
+
+        Returns:
+            Dictionary of UpdateDocumentInput field names to values
+        """
+        input_data = self._document_to_status_attributes(document)
+
         if document.num_pages > 0:
             input_data["PageCount"] = document.num_pages
 
@@ -192,6 +206,34 @@ class DocumentAppSyncService:
 
         return input_data
 
+    def _document_to_update_input(
+        self, document: Document, attributes: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Convert a Document object to an UpdateDocumentInput compatible with AppSync.
+
+        Only fields that changed since they were last sent for this document
+        are included (the resolver leaves omitted fields untouched); the status
+        fields are always included.
+
+        Args:
+            document: The Document object to convert
+            attributes: Optional precomputed result of _document_to_attributes
+
+        Returns:
+            Dictionary compatible with UpdateDocumentInput GraphQL type
+        """
+        if attributes is None:
+            attributes = self._document_to_attributes(document)
+
+        changed = document.changed_attributes(attributes)
+        input_data = {"ObjectKey": document.input_key}
+        for name, value in attributes.items():
+            if name in changed or name in ALWAYS_UPDATED_ATTRIBUTES:
+                input_data[name] = value
+
+        return input_data
+
     def _appsync_to_document(self, appsync_data: Dict[str, Any]) -> Document:
         """
         Convert AppSync document data to a Document object.
@@ -365,9 +407,47 @@ class DocumentAppSyncService:
         """
         input_data = self._document_to_update_input(document)
         result = self.client.execute_mutation(UPDATE_DOCUMENT, {"input": input_data})
+        self._mark_sent(document, input_data)
 
         # Convert the response back to a Document object
-        return self._appsync_to_document(result["updateDocument"])
+        updated_document = self._appsync_to_document(result["updateDocument"])
+        updated_document.persisted_state = dict(document.persisted_state)
+        return updated_document
+
+    def update_document_status(self, document: Document) -> Document:
+        """
+        Update only the status and workflow fields of an existing document.
+
+        This is a lightweight alternative to update_document() for status
+        transitions (e.g. to CLASSIFYING or EXTRACTING): pages, sections and
+        metering are neither converted nor sent.
+
+        Args:
+            document: The Document object whose status changed
+
+        Returns:
+            Updated Document object with any data returned from AppSync
+
+        Raises:
+            AppSyncError: If the GraphQL operation fails
+        """
+        input_data = self._document_to_update_input(
+            document, self._document_to_status_attributes(document)
+        )
+        # Subscribers receive the selection set of this mutation, so the full
+        # document is still requested
+        result = self.client.execute_mutation(UPDATE_DOCUMENT, {"input": input_data})
+        self._mark_sent(document, input_data)
+
+        updated_document = self._appsync_to_document(result["updateDocument"])
+        updated_document.persisted_state = dict(document.persisted_state)
+        return updated_document
+
+    def _mark_sent(self, document: Document, input_data: Dict[str, Any]) -> None:
+        """Record the fields of an update input as persisted for the document."""
+        document.mark_persisted(
+            {name: value for name, value in input_data.items() if name != "ObjectKey"}
+        )
 
     def calculate_ttl(self, days: int = 30) -> int:
         """
@@ -19,7 +19,7 @@ import os
 import time
 from typing import Any, Dict, List
 
-from idp_common import bedrock, image, metrics, s3, utils
+from idp_common import bedrock, image, metrics, page_assets, s3, utils
 from idp_common.models import Document
 from idp_common.utils import extract_json_from_text
 
@@ -650,9 +650,22 @@ class AssessmentService:
         metrics.put_metric("InputDocumentsForAssessment", 1)
         metrics.put_metric("InputDocumentPagesForAssessment", len(section.page_ids))
 
+        prefetch = None
         try:
-            # Read existing extraction results
+            # Start reading the page inputs in the background: text, images
+            # and text confidence data of all pages
             t0 = time.time()
+            assessment_config = self.config.get("assessment", {})
+            image_config = assessment_config.get("image", {})
+            prefetch = page_assets.prefetch_section_pages(
+                document,
+                sorted_page_ids,
+                image_config.get("target_width"),
+                image_config.get("target_height"),
+                page_loader=self._get_text_confidence_data,
+            )
+
+            # Read existing extraction results
             extraction_data = s3.get_json_content(section.extraction_result_uri)
             extraction_results = extraction_data.get("inference_result", {})
 
@@ -664,62 +677,17 @@ class AssessmentService:
             t1 = time.time()
             logger.info(f"Time taken to read extraction results: {t1 - t0:.2f} seconds")
 
-            # Read document text from all pages in order
-            document_texts = []
-            for page_id in sorted_page_ids:
-                if page_id not in document.pages:
-                    error_msg = f"Page {page_id} not found in document"
-                    logger.error(error_msg)
-                    document.errors.append(error_msg)
-                    continue
-
-                page = document.pages[page_id]
-                text_path = page.parsed_text_uri
-                page_text = s3.get_text_content(text_path)
-                document_texts.append(page_text)
-
-            document_text = "\n".join(document_texts)
-            t2 = time.time()
-            logger.info(f"Time taken to read text content: {t2 - t1:.2f} seconds")
-
-            # Read page images with configurable dimensions
-            assessment_config = self.config.get("assessment", {})
-            image_config = assessment_config.get("image", {})
-            target_width = image_config.get("target_width")
-            target_height = image_config.get("target_height")
-
-            page_images = []
-            for page_id in sorted_page_ids:
-                if page_id not in document.pages:
-                    continue
-
-                page = document.pages[page_id]
-                image_uri = page.image_uri
-
-                if target_width is not None and target_height is not None:
-                    # Cast to int in case config values are strings
-                    target_width = int(target_width)
-                    target_height = int(target_height)
-                    image_content = image.prepare_image(
-                        image_uri, target_width, target_height
-                    )
-                else:
-                    image_content = image.prepare_image(
-                        image_uri
-                    )  # Uses function defaults
-                page_images.append(image_content)
-
-            t3 = time.time()
-            logger.info(f"Time taken to read images: {t3 - t2:.2f} seconds")
+            section_pages = prefetch.result()
+            document_text = section_pages.text
+            page_images = [
+                page_image for page_image in section_pages.images if page_image
+            ]
 
-            # Read text confidence data for confidence information
+            # Text confidence data for confidence information
             ocr_text_confidence = ""
-            for page_id in sorted_page_ids:
-                if page_id not in document.pages:
-                    continue
-
-                page = document.pages[page_id]
-                text_confidence_data_str = self._get_text_confidence_data(page)
+            for page_id, text_confidence_data_str in zip(
+                section_pages.page_ids, section_pages.extras
+            ):
                 if text_confidence_data_str:
                     ocr_text_confidence += (
                         f"\n--- Page {page_id} Text Confidence Data ---\n"
@@ -727,7 +695,7 @@ class AssessmentService:
                     ocr_text_confidence += text_confidence_data_str
 
             t4 = time.time()
-            logger.info(f"Time taken to read raw OCR results: {t4 - t3:.2f} seconds")
+            logger.info(f"Time taken to read page inputs: {t4 - t1:.2f} seconds")
 
             # Get assessment configuration
             model_id = self.config.get("model_id") or assessment_config.get("model")
@@ -975,6 +943,11 @@ class AssessmentService:
             logger.error(error_msg)
             document.errors.append(error_msg)
             raise
+        finally:
+            # Discard page reads still queued when the section failed or was
+            # skipped before its pages were used
+            if prefetch is not None:
+                prefetch.cancel()
 
         return document
 
@@ -4,10 +4,22 @@
 """
 Bedrock Data Automation module for IDP Common Package.
 
-Provides a service for calling Bedrock Data Automation.
+Provides a service for calling Bedrock Data Automation and tracking the
+completion of its invocations.
 """
 
 from idp_common.bda.bda_invocation import BdaInvocation
 from idp_common.bda.bda_service import BdaService
+from idp_common.bda.completion import (
+    AdaptivePollPolicy,
+    BdaCompletionTracker,
+    JobDurationHistory,
+)
 
-__all__ = ["BdaInvocation", "BdaService"]
+__all__ = [
+    "AdaptivePollPolicy",
+    "BdaCompletionTracker",
+    "BdaInvocation",
+    "BdaService",
+    "JobDurationHistory",
+]
@@ -1,14 +1,18 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 
+import asyncio
+import itertools
 import logging
 import os
 import time
 import uuid
-from typing import Optional
+from typing import Any, Dict, Iterable, Optional
 
 import boto3
 
+from idp_common.bda.completion import TERMINAL_STATUSES, BdaCompletionTracker
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,6 +22,7 @@ class BdaService:
         output_s3_uri: str,
         dataAutomationProjectArn: Optional[str] = None,
         dataAutomationProfileArn: Optional[str] = None,
+        completion_tracker: Optional[BdaCompletionTracker] = None,
     ):
         self._output_s3_uri = output_s3_uri
 
@@ -33,6 +38,12 @@ class BdaService:
 
         self._bda_client = boto3.client("bedrock-data-automation-runtime")
 
+        # Tracks invocations for adaptive polling, multi-invocation waits and
+        # EventBridge completion events
+        self.completion_tracker = completion_tracker or BdaCompletionTracker(
+            self._bda_client
+        )
+
         return
 
     def invoke_data_automation_async(
@@ -63,11 +74,46 @@ class BdaService:
         logger.debug(
             f"Data automation job started with invocation ARN: {response['invocationArn']}"
         )
+        self.completion_tracker.register(
+            response["invocationArn"],
+            key=blueprintArn or self._dataAutomationProjectArn,
+        )
         return response
 
-    def wait_data_automation_invocation(self, invocationArn: str, sleep_seconds=10):
+    def wait_data_automation_invocation(
+        self,
+        invocationArn: str,
+        sleep_seconds: Optional[float] = None,
+        page_count: Optional[int] = None,
+    ):
+        """
+        Wait until an invocation completes.
+
+        Without sleep_seconds, status checks are scheduled adaptively from the
+        durations of earlier jobs with the same blueprint or project and page
+        count, backing off exponentially.
+
+        Args:
+            invocationArn: Invocation ARN
+            sleep_seconds: Fixed delay between status checks, instead of adaptive polling
+            page_count: Number of pages in the input document, if known
+
+        Returns:
+            Final get_data_automation_status response
+        """
+        if page_count is not None:
+            self.completion_tracker.register(invocationArn, page_count=page_count)
+        if sleep_seconds:
+            delays = itertools.chain([0], itertools.repeat(sleep_seconds))
+        else:
+            delays = self.completion_tracker.poll_delays(invocationArn)
+
         # Poll for job status until completion
         while True:
+            delay = next(delays)
+            if delay:
+                time.sleep(delay)
+
             status_response = self._bda_client.get_data_automation_status(
                 invocationArn=invocationArn
             )
@@ -75,11 +121,44 @@ class BdaService:
             status = status_response["status"]
             logger.debug(f"Current job status: {status}")
 
-            if status in ["Success", "ServiceError", "ClientError"]:
-                break
+            if status in TERMINAL_STATUSES:
+                self.completion_tracker.record_completion(invocationArn, status)
+                return status_response
+
+    async def wait_data_automation_invocations_async(
+        self, invocationArns: Iterable[str], timeout: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Wait until all invocations complete, tracking them from one event loop.
+
+        Args:
+            invocationArns: Invocation ARNs
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            Final get_data_automation_status response of each invocation
+        """
+        return await self.completion_tracker.wait_all(invocationArns, timeout=timeout)
+
+    def wait_data_automation_invocations(
+        self, invocationArns: Iterable[str], timeout: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Synchronous version of wait_data_automation_invocations_async."""
+        return asyncio.run(
+            self.wait_data_automation_invocations_async(invocationArns, timeout)
+        )
+
+    def notify_event(self, event: Dict[str, Any]) -> Optional[str]:
+        """
+        Pass a BDA EventBridge job status event to the completion tracker.
+
+        A wait_data_automation_invocations call waiting for the matching
+        invocation checks its status immediately instead of at its next poll.
 
-            # Wait before checking again
-            time.sleep(sleep_seconds)
+        Returns:
+            ARN of the tracked invocation the event refers to, if any
+        """
+        return self.completion_tracker.notify_event(event)
 
     def get_data_automation_invocation(self, invocationArn: str):
         status_response = self._bda_client.get_data_automation_status(
@@ -114,12 +193,18 @@ class BdaService:
             }
 
     def invoke_data_automation(
-        self, input_s3_uri: str, blueprintArn: Optional[str] = None, sleep_seconds=10
+        self,
+        input_s3_uri: str,
+        blueprintArn: Optional[str] = None,
+        sleep_seconds: Optional[float] = None,
+        page_count: Optional[int] = None,
     ):
         invocation_response = self.invoke_data_automation_async(
             input_s3_uri=input_s3_uri, blueprintArn=blueprintArn
         )
         invocationArn = invocation_response["invocationArn"]
+        if page_count is not None:
+            self.completion_tracker.register(invocationArn, page_count=page_count)
         self.wait_data_automation_invocation(
             invocationArn=invocationArn, sleep_seconds=sleep_seconds
         )
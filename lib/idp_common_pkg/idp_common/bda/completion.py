@@ -0,0 +1,446 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Completion tracking for Bedrock Data Automation invocations.
+
+Instead of polling every invocation at a fixed interval, the first status
+check is scheduled shortly before the job is expected to finish, based on
+the durations of earlier jobs with the same blueprint (or project) and a
+similar page count, and later checks back off exponentially. Jobs without
+history are checked every max_interval, so they never make more status
+calls than the previous fixed 10-second poll.
+
+BdaCompletionTracker waits for many invocations from a single asyncio loop
+and accepts BDA EventBridge events (notify_event), so callers that receive
+the completion events are woken immediately and only poll as a fallback.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = frozenset({"Success", "ServiceError", "ClientError"})
+
+DEFAULT_MIN_POLL_SECONDS = 1.0
+DEFAULT_MAX_POLL_SECONDS = 10.0
+DEFAULT_BACKOFF_FACTOR = 2.0
+# First check at this fraction of the expected duration
+DEFAULT_FIRST_POLL_FRACTION = 0.8
+DEFAULT_JITTER = 0.1
+# Polling interval used as a safety net when completion events are expected
+DEFAULT_EVENT_FALLBACK_POLL_SECONDS = 60.0
+DEFAULT_MAX_CONCURRENT_POLLS = 10
+
+DURATION_WEIGHT = 0.3
+DEFAULT_MAX_HISTORY_KEYS = 512
+
+
+def _page_bucket(page_count: Optional[int]) -> Optional[int]:
+    """Bucket page counts by powers of two (1, 2-3, 4-7, ...)."""
+    if not page_count or page_count < 1:
+        return None
+    return int(page_count).bit_length()
+
+
+class JobDurationHistory:
+    """Thread-safe moving averages of BDA job durations."""
+
+    def __init__(self, max_keys: int = DEFAULT_MAX_HISTORY_KEYS):
+        """
+        Initialize the history.
+
+        Args:
+            max_keys: Maximum number of (key, page bucket) entries kept; the
+                least recently used entry is dropped beyond this
+        """
+        self.max_keys = max(1, max_keys)
+        self._durations: "OrderedDict[Tuple[Optional[str], Optional[int]], float]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def _update(self, entry: Tuple[Optional[str], Optional[int]], seconds: float):
+        previous = self._durations.get(entry)
+        if previous is None:
+            self._durations[entry] = seconds
+        else:
+            self._durations[entry] = previous + DURATION_WEIGHT * (seconds - previous)
+        self._durations.move_to_end(entry)
+        while len(self._durations) > self.max_keys:
+            self._durations.popitem(last=False)
+
+    def record(
+        self, key: Optional[str], page_count: Optional[int], seconds: float
+    ) -> None:
+        """
+        Record the duration of a completed job.
+
+        Args:
+            key: Blueprint or project ARN the job ran with
+            page_count: Number of pages in the input document, if known
+            seconds: Time from invocation to completion
+        """
+        if seconds <= 0:
+            return
+        bucket = _page_bucket(page_count)
+        with self._lock:
+            self._update((key, bucket), seconds)
+            if bucket is not None:
+                self._update((key, None), seconds)
+
+    def expected(
+        self, key: Optional[str], page_count: Optional[int]
+    ) -> Optional[float]:
+        """
+        Get the expected duration of a job, if there is history for it.
+
+        Falls back to all page counts for the key when there is no history
+        for the job's page count.
+        """
+        bucket = _page_bucket(page_count)
+        with self._lock:
+            expected = self._durations.get((key, bucket))
+            if expected is None and bucket is not None:
+                expected = self._durations.get((key, None))
+            return expected
+
+    def clear(self) -> None:
+        """Discard all recorded durations."""
+        with self._lock:
+            self._durations.clear()
+
+
+_history: Optional[JobDurationHistory] = None
+_history_lock = threading.Lock()
+
+
+def get_duration_history() -> JobDurationHistory:
+    """Get the process-wide BDA job duration history."""
+    global _history
+    if _history is None:
+        with _history_lock:
+            if _history is None:
+                _history = JobDurationHistory()
+    return _history
+
+
+def reset_duration_history() -> None:
+    """Discard the process-wide history (mainly for tests)."""
+    global _history
+    with _history_lock:
+        _history = None
+
+
+class AdaptivePollPolicy:
+    """Computes the delays between status checks of an invocation."""
+
+    def __init__(
+        self,
+        min_interval: float = DEFAULT_MIN_POLL_SECONDS,
+        max_interval: float = DEFAULT_MAX_POLL_SECONDS,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        first_poll_fraction: float = DEFAULT_FIRST_POLL_FRACTION,
+        jitter: float = DEFAULT_JITTER,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            min_interval: Shortest delay between status checks in seconds
+            max_interval: Longest delay between status checks in seconds
+            backoff_factor: Growth factor of the delay after each check
+            first_poll_fraction: Fraction of the expected duration to wait
+                before the first check
+            jitter: Relative random variation applied to each delay, so many
+                waiters do not poll in lockstep
+        """
+        self.min_interval = max(0.0, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.backoff_factor = max(1.0, backoff_factor)
+        self.first_poll_fraction = first_poll_fraction
+        self.jitter = max(0.0, jitter)
+
+    def _jittered(self, delay: float) -> float:
+        if not self.jitter:
+            return delay
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def delays(
+        self, expected: Optional[float] = None, elapsed: float = 0.0
+    ) -> Iterator[float]:
+        """
+        Generate the delay before each status check.
+
+        Args:
+            expected: Expected job duration in seconds, if known
+            elapsed: Seconds since the job was invoked
+
+        Yields:
+            Seconds to wait before the next status check
+        """
+        if expected:
+            first = max(
+                self.first_poll_fraction * expected - elapsed, self.min_interval
+            )
+            interval = min(self.max_interval, max(self.min_interval, 0.2 * expected))
+        else:
+            # Without an estimate, short intervals would cost more status
+            # calls than a fixed poll for all but the shortest jobs
+            first = self.max_interval
+            interval = self.max_interval
+        yield self._jittered(first)
+        while True:
+            yield self._jittered(interval)
+            interval = min(self.max_interval, interval * self.backoff_factor)
+
+
+class BdaCompletionTracker:
+    """Tracks BDA invocations until they complete, by polling and events."""
+
+    def __init__(
+        self,
+        bda_client: Any,
+        policy: Optional[AdaptivePollPolicy] = None,
+        history: Optional[JobDurationHistory] = None,
+        event_driven: bool = False,
+        event_fallback_interval: float = DEFAULT_EVENT_FALLBACK_POLL_SECONDS,
+        max_concurrent_polls: int = DEFAULT_MAX_CONCURRENT_POLLS,
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            bda_client: bedrock-data-automation-runtime client
+            policy: Poll policy (defaults to AdaptivePollPolicy())
+            history: Job duration history (defaults to the process-wide one)
+            event_driven: Whether completion events are passed to notify_event;
+                status checks then only run every event_fallback_interval
+            event_fallback_interval: Polling interval in seconds in event-driven mode
+            max_concurrent_polls: Maximum concurrent status calls in wait_all
+        """
+        self._bda_client = bda_client
+        self.policy = policy or AdaptivePollPolicy()
+        self.history = history or get_duration_history()
+        self.event_driven = event_driven
+        self.event_fallback_interval = event_fallback_interval
+        self.max_concurrent_polls = max(1, max_concurrent_polls)
+        # invocation ARN -> (key, page count, start time)
+        self._invocations: Dict[str, Tuple[Optional[str], Optional[int], float]] = {}
+        self._signalled: set = set()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def register(
+        self,
+        invocation_arn: str,
+        key: Optional[str] = None,
+        page_count: Optional[int] = None,
+    ) -> None:
+        """
+        Register an invocation so its duration can be predicted and recorded.
+
+        Registering an invocation again updates its key and page count but
+        keeps its start time.
+
+        Args:
+            invocation_arn: Invocation ARN
+            key: Blueprint or project ARN the job runs with
+            page_count: Number of pages in the input document, if known
+        """
+        with self._lock:
+            previous = self._invocations.get(invocation_arn)
+            if previous is None:
+                self._invocations[invocation_arn] = (key, page_count, time.monotonic())
+            else:
+                self._invocations[invocation_arn] = (
+                    key if key is not None else previous[0],
+                    page_count if page_count is not None else previous[1],
+                    previous[2],
+                )
+
+    def poll_delays(self, invocation_arn: str) -> Iterator[float]:
+        """Generate the delays before each status check of an invocation."""
+        if self.event_driven:
+            return itertools.repeat(self.event_fallback_interval)
+
+        with self._lock:
+            entry = self._invocations.get(invocation_arn)
+        if entry is None:
+            self.register(invocation_arn)
+            return self.policy.delays()
+        key, page_count, start = entry
+        return self.policy.delays(
+            self.history.expected(key, page_count), time.monotonic() - start
+        )
+
+    def record_completion(self, invocation_arn: str, status: str) -> None:
+        """Record the duration of a completed invocation and stop tracking it."""
+        with self._lock:
+            entry = self._invocations.pop(invocation_arn, None)
+            self._signalled.discard(invocation_arn)
+        if entry is None or status != "Success":
+            return
+        key, page_count, start = entry
+        duration = time.monotonic() - start
+        self.history.record(key, page_count, duration)
+        logger.debug(f"Invocation {invocation_arn} completed in {duration:.1f}s")
+
+    def notify_event(self, event: Dict[str, Any]) -> Optional[str]:
+        """
+        Handle a BDA job status change event from EventBridge.
+
+        The matching invocation gets its status checked immediately by
+        wait_all, instead of at its next scheduled poll. Safe to call from
+        any thread.
+
+        Args:
+            event: EventBridge event with source aws.bedrock
+
+        Returns:
+            ARN of the tracked invocation the event refers to, if any
+        """
+        detail = event.get("detail") or {}
+        job_id = detail.get("job_id")
+        candidates = set(event.get("resources") or [])
+        if detail.get("invocation_arn"):
+            candidates.add(detail["invocation_arn"])
+
+        with self._lock:
+            matched = next(
+                (
+                    arn
+                    for arn in self._invocations
+                    if arn in candidates
+                    or (job_id and arn.rsplit("/", 1)[-1] == job_id)
+                ),
+                None,
+            )
+            if matched is None:
+                return None
+            self._signalled.add(matched)
+            loop, wakeup = self._loop, self._wakeup
+
+        logger.debug(f"Completion event received for invocation {matched}")
+        if loop is not None and wakeup is not None:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:  # loop already closed
+                pass
+        return matched
+
+    def _take_signalled(self) -> List[str]:
+        with self._lock:
+            signalled = list(self._signalled)
+            self._signalled.clear()
+        return signalled
+
+    def get_status(self, invocation_arn: str) -> Dict[str, Any]:
+        """Get the status of an invocation."""
+        return self._bda_client.get_data_automation_status(invocationArn=invocation_arn)
+
+    async def wait_all(
+        self, invocation_arns: Iterable[str], timeout: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Wait until all invocations complete.
+
+        All invocations are tracked from a single loop: each is checked when
+        its poll delay expires or when a completion event for it arrives, with
+        at most max_concurrent_polls status calls in flight.
+
+        Args:
+            invocation_arns: Invocation ARNs to wait for
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            Final get_data_automation_status response of each invocation
+
+        Raises:
+            TimeoutError: If invocations are still running after timeout
+        """
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        with self._lock:
+            self._loop, self._wakeup = loop, wakeup
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_polls)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        results: Dict[str, Dict[str, Any]] = {}
+        delays: Dict[str, Iterator[float]] = {}
+        next_check: Dict[str, float] = {}
+        schedule: List[Tuple[float, str]] = []
+
+        def schedule_check(arn: str, at: float) -> None:
+            next_check[arn] = at
+            heapq.heappush(schedule, (at, arn))
+
+        async def check(arn: str) -> Tuple[str, Dict[str, Any]]:
+            async with semaphore:
+                return arn, await loop.run_in_executor(None, self.get_status, arn)
+
+        now = time.monotonic()
+        for arn in dict.fromkeys(invocation_arns):
+            delays[arn] = self.poll_delays(arn)
+            schedule_check(arn, now + next(delays[arn]))
+
+        try:
+            while next_check:
+                # Cleared before taking signalled invocations, so an event
+                # arriving after this point still wakes the wait below
+                wakeup.clear()
+                now = time.monotonic()
+                for arn in self._take_signalled():
+                    if arn in next_check:
+                        schedule_check(arn, now)
+
+                due = []
+                while schedule and schedule[0][0] <= now:
+                    at, arn = heapq.heappop(schedule)
+                    # Skip entries superseded by an event-triggered check
+                    if next_check.get(arn) == at and arn not in due:
+                        due.append(arn)
+
+                if due:
+                    for arn in due:
+                        del next_check[arn]
+                    for arn, status_response in await asyncio.gather(
+                        *(check(arn) for arn in due)
+                    ):
+                        status = status_response["status"]
+                        if status in TERMINAL_STATUSES:
+                            self.record_completion(arn, status)
+                            results[arn] = status_response
+                        else:
+                            schedule_check(arn, time.monotonic() + next(delays[arn]))
+                    continue
+
+                if deadline is not None and now >= deadline:
+                    raise TimeoutError(
+                        f"{len(next_check)} BDA invocations still running after "
+                        f"{timeout} seconds"
+                    )
+                wait = (
+                    min(at for at, arn in schedule if next_check.get(arn) == at) - now
+                )
+                if deadline is not None:
+                    wait = min(wait, deadline - now)
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=max(0.0, wait))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._lock:
+                if self._loop is loop:
+                    self._loop, self._wakeup = None, None
+
+        return results
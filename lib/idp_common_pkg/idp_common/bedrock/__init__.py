@@ -4,6 +4,8 @@
 """Bedrock integration module for IDP Common package."""
 
 from .client import BedrockClient, invoke_model, default_client
+from .cachepoint import CachePointPlanner, get_cachepoint_planner
+from .retry import RetryScheduler, get_retry_scheduler
 
 # Add version info
 __version__ = "0.1.0"
@@ -12,7 +14,11 @@ __version__ = "0.1.0"
 __all__ = [
     "BedrockClient",
     "invoke_model",
-    "default_client"
+    "default_client",
+    "RetryScheduler",
+    "get_retry_scheduler",
+    "CachePointPlanner",
+    "get_cachepoint_planner"
 ]
 
 # Re-export key functions from the default client for backward compatibility
@@ -0,0 +1,327 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Automatic cache point placement for Bedrock prompts.
+
+The services rebuild the same static prompt content (instructions, class
+lists, attribute descriptions, few-shot examples) for every call and only the
+document text and images change. Unless a template contains explicit
+<<CACHEPOINT>> tags, that static prefix is processed and billed in full on
+every call.
+
+The planner finds the static prefix by comparing each request with the
+recent requests of the same prompt template (context and model) and the same
+system prompt:
+
+- Content items that are identical to a recent request belong to the prefix.
+- Within the first differing text item, the common leading text belongs to the
+  prefix up to the last line break, so the boundary does not move with the
+  first characters of the document text.
+- When the prefix is long enough to be cached by the model, a cachePoint is
+  inserted at its end, so subsequent requests read it from the prompt cache.
+
+The first request of a template in a process has nothing to compare with and
+is sent unchanged. Cache read and write tokens are recorded per template, so
+the read and write ratios show how much of the prompt input was served from
+the cache; BedrockClient publishes them as metrics with a Template dimension.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Minimum number of tokens in front of a cache checkpoint, per model
+MIN_CACHEPOINT_TOKENS = {
+    "us.anthropic.claude-3-5-haiku-20241022-v1:0": 2048,
+    "us.anthropic.claude-3-7-sonnet-20250219-v1:0": 1024,
+    "us.amazon.nova-lite-v1:0": 1000,
+    "us.amazon.nova-pro-v1:0": 1000,
+}
+DEFAULT_MIN_CACHEPOINT_TOKENS = 1024
+
+CHARS_PER_TOKEN = 4
+# Rough token count of an image or document item (a rendered page is ~1000-1600)
+NON_TEXT_ITEM_TOKENS = 1000
+# Recent requests kept per template, e.g. one per document class
+DEFAULT_HISTORY_SIZE = 8
+MAX_TEMPLATES = 256
+
+
+def _digest_bytes(value: Any) -> str:
+    if isinstance(value, (bytes, bytearray)):
+        return hashlib.sha256(value).hexdigest()
+    return str(value)
+
+
+def _fingerprint(item: Dict[str, Any]) -> Tuple[str, str]:
+    """Fingerprint a content item; text items keep their text for prefix matching."""
+    if isinstance(item.get("text"), str):
+        return ("text", item["text"])
+    return (
+        "item",
+        hashlib.sha256(
+            json.dumps(item, sort_keys=True, default=_digest_bytes).encode("utf-8")
+        ).hexdigest(),
+    )
+
+
+def _common_prefix(
+    current: List[Tuple[str, str]], previous: List[Tuple[str, str]]
+) -> Tuple[int, int]:
+    """
+    Find the common prefix of two fingerprinted content lists.
+
+    Returns:
+        Tuple of (number of identical leading items, number of leading
+        characters of the next text item that are common, ending at a line
+        break)
+    """
+    items = 0
+    for current_item, previous_item in zip(current, previous):
+        if current_item != previous_item:
+            break
+        items += 1
+
+    chars = 0
+    if items < min(len(current), len(previous)):
+        (kind, text), (previous_kind, previous_text) = current[items], previous[items]
+        if kind == previous_kind == "text":
+            length = 0
+            for a, b in zip(text, previous_text):
+                if a != b:
+                    break
+                length += 1
+            chars = text.rfind("\n", 0, length) + 1
+    return items, chars
+
+
+class CachePointPlanner:
+    """Inserts cache points after the static prefix of repeated prompts."""
+
+    def __init__(
+        self,
+        history_size: int = DEFAULT_HISTORY_SIZE,
+        min_tokens: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Initialize the planner.
+
+        Args:
+            history_size: Recent requests compared per template and system prompt
+            min_tokens: Minimum prefix tokens per model (defaults to
+                MIN_CACHEPOINT_TOKENS)
+        """
+        self.history_size = max(1, history_size)
+        self.min_tokens = dict(
+            MIN_CACHEPOINT_TOKENS if min_tokens is None else min_tokens
+        )
+        # Recent fingerprinted requests by (template key, system prompt hash)
+        self._history: "OrderedDict[Tuple[str, str], Deque[List]]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def plan(
+        self,
+        template_key: str,
+        model_id: str,
+        system_prompt: Union[str, List[Dict[str, Any]]],
+        content: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert a cache point after the static prefix of the content.
+
+        Args:
+            template_key: Identifies the prompt template, e.g. the metering key
+            model_id: Bedrock model ID
+            system_prompt: System prompt of the request
+            content: Content of the user message
+
+        Returns:
+            Content with a cachePoint item inserted, or the content unchanged if
+            no long enough static prefix was found
+        """
+        fingerprints = [_fingerprint(item) for item in content]
+        system_text = (
+            system_prompt
+            if isinstance(system_prompt, str)
+            else "".join(str(item.get("text", "")) for item in system_prompt)
+        )
+        history_key = (
+            template_key,
+            hashlib.sha256(system_text.encode("utf-8")).hexdigest(),
+        )
+
+        with self._lock:
+            recent = self._history.pop(history_key, None) or deque(
+                maxlen=self.history_size
+            )
+            candidates = list(recent)
+            if fingerprints not in candidates:
+                recent.appendleft(fingerprints)
+            self._history[history_key] = recent
+            while len(self._history) > MAX_TEMPLATES:
+                self._history.popitem(last=False)
+
+        best_items, best_chars, best_tokens = 0, 0, 0
+        for previous in candidates:
+            items, chars = _common_prefix(fingerprints, previous)
+            if chars and chars == len(content[items]["text"]):
+                items, chars = items + 1, 0
+            if items == len(content):
+                # Identical request (e.g. a retry): nothing dynamic to split off
+                continue
+            tokens = self._estimate_tokens(content[:items]) + chars // CHARS_PER_TOKEN
+            if tokens > best_tokens:
+                best_items, best_chars, best_tokens = items, chars, tokens
+
+        if not best_tokens:
+            return content
+        best_tokens += len(system_text) // CHARS_PER_TOKEN
+        min_tokens = self.min_tokens.get(model_id, DEFAULT_MIN_CACHEPOINT_TOKENS)
+        if best_tokens < min_tokens:
+            logger.debug(
+                f"Static prefix of {template_key} (~{best_tokens} tokens) is below "
+                f"the {min_tokens} token cache minimum"
+            )
+            return content
+
+        processed_content = list(content[:best_items])
+        remainder = content[best_items:]
+        if best_chars:
+            text = remainder[0]["text"]
+            processed_content.append({"text": text[:best_chars]})
+            remainder = [{"text": text[best_chars:]}] + list(remainder[1:])
+        processed_content.append({"cachePoint": {"type": "default"}})
+        processed_content.extend(remainder)
+
+        logger.info(
+            f"Inserted automatic cachePoint for {template_key} after "
+            f"~{best_tokens} static prefix tokens"
+        )
+        with self._lock:
+            self._template_stats(template_key)["planned_requests"] += 1
+        return processed_content
+
+    def record_usage(
+        self, template_key: str, usage: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Record the token usage of a request.
+
+        Args:
+            template_key: Template key passed to plan()
+            usage: The usage section of the converse response
+
+        Returns:
+            Statistics of this request alone, including its read and write ratios
+        """
+        request = {
+            "requests": 1,
+            "input_tokens": int(usage.get("inputTokens", 0)),
+            "cache_read_tokens": int(usage.get("cacheReadInputTokens", 0)),
+            "cache_write_tokens": int(usage.get("cacheWriteInputTokens", 0)),
+        }
+        with self._lock:
+            stats = self._template_stats(template_key)
+            for name, value in request.items():
+                stats[name] += value
+            summary = self._summarize(stats)
+        logger.debug(
+            f"Prompt cache for {template_key}: "
+            f"read ratio {summary['cache_read_ratio']:.1%}, "
+            f"write ratio {summary['cache_write_ratio']:.1%}"
+        )
+        return self._summarize(request)
+
+    def get_stats(self, template_key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get cache token statistics.
+
+        Args:
+            template_key: Template to report, or None for all templates
+
+        Returns:
+            Statistics of the template, or a dictionary of statistics by template.
+            The read and write ratios are the cache read and cache write tokens
+            as a fraction of all prompt input tokens.
+        """
+        with self._lock:
+            if template_key is not None:
+                return self._summarize(self._stats.get(template_key, {}))
+            return {key: self._summarize(stats) for key, stats in self._stats.items()}
+
+    def _template_stats(self, template_key: str) -> Dict[str, int]:
+        return self._stats.setdefault(
+            template_key,
+            {
+                "requests": 0,
+                "planned_requests": 0,
+                "input_tokens": 0,
+                "cache_read_tokens": 0,
+                "cache_write_tokens": 0,
+            },
+        )
+
+    @staticmethod
+    def _summarize(stats: Dict[str, int]) -> Dict[str, Any]:
+        summary = {
+            "requests": stats.get("requests", 0),
+            "planned_requests": stats.get("planned_requests", 0),
+            "input_tokens": stats.get("input_tokens", 0),
+            "cache_read_tokens": stats.get("cache_read_tokens", 0),
+            "cache_write_tokens": stats.get("cache_write_tokens", 0),
+        }
+        total = (
+            summary["input_tokens"]
+            + summary["cache_read_tokens"]
+            + summary["cache_write_tokens"]
+        )
+        summary["cache_read_ratio"] = (
+            summary["cache_read_tokens"] / total if total else 0.0
+        )
+        summary["cache_write_ratio"] = (
+            summary["cache_write_tokens"] / total if total else 0.0
+        )
+        return summary
+
+    @staticmethod
+    def _estimate_tokens(items: List[Dict[str, Any]]) -> int:
+        tokens = 0
+        for item in items:
+            if isinstance(item.get("text"), str):
+                tokens += len(item["text"]) // CHARS_PER_TOKEN
+            else:
+                tokens += NON_TEXT_ITEM_TOKENS
+        return tokens
+
+
+_planner: Optional[CachePointPlanner] = None
+_planner_lock = threading.Lock()
+
+
+def auto_cachepoint_enabled() -> bool:
+    """Check the BEDROCK_AUTO_CACHEPOINT environment variable (default: true)."""
+    return os.environ.get("BEDROCK_AUTO_CACHEPOINT", "true").lower() != "false"
+
+
+def get_cachepoint_planner() -> CachePointPlanner:
+    """Get the process-wide cache point planner, shared by all clients."""
+    global _planner
+    with _planner_lock:
+        if _planner is None:
+            _planner = CachePointPlanner()
+        return _planner
+
+
+def reset_cachepoint_planner() -> None:
+    """Discard the shared planner with its history and statistics (mainly for tests)."""
+    global _planner
+    with _planner_lock:
+        _planner = None
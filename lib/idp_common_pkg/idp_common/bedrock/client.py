@@ -6,20 +6,32 @@ Bedrock client module for interacting with Amazon Bedrock models.
 
 This module provides a class-based interface for invoking Bedrock models
 with built-in retry logic, metrics tracking, and configuration options.
+Retries are coordinated across threads per model by the retry scheduler
+(see idp_common.bedrock.retry).
 """
 
-import boto3
 import json
 import os
 import time
 import logging
 import copy
-import random
-import socket
 from typing import Dict, Any, List, Optional, Union, Tuple
-from botocore.config import Config
 from botocore.exceptions import ClientError, ReadTimeoutError, ConnectTimeoutError, EndpointConnectionError
 from urllib3.exceptions import ReadTimeoutError as Urllib3ReadTimeoutError
+
+from ..clients import get_client
+from .cachepoint import (
+    CachePointPlanner,
+    auto_cachepoint_enabled,
+    get_cachepoint_planner,
+)
+from .retry import (
+    THROTTLING_ERROR_CODES,
+    RetryScheduler,
+    full_jitter_backoff,
+    get_retry_scheduler,
+)
+
 try:
     from requests.exceptions import ReadTimeout as RequestsReadTimeout, ConnectTimeout as RequestsConnectTimeout
 except ImportError:
@@ -52,7 +64,10 @@ class BedrockClient:
         max_retries: int = DEFAULT_MAX_RETRIES,
         initial_backoff: float = DEFAULT_INITIAL_BACKOFF,
         max_backoff: float = DEFAULT_MAX_BACKOFF,
-        metrics_enabled: bool = True
+        metrics_enabled: bool = True,
+        retry_scheduler: Optional[RetryScheduler] = None,
+        auto_cachepoint: Optional[bool] = None,
+        cachepoint_planner: Optional[CachePointPlanner] = None
     ):
         """
         Initialize a Bedrock client.
@@ -63,6 +78,10 @@ class BedrockClient:
             initial_backoff: Initial backoff time in seconds
             max_backoff: Maximum backoff time in seconds
             metrics_enabled: Whether to publish metrics
+            retry_scheduler: Optional retry scheduler (defaults to the process-wide scheduler)
+            auto_cachepoint: Whether to insert cache points after the static prompt prefix
+                automatically (defaults to the BEDROCK_AUTO_CACHEPOINT env var, or True)
+            cachepoint_planner: Optional cache point planner (defaults to the process-wide planner)
         """
         self.region = region or os.environ.get('AWS_REGION', 'us-west-2')
         self.max_retries = max_retries
@@ -70,18 +89,36 @@ class BedrockClient:
         self.max_backoff = max_backoff
         self.metrics_enabled = metrics_enabled
         self._client = None
+        self._retry_scheduler = retry_scheduler
+        self.auto_cachepoint = auto_cachepoint_enabled() if auto_cachepoint is None else auto_cachepoint
+        self._cachepoint_planner = cachepoint_planner
         
     @property
     def client(self):
-        """Lazy-loaded Bedrock client."""
-        config = Config(
-            connect_timeout=10,
-            read_timeout=300  # allow plenty of time for large extraction or assessment inferences
-            )
+        """Lazy-loaded Bedrock client, shared by all BedrockClient instances for the region."""
         if self._client is None:
-            self._client = boto3.client('bedrock-runtime', region_name=self.region, config=config)
+            self._client = get_client(
+                'bedrock-runtime',
+                region_name=self.region,
+                connect_timeout=10,
+                read_timeout=300,  # allow plenty of time for large extraction or assessment inferences
+                # Throttles and transient errors are retried by _invoke_with_retry
+                # through the shared RetryScheduler; botocore retries underneath it
+                # would multiply the attempts and hide throttles from the scheduler
+                retries={'mode': 'standard', 'max_attempts': 1},
+            )
         return self._client
     
+    @property
+    def retry_scheduler(self) -> RetryScheduler:
+        """Retry scheduler shared with all other clients calling the same models."""
+        return self._retry_scheduler or get_retry_scheduler()
+
+    @property
+    def cachepoint_planner(self) -> CachePointPlanner:
+        """Cache point planner shared with all other clients."""
+        return self._cachepoint_planner or get_cachepoint_planner()
+    
     def __call__(
         self,
         model_id: str,
@@ -243,6 +280,15 @@ class BedrockClient:
                     else:
                         # Pass through unchanged
                         processed_content.append(item)
+        elif (
+            self.auto_cachepoint
+            and model_id in CACHEPOINT_SUPPORTED_MODELS
+            and not any("cachePoint" in item for item in content)
+        ):
+            # No cachepoint tags, cache the static prefix of the template if there is one
+            processed_content = self.cachepoint_planner.plan(
+                f"{context}/bedrock/{model_id}", model_id, formatted_system_prompt, content
+            )
         else:
             # No cachepoint tags, use content as is
             processed_content = content
@@ -346,35 +392,40 @@ class BedrockClient:
         # Start timing the entire request
         request_start_time = time.time()
         
-        # Call the recursive retry function
         result = self._invoke_with_retry(
             converse_params=converse_params,
-            retry_count=0,
             max_retries=effective_max_retries,
             request_start_time=request_start_time,
             context=context
         )
+
+        if model_id in CACHEPOINT_SUPPORTED_MODELS:
+            template_key = f"{context}/bedrock/{model_id}"
+            usage = self.cachepoint_planner.record_usage(
+                template_key, result["response"].get("usage", {})
+            )
+            # Per template, so the effect of automatic cache points can be monitored
+            dimensions = [{'Name': 'Template', 'Value': template_key}]
+            self._put_metric('BedrockCacheReadRatio', usage['cache_read_ratio'] * 100, 'Percent', dimensions)
+            self._put_metric('BedrockCacheWriteRatio', usage['cache_write_ratio'] * 100, 'Percent', dimensions)
         
         return result
     
     def _invoke_with_retry(
         self,
         converse_params: Dict[str, Any],
-        retry_count: int,
         max_retries: int,
         request_start_time: float,
-        last_exception: Exception = None,
         context: str = "Unspecified"
     ) -> Dict[str, Any]:
         """
-        Recursive helper method to handle retries for Bedrock invocation.
+        Invoke the Bedrock converse API, retrying throttled and timed out requests.
         
         Args:
             converse_params: Parameters for the Bedrock converse API call
-            retry_count: Current retry attempt (0-based)
             max_retries: Maximum number of retry attempts
             request_start_time: Time when the original request started
-            last_exception: The last exception encountered (for final error reporting)
+            context: Context prefix for the metering key
             
         Returns:
             Bedrock response object with metering information
@@ -382,32 +433,102 @@ class BedrockClient:
         Raises:
             Exception: The last exception encountered if max retries are exceeded
         """
-        try:
-            # Create a copy of the messages to sanitize for logging
-            sanitized_params = copy.deepcopy(converse_params)
-            if "messages" in sanitized_params:
-                sanitized_params["messages"] = self._sanitize_messages_for_logging(sanitized_params["messages"])
-            
-            # Log detailed request parameters
-            logger.info(f"Bedrock request attempt {retry_count + 1}/{max_retries}:")
-            logger.info(f"  - model: {converse_params['modelId']}")
-            logger.info(f"  - inferenceConfig: {converse_params['inferenceConfig']}")
-            logger.info(f"  - system: {converse_params['system']}")
-            logger.info(f"  - messages: {sanitized_params['messages']}")
-            logger.info(f"  - additionalModelRequestFields: {converse_params['additionalModelRequestFields']}")
-            
-            # Log guardrail usage if configured
-            if "guardrailConfig" in converse_params:
-                logger.debug(f"  - guardrailConfig: {converse_params['guardrailConfig']}")
-            
-            # Start timing this attempt
-            attempt_start_time = time.time()
-            
-            # Make the API call
-            response = self.client.converse(**converse_params)
+        model_id = converse_params['modelId']
+        retry_count = 0
+        
+        while True:
+            self._wait_for_model(model_id)
+            try:
+                # Create a copy of the messages to sanitize for logging
+                sanitized_params = copy.deepcopy(converse_params)
+                if "messages" in sanitized_params:
+                    sanitized_params["messages"] = self._sanitize_messages_for_logging(sanitized_params["messages"])
+                
+                # Log detailed request parameters
+                logger.info(f"Bedrock request attempt {retry_count + 1}/{max_retries}:")
+                logger.info(f"  - model: {converse_params['modelId']}")
+                logger.info(f"  - inferenceConfig: {converse_params['inferenceConfig']}")
+                logger.info(f"  - system: {converse_params['system']}")
+                logger.info(f"  - messages: {sanitized_params['messages']}")
+                logger.info(f"  - additionalModelRequestFields: {converse_params['additionalModelRequestFields']}")
+                
+                # Log guardrail usage if configured
+                if "guardrailConfig" in converse_params:
+                    logger.debug(f"  - guardrailConfig: {converse_params['guardrailConfig']}")
+                
+                # Start timing this attempt
+                attempt_start_time = time.time()
+                
+                # Make the API call
+                response = self.client.converse(**converse_params)
+                
+                # Calculate duration
+                duration = time.time() - attempt_start_time
+                
+            except ClientError as e:
+                # Handle boto3/botocore client errors (have response structure)
+                error_code = e.response['Error']['Code']
+                error_message = e.response['Error']['Message']
+                
+                retryable_errors = [
+                    'ThrottlingException', 
+                    'ServiceQuotaExceededException', 
+                    'RequestLimitExceeded', 
+                    'TooManyRequestsException', 
+                    'ServiceUnavailableException',
+                    'ModelErrorException',
+                    'RequestTimeout',
+                    'RequestTimeoutException'
+                ]
+                self._record_outcome(model_id, error_code)
+                
+                if error_code not in retryable_errors:
+                    logger.error(f"Non-retryable Bedrock error: {error_code} - {error_message}")
+                    self._put_metric('BedrockRequestsFailed', 1)
+                    self._put_metric('BedrockNonRetryableErrors', 1)
+                    raise
+                
+                self._put_metric('BedrockThrottles', 1)
+                
+                # Check if we've reached max retries
+                if retry_count >= max_retries:
+                    logger.error(f"Max retries ({max_retries}) exceeded. Last error: {error_message}")
+                    self._put_metric('BedrockRequestsFailed', 1)
+                    self._put_metric('BedrockMaxRetriesExceeded', 1)
+                    raise
+                
+                self._backoff(model_id, retry_count, max_retries, f"Bedrock throttling occurred. Error: {error_message}")
+                retry_count += 1
+                continue
+                
+            except (ReadTimeoutError, ConnectTimeoutError, EndpointConnectionError, 
+                    Urllib3ReadTimeoutError, RequestsReadTimeout, RequestsConnectTimeout) as e:
+                # Handle timeout and connection errors (these are retryable)
+                error_message = str(e)
+                self._record_outcome(model_id)
+                self._put_metric('BedrockTimeouts', 1)
+                
+                # Check if we've reached max retries
+                if retry_count >= max_retries:
+                    logger.error(f"Max retries ({max_retries}) exceeded. Last timeout error: {error_message}")
+                    self._put_metric('BedrockRequestsFailed', 1)
+                    self._put_metric('BedrockMaxRetriesExceeded', 1)
+                    raise
+                
+                self._backoff(model_id, retry_count, max_retries, f"Bedrock timeout occurred. Error: {error_message}")
+                retry_count += 1
+                continue
+                
+            except Exception as e:
+                # Handle unexpected errors (not retryable)
+                self._record_outcome(model_id)
+                error_message = str(e)
+                logger.error(f"Unexpected Bedrock error: {error_message}", exc_info=True)
+                self._put_metric('BedrockRequestsFailed', 1)
+                self._put_metric('BedrockUnexpectedErrors', 1)
+                raise
             
-            # Calculate duration
-            duration = time.time() - attempt_start_time
+            self._record_outcome(model_id)
             
             # Log response details, but sanitize large content
             sanitized_response = self._sanitize_response_for_logging(response)
@@ -449,97 +570,49 @@ class BedrockClient:
             }
             
             return response_with_metering
-            
-        except ClientError as e:
-            # Handle boto3/botocore client errors (have response structure)
-            error_code = e.response['Error']['Code']
-            error_message = e.response['Error']['Message']
-            
-            retryable_errors = [
-                'ThrottlingException', 
-                'ServiceQuotaExceededException', 
-                'RequestLimitExceeded', 
-                'TooManyRequestsException', 
-                'ServiceUnavailableException',
-                'ModelErrorException',
-                'RequestTimeout',
-                'RequestTimeoutException'
-            ]
-            
-            if error_code in retryable_errors:
-                self._put_metric('BedrockThrottles', 1)
-                
-                # Check if we've reached max retries
-                if retry_count >= max_retries:
-                    logger.error(f"Max retries ({max_retries}) exceeded. Last error: {error_message}")
-                    self._put_metric('BedrockRequestsFailed', 1)
-                    self._put_metric('BedrockMaxRetriesExceeded', 1)
-                    raise
-                
-                # Calculate backoff time
-                backoff = self._calculate_backoff(retry_count)
-                logger.warning(f"Bedrock throttling occurred (attempt {retry_count + 1}/{max_retries}). "
-                             f"Error: {error_message}. "
-                             f"Backing off for {backoff:.2f}s")
-                
-                # Sleep for backoff period
-                time.sleep(backoff)
-                
-                # Recursive call with incremented retry count
-                return self._invoke_with_retry(
-                    converse_params=converse_params,
-                    retry_count=retry_count + 1,
-                    max_retries=max_retries,
-                    request_start_time=request_start_time,
-                    last_exception=e,
-                    context=context
-                )
-            else:
-                logger.error(f"Non-retryable Bedrock error: {error_code} - {error_message}")
-                self._put_metric('BedrockRequestsFailed', 1)
-                self._put_metric('BedrockNonRetryableErrors', 1)
-                raise
-                
-        except (ReadTimeoutError, ConnectTimeoutError, EndpointConnectionError, 
-                Urllib3ReadTimeoutError, RequestsReadTimeout, RequestsConnectTimeout) as e:
-            # Handle timeout and connection errors (these are retryable)
-            error_message = str(e)
-            
-            self._put_metric('BedrockTimeouts', 1)
-            
-            # Check if we've reached max retries
-            if retry_count >= max_retries:
-                logger.error(f"Max retries ({max_retries}) exceeded. Last timeout error: {error_message}")
-                self._put_metric('BedrockRequestsFailed', 1)
-                self._put_metric('BedrockMaxRetriesExceeded', 1)
-                raise
-            
-            # Calculate backoff time
-            backoff = self._calculate_backoff(retry_count)
-            logger.warning(f"Bedrock timeout occurred (attempt {retry_count + 1}/{max_retries}). "
-                         f"Error: {error_message}. "
-                         f"Backing off for {backoff:.2f}s")
-            
-            # Sleep for backoff period
-            time.sleep(backoff)
-            
-            # Recursive call with incremented retry count
-            return self._invoke_with_retry(
-                converse_params=converse_params,
-                retry_count=retry_count + 1,
-                max_retries=max_retries,
-                request_start_time=request_start_time,
-                last_exception=e,
-                context=context
-            )
-            
-        except Exception as e:
-            # Handle unexpected errors (not retryable)
-            error_message = str(e)
-            logger.error(f"Unexpected Bedrock error: {error_message}", exc_info=True)
-            self._put_metric('BedrockRequestsFailed', 1)
-            self._put_metric('BedrockUnexpectedErrors', 1)
-            raise
+
+    def _wait_for_model(self, model_id: str) -> None:
+        """
+        Wait until the retry scheduler allows a request to the model.
+        
+        Args:
+            model_id: The Bedrock model ID
+        """
+        waits = self.retry_scheduler.before_attempt(model_id)
+        if waits['circuit_wait'] > 0:
+            self._put_metric('BedrockCircuitBreakerWaitTime', waits['circuit_wait'] * 1000, 'Milliseconds')
+        if waits['rate_limit_wait'] > 0:
+            self._put_metric('BedrockRateLimiterWaitTime', waits['rate_limit_wait'] * 1000, 'Milliseconds')
+    
+    def _record_outcome(self, model_id: str, error_code: Optional[str] = None) -> None:
+        """
+        Report the outcome of a request to the retry scheduler.
+        
+        Args:
+            model_id: The Bedrock model ID
+            error_code: Error code of a failed request (None for success or non-API errors)
+        """
+        if error_code in THROTTLING_ERROR_CODES:
+            if self.retry_scheduler.record_throttle(model_id):
+                self._put_metric('BedrockCircuitBreakerOpened', 1)
+        else:
+            self.retry_scheduler.record_success(model_id)
+    
+    def _backoff(self, model_id: str, retry_count: int, max_retries: int, reason: str) -> None:
+        """
+        Wait for a full-jitter backoff before retrying a request.
+        
+        Args:
+            model_id: The Bedrock model ID
+            retry_count: Current retry attempt (0-based)
+            max_retries: Maximum number of retry attempts
+            reason: Description of the failure for logging
+        """
+        backoff = self._calculate_backoff(retry_count)
+        logger.warning(f"{reason} (attempt {retry_count + 1}/{max_retries}). "
+                     f"Backing off for {backoff:.2f}s")
+        self.retry_scheduler.backoff(model_id, backoff)
+        self._put_metric('BedrockRetryBackoffTime', backoff * 1000, 'Milliseconds')
 
     
     def get_guardrail_config(self) -> Optional[Dict[str, str]]:
@@ -608,12 +681,10 @@ class BedrockClient:
                 "text": normalized_text
             })
         
-        # Call the recursive embedding function
         return self._generate_embedding_with_retry(
             model_id=model_id,
             request_body=request_body,
             normalized_text=normalized_text,
-            retry_count=0,
             max_retries=effective_max_retries
         )
     
@@ -622,20 +693,16 @@ class BedrockClient:
         model_id: str,
         request_body: str,
         normalized_text: str,
-        retry_count: int,
-        max_retries: int,
-        last_exception: Exception = None
+        max_retries: int
     ) -> List[float]:
         """
-        Recursive helper method to handle retries for embedding generation.
+        Generate an embedding, retrying throttled requests.
         
         Args:
             model_id: The embedding model ID
             request_body: JSON request body for the API call
             normalized_text: Normalized input text (for logging)
-            retry_count: Current retry attempt (0-based)
             max_retries: Maximum number of retry attempts
-            last_exception: The last exception encountered (for final error reporting)
             
         Returns:
             List of floats representing the embedding vector
@@ -643,22 +710,71 @@ class BedrockClient:
         Raises:
             Exception: The last exception encountered if max retries are exceeded
         """
-        try:
-            logger.info(f"Bedrock embedding request attempt {retry_count + 1}/{max_retries}:")
-            logger.debug(f"  - model: {model_id}")
-            logger.debug(f"  - input text length: {len(normalized_text)} characters")
-            
-            attempt_start_time = time.time()
-            response = self.client.invoke_model(
-                modelId=model_id,
-                contentType="application/json",
-                accept="application/json",
-                body=request_body
-            )
-            duration = time.time() - attempt_start_time
+        retry_count = 0
+        
+        while True:
+            self._wait_for_model(model_id)
+            try:
+                logger.info(f"Bedrock embedding request attempt {retry_count + 1}/{max_retries}:")
+                logger.debug(f"  - model: {model_id}")
+                logger.debug(f"  - input text length: {len(normalized_text)} characters")
+                
+                attempt_start_time = time.time()
+                response = self.client.invoke_model(
+                    modelId=model_id,
+                    contentType="application/json",
+                    accept="application/json",
+                    body=request_body
+                )
+                duration = time.time() - attempt_start_time
+                
+                # Extract the embedding vector from response
+                response_body = json.loads(response["body"].read())
+                
+            except ClientError as e:
+                error_code = e.response['Error']['Code']
+                error_message = e.response['Error']['Message']
+                
+                retryable_errors = [
+                    'ThrottlingException', 
+                    'ServiceQuotaExceededException', 
+                    'RequestLimitExceeded', 
+                    'TooManyRequestsException', 
+                    'ServiceUnavailableException',
+                    'RequestTimeout',
+                    'ReadTimeout',
+                    'TimeoutError',
+                    'RequestTimeoutException'
+                ]
+                self._record_outcome(model_id, error_code)
+                
+                if error_code not in retryable_errors:
+                    logger.error(f"Non-retryable Bedrock error for embedding: {error_code} - {error_message}")
+                    self._put_metric('BedrockEmbeddingRequestsFailed', 1)
+                    self._put_metric('BedrockEmbeddingNonRetryableErrors', 1)
+                    raise
+                
+                self._put_metric('BedrockEmbeddingThrottles', 1)
+                
+                # Check if we've reached max retries
+                if retry_count >= max_retries:
+                    logger.error(f"Max retries ({max_retries}) exceeded for embedding. Last error: {error_message}")
+                    self._put_metric('BedrockEmbeddingRequestsFailed', 1)
+                    self._put_metric('BedrockEmbeddingMaxRetriesExceeded', 1)
+                    raise
+                
+                self._backoff(model_id, retry_count, max_retries, f"Bedrock throttling occurred. Error: {error_message}")
+                retry_count += 1
+                continue
             
-            # Extract the embedding vector from response
-            response_body = json.loads(response["body"].read())
+            except Exception as e:
+                self._record_outcome(model_id)
+                logger.error(f"Unexpected error generating embedding: {str(e)}", exc_info=True)
+                self._put_metric('BedrockEmbeddingRequestsFailed', 1)
+                self._put_metric('BedrockEmbeddingUnexpectedErrors', 1)
+                raise
+            
+            self._record_outcome(model_id)
             
             # Handle different response formats based on the model
             if "amazon.titan-embed" in model_id:
@@ -673,62 +789,6 @@ class BedrockClient:
             
             logger.debug(f"Generated embedding with {len(embedding)} dimensions")
             return embedding
-            
-        except ClientError as e:
-            error_code = e.response['Error']['Code']
-            error_message = e.response['Error']['Message']
-            
-            retryable_errors = [
-                'ThrottlingException', 
-                'ServiceQuotaExceededException', 
-                'RequestLimitExceeded', 
-                'TooManyRequestsException', 
-                'ServiceUnavailableException',
-                'RequestTimeout',
-                'ReadTimeout',
-                'TimeoutError',
-                'RequestTimeoutException'
-            ]
-            
-            if error_code in retryable_errors:
-                self._put_metric('BedrockEmbeddingThrottles', 1)
-                
-                # Check if we've reached max retries
-                if retry_count >= max_retries:
-                    logger.error(f"Max retries ({max_retries}) exceeded for embedding. Last error: {error_message}")
-                    self._put_metric('BedrockEmbeddingRequestsFailed', 1)
-                    self._put_metric('BedrockEmbeddingMaxRetriesExceeded', 1)
-                    raise
-                
-                # Calculate backoff time
-                backoff = self._calculate_backoff(retry_count)
-                logger.warning(f"Bedrock throttling occurred (attempt {retry_count + 1}/{max_retries}). "
-                            f"Error: {error_message}. "
-                            f"Backing off for {backoff:.2f}s")
-                
-                # Sleep for backoff period
-                time.sleep(backoff)
-                
-                # Recursive call with incremented retry count
-                return self._generate_embedding_with_retry(
-                    model_id=model_id,
-                    request_body=request_body,
-                    normalized_text=normalized_text,
-                    retry_count=retry_count + 1,
-                    max_retries=max_retries,
-                    last_exception=e
-                )
-            else:
-                logger.error(f"Non-retryable Bedrock error for embedding: {error_code} - {error_message}")
-                self._put_metric('BedrockEmbeddingRequestsFailed', 1)
-                self._put_metric('BedrockEmbeddingNonRetryableErrors', 1)
-                raise
-        
-        except Exception as e:
-            logger.error(f"Unexpected error generating embedding: {str(e)}", exc_info=True)
-            self._put_metric('BedrockEmbeddingRequestsFailed', 1)
-            self._put_metric('BedrockEmbeddingUnexpectedErrors', 1)
-            raise
     
     def extract_text_from_response(self, response: Dict[str, Any]) -> str:
         """
@@ -781,7 +841,7 @@ class BedrockClient:
     
     def _calculate_backoff(self, retry_count: int) -> float:
         """
-        Calculate exponential backoff time with jitter.
+        Calculate exponential backoff time with full jitter.
         
         Args:
             retry_count: Current retry attempt (0-based)
@@ -789,18 +849,15 @@ class BedrockClient:
         Returns:
             Backoff time in seconds
         """
-        # Exponential backoff with base of 2
-        backoff_seconds = min(
-            self.max_backoff,
-            self.initial_backoff * (2 ** retry_count)
-        )
-        
-        # Add jitter (random value between 0 and 1 second)
-        jitter = random.random()
-        
-        return backoff_seconds + jitter
+        return full_jitter_backoff(retry_count, self.initial_backoff, self.max_backoff)
     
-    def _put_metric(self, metric_name: str, value: Union[int, float], unit: str = 'Count'):
+    def _put_metric(
+        self,
+        metric_name: str,
+        value: Union[int, float],
+        unit: str = 'Count',
+        dimensions: Optional[List[Dict[str, str]]] = None
+    ):
         """
         Publish a metric if metrics are enabled.
         
@@ -808,11 +865,12 @@ class BedrockClient:
             metric_name: Name of the metric
             value: Metric value
             unit: Metric unit (default: Count)
+            dimensions: Optional list of dimensions
         """
         if self.metrics_enabled:
             try:
                 from ..metrics import put_metric
-                put_metric(metric_name, value, unit)
+                put_metric(metric_name, value, unit, dimensions)
             except Exception as e:
                 logger.warning(f"Failed to publish metric {metric_name}: {str(e)}")
     
@@ -0,0 +1,441 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Retry scheduling for Bedrock requests.
+
+All threads in the process that call the same model share one rate limiter
+and one circuit breaker, so that a throttling burst slows the whole process
+down to the model's quota instead of putting every worker thread to sleep for
+the same backoff and retrying in lockstep:
+
+- Retries wait for a full-jitter backoff (uniformly random between zero and
+  the exponential cap), which spreads them out instead of producing waves.
+- The adaptive rate limiter is inactive until the model throttles. It then
+  paces requests at a fraction of the measured request rate, handing each
+  request its own send slot, and raises the rate again while requests succeed.
+- The circuit breaker opens after a run of consecutive throttles. While it is
+  open no requests are sent; after a cooldown a single probe request is let
+  through, and the breaker closes again when the probe succeeds.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Error codes that mean the model (or account quota) is saturated
+THROTTLING_ERROR_CODES = {
+    "ThrottlingException",
+    "ServiceQuotaExceededException",
+    "RequestLimitExceeded",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+}
+
+DEFAULT_FAILURE_THRESHOLD = int(os.environ.get("BEDROCK_CIRCUIT_BREAKER_THRESHOLD", "10"))
+DEFAULT_RESET_TIMEOUT = float(os.environ.get("BEDROCK_CIRCUIT_BREAKER_RESET_SECONDS", "10"))
+DEFAULT_MAX_RESET_TIMEOUT = 120.0
+
+# Rate limiter tuning
+RATE_DECREASE_FACTOR = 0.7  # multiplicative decrease on throttling
+RATE_INCREASE_FRACTION = 0.05  # additive increase per second, as a fraction of the rate
+MIN_RATE = 0.1  # requests per second
+MEASUREMENT_WINDOW = 1.0  # sliding window over which the request rate is measured
+
+
+def full_jitter_backoff(retry_count: int, initial_backoff: float, max_backoff: float) -> float:
+    """
+    Calculate an exponential backoff with full jitter.
+
+    Args:
+        retry_count: Current retry attempt (0-based)
+        initial_backoff: Backoff cap for the first retry in seconds
+        max_backoff: Maximum backoff cap in seconds
+
+    Returns:
+        Backoff time in seconds, uniformly distributed between 0 and the cap
+    """
+    cap = min(max_backoff, initial_backoff * (2 ** retry_count))
+    return random.uniform(0, cap)
+
+
+class AdaptiveRateLimiter:
+    """Token-bucket style pacing whose rate adapts to throttling (AIMD)."""
+
+    def __init__(
+        self,
+        decrease_factor: float = RATE_DECREASE_FACTOR,
+        increase_fraction: float = RATE_INCREASE_FRACTION,
+        min_rate: float = MIN_RATE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            decrease_factor: Factor applied to the request rate on throttling
+            increase_fraction: Rate increase per second of successful requests,
+                as a fraction of the current rate
+            min_rate: Lowest rate in requests per second
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.decrease_factor = decrease_factor
+        self.increase_fraction = increase_fraction
+        self.min_rate = min_rate
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.enabled = False  # No pacing until the first throttle
+        self.rate = 0.0
+        self._next_slot = 0.0
+        self._last_decrease = float("-inf")
+        self._last_increase = 0.0
+        self._sent: deque = deque()  # send times within the measurement window
+
+    def reserve(self) -> float:
+        """
+        Reserve a send slot for one request.
+
+        Returns:
+            Seconds the caller must wait before sending
+        """
+        with self._lock:
+            now = self._clock()
+            if not self.enabled:
+                self._sent.append(now)
+                return 0.0
+            send_at = max(now, self._next_slot)
+            self._next_slot = send_at + 1.0 / self.rate
+            self._sent.append(send_at)
+            return send_at - now
+
+    def on_throttle(self) -> None:
+        """Reduce the rate after a throttled request."""
+        with self._lock:
+            now = self._clock()
+            # Requests sent at the old rate are throttled together; react once per interval
+            if self.enabled and now - self._last_decrease < max(MEASUREMENT_WINDOW, 1.0 / self.rate):
+                return
+            measured = self._measured_rate(now)
+            base = min(self.rate, measured) if self.enabled else measured
+            self.rate = max(self.min_rate, base * self.decrease_factor)
+            self.enabled = True
+            self._last_decrease = now
+            self._last_increase = now
+            logger.info(f"Bedrock rate limiter reduced rate to {self.rate:.2f} requests/s")
+
+    def on_success(self) -> None:
+        """Increase the rate after a successful request."""
+        with self._lock:
+            if not self.enabled:
+                return
+            now = self._clock()
+            elapsed = now - self._last_increase
+            self._last_increase = now
+            self.rate += max(self.min_rate, self.rate * self.increase_fraction) * elapsed
+
+    @property
+    def measured_rate(self) -> float:
+        """Requests per second sent during the last measurement window."""
+        with self._lock:
+            return self._measured_rate(self._clock())
+
+    def _measured_rate(self, now: float) -> float:
+        while self._sent and now - self._sent[0] > MEASUREMENT_WINDOW:
+            self._sent.popleft()
+        return len(self._sent) / MEASUREMENT_WINDOW
+
+
+class CircuitBreaker:
+    """Stops sending requests to a saturated model until a probe succeeds."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        max_reset_timeout: float = DEFAULT_MAX_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive throttles that open the breaker (0 disables it)
+            reset_timeout: Seconds the breaker stays open before a probe request
+            max_reset_timeout: Cap for the open period, which doubles every
+                time a probe is throttled
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._clock = clock
+        self._cond = threading.Condition()
+
+        self.state = self.CLOSED
+        self.consecutive_throttles = 0
+        self._open_until = 0.0
+        self._current_timeout = reset_timeout
+        self._probe_in_flight = False
+
+    def wait_until_closed(self) -> float:
+        """
+        Block while the breaker is open or another thread is probing.
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.failure_threshold <= 0:
+            return 0.0
+
+        start = self._clock()
+        with self._cond:
+            while True:
+                if self.state == self.CLOSED:
+                    break
+                now = self._clock()
+                if self.state == self.OPEN and now >= self._open_until:
+                    self.state = self.HALF_OPEN
+                    self._probe_in_flight = False
+                if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                    # This caller sends the probe request
+                    self._probe_in_flight = True
+                    break
+                timeout = self._open_until - now if self.state == self.OPEN else self._current_timeout
+                self._cond.wait(timeout=max(timeout, 0.01))
+        return self._clock() - start
+
+    def on_throttle(self) -> bool:
+        """
+        Record a throttled request.
+
+        Returns:
+            True if this throttle opened the breaker
+        """
+        with self._cond:
+            self.consecutive_throttles += 1
+            if self.failure_threshold <= 0:
+                return False
+            if self.state == self.HALF_OPEN:
+                # The probe was throttled: stay open for longer
+                self._current_timeout = min(self.max_reset_timeout, self._current_timeout * 2)
+                self._open(self._current_timeout)
+                return True
+            if self.state == self.CLOSED and self.consecutive_throttles >= self.failure_threshold:
+                self._current_timeout = self.reset_timeout
+                self._open(self._current_timeout)
+                return True
+            return False
+
+    def on_success(self) -> None:
+        """Record a request that was not throttled."""
+        with self._cond:
+            self.consecutive_throttles = 0
+            if self.state != self.CLOSED:
+                logger.info("Bedrock circuit breaker closed")
+            self.state = self.CLOSED
+            self._probe_in_flight = False
+            self._current_timeout = self.reset_timeout
+            self._cond.notify_all()
+
+    def _open(self, timeout: float) -> None:
+        self.state = self.OPEN
+        self._probe_in_flight = False
+        self._open_until = self._clock() + timeout
+        logger.warning(
+            f"Bedrock circuit breaker opened for {timeout:.1f}s after "
+            f"{self.consecutive_throttles} consecutive throttles"
+        )
+        self._cond.notify_all()
+
+
+class _ModelState:
+    """Rate limiter, circuit breaker and wait statistics for one model."""
+
+    def __init__(self, rate_limiting: bool, breaker: CircuitBreaker):
+        self.limiter = AdaptiveRateLimiter() if rate_limiting else None
+        self.breaker = breaker
+        self.lock = threading.Lock()
+        self.stats = {
+            "attempts": 0,
+            "throttles": 0,
+            "circuit_opened": 0,
+            "rate_limit_wait_seconds": 0.0,
+            "circuit_wait_seconds": 0.0,
+            "backoff_wait_seconds": 0.0,
+        }
+
+    def add(self, name: str, value: float) -> None:
+        with self.lock:
+            self.stats[name] += value
+
+
+class RetryScheduler:
+    """
+    Process-wide coordination of Bedrock requests and retries per model ID.
+
+    Use get_retry_scheduler() to obtain the shared instance.
+    """
+
+    def __init__(
+        self,
+        rate_limiting: bool = True,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        max_reset_timeout: float = DEFAULT_MAX_RESET_TIMEOUT,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            rate_limiting: Whether to pace requests with an adaptive rate limiter
+            failure_threshold: Consecutive throttles that open a model's circuit
+                breaker (0 disables the breaker)
+            reset_timeout: Seconds a circuit breaker stays open before a probe
+            max_reset_timeout: Cap for the circuit breaker open period
+            sleep: Sleep function (injectable for tests)
+        """
+        self.rate_limiting = rate_limiting
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._sleep = sleep
+        self._models: Dict[str, _ModelState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, model_id: str) -> _ModelState:
+        state = self._models.get(model_id)
+        if state is None:
+            with self._lock:
+                state = self._models.get(model_id)
+                if state is None:
+                    state = _ModelState(
+                        self.rate_limiting,
+                        CircuitBreaker(
+                            self.failure_threshold,
+                            self.reset_timeout,
+                            self.max_reset_timeout,
+                        ),
+                    )
+                    self._models[model_id] = state
+        return state
+
+    def before_attempt(self, model_id: str) -> Dict[str, float]:
+        """
+        Wait until a request to the model may be sent.
+
+        Args:
+            model_id: Bedrock model ID
+
+        Returns:
+            Dict with the seconds spent waiting for the circuit breaker
+            ('circuit_wait') and for the rate limiter ('rate_limit_wait')
+        """
+        state = self._state(model_id)
+        circuit_wait = state.breaker.wait_until_closed()
+
+        rate_limit_wait = 0.0
+        if state.limiter is not None:
+            rate_limit_wait = state.limiter.reserve()
+            if rate_limit_wait > 0:
+                self._sleep(rate_limit_wait)
+
+        state.add("attempts", 1)
+        state.add("circuit_wait_seconds", circuit_wait)
+        state.add("rate_limit_wait_seconds", rate_limit_wait)
+        return {"circuit_wait": circuit_wait, "rate_limit_wait": rate_limit_wait}
+
+    def record_success(self, model_id: str) -> None:
+        """Record a request that was not throttled (including non-throttling errors)."""
+        state = self._state(model_id)
+        state.breaker.on_success()
+        if state.limiter is not None:
+            state.limiter.on_success()
+
+    def record_throttle(self, model_id: str) -> bool:
+        """
+        Record a throttled request.
+
+        Returns:
+            True if the throttle opened the model's circuit breaker
+        """
+        state = self._state(model_id)
+        state.add("throttles", 1)
+        if state.limiter is not None:
+            state.limiter.on_throttle()
+        opened = state.breaker.on_throttle()
+        if opened:
+            state.add("circuit_opened", 1)
+        return opened
+
+    def backoff(self, model_id: str, delay: float) -> None:
+        """
+        Wait before retrying a failed request.
+
+        Args:
+            model_id: Bedrock model ID
+            delay: Backoff in seconds (see full_jitter_backoff)
+        """
+        self._sleep(delay)
+        self._state(model_id).add("backoff_wait_seconds", delay)
+
+    def get_stats(self, model_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get wait and throttling statistics.
+
+        Args:
+            model_id: Model to report on; all models if omitted
+
+        Returns:
+            Statistics dict for the model, or a dict of them keyed by model ID
+        """
+        if model_id is not None:
+            state = self._state(model_id)
+            with state.lock:
+                return dict(state.stats)
+        with self._lock:
+            states = dict(self._models)
+        return {mid: self.get_stats(mid) for mid in states}
+
+
+_scheduler: Optional[RetryScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_retry_scheduler() -> RetryScheduler:
+    """
+    Get the process-wide retry scheduler, configured from the environment.
+
+    Environment variables:
+        BEDROCK_RATE_LIMITING: 'false' disables adaptive rate limiting
+        BEDROCK_CIRCUIT_BREAKER_THRESHOLD: Consecutive throttles that open the breaker (0 disables it)
+        BEDROCK_CIRCUIT_BREAKER_RESET_SECONDS: Seconds before a probe request is sent
+
+    Returns:
+        Shared RetryScheduler
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RetryScheduler(
+                rate_limiting=os.environ.get("BEDROCK_RATE_LIMITING", "true").lower() != "false",
+            )
+        return _scheduler
+
+
+def reset_retry_scheduler() -> None:
+    """Discard the shared scheduler and its per-model state (mainly for tests)."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = None
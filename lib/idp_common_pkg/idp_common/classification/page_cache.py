@@ -0,0 +1,395 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Content-addressed cache of page classification results.
+
+Identical pages recur across documents (cover sheets, terms and conditions,
+repeated forms). The cache key combines a hash of the page text, a
+perceptual hash of the page image, the model ID and a hash of the
+classification configuration, so a page is only classified by the model
+once per configuration, whichever document it appears in. Cached results
+expire after a TTL, and entries are stored in memory, on local disk or in a
+DynamoDB table.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from idp_common.clients import get_resource
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_CACHE_DIRECTORY = "/tmp/classification-page-cache"
+KEY_PREFIX = "pagecache#"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def text_hash(text: Optional[str]) -> str:
+    """Hash page text, ignoring differences in whitespace."""
+    normalized = _WHITESPACE.sub(" ", text or "").strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def image_hash(image_bytes: Optional[bytes]) -> str:
+    """
+    Compute a perceptual (difference) hash of an image.
+
+    The hash compares the brightness of adjacent pixels of a 9x8 grayscale
+    thumbnail, so re-encoded or rescaled renderings of the same page get the
+    same hash.
+
+    Args:
+        image_bytes: Encoded image
+
+    Returns:
+        16-character hex hash, or an empty string without an image
+    """
+    if not image_bytes:
+        return ""
+    from PIL import Image
+
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            pixels = list(img.convert("L").resize((9, 8), Image.LANCZOS).getdata())
+    except Exception as e:
+        logger.warning(f"Failed to compute perceptual image hash: {e}")
+        return hashlib.sha256(image_bytes).hexdigest()
+
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (left > right)
+    return f"{bits:016x}"
+
+
+def config_hash(config: Any) -> str:
+    """Hash a JSON-serializable configuration."""
+    return hashlib.sha256(
+        json.dumps(config, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def make_cache_key(
+    text: Optional[str], image_bytes: Optional[bytes], model_id: str, config_digest: str
+) -> str:
+    """
+    Build the cache key of a page.
+
+    Args:
+        text: Page text
+        image_bytes: Page image as sent to the model
+        model_id: Classification model ID
+        config_digest: config_hash of the classification configuration
+
+    Returns:
+        Cache key
+    """
+    digest = hashlib.sha256(
+        "|".join(
+            [text_hash(text), image_hash(image_bytes), model_id, config_digest]
+        ).encode("utf-8")
+    ).hexdigest()
+    return f"{KEY_PREFIX}{digest}"
+
+
+class MemoryCacheBackend:
+    """Size-bounded in-memory LRU backend."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry["expires_at"] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry["value"]
+
+    def put(self, key: str, value: Dict[str, Any], ttl_seconds: int) -> None:
+        with self._lock:
+            self._entries[key] = {
+                "value": value,
+                "expires_at": time.time() + ttl_seconds,
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCacheBackend:
+    """Local disk backend with one JSON file per entry."""
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIRECTORY,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.directory = directory
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key[len(KEY_PREFIX) :]}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("expires_at", 0) <= time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        # Touch the file so eviction is least recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("value")
+
+    def put(self, key: str, value: Dict[str, Any], ttl_seconds: int) -> None:
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"value": value, "expires_at": time.time() + ttl_seconds}, f)
+        os.replace(temp_path, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            try:
+                entries = [
+                    entry
+                    for entry in os.scandir(self.directory)
+                    if entry.name.endswith(".json")
+                ]
+            except OSError:
+                return
+            excess = len(entries) - self.max_entries
+            if excess <= 0:
+                return
+            entries.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in entries[:excess]:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+class DynamoDBCacheBackend:
+    """
+    DynamoDB backend.
+
+    Entries are stored as {PK: key, SK: "none"} items that expire through the
+    table's ExpiresAfter TTL attribute, so the table bounds its own size.
+    """
+
+    def __init__(self, table_name: str, region: Optional[str] = None):
+        self.table_name = table_name
+        self.table = get_resource("dynamodb", region_name=region).Table(table_name)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        response = self.table.get_item(Key={"PK": key, "SK": "none"})
+        item = response.get("Item")
+        # TTL deletion is not immediate, so check expiry explicitly
+        if not item or int(item.get("ExpiresAfter", 0)) <= time.time():
+            return None
+        return json.loads(item["value"])
+
+    def put(self, key: str, value: Dict[str, Any], ttl_seconds: int) -> None:
+        self.table.put_item(
+            Item={
+                "PK": key,
+                "SK": "none",
+                "value": json.dumps(value),
+                "ExpiresAfter": int(time.time() + ttl_seconds),
+            }
+        )
+
+
+_memory_backend: Optional[MemoryCacheBackend] = None
+_memory_backend_lock = threading.Lock()
+
+
+def get_memory_backend(max_entries: int = DEFAULT_MAX_ENTRIES) -> MemoryCacheBackend:
+    """Get the process-wide in-memory backend, shared across documents."""
+    global _memory_backend
+    if _memory_backend is None:
+        with _memory_backend_lock:
+            if _memory_backend is None:
+                _memory_backend = MemoryCacheBackend(max_entries)
+    return _memory_backend
+
+
+def reset_memory_backend() -> None:
+    """Discard the process-wide in-memory backend (mainly for tests)."""
+    global _memory_backend
+    with _memory_backend_lock:
+        _memory_backend = None
+
+
+class PageClassificationCache:
+    """Page classification cache with hit and saved-token statistics."""
+
+    def __init__(self, backend: Any, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        """
+        Initialize the cache.
+
+        Args:
+            backend: Storage backend with get(key) and put(key, value, ttl_seconds)
+            ttl_seconds: Time after which cached results expire
+        """
+        self.backend = backend
+        self.ttl_seconds = int(ttl_seconds)
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls,
+        cache_config: Dict[str, Any],
+        table_name: Optional[str] = None,
+        region: Optional[str] = None,
+    ) -> Optional["PageClassificationCache"]:
+        """
+        Create a cache from the classification page_cache configuration.
+
+        Args:
+            cache_config: page_cache configuration section
+            table_name: DynamoDB table used by default for the dynamodb backend
+            region: AWS region
+
+        Returns:
+            Cache, or None if the cache is disabled
+        """
+        enabled = cache_config.get("enabled", False)
+        if isinstance(enabled, str):
+            enabled = enabled.lower() == "true"
+        if not enabled:
+            return None
+
+        backend_name = cache_config.get("backend", "memory").lower()
+        max_entries = int(cache_config.get("max_entries", DEFAULT_MAX_ENTRIES))
+        if backend_name == "dynamodb":
+            table_name = cache_config.get("table_name") or table_name
+            if not table_name:
+                raise ValueError(
+                    "The dynamodb page cache backend requires a table name"
+                )
+            backend = DynamoDBCacheBackend(table_name, region)
+        elif backend_name == "disk":
+            backend = DiskCacheBackend(
+                cache_config.get("directory", DEFAULT_CACHE_DIRECTORY), max_entries
+            )
+        else:
+            if backend_name != "memory":
+                logger.warning(
+                    f"Invalid page cache backend '{backend_name}', using 'memory'"
+                )
+            backend = get_memory_backend(max_entries)
+
+        return cls(backend, int(cache_config.get("ttl_seconds", DEFAULT_TTL_SECONDS)))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached result of a page.
+
+        Backend errors are logged and treated as misses.
+
+        Returns:
+            Cached result with doc_type, confidence and tokens, or None
+        """
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Failed to read page classification cache: {e}")
+            value = None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.saved_tokens += int(value.get("tokens", 0))
+        return value
+
+    def put(
+        self,
+        key: str,
+        doc_type: str,
+        confidence: float,
+        metering: Optional[Dict[str, Any]] = None,
+        tokens: Optional[int] = None,
+    ) -> None:
+        """
+        Cache the result of a page.
+
+        Args:
+            key: Cache key from make_cache_key
+            doc_type: Classified document type
+            confidence: Classification confidence
+            metering: Metering of the model call, used to count saved tokens
+            tokens: Tokens spent on the page, instead of the metering total
+                (e.g. its share of a multi-page call)
+        """
+        if tokens is None:
+            tokens = sum(
+                int(usage.get("totalTokens", 0))
+                for usage in (metering or {}).values()
+                if isinstance(usage, dict)
+            )
+        try:
+            self.backend.put(
+                key,
+                {"doc_type": doc_type, "confidence": confidence, "tokens": tokens},
+                self.ttl_seconds,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to write page classification cache: {e}")
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the hit, miss and saved-token counts."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hit_rate,
+                "saved_tokens": self.saved_tokens,
+            }
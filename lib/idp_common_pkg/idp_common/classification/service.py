@@ -16,12 +16,12 @@ import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
-import boto3
 from botocore.exceptions import ClientError
 
-from idp_common import bedrock, image, s3, utils
+from idp_common import bedrock, image, metrics, page_assets, s3, utils
+from idp_common.bedrock.client import CACHEPOINT_SUPPORTED_MODELS
 from idp_common.classification.models import (
     ClassificationResult,
     DocumentClassification,
@@ -29,7 +29,13 @@ from idp_common.classification.models import (
     DocumentType,
     PageClassification,
 )
-from idp_common.models import Document, Section, Status
+from idp_common.classification.page_cache import (
+    PageClassificationCache,
+    config_hash,
+    make_cache_key,
+)
+from idp_common.clients import get_client, get_resource
+from idp_common.models import Document, Page, Section, Status
 from idp_common.utils import extract_json_from_text, extract_structured_data_from_text
 
 logger = logging.getLogger(__name__)
@@ -45,8 +51,27 @@ class ClassificationService:
 
     # Classification method options
     MULTIMODAL_PAGE_LEVEL = "multimodalPageLevelClassification"
+    MULTIMODAL_BATCHED = "multimodalBatchedPageClassification"
     TEXTBASED_HOLISTIC = "textbasedHolisticClassification"
 
+    # Default number of pages classified per request in batched mode
+    DEFAULT_BATCH_SIZE = 10
+    # Bedrock limit on images per request
+    MAX_IMAGES_PER_REQUEST = 20
+
+    # Shared prompt prefix of batched mode, followed by the numbered pages.
+    # Supports {CLASS_NAMES_AND_DESCRIPTIONS} and {FEW_SHOT_EXAMPLES}.
+    DEFAULT_BATCH_TASK_PROMPT = """Classify each of the document pages that follow into one of these document types:
+
+<document-types>
+{CLASS_NAMES_AND_DESCRIPTIONS}
+</document-types>
+
+{FEW_SHOT_EXAMPLES}
+
+Each page is enclosed in <page number="N"> tags and contains the page text, followed by the page image if available. Classify every page on its own content. Respond only with JSON in this format, with exactly one entry per page:
+{"pages": [{"page": "1", "class": "<document type>"}, {"page": "2", "class": "<document type>"}]}"""
+
     def __init__(
         self,
         region: str = None,
@@ -54,6 +79,7 @@ class ClassificationService:
         config: Dict[str, Any] = None,
         backend: str = "bedrock",
         cache_table: str = None,
+        page_cache: Optional[PageClassificationCache] = None,
     ):
         """
         Initialize the classification service.
@@ -64,6 +90,8 @@ class ClassificationService:
             config: Configuration dictionary
             backend: Classification backend to use ('bedrock' or 'sagemaker')
             cache_table: Optional DynamoDB table name for caching classification results
+            page_cache: Optional content-addressed page classification cache;
+                created from the classification page_cache configuration if not given
         """
         self.config = config or {}
         self.region = (
@@ -84,7 +112,7 @@ class ClassificationService:
         )
         self.cache_table = None
         if self.cache_table_name:
-            dynamodb = boto3.resource("dynamodb", region_name=self.region)
+            dynamodb = get_resource("dynamodb", region_name=self.region)
             self.cache_table = dynamodb.Table(self.cache_table_name)
             logger.info(
                 f"Classification caching enabled using table: {self.cache_table_name}"
@@ -92,6 +120,30 @@ class ClassificationService:
         else:
             logger.info("Classification caching disabled")
 
+        # Content-addressed cache of page results, shared across documents
+        classification_config = self.config.get("classification", {})
+        self.page_cache = page_cache or PageClassificationCache.from_config(
+            classification_config.get("page_cache", {}),
+            table_name=self.cache_table_name,
+            region=self.region,
+        )
+        # Everything that affects a page's result except its content and the
+        # model; the cache settings themselves are excluded
+        self._page_cache_config_digest = config_hash(
+            {
+                "classification": {
+                    key: value
+                    for key, value in classification_config.items()
+                    if key != "page_cache"
+                },
+                "classes": self.config.get("classes"),
+            }
+        )
+        if self.page_cache:
+            logger.info(
+                f"Page classification cache enabled with {type(self.page_cache.backend).__name__}"
+            )
+
         # Validate backend choice
         if self.backend not in ["bedrock", "sagemaker"]:
             logger.warning(f"Invalid backend '{backend}', falling back to 'bedrock'")
@@ -117,14 +169,13 @@ class ClassificationService:
                 raise ValueError(
                     "No SageMaker endpoint name specified in configuration or environment"
                 )
-            self.sm_client = boto3.client("sagemaker-runtime", region_name=self.region)
+            self.sm_client = get_client("sagemaker-runtime", region_name=self.region)
             self.sagemaker_endpoint = endpoint_name
             logger.info(
                 f"Initialized classification service with SageMaker backend using endpoint {endpoint_name}"
             )
 
         # Get classification method from config
-        classification_config = self.config.get("classification", {})
         self.classification_method = classification_config.get(
             "classificationMethod", self.MULTIMODAL_PAGE_LEVEL
         )
@@ -132,6 +183,20 @@ class ClassificationService:
         # Log classification method
         if self.classification_method == self.TEXTBASED_HOLISTIC:
             logger.info("Using textbased holistic packet classification method")
+        elif self.classification_method == self.MULTIMODAL_BATCHED:
+            self.batch_size = max(
+                1,
+                int(classification_config.get("batch_size", self.DEFAULT_BATCH_SIZE)),
+            )
+            if self.backend != "bedrock":
+                logger.warning(
+                    f"'{self.MULTIMODAL_BATCHED}' requires the Bedrock backend, falling back to '{self.MULTIMODAL_PAGE_LEVEL}'"
+                )
+                self.classification_method = self.MULTIMODAL_PAGE_LEVEL
+            else:
+                logger.info(
+                    f"Using multimodal batched page classification method with up to {self.batch_size} pages per request"
+                )
         else:
             # Default to multimodal page-level classification if value is invalid
             if self.classification_method != self.MULTIMODAL_PAGE_LEVEL:
@@ -579,33 +644,28 @@ class ClassificationService:
                     "No CONFIGURATION_BUCKET or ROOT_DIR set. Cannot read example images from local filesystem."
                 )
 
-    def classify_page_bedrock(
-        self,
-        page_id: str,
-        text_uri: Optional[str] = None,
-        image_uri: Optional[str] = None,
-        raw_text_uri: Optional[str] = None,
-    ) -> PageClassification:
+    def _load_page_content(
+        self, text_uri: Optional[str], image_uri: Optional[str]
+    ) -> Tuple[Optional[str], Optional[bytes]]:
         """
-        Classify a single page using Bedrock LLMs.
+        Load the text and prepared image of a page.
+
+        Failures are logged and leave the corresponding content empty.
 
         Args:
-            page_id: ID of the page
             text_uri: URI of the text content
             image_uri: URI of the image content
-            raw_text_uri: URI of the raw text content
 
         Returns:
-            PageClassification: Classification result for the page
+            Tuple of (text content, image content)
         """
-        # Initialize content variables
         text_content = None
         image_content = None
 
         # Load text content from URI
         if text_uri:
             try:
-                text_content = s3.get_text_content(text_uri)
+                text_content = page_assets.get_page_text(text_uri)
             except Exception as e:
                 logger.warning(f"Failed to load text content from {text_uri}: {e}")
                 # Continue without text content
@@ -614,24 +674,92 @@ class ClassificationService:
         if image_uri:
             try:
                 image_config = self.config.get("classification", {}).get("image", {})
-                target_width = image_config.get("target_width")
-                target_height = image_config.get("target_height")
-
-                if target_width is not None and target_height is not None:
-                    # Cast to int in case config values are strings
-                    target_width = int(target_width)
-                    target_height = int(target_height)
-                    image_content = image.prepare_image(
-                        image_uri, target_width, target_height
-                    )
-                else:
-                    image_content = image.prepare_image(
-                        image_uri
-                    )  # Uses function defaults
+                image_content = page_assets.get_page_image(
+                    image_uri,
+                    image_config.get("target_width"),
+                    image_config.get("target_height"),
+                )
             except Exception as e:
                 logger.warning(f"Failed to load image content from {image_uri}: {e}")
                 # Continue without image content
 
+        return text_content, image_content
+
+    def _get_page_cache_key(
+        self,
+        text_content: Optional[str],
+        image_content: Optional[bytes],
+        config: Dict[str, Any],
+    ) -> Optional[str]:
+        """Get the page cache key of a page, or None if the page cache is disabled."""
+        if not self.page_cache:
+            return None
+        return make_cache_key(
+            text_content,
+            image_content,
+            config["model_id"],
+            self._page_cache_config_digest,
+        )
+
+    def _get_page_cache_result(
+        self,
+        cache_key: str,
+        page_id: str,
+        image_uri: Optional[str] = None,
+        text_uri: Optional[str] = None,
+        raw_text_uri: Optional[str] = None,
+    ) -> Optional[PageClassification]:
+        """
+        Look up a page in the page cache and publish hit/miss metrics.
+
+        Returns:
+            PageClassification built from the cached result, or None on a miss
+        """
+        cached = self.page_cache.get(cache_key)
+        if cached is None:
+            metrics.put_metric("ClassificationPageCacheMisses", 1)
+            return None
+
+        metrics.put_metric("ClassificationPageCacheHits", 1)
+        metrics.put_metric(
+            "ClassificationPageCacheSavedTokens", cached.get("tokens", 0)
+        )
+        logger.info(
+            f"Page {page_id} classified as {cached['doc_type']} from page cache"
+        )
+        return PageClassification(
+            page_id=page_id,
+            classification=DocumentClassification(
+                doc_type=cached["doc_type"],
+                confidence=cached.get("confidence", 1.0),
+                metadata={"metering": {}, "page_cache_hit": True},
+            ),
+            image_uri=image_uri,
+            text_uri=text_uri,
+            raw_text_uri=raw_text_uri,
+        )
+
+    def classify_page_bedrock(
+        self,
+        page_id: str,
+        text_uri: Optional[str] = None,
+        image_uri: Optional[str] = None,
+        raw_text_uri: Optional[str] = None,
+    ) -> PageClassification:
+        """
+        Classify a single page using Bedrock LLMs.
+
+        Args:
+            page_id: ID of the page
+            text_uri: URI of the text content
+            image_uri: URI of the image content
+            raw_text_uri: URI of the raw text content
+
+        Returns:
+            PageClassification: Classification result for the page
+        """
+        text_content, image_content = self._load_page_content(text_uri, image_uri)
+
         # Verify we have at least some content to classify
         if not text_content and not image_content:
             logger.warning(f"No content available for page {page_id}")
@@ -647,6 +775,54 @@ class ClassificationService:
         # Get classification configuration
         config = self._get_classification_config()
 
+        # Identical pages seen before with the same model and configuration
+        # are served from the page cache without calling Bedrock
+        cache_key = self._get_page_cache_key(text_content, image_content, config)
+        if cache_key:
+            cached_result = self._get_page_cache_result(
+                cache_key, page_id, image_uri, text_uri, raw_text_uri
+            )
+            if cached_result:
+                return cached_result
+
+        return self._classify_page_content(
+            page_id,
+            text_content,
+            image_content,
+            config,
+            cache_key=cache_key,
+            image_uri=image_uri,
+            text_uri=text_uri,
+            raw_text_uri=raw_text_uri,
+        )
+
+    def _classify_page_content(
+        self,
+        page_id: str,
+        text_content: Optional[str],
+        image_content: Optional[bytes],
+        config: Dict[str, Any],
+        cache_key: Optional[str] = None,
+        image_uri: Optional[str] = None,
+        text_uri: Optional[str] = None,
+        raw_text_uri: Optional[str] = None,
+    ) -> PageClassification:
+        """
+        Classify the loaded content of a single page with one Bedrock call.
+
+        Args:
+            page_id: ID of the page
+            text_content: Page text
+            image_content: Prepared page image
+            config: Classification configuration
+            cache_key: Page cache key to store the result under, if any
+            image_uri: URI of the image content
+            text_uri: URI of the text content
+            raw_text_uri: URI of the raw text content
+
+        Returns:
+            PageClassification: Classification result for the page
+        """
         # Build content with support for placeholders
         content = self._build_content(
             config["task_prompt"],
@@ -711,6 +887,9 @@ class ClassificationService:
 
             logger.info(f"Page {page_id} classified as {doc_type}")
 
+            if cache_key:
+                self.page_cache.put(cache_key, doc_type, 1.0, metering)
+
             # Create and return classification result
             return PageClassification(
                 page_id=page_id,
@@ -918,6 +1097,328 @@ class ClassificationService:
                 text_uri=text_uri,
             )
 
+    def _classify_pages_individually(
+        self, pages: Dict[str, Page]
+    ) -> Iterator[Tuple[str, Optional[PageClassification], Optional[Exception]]]:
+        """
+        Classify pages concurrently with one backend call per page.
+
+        Yields:
+            Tuples of (page ID, result, exception) as pages complete
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for page_id, page in pages.items():
+                future = executor.submit(
+                    self.classify_page,
+                    page_id=page_id,
+                    text_uri=page.parsed_text_uri,
+                    image_uri=page.image_uri,
+                    raw_text_uri=page.raw_text_uri,
+                )
+                futures[future] = page_id
+
+            for future in as_completed(futures):
+                page_id = futures[future]
+                try:
+                    yield page_id, future.result(), None
+                except Exception as e:
+                    yield page_id, None, e
+
+    def _classify_pages_batched(
+        self, pages: Dict[str, Page], metering: Dict[str, Any]
+    ) -> Iterator[Tuple[str, Optional[PageClassification], Optional[Exception]]]:
+        """
+        Classify pages concurrently in batches of up to batch_size pages per call.
+
+        Args:
+            pages: Pages to classify by page ID
+            metering: Dictionary the metering of the multi-page calls is merged
+                into, since those calls belong to no single page
+
+        Yields:
+            Tuples of (page ID, result, exception) as batches complete
+        """
+        batch_size = self.batch_size
+        page_items = list(pages.items())
+        if any(page.image_uri for _, page in page_items):
+            batch_size = min(batch_size, self.MAX_IMAGES_PER_REQUEST)
+        batches = [
+            page_items[i : i + batch_size]
+            for i in range(0, len(page_items), batch_size)
+        ]
+        logger.info(
+            f"Classifying {len(page_items)} pages in {len(batches)} batches of up to {batch_size} pages"
+        )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._classify_page_batch, batch) for batch in batches
+            ]
+            for future in as_completed(futures):
+                outcomes, batch_metering = future.result()
+                metering.update(utils.merge_metering_data(metering, batch_metering))
+                yield from outcomes
+
+    def _classify_page_batch(
+        self, pages: List[Tuple[str, Page]]
+    ) -> Tuple[
+        List[Tuple[str, Optional[PageClassification], Optional[Exception]]], Dict
+    ]:
+        """
+        Classify a batch of pages, splitting and retrying pages without an answer.
+
+        Never raises: a page that cannot be classified is returned with its
+        exception, as in page-level classification.
+
+        Args:
+            pages: (page ID, page) tuples
+
+        Returns:
+            Tuple of (list of (page ID, result, exception), metering of the
+            multi-page calls)
+        """
+        config = self._get_classification_config()
+
+        with ThreadPoolExecutor(max_workers=min(len(pages), 8)) as loader:
+            contents = list(
+                loader.map(
+                    lambda item: self._load_page_content(
+                        item[1].parsed_text_uri, item[1].image_uri
+                    ),
+                    pages,
+                )
+            )
+
+        outcomes = []
+        pending = []
+        for (page_id, page), (text_content, image_content) in zip(pages, contents):
+            if not text_content and not image_content:
+                logger.warning(f"No content available for page {page_id}")
+                result = self._create_unclassified_result(
+                    page_id=page_id,
+                    image_uri=page.image_uri,
+                    text_uri=page.parsed_text_uri,
+                    raw_text_uri=page.raw_text_uri,
+                    error_message="No content available for classification",
+                )
+                outcomes.append((page_id, result, None))
+                continue
+
+            cache_key = self._get_page_cache_key(text_content, image_content, config)
+            if cache_key:
+                cached_result = self._get_page_cache_result(
+                    cache_key,
+                    page_id,
+                    page.image_uri,
+                    page.parsed_text_uri,
+                    page.raw_text_uri,
+                )
+                if cached_result:
+                    outcomes.append((page_id, cached_result, None))
+                    continue
+            pending.append((page_id, page, text_content, image_content, cache_key))
+
+        batch_outcomes, batch_metering = self._classify_loaded_pages(pending, config)
+        outcomes.extend(batch_outcomes)
+        return outcomes, batch_metering
+
+    def _classify_loaded_pages(
+        self, pending: List[Tuple], config: Dict[str, Any]
+    ) -> Tuple[
+        List[Tuple[str, Optional[PageClassification], Optional[Exception]]], Dict
+    ]:
+        """
+        Classify loaded pages with one call, recursing on pages without an answer.
+
+        If the call fails or answers no page, the pages are split in half and
+        each half is retried; otherwise only the unanswered pages are retried.
+        A single page falls back to page-level classification.
+
+        Args:
+            pending: (page ID, page, text, image, cache key) tuples
+            config: Classification configuration
+
+        Returns:
+            Tuple of (list of (page ID, result, exception), metering of the
+            multi-page calls)
+        """
+        if not pending:
+            return [], {}
+
+        if len(pending) == 1:
+            page_id, page, text_content, image_content, cache_key = pending[0]
+            try:
+                result = self._classify_page_content(
+                    page_id,
+                    text_content,
+                    image_content,
+                    config,
+                    cache_key=cache_key,
+                    image_uri=page.image_uri,
+                    text_uri=page.parsed_text_uri,
+                    raw_text_uri=page.raw_text_uri,
+                )
+                return [(page_id, result, None)], {}
+            except Exception as e:
+                return [(page_id, None, e)], {}
+
+        try:
+            answers, metering = self._invoke_page_batch(pending, config)
+        except Exception as e:
+            logger.warning(
+                f"Classification of a batch of {len(pending)} pages failed: {e}"
+            )
+            answers, metering = {}, {}
+
+        outcomes = []
+        unanswered = []
+        tokens_per_page = self._total_tokens(metering) // len(pending)
+        for label, item in enumerate(pending, start=1):
+            page_id, page, _, _, cache_key = item
+            doc_type = answers.get(str(label))
+            if doc_type is None:
+                unanswered.append(item)
+                continue
+            if cache_key:
+                self.page_cache.put(cache_key, doc_type, 1.0, tokens=tokens_per_page)
+            result = PageClassification(
+                page_id=page_id,
+                classification=DocumentClassification(
+                    doc_type=doc_type,
+                    confidence=1.0,  # Default confidence
+                    metadata={"metering": {}},
+                ),
+                image_uri=page.image_uri,
+                text_uri=page.parsed_text_uri,
+                raw_text_uri=page.raw_text_uri,
+            )
+            outcomes.append((page_id, result, None))
+
+        if unanswered:
+            logger.info(
+                f"{len(unanswered)} of {len(pending)} pages in batch without a valid answer, retrying"
+            )
+            if len(unanswered) == len(pending):
+                middle = len(pending) // 2
+                retries = [pending[:middle], pending[middle:]]
+            else:
+                retries = [unanswered]
+            for retry in retries:
+                retry_outcomes, retry_metering = self._classify_loaded_pages(
+                    retry, config
+                )
+                outcomes.extend(retry_outcomes)
+                metering = utils.merge_metering_data(metering, retry_metering)
+
+        return outcomes, metering
+
+    def _invoke_page_batch(
+        self, pending: List[Tuple], config: Dict[str, Any]
+    ) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Classify several pages with a single Bedrock call.
+
+        The shared instructions, classes and few-shot examples come first and
+        are marked as a prompt cache prefix for supported models, followed by
+        each page's text and image enclosed in numbered page tags.
+
+        Args:
+            pending: (page ID, page, text, image, cache key) tuples
+            config: Classification configuration
+
+        Returns:
+            Tuple of (page number -> valid document type, metering)
+        """
+        classification_config = self.config.get("classification", {})
+        content = self._build_content(
+            classification_config.get("batch_task_prompt")
+            or self.DEFAULT_BATCH_TASK_PROMPT,
+            "",
+            self._format_classes_list(),
+        )
+        if config["model_id"] in CACHEPOINT_SUPPORTED_MODELS and content:
+            content.append({"text": "<<CACHEPOINT>>"})
+
+        for label, (_, _, text_content, image_content, _) in enumerate(
+            pending, start=1
+        ):
+            content.append({"text": f'<page number="{label}">\n{text_content or ""}'})
+            if image_content:
+                content.append(image.prepare_bedrock_image_attachment(image_content))
+            content.append({"text": "</page>"})
+
+        t0 = time.time()
+        response_with_metering = self._invoke_bedrock_model(
+            content=content, config=config
+        )
+        logger.info(
+            f"Time taken for classification of {len(pending)} pages: {time.time() - t0:.2f} seconds"
+        )
+
+        response_text = response_with_metering["response"]["output"]["message"][
+            "content"
+        ][0].get("text", "")
+        answers = self._parse_batch_response(response_text, len(pending))
+        return answers, response_with_metering["metering"]
+
+    def _parse_batch_response(
+        self, response_text: str, page_count: int
+    ) -> Dict[str, str]:
+        """
+        Parse the per-page answers of a batched classification response.
+
+        Accepts {"pages": [{"page": N, "class": ...}]}, a bare list of such
+        entries, or a {N: class} mapping. Answers for unknown page numbers or
+        document types are dropped so the pages are retried.
+
+        Args:
+            response_text: Model response text
+            page_count: Number of pages in the request
+
+        Returns:
+            Dictionary of page number (as a string) to document type
+        """
+        try:
+            data, _ = extract_structured_data_from_text(response_text)
+        except Exception as e:
+            logger.warning(f"Failed to parse batched classification response: {e}")
+            return {}
+
+        if isinstance(data, dict) and "pages" in data:
+            data = data["pages"]
+        if isinstance(data, dict):
+            entries = data.items()
+        elif isinstance(data, list):
+            entries = [
+                (entry.get("page"), entry.get("class"))
+                for entry in data
+                if isinstance(entry, dict)
+            ]
+        else:
+            return {}
+
+        labels = {str(label) for label in range(1, page_count + 1)}
+        answers = {}
+        for label, doc_type in entries:
+            label = str(label).strip()
+            if (
+                label in labels
+                and isinstance(doc_type, str)
+                and doc_type.strip() in self.valid_doc_types
+            ):
+                answers[label] = doc_type.strip()
+        return answers
+
+    @staticmethod
+    def _total_tokens(metering: Dict[str, Any]) -> int:
+        """Sum the total tokens of all model calls in metering data."""
+        return sum(
+            int(usage.get("totalTokens", 0))
+            for usage in metering.values()
+            if isinstance(usage, dict)
+        )
+
     def _invoke_bedrock_model(
         self, content: List[Dict[str, Any]], config: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -1155,6 +1656,8 @@ class ClassificationService:
         The classification method is determined by the 'classificationMethod' setting:
         - multimodalPageLevelClassification (default): Uses page-by-page classification
           that can leverage both text and image content
+        - multimodalBatchedPageClassification: Classifies up to batch_size pages per
+          Bedrock call with per-page answers, retrying pages without an answer
         - textbasedHolisticClassification: Processes the entire document as a packet
           to identify document segments across pages, using a holistic approach
 
@@ -1250,63 +1753,64 @@ class ClassificationService:
                     f"Found {len(cached_page_classifications)} cached page classifications, classifying {len(pages_to_classify)} remaining pages"
                 )
 
-                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                    futures = {}
+                # Start processing only uncached pages
+                batch_metering = {}
+                if self.classification_method == self.MULTIMODAL_BATCHED:
+                    page_outcomes = self._classify_pages_batched(
+                        pages_to_classify, batch_metering
+                    )
+                else:
+                    page_outcomes = self._classify_pages_individually(pages_to_classify)
 
-                    # Start processing only uncached pages
-                    for page_id, page in pages_to_classify.items():
-                        future = executor.submit(
-                            self.classify_page,
-                            page_id=page_id,
-                            text_uri=page.parsed_text_uri,
-                            image_uri=page.image_uri,
-                            raw_text_uri=page.raw_text_uri,
+                # Process results as they complete
+                for page_id, page_result, page_exception in page_outcomes:
+                    if page_exception is None:
+                        all_page_results.append(page_result)
+
+                        # Check if there was an error in the classification
+                        if "error" in page_result.classification.metadata:
+                            with errors_lock:
+                                error_msg = f"Error classifying page {page_id}: {page_result.classification.metadata['error']}"
+                                document.errors.append(error_msg)
+
+                        # Update the page in the document
+                        document.pages[
+                            page_id
+                        ].classification = page_result.classification.doc_type
+                        document.pages[
+                            page_id
+                        ].confidence = page_result.classification.confidence
+
+                        # Merge metering data
+                        page_metering = page_result.classification.metadata.get(
+                            "metering", {}
                         )
-                        futures[future] = page_id
-
-                    # Process results as they complete
-                    for future in as_completed(futures):
-                        page_id = futures[future]
-                        try:
-                            page_result = future.result()
-                            all_page_results.append(page_result)
-
-                            # Check if there was an error in the classification
-                            if "error" in page_result.classification.metadata:
-                                with errors_lock:
-                                    error_msg = f"Error classifying page {page_id}: {page_result.classification.metadata['error']}"
-                                    document.errors.append(error_msg)
-
-                            # Update the page in the document
-                            document.pages[
-                                page_id
-                            ].classification = page_result.classification.doc_type
+                        combined_metering = utils.merge_metering_data(
+                            combined_metering, page_metering
+                        )
+                    else:
+                        # Capture exception details in the document object instead of raising
+                        error_msg = (
+                            f"Error classifying page {page_id}: {str(page_exception)}"
+                        )
+                        logger.error(error_msg)
+                        with errors_lock:
+                            document.errors.append(error_msg)
+                            # Store the original exception for later use
+                            failed_page_exceptions[page_id] = page_exception
+
+                        # Mark page as unclassified on error
+                        if page_id in document.pages:
                             document.pages[
                                 page_id
-                            ].confidence = page_result.classification.confidence
-
-                            # Merge metering data
-                            page_metering = page_result.classification.metadata.get(
-                                "metering", {}
-                            )
-                            combined_metering = utils.merge_metering_data(
-                                combined_metering, page_metering
-                            )
-                        except Exception as e:
-                            # Capture exception details in the document object instead of raising
-                            error_msg = f"Error classifying page {page_id}: {str(e)}"
-                            logger.error(error_msg)
-                            with errors_lock:
-                                document.errors.append(error_msg)
-                                # Store the original exception for later use
-                                failed_page_exceptions[page_id] = e
+                            ].classification = "error (backoff/retry)"
+                            document.pages[page_id].confidence = 0.0
 
-                            # Mark page as unclassified on error
-                            if page_id in document.pages:
-                                document.pages[
-                                    page_id
-                                ].classification = "error (backoff/retry)"
-                                document.pages[page_id].confidence = 0.0
+                # Multi-page calls are metered once per document, even when
+                # none of their pages could be classified
+                combined_metering = utils.merge_metering_data(
+                    combined_metering, batch_metering
+                )
 
                 # Store failed page exceptions in document metadata for caller to access
                 if failed_page_exceptions:
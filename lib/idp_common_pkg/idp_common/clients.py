@@ -0,0 +1,148 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Process-wide registry of boto3 clients and resources.
+
+Creating a boto3 client loads service models and sets up a connection pool,
+which is slow and wasteful when repeated per call or per service object.
+The registry creates each client once per process (per service, region and
+configuration), with a connection pool large enough for the thread pools that
+share it and adaptive retries. Clients are thread-safe and shared across
+threads; boto3 resources are not, so they are cached per thread.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Connection pool size used when a caller does not request a specific size.
+# Matches the largest thread pools used across the library.
+DEFAULT_MAX_POOL_CONNECTIONS = int(os.environ.get("MAX_POOL_CONNECTIONS", "50"))
+
+# Retry configuration applied to every client unless overridden
+DEFAULT_RETRIES = {
+    "mode": "adaptive",
+    "max_attempts": int(os.environ.get("AWS_MAX_ATTEMPTS", "5")),
+}
+
+# (service_name, region_name, config overrides)
+ClientKey = Tuple[str, Optional[str], str]
+
+_clients: Dict[ClientKey, Tuple[Any, int]] = {}
+_thread_resources = threading.local()
+# boto3's default session is not thread-safe, so all creation happens under this lock
+_lock = threading.Lock()
+
+
+def _build_config(max_pool_connections: int, config_kwargs: Dict[str, Any]) -> Config:
+    """Build the botocore Config for a client."""
+    kwargs = {"retries": DEFAULT_RETRIES, **config_kwargs}
+    kwargs["max_pool_connections"] = max_pool_connections
+    return Config(**kwargs)
+
+
+def _make_key(
+    service_name: str, region_name: Optional[str], config_kwargs: Dict[str, Any]
+) -> ClientKey:
+    return (service_name, region_name, repr(sorted(config_kwargs.items())))
+
+
+def get_client(
+    service_name: str,
+    region_name: Optional[str] = None,
+    max_pool_connections: Optional[int] = None,
+    **config_kwargs: Any,
+) -> Any:
+    """
+    Get the shared boto3 client for a service.
+
+    If a client exists but was created with a smaller connection pool than
+    requested, it is replaced by one with the larger pool.
+
+    Args:
+        service_name: AWS service name (e.g. 's3', 'bedrock-runtime')
+        region_name: AWS region (defaults to the boto3 default region)
+        max_pool_connections: Minimum connection pool size, typically the
+            number of threads that use the client concurrently
+        **config_kwargs: Additional botocore Config options (e.g. read_timeout,
+            retries), which also distinguish the cached client
+
+    Returns:
+        boto3 client
+    """
+    pool_size = max(max_pool_connections or 0, DEFAULT_MAX_POOL_CONNECTIONS)
+    key = _make_key(service_name, region_name, config_kwargs)
+
+    entry = _clients.get(key)
+    if entry is not None and entry[1] >= pool_size:
+        return entry[0]
+
+    with _lock:
+        entry = _clients.get(key)
+        if entry is not None and entry[1] >= pool_size:
+            return entry[0]
+
+        client = boto3.client(
+            service_name,
+            region_name=region_name,
+            config=_build_config(pool_size, config_kwargs),
+        )
+        _clients[key] = (client, pool_size)
+        logger.debug(
+            f"Created {service_name} client (region={region_name}, max_pool_connections={pool_size})"
+        )
+        return client
+
+
+def get_resource(
+    service_name: str,
+    region_name: Optional[str] = None,
+    max_pool_connections: Optional[int] = None,
+    **config_kwargs: Any,
+) -> Any:
+    """
+    Get the calling thread's boto3 resource for a service.
+
+    Args:
+        service_name: AWS service name (e.g. 'dynamodb')
+        region_name: AWS region (defaults to the boto3 default region)
+        max_pool_connections: Minimum connection pool size
+        **config_kwargs: Additional botocore Config options
+
+    Returns:
+        boto3 service resource
+    """
+    pool_size = max(max_pool_connections or 0, DEFAULT_MAX_POOL_CONNECTIONS)
+    key = _make_key(service_name, region_name, config_kwargs)
+
+    resources = getattr(_thread_resources, "resources", None)
+    if resources is None:
+        resources = _thread_resources.resources = {}
+
+    entry = resources.get(key)
+    if entry is not None and entry[1] >= pool_size:
+        return entry[0]
+
+    with _lock:
+        resource = boto3.resource(
+            service_name,
+            region_name=region_name,
+            config=_build_config(pool_size, config_kwargs),
+        )
+    resources[key] = (resource, pool_size)
+    return resource
+
+
+def clear_clients() -> None:
+    """Discard all cached clients and resources (mainly for tests)."""
+    global _thread_resources
+    with _lock:
+        _clients.clear()
+        _thread_resources = threading.local()
@@ -1,15 +1,26 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 
-import boto3
 import os
 from typing import Dict, Any, Optional
 from botocore.exceptions import ClientError
 import logging
 from copy import deepcopy
+from ..clients import get_resource
+from .cache import (
+    CONFIG_VERSION_ATTRIBUTE,
+    DEFAULT_CACHE_TTL,
+    ConfigurationCache,
+    FrozenDict,
+    FrozenList,
+    freeze,
+)
 
 logger = logging.getLogger(__name__)
 
+# Item attributes that are bookkeeping rather than part of the configuration
+_NON_CONFIG_ATTRIBUTES = ('Configuration', CONFIG_VERSION_ATTRIBUTE)
+
 class ConfigurationReader:
     def __init__(self, table_name=None):
         """
@@ -22,7 +33,7 @@ class ConfigurationReader:
         if not table_name:
             raise ValueError("Configuration table name not provided. Either set CONFIGURATION_TABLE_NAME environment variable or provide table_name parameter.")
             
-        self.dynamodb = boto3.resource('dynamodb')
+        self.dynamodb = get_resource('dynamodb')
         self.table = self.dynamodb.Table(table_name)
         logger.info(f"Initialized ConfigurationReader with table: {table_name}")
 
@@ -47,6 +58,42 @@ class ConfigurationReader:
             logger.error(f"Error retrieving configuration {config_type}: {str(e)}")
             raise
 
+    def get_configuration_versions(self) -> Dict[str, Optional[str]]:
+        """
+        Retrieve only the version attributes of the Default and Custom configurations
+        in a single request.
+
+        Returns:
+            Dictionary mapping each existing configuration type to its version,
+            or None if the item was written without a version attribute
+        """
+        table_name = self.table.name
+        try:
+            response = self.dynamodb.batch_get_item(
+                RequestItems={
+                    table_name: {
+                        'Keys': [{'Configuration': 'Default'}, {'Configuration': 'Custom'}],
+                        'ProjectionExpression': '#cfg, #ver',
+                        'ExpressionAttributeNames': {
+                            '#cfg': 'Configuration',
+                            '#ver': CONFIG_VERSION_ATTRIBUTE,
+                        },
+                    }
+                }
+            )
+        except ClientError as e:
+            logger.error(f"Error retrieving configuration versions: {str(e)}")
+            raise
+
+        if response.get('UnprocessedKeys'):
+            # Unknown versions force a full reload rather than a stale cache hit
+            return {'Default': None, 'Custom': None}
+
+        return {
+            item['Configuration']: item.get(CONFIG_VERSION_ATTRIBUTE)
+            for item in response.get('Responses', {}).get(table_name, [])
+        }
+
     def deep_merge(self, default: Dict[str, Any], custom: Dict[str, Any]) -> Dict[str, Any]:
         """
         Recursively merge two dictionaries, with custom values taking precedence
@@ -86,14 +133,17 @@ class ConfigurationReader:
             # Get Custom configuration
             custom_config = self.get_configuration('Custom')
             
+            # Remove the 'Configuration' key and version attribute as they're not part of the actual config
+            for key in _NON_CONFIG_ATTRIBUTES:
+                default_config.pop(key, None)
+
             # If no custom config exists, return default
             if not custom_config:
                 logger.info("No Custom configuration found, using Default only")
                 return default_config
 
-            # Remove the 'Configuration' key as it's not part of the actual config
-            default_config.pop('Configuration', None)
-            custom_config.pop('Configuration', None)
+            for key in _NON_CONFIG_ATTRIBUTES:
+                custom_config.pop(key, None)
 
             # Merge configurations
             merged_config = self.deep_merge(default_config, custom_config)
@@ -105,15 +155,68 @@ class ConfigurationReader:
             logger.error(f"Error getting merged configuration: {str(e)}")
             raise
 
-def get_config(table_name=None) -> Dict[str, Any]:
+_config_cache = ConfigurationCache(ConfigurationReader)
+
+def get_config(table_name=None, ttl: Optional[float] = None) -> Dict[str, Any]:
     """
     Get the merged configuration using the environment variable for table name
-    
+
+    The merged configuration is cached for the lifetime of the process. Once the
+    TTL expires, only the configuration version attributes are read, and the
+    configuration is reloaded only if a version changed. The returned
+    configuration is read-only and shared between callers; use copy.deepcopy()
+    to obtain a mutable copy.
+
     Args:
         table_name: Optional override for configuration table name
-        
+        ttl: Optional cache TTL in seconds (defaults to CONFIGURATION_CACHE_TTL
+            environment variable, or 60). A TTL of 0 or less disables caching.
+
     Returns:
         Merged configuration dictionary
     """
-    reader = ConfigurationReader(table_name)
-    return reader.get_merged_configuration()
\ No newline at end of file
+    if ttl is None:
+        ttl = float(os.environ.get('CONFIGURATION_CACHE_TTL', DEFAULT_CACHE_TTL))
+
+    if ttl <= 0:
+        reader = ConfigurationReader(table_name)
+        return reader.get_merged_configuration()
+
+    table_name = table_name or os.environ.get('CONFIGURATION_TABLE_NAME')
+    if not table_name:
+        raise ValueError("Configuration table name not provided. Either set CONFIGURATION_TABLE_NAME environment variable or provide table_name parameter.")
+
+    return _config_cache.get(table_name, ttl)
+
+def get_config_version(table_name=None, ttl: Optional[float] = None) -> Optional[str]:
+    """
+    Get an identifier of the current configuration version
+
+    The identifier combines the version attributes of the Default and Custom
+    configuration items and changes whenever either of them is updated. It is
+    read through the same cache as get_config().
+
+    Args:
+        table_name: Optional override for configuration table name
+        ttl: Optional cache TTL in seconds (see get_config)
+
+    Returns:
+        Version identifier, or None if the configuration items have no version
+        attribute (written before versions were recorded) or caching is disabled
+    """
+    if ttl is None:
+        ttl = float(os.environ.get('CONFIGURATION_CACHE_TTL', DEFAULT_CACHE_TTL))
+    table_name = table_name or os.environ.get('CONFIGURATION_TABLE_NAME')
+    if ttl <= 0 or not table_name:
+        return None
+
+    versions = _config_cache.get_versions(table_name, ttl)
+    if not versions or any(version is None for version in versions.values()):
+        return None
+    return ",".join(f"{name}:{version}" for name, version in sorted(versions.items()))
+
+def clear_config_cache() -> None:
+    """
+    Discard cached configurations so the next get_config() call reloads them
+    """
+    _config_cache.clear()
@@ -0,0 +1,185 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Process-level cache for the merged Default/Custom configuration.
+
+Warm Lambda invocations reuse the cached configuration until its TTL expires.
+After that, only the version attribute of each configuration item is read; the
+full items are fetched and merged again only when a version has changed.
+The cached configuration is frozen so callers can share it without copying.
+"""
+
+import copy
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Attribute written alongside each configuration item whenever it is updated
+CONFIG_VERSION_ATTRIBUTE = "ConfigVersion"
+
+# Default number of seconds a cached configuration is used without checking versions
+DEFAULT_CACHE_TTL = 60
+
+_READ_ONLY_MESSAGE = (
+    "Configuration returned by get_config() is read-only; "
+    "use copy.deepcopy() to get a mutable copy"
+)
+
+
+class FrozenDict(dict):
+    """Read-only dict. Copies (copy.copy/deepcopy, dict.copy) are regular mutable dicts."""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(_READ_ONLY_MESSAGE)
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only list. Copies (copy.copy/deepcopy, list.copy) are regular mutable lists."""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(_READ_ONLY_MESSAGE)
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """
+    Recursively convert dicts and lists into their read-only counterparts.
+
+    Args:
+        value: The value to freeze
+
+    Returns:
+        Frozen value (scalars are returned unchanged)
+    """
+    if isinstance(value, FrozenDict) or isinstance(value, FrozenList):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+class _CacheEntry:
+    """Cached configuration for a single table."""
+
+    __slots__ = ("config", "versions", "expires_at")
+
+    def __init__(self, config: Dict[str, Any], versions: Dict[str, Any], expires_at: float):
+        self.config = config
+        self.versions = versions
+        self.expires_at = expires_at
+
+
+class ConfigurationCache:
+    """Thread-safe, TTL-based, version-aware cache of merged configurations."""
+
+    def __init__(self, reader_factory: Callable[[str], Any]):
+        """
+        Initialize the cache.
+
+        Args:
+            reader_factory: Callable creating a ConfigurationReader for a table name
+        """
+        self._reader_factory = reader_factory
+        self._readers: Dict[str, Any] = {}
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, table_name: str, ttl: float) -> Dict[str, Any]:
+        """
+        Get the merged configuration for a table, refreshing it if needed.
+
+        Args:
+            table_name: Configuration table name
+            ttl: Seconds the cached configuration is used without checking versions
+
+        Returns:
+            Frozen merged configuration dictionary
+        """
+        entry = self._entries.get(table_name)
+        if entry is not None and time.monotonic() < entry.expires_at:
+            return entry.config
+
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            entry = self._entries.get(table_name)
+            if entry is not None and time.monotonic() < entry.expires_at:
+                return entry.config
+
+            reader = self._readers.get(table_name)
+            if reader is None:
+                reader = self._readers[table_name] = self._reader_factory(table_name)
+
+            # Read versions before the configuration so a concurrent update is
+            # detected on the next check rather than masked
+            versions = reader.get_configuration_versions()
+
+            if entry is not None and self._is_unchanged(entry.versions, versions):
+                logger.debug("Configuration versions unchanged, reusing cached configuration")
+                entry.expires_at = time.monotonic() + ttl
+                return entry.config
+
+            config = freeze(reader.get_merged_configuration())
+            self._entries[table_name] = _CacheEntry(config, versions, time.monotonic() + ttl)
+            logger.info(f"Loaded configuration versions {versions} into cache")
+            return config
+
+    def get_versions(self, table_name: str, ttl: float) -> Dict[str, Any]:
+        """
+        Get the versions of the cached configuration items for a table.
+
+        Args:
+            table_name: Configuration table name
+            ttl: Seconds the cached configuration is used without checking versions
+
+        Returns:
+            Mapping of configuration item to version attribute
+        """
+        self.get(table_name, ttl)
+        return dict(self._entries[table_name].versions)
+
+    def clear(self) -> None:
+        """Discard all cached configurations."""
+        with self._lock:
+            self._entries.clear()
+            self._readers.clear()
+
+    @staticmethod
+    def _is_unchanged(cached: Dict[str, Any], current: Dict[str, Any]) -> bool:
+        """
+        Check whether configuration versions are unchanged.
+
+        Items written without a version attribute cannot be compared, so they
+        are always treated as changed.
+        """
+        if cached != current:
+            return False
+        return all(version is not None for version in current.values())
@@ -14,7 +14,18 @@ from idp_common.criteria_validation.models import (
     CriteriaValidationResult,
     LLMResponse,
 )
-from idp_common.criteria_validation.service import CriteriaValidationService
+
+
+def __getattr__(name):
+    """Lazy load the service so chunking and models import without s3fs"""
+    if name == "CriteriaValidationService":
+        from idp_common.criteria_validation.service import CriteriaValidationService
+
+        return CriteriaValidationService
+    raise AttributeError(
+        f"module 'idp_common.criteria_validation' has no attribute '{name}'"
+    )
+
 
 __all__ = [
     "CriteriaValidationService",
@@ -0,0 +1,314 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Token-aware text chunking for criteria validation.
+
+Chunks are packed up to a token budget along sentence boundaries, preferring
+paragraph boundaries when a chunk is nearly full, and consecutive chunks
+overlap by whole sentences up to an overlap budget in tokens. Token counts
+are estimated from characters with a per-model characters-per-token ratio
+that is calibrated from the input token counts Bedrock reports, so chunks
+fill the model's real budget instead of a fixed guess.
+
+Chunk plans (character offsets) are cached per document hash and token
+budgets, together with the characters-per-token ratio they were computed at,
+so re-validating the same document does not re-chunk it. Calibration moves
+the ratio after every call, so a plan is reused while the ratio stays within
+PLAN_RATIO_TOLERANCE above the plan's ratio, where its chunks still fit the
+budget, and recomputed when the ratio drops below it or drifts further.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHARS_PER_TOKEN = 4.0
+# Bounds and smoothing for calibration from observed token counts
+MIN_CHARS_PER_TOKEN = 1.5
+MAX_CHARS_PER_TOKEN = 8.0
+CALIBRATION_WEIGHT = 0.3
+
+# A chunk is cut at the last paragraph boundary rather than mid-paragraph
+# when that boundary leaves the chunk at least this full
+PARAGRAPH_BREAK_MIN_FILL = 0.75
+
+DEFAULT_MAX_CACHED_PLANS = 128
+# Relative increase of the ratio up to which a cached plan is reused
+PLAN_RATIO_TOLERANCE = 0.15
+
+_PARAGRAPH_SPLIT = re.compile(r"(\n[ \t]*\n\s*)")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?;:])(\s+)")
+_WORD_SPLIT = re.compile(r"(\s+)")
+
+# (start, end) character offsets of each chunk
+ChunkPlan = List[Tuple[int, int]]
+
+
+class TokenEstimator:
+    """Estimates token counts from character counts with a calibrated ratio."""
+
+    def __init__(self, chars_per_token: float = DEFAULT_CHARS_PER_TOKEN):
+        """
+        Initialize the estimator.
+
+        Args:
+            chars_per_token: Initial average number of characters per token
+        """
+        self.chars_per_token = min(
+            MAX_CHARS_PER_TOKEN, max(MIN_CHARS_PER_TOKEN, float(chars_per_token))
+        )
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def estimate(self, text: str) -> int:
+        """Estimate the number of tokens in text."""
+        return int(len(text) / self.chars_per_token + 0.5)
+
+    def chars_for_tokens(self, tokens: int) -> int:
+        """Estimate the number of characters that make up the given number of tokens."""
+        return int(tokens * self.chars_per_token)
+
+    def calibrate(self, num_chars: int, num_tokens: int) -> None:
+        """
+        Update the ratio from an observed (characters, tokens) pair.
+
+        Args:
+            num_chars: Number of characters sent to the model
+            num_tokens: Number of input tokens the model reported for them
+        """
+        if num_chars <= 0 or num_tokens <= 0:
+            return
+        observed = min(
+            MAX_CHARS_PER_TOKEN, max(MIN_CHARS_PER_TOKEN, num_chars / num_tokens)
+        )
+        with self._lock:
+            if self.samples == 0:
+                self.chars_per_token = observed
+            else:
+                self.chars_per_token += CALIBRATION_WEIGHT * (
+                    observed - self.chars_per_token
+                )
+            self.samples += 1
+
+
+_estimators: Dict[Optional[str], TokenEstimator] = {}
+# (text hash, max tokens, overlap tokens) -> (chars per token, plan)
+_plan_cache: "OrderedDict[Tuple[str, int, int], Tuple[float, ChunkPlan]]" = (
+    OrderedDict()
+)
+_lock = threading.Lock()
+
+
+def get_token_estimator(
+    model_id: Optional[str], chars_per_token: float = DEFAULT_CHARS_PER_TOKEN
+) -> TokenEstimator:
+    """
+    Get the process-wide token estimator for a model.
+
+    Args:
+        model_id: Bedrock model ID
+        chars_per_token: Initial ratio for a model without an estimator yet
+
+    Returns:
+        TokenEstimator shared by all callers for the model
+    """
+    with _lock:
+        estimator = _estimators.get(model_id)
+        if estimator is None:
+            estimator = _estimators[model_id] = TokenEstimator(chars_per_token)
+        return estimator
+
+
+def reset_chunking_state() -> None:
+    """Discard calibrated estimators and cached chunk plans (mainly for tests)."""
+    with _lock:
+        _estimators.clear()
+        _plan_cache.clear()
+
+
+def _split_units(text: str, max_chars: int) -> Tuple[List[int], List[bool]]:
+    """
+    Split text into sentence units no longer than max_chars.
+
+    Units include their trailing whitespace, so they concatenate back to the
+    original text.
+
+    Returns:
+        Tuple of (unit lengths, whether each unit ends a paragraph)
+    """
+    lengths: List[int] = []
+    paragraph_ends: List[bool] = []
+
+    def add_long(piece: str) -> None:
+        # Split an oversized sentence between words, or hard-split a single long word
+        current = 0
+        for part in _WORD_SPLIT.split(piece):
+            while len(part) > max_chars:
+                if current:
+                    lengths.append(current)
+                    paragraph_ends.append(False)
+                    current = 0
+                lengths.append(max_chars)
+                paragraph_ends.append(False)
+                part = part[max_chars:]
+            if current + len(part) > max_chars and current:
+                lengths.append(current)
+                paragraph_ends.append(False)
+                current = 0
+            current += len(part)
+        if current:
+            lengths.append(current)
+            paragraph_ends.append(False)
+
+    paragraphs = _PARAGRAPH_SPLIT.split(text)
+    # re.split with a capture group alternates paragraph text and separators
+    for index in range(0, len(paragraphs), 2):
+        paragraph = paragraphs[index]
+        separator = paragraphs[index + 1] if index + 1 < len(paragraphs) else ""
+        parts = _SENTENCE_SPLIT.split(paragraph)
+        sentences = [
+            parts[i] + (parts[i + 1] if i + 1 < len(parts) else "")
+            for i in range(0, len(parts), 2)
+        ]
+        sentences[-1] += separator
+        for sentence in sentences:
+            if not sentence:
+                continue
+            if len(sentence) > max_chars:
+                add_long(sentence)
+            else:
+                lengths.append(len(sentence))
+                paragraph_ends.append(False)
+        if lengths and separator:
+            paragraph_ends[-1] = True
+
+    return lengths, paragraph_ends
+
+
+def plan_chunks(text: str, max_chars: int, overlap_chars: int) -> ChunkPlan:
+    """
+    Compute chunk offsets for text.
+
+    Args:
+        text: Text to chunk
+        max_chars: Maximum chunk length in characters
+        overlap_chars: Maximum overlap between consecutive chunks in characters
+
+    Returns:
+        List of (start, end) character offsets
+    """
+    if len(text) <= max_chars:
+        return [(0, len(text))]
+
+    lengths, paragraph_ends = _split_units(text, max_chars)
+    offsets = [0]
+    for length in lengths:
+        offsets.append(offsets[-1] + length)
+
+    plan: ChunkPlan = []
+    count = len(lengths)
+    start = 0
+    while start < count:
+        end = start
+        size = 0
+        last_paragraph_end = None
+        while end < count and size + lengths[end] <= max_chars:
+            size += lengths[end]
+            end += 1
+            if paragraph_ends[end - 1]:
+                last_paragraph_end = end
+        if end == start:
+            end = start + 1
+        elif (
+            end < count
+            and last_paragraph_end is not None
+            and last_paragraph_end < end
+            and offsets[last_paragraph_end] - offsets[start]
+            >= PARAGRAPH_BREAK_MIN_FILL * max_chars
+        ):
+            end = last_paragraph_end
+
+        plan.append((offsets[start], offsets[end]))
+        if end >= count:
+            break
+
+        # Start the next chunk with the trailing sentences that fit in the overlap
+        next_start = end
+        overlap = 0
+        while (
+            next_start - 1 > start
+            and overlap + lengths[next_start - 1] <= overlap_chars
+        ):
+            next_start -= 1
+            overlap += lengths[next_start]
+        start = next_start
+
+    return plan
+
+
+def chunk_text(
+    text: str,
+    max_tokens: int,
+    overlap_tokens: int,
+    estimator: Optional[TokenEstimator] = None,
+    use_cache: bool = True,
+) -> List[str]:
+    """
+    Split text into chunks of up to max_tokens along sentence and paragraph boundaries.
+
+    Args:
+        text: Text to chunk
+        max_tokens: Token budget per chunk
+        overlap_tokens: Maximum overlap between consecutive chunks in tokens
+        estimator: Token estimator (defaults to an uncalibrated one)
+        use_cache: Whether to reuse a cached plan for the same text and budgets
+            computed at a close enough ratio
+
+    Returns:
+        List of text chunks
+    """
+    estimator = estimator or TokenEstimator()
+    chars_per_token = estimator.chars_per_token
+    key = (
+        hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest(),
+        max_tokens,
+        overlap_tokens,
+    )
+
+    plan = None
+    if use_cache:
+        with _lock:
+            cached = _plan_cache.get(key)
+            # A plan computed at a lower ratio has smaller chunks, which still
+            # fit the budget
+            if cached is not None and cached[0] <= chars_per_token <= cached[0] * (
+                1 + PLAN_RATIO_TOLERANCE
+            ):
+                plan = cached[1]
+                _plan_cache.move_to_end(key)
+
+    if plan is None:
+        max_chars = max(1, int(max_tokens * chars_per_token))
+        overlap_chars = int(overlap_tokens * chars_per_token)
+        plan = plan_chunks(text, max_chars, overlap_chars)
+        if use_cache:
+            with _lock:
+                _plan_cache[key] = (chars_per_token, plan)
+                _plan_cache.move_to_end(key)
+                while len(_plan_cache) > DEFAULT_MAX_CACHED_PLANS:
+                    _plan_cache.popitem(last=False)
+        if len(plan) > 1:
+            logger.info(
+                f"Split {len(text)} characters into {len(plan)} chunks of up to "
+                f"{max_tokens} tokens ({chars_per_token:.2f} chars/token)"
+            )
+    else:
+        logger.debug(f"Reusing cached chunk plan with {len(plan)} chunks")
+
+    return [text[start:end] for start, end in plan]
@@ -14,12 +14,17 @@ import json
 import logging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-import s3fs
+try:
+    import s3fs
+except ImportError:
+    s3fs = None
 
 from idp_common import bedrock, s3, utils
+from idp_common.criteria_validation.chunking import chunk_text, get_token_estimator
 from idp_common.criteria_validation.models import (
     CriteriaValidationResult,
     LLMResponse,
@@ -45,10 +50,12 @@ class CriteriaValidationService:
         )
 
         # Get model_id from config
-        model_id = self.config.get("model_id") or self.config.get(
+        self.model_id = self.config.get("model_id") or self.config.get(
             "criteria_validation", {}
         ).get("model")
-        logger.info(f"Initialized criteria validation service with model {model_id}")
+        logger.info(
+            f"Initialized criteria validation service with model {self.model_id}"
+        )
 
         # Initialize token tracking (will be accumulated using utils.merge_metering_data)
         self.token_metrics = {}
@@ -64,10 +71,22 @@ class CriteriaValidationService:
             "criteria_processing_time": [],
         }
 
-        # Get async processing config
-        self.semaphore = asyncio.Semaphore(
-            self.config.get("criteria_validation", {}).get("semaphore", 5)
+        # Get async processing config. The semaphore bounds concurrent model
+        # calls; blocking work (S3 reads, Bedrock calls) runs on a dedicated
+        # executor sized to match, so it does not compete for the loop's default pool.
+        self.max_concurrency = max(
+            1, int(self.config.get("criteria_validation", {}).get("semaphore", 5))
+        )
+        self.max_workers = max(
+            1,
+            int(
+                self.config.get("criteria_validation", {}).get(
+                    "max_workers", self.max_concurrency
+                )
+            ),
         )
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._executor: Optional[ThreadPoolExecutor] = None
         self.max_chunk_size = self.config.get("criteria_validation", {}).get(
             "max_chunk_size", 10000
         )
@@ -77,6 +96,11 @@ class CriteriaValidationService:
         self.overlap_percentage = self.config.get("criteria_validation", {}).get(
             "overlap_percentage", 10
         )
+        # Overlap between chunks in tokens; defaults to overlap_percentage of
+        # max_chunk_size
+        self.overlap_tokens = self.config.get("criteria_validation", {}).get(
+            "overlap_tokens"
+        )
 
     def _chunk_text_with_overlap(
         self,
@@ -88,42 +112,34 @@ class CriteriaValidationService:
         """
         Chunk text with overlap for better context preservation.
 
+        Chunks are packed up to max_chunk_size tokens along sentence and
+        paragraph boundaries, and consecutive chunks overlap by whole
+        sentences. Tokens are estimated with the model's calibrated
+        characters-per-token ratio, initially token_size.
+
         Args:
             text: Text to chunk
             max_chunk_size: Maximum chunk size in tokens
-            token_size: Average token size
-            overlap_percentage: Percentage of overlap between chunks
+            token_size: Average token size in characters, used until the ratio
+                is calibrated from model responses
+            overlap_percentage: Percentage of overlap between chunks, used when
+                overlap_tokens is not configured
 
         Returns:
             List of text chunks
         """
-        # Simple token estimation
-        estimated_tokens = len(text) // token_size
-
-        if estimated_tokens <= max_chunk_size:
-            return [text]
-
-        # Calculate chunk size in characters
-        chunk_size_chars = max_chunk_size * token_size
-        overlap_chars = int(chunk_size_chars * (overlap_percentage / 100))
-
-        chunks = []
-        start = 0
-
-        while start < len(text):
-            end = start + chunk_size_chars
-            if end > len(text):
-                end = len(text)
-
-            chunk = text[start:end]
-            chunks.append(chunk)
-
-            # Move start position with overlap
-            start = end - overlap_chars
-            if start >= len(text):
-                break
-
-        return chunks
+        max_chunk_size = int(max_chunk_size)
+        if self.overlap_tokens is not None:
+            overlap_tokens = int(self.overlap_tokens)
+        else:
+            overlap_tokens = int(max_chunk_size * overlap_percentage / 100)
+
+        return chunk_text(
+            text,
+            max_chunk_size,
+            overlap_tokens,
+            estimator=get_token_estimator(self.model_id, token_size),
+        )
 
     def _prepare_prompt(
         self,
@@ -146,6 +162,16 @@ class CriteriaValidationService:
 
         return format_prompt(template, substitutions, required_placeholders)
 
+    async def _run_blocking(self, func: Callable, *args: Any) -> Any:
+        """
+        Run a blocking call on the service's executor.
+
+        Falls back to the event loop's default executor outside of
+        validate_request_async (e.g. when methods are called directly).
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
     async def _invoke_model_async(
         self,
         model_id: str,
@@ -160,14 +186,11 @@ class CriteriaValidationService:
         """
         Async wrapper for bedrock.invoke_model.
 
-        Since the common bedrock client is synchronous, we run it in an executor
-        to maintain async compatibility.
+        Since the common bedrock client is synchronous, we run it in the
+        service's executor to maintain async compatibility.
         """
-        loop = asyncio.get_event_loop()
-
         # Run the synchronous bedrock.invoke_model in an executor
-        response = await loop.run_in_executor(
-            None,
+        response = await self._run_blocking(
             bedrock.invoke_model,
             model_id,
             system_prompt,
@@ -181,6 +204,28 @@ class CriteriaValidationService:
 
         return response
 
+    def _calibrate_token_estimate(
+        self, model_id: str, num_chars: int, metering: Dict[str, Any]
+    ) -> None:
+        """
+        Calibrate the model's characters-per-token ratio from reported usage.
+
+        Args:
+            model_id: Bedrock model ID
+            num_chars: Number of prompt characters sent to the model
+            metering: Metering data from the model response
+        """
+        input_tokens = sum(
+            usage.get("inputTokens", 0)
+            + usage.get("cacheReadInputTokens", 0)
+            + usage.get("cacheWriteInputTokens", 0)
+            for usage in (metering or {}).values()
+            if isinstance(usage, dict)
+        )
+        get_token_estimator(model_id, self.token_size).calibrate(
+            num_chars, input_tokens
+        )
+
     async def _process_criteria_question(
         self,
         question: str,
@@ -263,6 +308,11 @@ class CriteriaValidationService:
 
                 # Track metering using the same approach as extraction service
                 metering = response.get("metering", {})
+                self._calibrate_token_estimate(
+                    config["model_id"],
+                    len(config["system_prompt"] or "") + len(prompt),
+                    metering,
+                )
 
                 # Add comprehensive logging for debugging
                 logger.info(
@@ -298,67 +348,29 @@ class CriteriaValidationService:
                     "Reasoning": f"Error during processing: {str(e)}",
                 }
 
-    async def _process_criteria_type(
-        self,
-        criteria_type: str,
-        user_history: str,
-        txt_file_uri: str,
-        config: Dict[str, Any],
-    ) -> List[Dict[str, Any]]:
+    def _load_criteria_questions(
+        self, criteria_type: str, config: Dict[str, Any]
+    ) -> List[str]:
         """
-        Process all criteria questions for a specific criteria type.
+        Load the criteria questions for a criteria type.
 
         Args:
-            criteria_type: The criteria type to process
-            user_history: The user history text
-            txt_file_uri: Source file URI
+            criteria_type: The criteria type to load
             config: Configuration for the validation
 
         Returns:
-            List of validation responses
-        """
-        start_time = time.time()
-
-        try:
-            # Get criteria questions
-            criteria_bucket = config.get("criteria_bucket")
-            criteria_uri = f"s3://{criteria_bucket}/{criteria_type}.json"
-
-            # Read criteria file
-            criteria_data = s3.get_json_content(criteria_uri)
-            if not criteria_data or "criteria" not in criteria_data:
-                raise ValueError(f"Invalid criteria file: {criteria_uri}")
-
-            # Process all questions concurrently
-            tasks = []
-            for question in criteria_data["criteria"]:
-                task = self._process_criteria_question(
-                    question=question,
-                    user_history=user_history,
-                    txt_file_uri=txt_file_uri,
-                    criteria_type=criteria_type,
-                    config=config,
-                )
-                tasks.append(task)
+            List of criteria questions
 
-            # Wait for all tasks to complete
-            responses = await asyncio.gather(*tasks)
-
-            # Track timing
-            duration = time.time() - start_time
-            self.timing_metrics["criteria_processing_time"].append(
-                {"criteria_type": criteria_type, "duration": duration}
-            )
-
-            logger.info(
-                f"Processed criteria type {criteria_type} in {duration:.2f} seconds"
-            )
-
-            return responses
+        Raises:
+            ValueError: If the criteria file is invalid
+        """
+        criteria_bucket = config.get("criteria_bucket")
+        criteria_uri = f"s3://{criteria_bucket}/{criteria_type}.json"
 
-        except Exception as e:
-            logger.error(f"Error processing criteria type {criteria_type}: {str(e)}")
-            raise
+        criteria_data = s3.get_json_content(criteria_uri)
+        if not criteria_data or "criteria" not in criteria_data:
+            raise ValueError(f"Invalid criteria file: {criteria_uri}")
+        return criteria_data["criteria"]
 
     async def _summarize_responses(
         self, responses: Dict[str, Any], config: Dict[str, Any]
@@ -377,49 +389,64 @@ class CriteriaValidationService:
         if not summary_config:
             return responses
 
-        try:
-            final_responses = {}
-
-            for criteria_type, criteria_content in responses.items():
-                criteria_summaries = []
-
-                for question, question_responses in criteria_content.items():
-                    # Prepare summary prompt
-                    prompt = self._prepare_prompt(
-                        summary_config["task_prompt"],
-                        {
-                            "initial_response": json.dumps(question_responses),
-                            "question": question,
-                            "criteria_type": criteria_type,
-                            "recommendation_options": config["recommendation_options"],
-                        },
-                    )
+        async def summarize_question(
+            criteria_type: str, question: str, question_responses: List[Dict]
+        ) -> Optional[Dict[str, Any]]:
+            async with self.semaphore:
+                # Prepare summary prompt
+                prompt = self._prepare_prompt(
+                    summary_config["task_prompt"],
+                    {
+                        "initial_response": json.dumps(question_responses),
+                        "question": question,
+                        "criteria_type": criteria_type,
+                        "recommendation_options": config["recommendation_options"],
+                    },
+                )
 
-                    # Invoke model for summary
-                    response = await self._invoke_model_async(
-                        model_id=config["model_id"],
-                        system_prompt=summary_config["system_prompt"],
-                        content=prompt,
-                        temperature=summary_config.get("temperature", 0.0),
-                        context="CriteriaValidationSummary",
-                    )
+                # Invoke model for summary
+                response = await self._invoke_model_async(
+                    model_id=config["model_id"],
+                    system_prompt=summary_config["system_prompt"],
+                    content=prompt,
+                    temperature=summary_config.get("temperature", 0.0),
+                    context="CriteriaValidationSummary",
+                )
 
-                    # Parse response
-                    response_text = bedrock.extract_text_from_response(response)
-                    try:
-                        if "```json" in response_text:
-                            start_idx = response_text.find("```json") + 7
-                            end_idx = response_text.find("```", start_idx)
-                            response_text = response_text[start_idx:end_idx].strip()
+            # Parse response
+            response_text = bedrock.extract_text_from_response(response)
+            try:
+                if "```json" in response_text:
+                    start_idx = response_text.find("```json") + 7
+                    end_idx = response_text.find("```", start_idx)
+                    response_text = response_text[start_idx:end_idx].strip()
 
-                        summary_dict = json.loads(response_text)
-                        validated_summary = LLMResponse(**summary_dict)
-                        criteria_summaries.append(validated_summary.dict())
-                    except Exception as e:
-                        logger.error(f"Error parsing summary response: {str(e)}")
+                summary_dict = json.loads(response_text)
+                return LLMResponse(**summary_dict).dict()
+            except Exception as e:
+                logger.error(f"Error parsing summary response: {str(e)}")
+                return None
 
-                if criteria_type not in final_responses:
-                    final_responses[criteria_type] = criteria_summaries
+        try:
+            # Summarize all questions concurrently; gather keeps the input order
+            keys = [
+                (criteria_type, question)
+                for criteria_type, criteria_content in responses.items()
+                for question in criteria_content
+            ]
+            summaries = await asyncio.gather(
+                *(
+                    summarize_question(
+                        criteria_type, question, responses[criteria_type][question]
+                    )
+                    for criteria_type, question in keys
+                )
+            )
+
+            final_responses = {criteria_type: [] for criteria_type in responses}
+            for (criteria_type, _), summary in zip(keys, summaries):
+                if summary is not None:
+                    final_responses[criteria_type].append(summary)
 
             return final_responses
 
@@ -442,6 +469,13 @@ class CriteriaValidationService:
         """
         self.timing_metrics["start_time"] = datetime.now()
 
+        # Semaphores bind to the running event loop, and validate_request()
+        # creates a new loop per call, so create the semaphore per request
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="criteria-validation"
+        )
+
         try:
             # Get user history files
             request_bucket = config.get("request_bucket")
@@ -451,22 +485,41 @@ class CriteriaValidationService:
             )
 
             # List all text files
+            if s3fs is None:
+                raise ImportError(
+                    "s3fs is required for criteria validation; "
+                    "install it with `pip install s3fs`"
+                )
             fs = s3fs.S3FileSystem()
-            txt_files = [
-                f"s3://{file}" for file in fs.ls(data_location) if file.endswith(".txt")
-            ]
+            listing = await self._run_blocking(fs.ls, data_location)
+            txt_files = [f"s3://{file}" for file in listing if file.endswith(".txt")]
 
             if not txt_files:
                 raise ValueError(f"No text files found for request {request_id}")
 
-            # Process each file
-            all_responses = {}
-            multiple_files = len(txt_files) > 1
+            criteria_types = config.get("criteria_types", [])
 
-            for txt_file in txt_files:
-                # Read file content
-                content = s3.get_text_content(txt_file)
+            # Read all files and criteria definitions concurrently
+            contents, criteria_questions = await asyncio.gather(
+                asyncio.gather(
+                    *(
+                        self._run_blocking(s3.get_text_content, txt_file)
+                        for txt_file in txt_files
+                    )
+                ),
+                asyncio.gather(
+                    *(
+                        self._run_blocking(
+                            self._load_criteria_questions, criteria_type, config
+                        )
+                        for criteria_type in criteria_types
+                    )
+                ),
+            )
 
+            # Execution plan: one task per (file, chunk, criteria type, question)
+            plan: List[Tuple[str, str, str, str]] = []
+            for txt_file, content in zip(txt_files, contents):
                 # Check if chunking is needed
                 chunks = self._chunk_text_with_overlap(
                     content,
@@ -474,39 +527,65 @@ class CriteriaValidationService:
                     self.token_size,
                     self.overlap_percentage,
                 )
+                for chunk in chunks:
+                    for criteria_type, questions in zip(
+                        criteria_types, criteria_questions
+                    ):
+                        for question in questions:
+                            plan.append((txt_file, chunk, criteria_type, question))
 
-                for chunk_idx, chunk in enumerate(chunks):
-                    # Process each criteria type concurrently
-                    tasks = []
-                    for criteria_type in config.get("criteria_types", []):
-                        task = self._process_criteria_type(
-                            criteria_type=criteria_type,
-                            user_history=chunk,
-                            txt_file_uri=txt_file,
-                            config=config,
-                        )
-                        tasks.append(task)
+            logger.info(
+                f"Processing {len(plan)} criteria questions for {len(txt_files)} files "
+                f"with up to {self.max_concurrency} concurrent requests"
+            )
 
-                    # Wait for all criteria types to complete
-                    responses = await asyncio.gather(*tasks)
+            # Run all tasks together under the semaphore; gather keeps plan order
+            plan_start = time.time()
+            completion_times: Dict[str, float] = {}
 
-                    # Organize responses
-                    for criteria_idx, criteria_type in enumerate(
-                        config.get("criteria_types", [])
-                    ):
-                        if criteria_type not in all_responses:
-                            all_responses[criteria_type] = {} if multiple_files else []
-
-                        if multiple_files:
-                            # For multiple files, organize by question
-                            for response in responses[criteria_idx]:
-                                question = response["question"]
-                                if question not in all_responses[criteria_type]:
-                                    all_responses[criteria_type][question] = []
-                                all_responses[criteria_type][question].append(response)
-                        else:
-                            # For single file, just append
-                            all_responses[criteria_type].extend(responses[criteria_idx])
+            async def run(
+                txt_file: str, chunk: str, criteria_type: str, question: str
+            ) -> Dict[str, Any]:
+                response = await self._process_criteria_question(
+                    question=question,
+                    user_history=chunk,
+                    txt_file_uri=txt_file,
+                    criteria_type=criteria_type,
+                    config=config,
+                )
+                completion_times[criteria_type] = max(
+                    completion_times.get(criteria_type, 0.0), time.time()
+                )
+                return response
+
+            responses = await asyncio.gather(*(run(*task) for task in plan))
+
+            for criteria_type in criteria_types:
+                if criteria_type in completion_times:
+                    duration = completion_times[criteria_type] - plan_start
+                    self.timing_metrics["criteria_processing_time"].append(
+                        {"criteria_type": criteria_type, "duration": duration}
+                    )
+                    logger.info(
+                        f"Processed criteria type {criteria_type} in {duration:.2f} seconds"
+                    )
+
+            # Organize responses in file, chunk, criteria type and question order
+            all_responses = {}
+            multiple_files = len(txt_files) > 1
+            for criteria_type in criteria_types:
+                all_responses[criteria_type] = {} if multiple_files else []
+
+            for (_, _, criteria_type, _), response in zip(plan, responses):
+                if multiple_files:
+                    # For multiple files, organize by question
+                    question = response["question"]
+                    all_responses[criteria_type].setdefault(question, []).append(
+                        response
+                    )
+                else:
+                    # For single file, just append
+                    all_responses[criteria_type].append(response)
 
             # Summarize if multiple files
             if multiple_files and config.get("summary"):
@@ -515,6 +594,7 @@ class CriteriaValidationService:
             # Save results
             output_bucket = config.get("output_bucket", request_bucket)
             output_uris = []
+            writes = []
 
             for criteria_type, responses in all_responses.items():
                 output_key = (
@@ -523,14 +603,20 @@ class CriteriaValidationService:
                 output_uri = f"s3://{output_bucket}/{output_key}"
 
                 # Save to S3
-                s3.write_content(
-                    responses,
-                    output_bucket,
-                    output_key,
-                    content_type="application/json",
+                writes.append(
+                    self._run_blocking(
+                        lambda content=responses, key=output_key: s3.write_content(
+                            content,
+                            output_bucket,
+                            key,
+                            content_type="application/json",
+                        )
+                    )
                 )
                 output_uris.append(output_uri)
 
+            await asyncio.gather(*writes)
+
             # Calculate timing
             self.timing_metrics["end_time"] = datetime.now()
             self.timing_metrics["total_duration"] = (
@@ -563,6 +649,10 @@ class CriteriaValidationService:
             logger.error(f"Error validating request {request_id}: {str(e)}")
             raise
 
+        finally:
+            executor, self._executor = self._executor, None
+            executor.shutdown(wait=False)
+
     def validate_request(
         self, request_id: str, config: Dict[str, Any]
     ) -> CriteriaValidationResult:
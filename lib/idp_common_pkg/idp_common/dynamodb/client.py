@@ -9,9 +9,10 @@ import logging
 import os
 from typing import Any, Dict, List, Optional
 
-import boto3
 from botocore.exceptions import BotoCoreError, ClientError
 
+from idp_common.clients import get_resource
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,7 +54,7 @@ class DynamoDBClient:
             )
 
         try:
-            self.dynamodb = boto3.resource("dynamodb", region_name=self.region)
+            self.dynamodb = get_resource("dynamodb", region_name=self.region)
             self.table = self.dynamodb.Table(self.table_name)
         except Exception as e:
             logger.error(f"Failed to initialize DynamoDB client: {str(e)}")
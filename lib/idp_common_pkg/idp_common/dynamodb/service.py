@@ -18,6 +18,13 @@ from idp_common.models import Document, Page, Section, Status
 
 logger = logging.getLogger(__name__)
 
+# Attributes written on every update, even when unchanged
+ALWAYS_UPDATED_ATTRIBUTES = ("ObjectStatus", "WorkflowStatus")
+
+# Above this many changed list elements the whole list is written instead,
+# keeping the update expression well below the DynamoDB expression size limit
+MAX_ELEMENT_UPDATES = 25
+
 
 class DocumentDynamoDBService:
     """
@@ -95,47 +102,30 @@ class DocumentDynamoDBService:
 
         return item
 
-    def _document_to_update_expressions(
-        self, document: Document
-    ) -> tuple[str, Dict[str, str], Dict[str, Any]]:
+    def _document_to_status_attributes(self, document: Document) -> Dict[str, Any]:
         """
-        Convert a Document object to DynamoDB update expressions.
+        Convert the status and workflow fields of a Document to DynamoDB attributes.
 
         Args:
             document: The Document object to convert
 
         Returns:
-            Tuple of (update_expression, expression_attribute_names, expression_attribute_values)
+            Dictionary of attribute names to values
         """
-        set_expressions = []
-        expression_names = {}
-        expression_values = {}
-
-        # Always update ObjectStatus
-        set_expressions.append("#ObjectStatus = :ObjectStatus")
-        expression_names["#ObjectStatus"] = "ObjectStatus"
-        expression_values[":ObjectStatus"] = document.status.value
+        attributes = {"ObjectStatus": document.status.value}
 
         # Add optional fields if they exist
         if document.queued_time:
-            set_expressions.append("#QueuedTime = :QueuedTime")
-            expression_names["#QueuedTime"] = "QueuedTime"
-            expression_values[":QueuedTime"] = document.queued_time
+            attributes["QueuedTime"] = document.queued_time
 
         if document.start_time:
-            set_expressions.append("#WorkflowStartTime = :WorkflowStartTime")
-            expression_names["#WorkflowStartTime"] = "WorkflowStartTime"
-            expression_values[":WorkflowStartTime"] = document.start_time
+            attributes["WorkflowStartTime"] = document.start_time
 
         if document.completion_time:
-            set_expressions.append("#CompletionTime = :CompletionTime")
-            expression_names["#CompletionTime"] = "CompletionTime"
-            expression_values[":CompletionTime"] = document.completion_time
+            attributes["CompletionTime"] = document.completion_time
 
         if document.workflow_execution_arn:
-            set_expressions.append("#WorkflowExecutionArn = :WorkflowExecutionArn")
-            expression_names["#WorkflowExecutionArn"] = "WorkflowExecutionArn"
-            expression_values[":WorkflowExecutionArn"] = document.workflow_execution_arn
+            attributes["WorkflowExecutionArn"] = document.workflow_execution_arn
 
         # Set workflow status based on document status
         if document.status == Status.FAILED:
@@ -145,14 +135,24 @@ class DocumentDynamoDBService:
         else:
             workflow_status = "RUNNING"
 
-        set_expressions.append("#WorkflowStatus = :WorkflowStatus")
-        expression_names["#WorkflowStatus"] = "WorkflowStatus"
-        expression_values[":WorkflowStatus"] = workflow_status
+        attributes["WorkflowStatus"] = workflow_status
+
+        return attributes
+
+    def _document_to_attributes(self, document: Document) -> Dict[str, Any]:
+        """
+        Convert a Document object to the full set of DynamoDB tracking attributes.
+
+        Args:
+            document: The Document object to convert
+
+        Returns:
+            Dictionary of attribute names to values
+        """
+        attributes = self._document_to_status_attributes(document)
 
         if document.num_pages > 0:
-            set_expressions.append("#PageCount = :PageCount")
-            expression_names["#PageCount"] = "PageCount"
-            expression_values[":PageCount"] = document.num_pages
+            attributes["PageCount"] = document.num_pages
 
         # Convert pages
         if document.pages:
@@ -174,9 +174,7 @@ class DocumentDynamoDBService:
                 pages_data.append(page_data)
 
             if pages_data:
-                set_expressions.append("#Pages = :Pages")
-                expression_names["#Pages"] = "Pages"
-                expression_values[":Pages"] = pages_data
+                attributes["Pages"] = pages_data
 
         # Convert sections
         if document.sections:
@@ -214,32 +212,68 @@ class DocumentDynamoDBService:
                 sections_data.append(section_data)
 
             if sections_data:
-                set_expressions.append("#Sections = :Sections")
-                expression_names["#Sections"] = "Sections"
-                expression_values[":Sections"] = sections_data
+                attributes["Sections"] = sections_data
 
         # Add metering data if available
         if document.metering:
-            set_expressions.append("#Metering = :Metering")
-            expression_names["#Metering"] = "Metering"
-            expression_values[":Metering"] = json.dumps(document.metering)
+            attributes["Metering"] = json.dumps(document.metering)
 
         # Add evaluation status & report if available
         if document.evaluation_status:
-            set_expressions.append("#EvaluationStatus = :EvaluationStatus")
-            expression_names["#EvaluationStatus"] = "EvaluationStatus"
-            expression_values[":EvaluationStatus"] = document.evaluation_status
+            attributes["EvaluationStatus"] = document.evaluation_status
 
         if document.evaluation_report_uri:
-            set_expressions.append("#EvaluationReportUri = :EvaluationReportUri")
-            expression_names["#EvaluationReportUri"] = "EvaluationReportUri"
-            expression_values[":EvaluationReportUri"] = document.evaluation_report_uri
+            attributes["EvaluationReportUri"] = document.evaluation_report_uri
 
         # Add summary report if available
         if document.summary_report_uri:
-            set_expressions.append("#SummaryReportUri = :SummaryReportUri")
-            expression_names["#SummaryReportUri"] = "SummaryReportUri"
-            expression_values[":SummaryReportUri"] = document.summary_report_uri
+            attributes["SummaryReportUri"] = document.summary_report_uri
+
+        return attributes
+
+    def _document_to_update_expressions(
+        self, document: Document, attributes: Optional[Dict[str, Any]] = None
+    ) -> tuple[str, Dict[str, str], Dict[str, Any]]:
+        """
+        Convert a Document object to DynamoDB update expressions.
+
+        Only attributes that changed since they were last written for this
+        document are included; the status attributes are always included.
+        Changed elements of the Pages and Sections lists are set individually
+        when the rest of the list is unchanged.
+
+        Args:
+            document: The Document object to convert
+            attributes: Optional precomputed result of _document_to_attributes
+
+        Returns:
+            Tuple of (update_expression, expression_attribute_names, expression_attribute_values)
+        """
+        if attributes is None:
+            attributes = self._document_to_attributes(document)
+
+        changed = document.changed_attributes(attributes)
+
+        set_expressions = []
+        expression_names = {}
+        expression_values = {}
+
+        for name, value in attributes.items():
+            if name not in changed and name not in ALWAYS_UPDATED_ATTRIBUTES:
+                continue
+
+            indexes = None
+            if isinstance(value, list):
+                indexes = document.changed_elements(name, value)
+
+            if indexes is not None and 0 < len(indexes) <= MAX_ELEMENT_UPDATES:
+                for index in indexes:
+                    set_expressions.append(f"#{name}[{index}] = :{name}{index}")
+                    expression_values[f":{name}{index}"] = value[index]
+            else:
+                set_expressions.append(f"#{name} = :{name}")
+                expression_values[f":{name}"] = value
+            expression_names[f"#{name}"] = name
 
         update_expression = "SET " + ", ".join(set_expressions)
 
@@ -403,8 +437,9 @@ class DocumentDynamoDBService:
             "SK": "none",
         }
 
+        attributes = self._document_to_attributes(document)
         update_expression, expression_names, expression_values = (
-            self._document_to_update_expressions(document)
+            self._document_to_update_expressions(document, attributes)
         )
 
         response = self.client.update_item(
@@ -414,14 +449,60 @@ class DocumentDynamoDBService:
             expression_attribute_values=expression_values,
             return_values="ALL_NEW",
         )
+        document.mark_persisted(attributes)
 
         # Convert the response back to a Document object
         updated_item = response.get("Attributes", {})
         updated_document = self._dynamodb_item_to_document(updated_item)
+        updated_document.persisted_state = dict(document.persisted_state)
 
-        logger.info(f"Successfully updated document: {document.input_key}")
+        logger.info(
+            f"Successfully updated document: {document.input_key} "
+            f"({len(expression_values)} attribute values written)"
+        )
         return updated_document
 
+    def update_document_status(self, document: Document) -> Document:
+        """
+        Update only the status and workflow fields of an existing document.
+
+        This is a lightweight alternative to update_document() for status
+        transitions (e.g. to CLASSIFYING or EXTRACTING): pages, sections and
+        metering are neither converted nor written, and no item is returned.
+
+        Args:
+            document: The Document object whose status changed
+
+        Returns:
+            The same Document object
+
+        Raises:
+            DynamoDBError: If the DynamoDB operation fails
+        """
+        key = {
+            "PK": f"doc#{document.input_key}",
+            "SK": "none",
+        }
+
+        attributes = self._document_to_status_attributes(document)
+        update_expression, expression_names, expression_values = (
+            self._document_to_update_expressions(document, attributes)
+        )
+
+        self.client.update_item(
+            key=key,
+            update_expression=update_expression,
+            expression_attribute_names=expression_names,
+            expression_attribute_values=expression_values,
+            return_values="NONE",
+        )
+        document.mark_persisted(attributes)
+
+        logger.info(
+            f"Successfully updated document status: {document.input_key} ({document.status.value})"
+        )
+        return document
+
     def get_document(self, object_key: str) -> Optional[Document]:
         """
         Get a document from DynamoDB by its object key.
@@ -14,6 +14,7 @@ from idp_common.evaluation.comparator import (
     compare_numeric,
     compare_values,
 )
+from idp_common.evaluation.embedding_cache import EmbeddingCache, get_embedding_cache
 from idp_common.evaluation.metrics import calculate_metrics
 from idp_common.evaluation.models import (
     AttributeEvaluationResult,
@@ -37,4 +38,6 @@ __all__ = [
     "compare_fuzzy",
     "compare_hungarian",
     "calculate_metrics",
+    "EmbeddingCache",
+    "get_embedding_cache",
 ]
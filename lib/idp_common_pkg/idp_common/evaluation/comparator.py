@@ -17,11 +17,31 @@ from typing import Any, List, Optional, Tuple
 
 from munkres import Munkres, make_cost_matrix
 
-from idp_common import bedrock
+from idp_common.evaluation.embedding_cache import (
+    DEFAULT_EMBEDDING_MODEL,
+    EmbeddingCache,
+    cosine_similarity_matrix,
+    get_embedding_cache,
+)
 from idp_common.evaluation.models import EvaluationMethod
 
+try:
+    import numpy as np
+    from rapidfuzz import process as rapidfuzz_process
+    from rapidfuzz.distance import Levenshtein as RapidfuzzLevenshtein
+
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    # rapidfuzz is optional; fall back to the pure Python implementation
+    RAPIDFUZZ_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Fuzzy matching backends
+FUZZY_BACKEND_AUTO = "auto"
+FUZZY_BACKEND_PYTHON = "python"
+FUZZY_BACKEND_RAPIDFUZZ = "rapidfuzz"
+
 
 class Comparator(ABC):
     """Base class for value comparators."""
@@ -40,6 +60,27 @@ class Comparator(ABC):
         """
         pass
 
+    def score_matrix(
+        self, expected_list: List[Any], actual_list: List[Any]
+    ) -> List[List[float]]:
+        """
+        Compare every expected value with every actual value.
+
+        Subclasses override this to normalize each value once and compute the
+        whole matrix in a single pass.
+
+        Args:
+            expected_list: Expected values (matrix rows)
+            actual_list: Actual values (matrix columns)
+
+        Returns:
+            Matrix of similarity scores, indexed [expected][actual]
+        """
+        return [
+            [self.compare(exp_val, act_val) for act_val in actual_list]
+            for exp_val in expected_list
+        ]
+
 
 class ExactComparator(Comparator):
     """Exact string match comparator."""
@@ -50,6 +91,18 @@ class ExactComparator(Comparator):
         value2_norm = strip_punctuation_space(str(value2))
         return 1.0 if value1_norm == value2_norm else 0.0
 
+    def score_matrix(
+        self, expected_list: List[Any], actual_list: List[Any]
+    ) -> List[List[float]]:
+        """Compare all pairs, normalizing each value only once."""
+        actual_norm = [strip_punctuation_space(str(value)) for value in actual_list]
+        return [
+            [1.0 if exp_norm == act_norm else 0.0 for act_norm in actual_norm]
+            for exp_norm in (
+                strip_punctuation_space(str(value)) for value in expected_list
+            )
+        ]
+
 
 class NumericComparator(Comparator):
     """Numeric exact match comparator."""
@@ -68,19 +121,145 @@ class NumericComparator(Comparator):
 class FuzzyComparator(Comparator):
     """Fuzzy string match comparator."""
 
-    def __init__(self, threshold: float = 0.8):
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        backend: str = FUZZY_BACKEND_AUTO,
+        score_cutoff: Optional[float] = None,
+    ):
         """
         Initialize the fuzzy comparator.
 
         Args:
             threshold: Minimum similarity score to consider a match (0.0 to 1.0)
+            backend: "python", "rapidfuzz", or "auto" (rapidfuzz if installed)
+            score_cutoff: Optional score below which comparisons stop early and
+                return 0.0. Exact scores are computed when not set.
+
+        Raises:
+            ValueError: If the backend is unknown, or rapidfuzz is requested but not installed
         """
         self.threshold = threshold
+        self.score_cutoff = score_cutoff
+
+        if backend == FUZZY_BACKEND_AUTO:
+            backend = (
+                FUZZY_BACKEND_RAPIDFUZZ if RAPIDFUZZ_AVAILABLE else FUZZY_BACKEND_PYTHON
+            )
+        if backend not in (FUZZY_BACKEND_PYTHON, FUZZY_BACKEND_RAPIDFUZZ):
+            raise ValueError(f"Unknown fuzzy matching backend: {backend}")
+        if backend == FUZZY_BACKEND_RAPIDFUZZ and not RAPIDFUZZ_AVAILABLE:
+            raise ValueError(
+                "rapidfuzz backend requested but rapidfuzz is not installed"
+            )
+        self.backend = backend
 
     def compare(self, value1: Any, value2: Any) -> float:
         """Compare values using fuzzy string matching."""
-        score = fuzz_score(str(value1), str(value2))
-        return score
+        return self._score_normalized(
+            strip_punctuation_space(str(value1)), strip_punctuation_space(str(value2))
+        )
+
+    def score_matrix(
+        self, expected_list: List[Any], actual_list: List[Any]
+    ) -> List[List[float]]:
+        """
+        Compute fuzzy scores for all pairs in one pass.
+
+        Each value is normalized once. With the rapidfuzz backend the matrix is
+        computed natively; otherwise each distinct pair is scored once.
+        """
+        expected_norm = [strip_punctuation_space(str(value)) for value in expected_list]
+        actual_norm = [strip_punctuation_space(str(value)) for value in actual_list]
+
+        if self.backend == FUZZY_BACKEND_RAPIDFUZZ:
+            matrix = rapidfuzz_process.cdist(
+                expected_norm,
+                actual_norm,
+                scorer=RapidfuzzLevenshtein.normalized_similarity,
+                score_cutoff=self.score_cutoff,
+                dtype=np.float64,
+            )
+            return matrix.tolist()
+
+        scores = {}
+        matrix = []
+        for exp_norm in expected_norm:
+            row = []
+            for act_norm in actual_norm:
+                key = (exp_norm, act_norm)
+                score = scores.get(key)
+                if score is None:
+                    score = scores[key] = _normalized_fuzz_score(
+                        exp_norm, act_norm, self.score_cutoff
+                    )
+                row.append(score)
+            matrix.append(row)
+        return matrix
+
+    def _score_normalized(self, value1: str, value2: str) -> float:
+        """Score two already-normalized strings with the configured backend."""
+        if self.backend == FUZZY_BACKEND_RAPIDFUZZ:
+            return RapidfuzzLevenshtein.normalized_similarity(
+                value1, value2, score_cutoff=self.score_cutoff
+            )
+        return _normalized_fuzz_score(value1, value2, self.score_cutoff)
+
+
+class SemanticComparator(Comparator):
+    """Embedding similarity comparator backed by an embedding cache."""
+
+    def __init__(
+        self,
+        model_id: str = DEFAULT_EMBEDDING_MODEL,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        max_workers: int = 10,
+    ):
+        """
+        Initialize the semantic comparator.
+
+        Args:
+            model_id: The embedding model to use
+            embedding_cache: Embedding cache (defaults to the process-wide cache)
+            max_workers: Maximum concurrent embedding requests when prefetching
+        """
+        self.model_id = model_id
+        self.embedding_cache = (
+            embedding_cache if embedding_cache is not None else get_embedding_cache()
+        )
+        self.max_workers = max_workers
+
+    def compare(self, value1: Any, value2: Any) -> float:
+        """Compare values using embedding cosine similarity."""
+        return self.score_matrix([value1], [value2])[0][0]
+
+    def score_matrix(
+        self, expected_list: List[Any], actual_list: List[Any]
+    ) -> List[List[float]]:
+        """
+        Embed all distinct values concurrently, then compute all cosine
+        similarities with one matrix product. Pairs without usable embeddings
+        fall back to fuzzy matching.
+        """
+        expected_str = [str(value) for value in expected_list]
+        actual_str = [str(value) for value in actual_list]
+        self.embedding_cache.prefetch(
+            expected_str + actual_str, self.model_id, self.max_workers
+        )
+        embeddings = {
+            value: self.embedding_cache.get_embedding(value, self.model_id)
+            for value in set(expected_str + actual_str)
+        }
+        similarities = cosine_similarity_matrix(
+            [embeddings[v] for v in expected_str],
+            [embeddings[v] for v in actual_str],
+        ).tolist()
+
+        for i, row in enumerate(similarities):
+            for j, score in enumerate(row):
+                if math.isnan(score):
+                    row[j] = fuzz_score(expected_str[i], actual_str[j])
+        return similarities
 
 
 def strip_punctuation_space(text: str) -> str:
@@ -262,13 +441,8 @@ def compare_hungarian(
     if not actual_list:
         return 0, 0, 0.0
 
-    # Create similarity matrix for Hungarian algorithm
-    matrix = [[0 for _ in range(len(actual_list))] for _ in range(len(expected_list))]
-
-    # Fill matrix with comparison scores from the provided comparator
-    for i, exp_val in enumerate(expected_list):
-        for j, act_val in enumerate(actual_list):
-            matrix[i][j] = comparator.compare(exp_val, act_val)
+    # Create similarity matrix for Hungarian algorithm in a single pass
+    matrix = comparator.score_matrix(expected_list, actual_list)
 
     # Convert to cost matrix (Hungarian algorithm minimizes cost)
     cost_matrix = make_cost_matrix(matrix, lambda x: 1 - x)
@@ -287,24 +461,72 @@ def compare_hungarian(
     return true_positives, false_positives, avg_score
 
 
-def fuzz_score(s1: str, s2: str) -> float:
+def levenshtein_distance(s1: str, s2: str, max_distance: Optional[int] = None) -> int:
     """
-    Calculate fuzzy match score between two strings.
+    Calculate the Levenshtein distance between two strings.
 
-    This is a simplified implementation. For a real implementation,
-    you might want to use a dedicated library like python-Levenshtein or fuzzywuzzy.
+    Uses two reusable rows instead of a full matrix, and stops early once the
+    distance is known to exceed max_distance.
 
     Args:
         s1: First string
         s2: Second string
+        max_distance: Optional upper bound of interest
 
     Returns:
-        Similarity score between 0.0 and 1.0
+        The edit distance, or max_distance + 1 if it exceeds max_distance
+    """
+    # Iterate over the longer string so the rows are as short as possible
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    len_s1, len_s2 = len(s1), len(s2)
+
+    if max_distance is not None and len_s1 - len_s2 > max_distance:
+        return max_distance + 1
+    if len_s2 == 0:
+        return len_s1
+
+    previous = list(range(len_s2 + 1))
+    current = [0] * (len_s2 + 1)
+
+    for i in range(1, len_s1 + 1):
+        char1 = s1[i - 1]
+        current[0] = i
+        row_min = i
+        for j in range(1, len_s2 + 1):
+            cost = 0 if char1 == s2[j - 1] else 1
+            value = min(
+                previous[j] + 1,  # deletion
+                current[j - 1] + 1,  # insertion
+                previous[j - 1] + cost,  # substitution
+            )
+            current[j] = value
+            if value < row_min:
+                row_min = value
+
+        # Every edit path crosses each row, so the row minimum is a lower bound
+        if max_distance is not None and row_min > max_distance:
+            return max_distance + 1
+
+        previous, current = current, previous
+
+    return previous[len_s2]
+
+
+def _normalized_fuzz_score(
+    s1: str, s2: str, score_cutoff: Optional[float] = None
+) -> float:
     """
-    # Normalize inputs
-    s1 = strip_punctuation_space(s1)
-    s2 = strip_punctuation_space(s2)
+    Calculate the fuzzy match score between two already-normalized strings.
 
+    Args:
+        s1: First normalized string
+        s2: Second normalized string
+        score_cutoff: Optional minimum score; lower scores are returned as 0.0
+
+    Returns:
+        Similarity score between 0.0 and 1.0
+    """
     # Perfect match
     if s1 == s2:
         return 1.0
@@ -313,27 +535,39 @@ def fuzz_score(s1: str, s2: str) -> float:
     if not s1 or not s2:
         return 0.0
 
-    # Calculate Levenshtein distance (simplified implementation)
-    len_s1, len_s2 = len(s1), len(s2)
-    d = [[0 for _ in range(len_s2 + 1)] for _ in range(len_s1 + 1)]
+    max_len = max(len(s1), len(s2))
+    max_distance = None
+    if score_cutoff:
+        max_distance = int(math.floor((1.0 - score_cutoff) * max_len + 1e-9))
 
-    for i in range(len_s1 + 1):
-        d[i][0] = i
-    for j in range(len_s2 + 1):
-        d[0][j] = j
-
-    for i in range(1, len_s1 + 1):
-        for j in range(1, len_s2 + 1):
-            cost = 0 if s1[i - 1] == s2[j - 1] else 1
-            d[i][j] = min(
-                d[i - 1][j] + 1,  # deletion
-                d[i][j - 1] + 1,  # insertion
-                d[i - 1][j - 1] + cost,  # substitution
-            )
+    distance = levenshtein_distance(s1, s2, max_distance)
 
     # Convert to similarity score (1.0 for identical, approaching 0.0 for very different)
-    max_len = max(len_s1, len_s2)
-    return 1.0 - (d[len_s1][len_s2] / max_len if max_len > 0 else 0.0)
+    score = 1.0 - distance / max_len
+    if score_cutoff and score < score_cutoff:
+        return 0.0
+    return score
+
+
+def fuzz_score(s1: str, s2: str, score_cutoff: Optional[float] = None) -> float:
+    """
+    Calculate fuzzy match score between two strings.
+
+    The score is 1 minus the Levenshtein distance divided by the length of the
+    longer string, computed after punctuation and whitespace normalization.
+
+    Args:
+        s1: First string
+        s2: Second string
+        score_cutoff: Optional minimum score. When set, the computation stops as
+            soon as the cutoff cannot be reached and 0.0 is returned.
+
+    Returns:
+        Similarity score between 0.0 and 1.0
+    """
+    return _normalized_fuzz_score(
+        strip_punctuation_space(s1), strip_punctuation_space(s2), score_cutoff
+    )
 
 
 def compare_fuzzy(
@@ -407,7 +641,8 @@ def compare_semantic(
     expected: Any,
     actual: Any,
     threshold: float = 0.8,
-    model_id: str = "amazon.titan-embed-text-v1",
+    model_id: str = DEFAULT_EMBEDDING_MODEL,
+    embedding_cache: Optional[EmbeddingCache] = None,
 ) -> Tuple[bool, float]:
     """
     Compare values using semantic embedding similarity.
@@ -417,6 +652,7 @@ def compare_semantic(
         actual: Actual value
         threshold: Minimum similarity score to consider a match (0.0 to 1.0)
         model_id: The embedding model to use
+        embedding_cache: Embedding cache (defaults to the process-wide cache)
 
     Returns:
         Tuple of (matched, score)
@@ -452,9 +688,12 @@ def compare_semantic(
             f"Actual text: {actual_str[:100]}{'...' if len(actual_str) > 100 else ''}"
         )
 
-        # Generate embeddings
-        expected_embedding = bedrock.generate_embedding(expected_str, model_id)
-        actual_embedding = bedrock.generate_embedding(actual_str, model_id)
+        # Get embeddings, generating them only if not already cached
+        cache = (
+            embedding_cache if embedding_cache is not None else get_embedding_cache()
+        )
+        expected_embedding = cache.get_embedding(expected_str, model_id)
+        actual_embedding = cache.get_embedding(actual_str, model_id)
 
         # If either embedding is empty, fall back to fuzzy matching
         if not expected_embedding or not actual_embedding:
@@ -486,6 +725,7 @@ def compare_values(
     attr_description: str = None,
     llm_config: dict = None,
     comparator_type: str = None,  # New parameter for specifying comparator
+    embedding_cache: Optional[EmbeddingCache] = None,
 ) -> Tuple[bool, float, Optional[str]]:
     """
     Compare values using the specified method.
@@ -500,6 +740,7 @@ def compare_values(
         attr_description: Attribute description (for LLM evaluation)
         llm_config: Configuration for LLM invocation
         comparator_type: Type of comparator to use (for Hungarian methods)
+        embedding_cache: Embedding cache for semantic comparisons
 
     Returns:
         Tuple of (matched, score, reason)
@@ -539,6 +780,8 @@ def compare_values(
             comparator = FuzzyComparator(threshold)
         elif comparator_type == "NUMERIC":
             comparator = NumericComparator()
+        elif comparator_type == "SEMANTIC":
+            comparator = SemanticComparator(embedding_cache=embedding_cache)
         else:
             # Default to exact comparator
             comparator = ExactComparator()
@@ -557,7 +800,9 @@ def compare_values(
 
     elif method == EvaluationMethod.SEMANTIC:
         # Use embedding-based semantic comparison with configurable threshold
-        matched, score = compare_semantic(expected, actual, threshold)
+        matched, score = compare_semantic(
+            expected, actual, threshold, embedding_cache=embedding_cache
+        )
 
     elif method == EvaluationMethod.LLM:
         # Use the compare_llm function directly
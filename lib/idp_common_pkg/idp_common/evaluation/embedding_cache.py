@@ -0,0 +1,303 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Embedding cache for semantic evaluation.
+
+Embeddings are keyed by (model_id, whitespace-normalized text) and kept in an
+in-memory LRU tier, with an optional persistent tier on local disk or S3 that
+is shared across evaluation runs. Distinct values can be prefetched
+concurrently so that similarity matrices are computed with a single NumPy
+matrix product instead of one Bedrock call per comparison.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from botocore.exceptions import ClientError
+
+from idp_common import bedrock, s3
+from idp_common.utils import parse_s3_uri
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "amazon.titan-embed-text-v1"
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_PREFETCH_WORKERS = 10
+
+
+def normalize_embedding_text(text: str) -> str:
+    """Normalize whitespace the same way the Bedrock client does before embedding."""
+    return " ".join(str(text).split())
+
+
+class EmbeddingCache:
+    """Thread-safe two-tier (memory LRU + optional disk/S3) embedding cache."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        persistent_uri: Optional[str] = None,
+    ):
+        """
+        Initialize the embedding cache.
+
+        Args:
+            max_entries: Maximum number of embeddings kept in memory
+            persistent_uri: Optional local directory or s3://bucket/prefix for
+                the persistent tier
+        """
+        self.max_entries = max_entries
+        self.persistent_uri = persistent_uri
+        self._entries: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_embedding(
+        self, text: str, model_id: str = DEFAULT_EMBEDDING_MODEL
+    ) -> List[float]:
+        """
+        Get the embedding for a text, generating and caching it on a miss.
+
+        Args:
+            text: Text to embed
+            model_id: Embedding model ID
+
+        Returns:
+            Embedding vector (empty list if no embedding could be generated)
+        """
+        key = (model_id, normalize_embedding_text(text))
+        if not key[1]:
+            return []
+
+        embedding = self._get_memory(key)
+        if embedding is not None:
+            return embedding
+
+        embedding = self._read_persistent(key)
+        if embedding is None:
+            embedding = bedrock.generate_embedding(key[1], model_id)
+            if embedding:
+                self._write_persistent(key, embedding)
+
+        if embedding:
+            self._put_memory(key, embedding)
+        return embedding
+
+    def prefetch(
+        self,
+        texts: Iterable[str],
+        model_id: str = DEFAULT_EMBEDDING_MODEL,
+        max_workers: int = DEFAULT_PREFETCH_WORKERS,
+    ) -> None:
+        """
+        Embed all distinct, not yet cached texts concurrently.
+
+        Args:
+            texts: Texts to embed
+            model_id: Embedding model ID
+            max_workers: Maximum number of concurrent embedding requests
+        """
+        missing = []
+        seen = set()
+        for text in texts:
+            normalized = normalize_embedding_text(text)
+            if not normalized or normalized in seen:
+                continue
+            seen.add(normalized)
+            with self._lock:
+                if (model_id, normalized) not in self._entries:
+                    missing.append(normalized)
+
+        if not missing:
+            return
+
+        logger.info(f"Prefetching {len(missing)} embeddings with model {model_id}")
+        workers = max(1, min(max_workers, len(missing)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self.get_embedding, text, model_id) for text in missing
+            ]
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    # Individual failures surface again (and fall back) at comparison time
+                    logger.warning(f"Failed to prefetch embedding: {e}")
+
+    def get_embeddings(
+        self,
+        texts: List[str],
+        model_id: str = DEFAULT_EMBEDDING_MODEL,
+        max_workers: int = DEFAULT_PREFETCH_WORKERS,
+    ) -> List[List[float]]:
+        """
+        Get embeddings for a list of texts, prefetching missing ones concurrently.
+
+        Args:
+            texts: Texts to embed
+            model_id: Embedding model ID
+            max_workers: Maximum number of concurrent embedding requests
+
+        Returns:
+            Embeddings in the same order as texts
+        """
+        self.prefetch(texts, model_id, max_workers)
+        return [self.get_embedding(text, model_id) for text in texts]
+
+    def clear(self) -> None:
+        """Discard all in-memory embeddings."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _get_memory(self, key: Tuple[str, str]) -> Optional[List[float]]:
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def _put_memory(self, key: Tuple[str, str], embedding: List[float]) -> None:
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _persistent_path(self, key: Tuple[str, str]) -> str:
+        """Build the persistent location for a cache key."""
+        model_id, text = key
+        model_dir = re.sub(r"[^A-Za-z0-9._-]", "_", model_id)
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.persistent_uri.rstrip('/')}/{model_dir}/{digest}.json"
+
+    def _read_persistent(self, key: Tuple[str, str]) -> Optional[List[float]]:
+        """Read an embedding from the persistent tier, returning None on a miss."""
+        if not self.persistent_uri:
+            return None
+        path = self._persistent_path(key)
+        try:
+            if path.startswith("s3://"):
+                bucket, object_key = parse_s3_uri(path)
+                response = s3.get_s3_client().get_object(Bucket=bucket, Key=object_key)
+                data = json.loads(response["Body"].read().decode("utf-8"))
+            else:
+                if not os.path.exists(path):
+                    return None
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            return data.get("embedding") or None
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("NoSuchKey", "404"):
+                logger.warning(f"Error reading cached embedding {path}: {e}")
+            return None
+        except Exception as e:
+            logger.warning(f"Error reading cached embedding {path}: {e}")
+            return None
+
+    def _write_persistent(self, key: Tuple[str, str], embedding: List[float]) -> None:
+        """Write an embedding to the persistent tier; failures are logged and ignored."""
+        if not self.persistent_uri:
+            return
+        path = self._persistent_path(key)
+        data = {"model_id": key[0], "embedding": embedding}
+        try:
+            if path.startswith("s3://"):
+                bucket, object_key = parse_s3_uri(path)
+                s3.write_content(
+                    data, bucket, object_key, content_type="application/json"
+                )
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Error writing cached embedding {path}: {e}")
+
+
+def cosine_similarity_matrix(
+    embeddings1: List[List[float]], embeddings2: List[List[float]]
+) -> np.ndarray:
+    """
+    Calculate pairwise cosine similarities with a single matrix product.
+
+    Empty or zero-length embeddings produce NaN rows/columns so callers can
+    fall back to another comparison for those values.
+
+    Args:
+        embeddings1: Row embeddings
+        embeddings2: Column embeddings
+
+    Returns:
+        Similarity matrix of shape (len(embeddings1), len(embeddings2))
+    """
+    matrix1, valid1 = _normalized_rows(embeddings1)
+    matrix2, valid2 = _normalized_rows(embeddings2)
+
+    if matrix1.shape[1] != matrix2.shape[1]:
+        # Mirror cosine_similarity(): compare on the common prefix of the vectors
+        dims = min(matrix1.shape[1], matrix2.shape[1])
+        matrix1, valid1 = _normalized_rows([row[:dims] for row in embeddings1])
+        matrix2, valid2 = _normalized_rows([row[:dims] for row in embeddings2])
+
+    similarities = matrix1 @ matrix2.T
+    similarities[~valid1, :] = np.nan
+    similarities[:, ~valid2] = np.nan
+    return similarities
+
+
+def _normalized_rows(embeddings: List[List[float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Stack embeddings into a row-normalized matrix and a validity mask."""
+    dims = max((len(e) for e in embeddings if e), default=0)
+    matrix = np.zeros((len(embeddings), dims), dtype=np.float64)
+    for i, embedding in enumerate(embeddings):
+        if embedding and len(embedding) == dims:
+            matrix[i] = embedding
+    norms = np.linalg.norm(matrix, axis=1)
+    valid = norms > 0
+    matrix[valid] /= norms[valid][:, np.newaxis]
+    return matrix, valid
+
+
+_caches: Dict[Optional[str], EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(
+    persistent_uri: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES
+) -> EmbeddingCache:
+    """
+    Get the process-wide embedding cache for a persistent location.
+
+    Args:
+        persistent_uri: Optional local directory or s3://bucket/prefix
+        max_entries: Maximum in-memory entries (used when the cache is created)
+
+    Returns:
+        Shared EmbeddingCache instance
+    """
+    with _caches_lock:
+        cache = _caches.get(persistent_uri)
+        if cache is None:
+            cache = _caches[persistent_uri] = EmbeddingCache(
+                max_entries=max_entries, persistent_uri=persistent_uri
+            )
+        return cache
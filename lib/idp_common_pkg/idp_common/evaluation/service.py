@@ -17,7 +17,11 @@ from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 
 from idp_common import s3
-from idp_common.evaluation.comparator import compare_values
+from idp_common.evaluation.comparator import compare_values, convert_to_list
+from idp_common.evaluation.embedding_cache import (
+    DEFAULT_MAX_ENTRIES,
+    get_embedding_cache,
+)
 from idp_common.evaluation.metrics import calculate_metrics
 from idp_common.evaluation.models import (
     AttributeEvaluationResult,
@@ -86,6 +90,19 @@ IMPORTANT: Respond ONLY with a valid JSON object and nothing else. Here's the ex
             """,
         )
 
+        # Embedding cache shared across evaluate_document runs in this process
+        embedding_cache_config = self.config.get("evaluation", {}).get(
+            "embedding_cache", {}
+        )
+        self.embedding_cache = get_embedding_cache(
+            persistent_uri=embedding_cache_config.get("persistent_uri")
+            or os.environ.get("EMBEDDING_CACHE_URI")
+            or None,
+            max_entries=int(
+                embedding_cache_config.get("max_entries", DEFAULT_MAX_ENTRIES)
+            ),
+        )
+
         logger.info(
             "Initialized evaluation service with LLM configuration and max_workers=%d",
             self.max_workers,
@@ -394,6 +411,7 @@ IMPORTANT: Respond ONLY with a valid JSON object and nothing else. Here's the ex
                 attr_description=attr_description,
                 llm_config=llm_config,
                 comparator_type=comparator_type,
+                embedding_cache=self.embedding_cache,
             )
 
             if matched:
@@ -511,6 +529,38 @@ IMPORTANT: Respond ONLY with a valid JSON object and nothing else. Here's the ex
 
         return attribute_result, metrics
 
+    def _prefetch_embeddings(self, tasks: List[Dict[str, Any]]) -> None:
+        """
+        Prefetch embeddings for all values compared semantically in a section.
+
+        Args:
+            tasks: Attribute evaluation tasks for the section
+        """
+        texts = []
+        for task in tasks:
+            method = task["evaluation_method"]
+            is_semantic = method == EvaluationMethod.SEMANTIC
+            is_semantic_hungarian = (
+                method == EvaluationMethod.HUNGARIAN
+                and task["comparator_type"] == "SEMANTIC"
+            )
+            if not (is_semantic or is_semantic_hungarian):
+                continue
+            for value in (task["expected_value"], task["actual_value"]):
+                if value is None:
+                    continue
+                if is_semantic_hungarian:
+                    texts.extend(convert_to_list(value))
+                else:
+                    texts.append(str(value))
+
+        if texts:
+            try:
+                self.embedding_cache.prefetch(texts, max_workers=self.max_workers)
+            except Exception as e:
+                # Comparisons generate any missing embeddings themselves
+                logger.warning(f"Embedding prefetch failed: {e}")
+
     def evaluate_section(
         self,
         section: Section,
@@ -658,6 +708,9 @@ IMPORTANT: Respond ONLY with a valid JSON object and nothing else. Here's the ex
                 }
             )
 
+        # Embed all distinct values used by semantic comparisons up front, concurrently
+        self._prefetch_embeddings(sequential_tasks + parallel_tasks)
+
         attribute_results = []
 
         # First, process fast sequential tasks
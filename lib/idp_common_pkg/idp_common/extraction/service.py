@@ -14,7 +14,7 @@ import os
 import time
 from typing import Any, Dict, List
 
-from idp_common import bedrock, image, metrics, s3, utils
+from idp_common import bedrock, image, metrics, page_assets, s3, utils
 from idp_common.models import Document
 from idp_common.utils import extract_json_from_text
 
@@ -585,54 +585,18 @@ class ExtractionService:
         metrics.put_metric("InputDocuments", 1)
         metrics.put_metric("InputDocumentPages", len(section.page_ids))
 
+        prefetch = None
         try:
-            # Read document text from all pages in order
+            # Start reading the text and images of all pages in the background
             t0 = time.time()
-            document_texts = []
-            for page_id in sorted_page_ids:
-                if page_id not in document.pages:
-                    error_msg = f"Page {page_id} not found in document"
-                    logger.error(error_msg)
-                    document.errors.append(error_msg)
-                    continue
-
-                page = document.pages[page_id]
-                text_path = page.parsed_text_uri
-                page_text = s3.get_text_content(text_path)
-                document_texts.append(page_text)
-
-            document_text = "\n".join(document_texts)
-            t1 = time.time()
-            logger.info(f"Time taken to read text content: {t1 - t0:.2f} seconds")
-
-            # Read page images with configurable dimensions
             extraction_config = self.config.get("extraction", {})
             image_config = extraction_config.get("image", {})
-            target_width = image_config.get("target_width")
-            target_height = image_config.get("target_height")
-
-            page_images = []
-            for page_id in sorted_page_ids:
-                if page_id not in document.pages:
-                    continue
-
-                page = document.pages[page_id]
-                image_uri = page.image_uri
-                if target_width is not None and target_height is not None:
-                    # Cast to int in case config values are strings
-                    target_width = int(target_width)
-                    target_height = int(target_height)
-                    image_content = image.prepare_image(
-                        image_uri, target_width, target_height
-                    )
-                else:
-                    image_content = image.prepare_image(
-                        image_uri
-                    )  # Uses function defaults
-                page_images.append(image_content)
-
-            t2 = time.time()
-            logger.info(f"Time taken to read images: {t2 - t1:.2f} seconds")
+            prefetch = page_assets.prefetch_section_pages(
+                document,
+                sorted_page_ids,
+                image_config.get("target_width"),
+                image_config.get("target_height"),
+            )
 
             # Get extraction configuration
             model_id = self.config.get("model_id") or extraction_config.get("model")
@@ -655,6 +619,7 @@ class ExtractionService:
                 logger.info(
                     f"No attributes defined for class {class_label}, skipping LLM extraction"
                 )
+                prefetch.cancel()
 
                 # Create empty result structure without invoking LLM
                 extracted_fields = {}
@@ -695,6 +660,14 @@ class ExtractionService:
                 )
                 return document
 
+            section_pages = prefetch.result()
+            document_text = section_pages.text
+            page_images = [
+                page_image for page_image in section_pages.images if page_image
+            ]
+            t2 = time.time()
+            logger.info(f"Time taken to read text and images: {t2 - t0:.2f} seconds")
+
             # Prepare prompt
             prompt_template = extraction_config.get("task_prompt", "")
 
@@ -841,5 +814,10 @@ class ExtractionService:
             logger.error(error_msg)
             document.errors.append(error_msg)
             raise
+        finally:
+            # Discard page reads still queued when the section failed or was
+            # skipped before its pages were used
+            if prefetch is not None:
+                prefetch.cancel()
 
         return document
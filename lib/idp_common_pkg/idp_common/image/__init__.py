@@ -72,7 +72,9 @@ def prepare_image(image_source: Union[str, bytes],
     # Resize and process
     return resize_image(image_data, target_width, target_height)
 
-def apply_adaptive_binarization(image_data: bytes) -> bytes:
+def apply_adaptive_binarization(image_data: bytes,
+                                block_size: int = 15,
+                                c: int = 10) -> bytes:
     """
     Apply adaptive binarization using Pillow-only implementation.
     
@@ -81,16 +83,24 @@ def apply_adaptive_binarization(image_data: bytes) -> bytes:
     - Low contrast text
     - Background noise or gradients
     
-    Implements adaptive mean thresholding similar to OpenCV's ADAPTIVE_THRESH_MEAN_C
-    with block_size=15 and C=10.
+    Implements adaptive mean thresholding similar to OpenCV's ADAPTIVE_THRESH_MEAN_C.
+    The threshold is computed with Pillow's native image operations rather than a
+    per-pixel Python loop, so a full page takes milliseconds.
     
     Args:
         image_data: Raw image bytes
+        block_size: Size of the neighbourhood used to compute the local mean
+        c: Constant subtracted from the local mean
         
     Returns:
         Processed image as JPEG bytes with adaptive binarization applied
     """
     try:
+        if not isinstance(block_size, int) or block_size < 1:
+            raise ValueError(f"block_size must be a positive integer, got {block_size!r}")
+        if not isinstance(c, int):
+            raise ValueError(f"c must be an integer, got {c!r}")
+
         # Convert bytes to PIL Image
         pil_image = Image.open(io.BytesIO(image_data))
         
@@ -98,36 +108,28 @@ def apply_adaptive_binarization(image_data: bytes) -> bytes:
         if pil_image.mode != 'L':
             pil_image = pil_image.convert('L')
         
-        # Apply adaptive thresholding using Pillow operations
-        block_size = 15
-        C = 10
-        
         # Create a blurred version for local mean calculation
         # Use BoxBlur with radius = block_size // 2 to approximate local mean
         radius = block_size // 2
         blurred = pil_image.filter(ImageFilter.BoxBlur(radius))
         
         # Apply adaptive threshold: original > (blurred - C) ? 255 : 0
-        # Load pixel data for efficient access
-        width, height = pil_image.size
-        original_pixels = list(pil_image.getdata())
-        blurred_pixels = list(blurred.getdata())
-        
-        binary_pixels = []
-        # Apply thresholding pixel by pixel
-        for orig, blur in zip(original_pixels, blurred_pixels):
-            threshold = blur - C
-            binary_pixels.append(255 if orig > threshold else 0)
-        
-        # Create binary image
-        binary_image = Image.new('L', (width, height))
-        binary_image.putdata(binary_pixels)
+        # ImageChops.subtract clips at 0, which preserves the comparison result:
+        #   c > 0:  original > blurred - c  <=>  clip(blurred - original) < c
+        #   c <= 0: original > blurred - c  <=>  clip(original - blurred) > -c
+        if c > 0:
+            difference = ImageChops.subtract(blurred, pil_image)
+            lookup = [255 if value < c else 0 for value in range(256)]
+        else:
+            difference = ImageChops.subtract(pil_image, blurred)
+            lookup = [255 if value > -c else 0 for value in range(256)]
+        binary_image = difference.point(lookup)
         
         # Convert to JPEG bytes
         img_byte_array = io.BytesIO()
         binary_image.save(img_byte_array, format="JPEG")
         
-        logger.debug("Applied adaptive binarization preprocessing (Pillow implementation)")
+        logger.debug(f"Applied adaptive binarization preprocessing (block_size={block_size}, c={c})")
         return img_byte_array.getvalue()
         
     except Exception as e:
@@ -1,31 +1,86 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 
-import boto3
+import functools
 import os
 import logging
 import threading
 from typing import List, Dict, Any, Optional
 
+from ..clients import get_client
+from .buffer import (
+    MetricsBuffer,
+    MODE_DIRECT,
+    MODE_BUFFERED,
+    MODE_EMF,
+    VALID_MODES,
+    DEFAULT_FLUSH_INTERVAL,
+    get_metrics_buffer,
+    reset_metrics_buffer,
+)
+
 logger = logging.getLogger(__name__)
 
-# Initialize clients
-_cloudwatch_client = None
-_client_lock = threading.Lock()
 _metric_lock = threading.Lock()
 
+def get_metrics_mode() -> str:
+    """
+    Get the metrics publishing mode from the METRICS_MODE environment variable.
+
+    Supported modes:
+        buffered: aggregate in memory and publish in batches (default)
+        emf: aggregate in memory and write Embedded Metric Format records to stdout
+        direct: publish every data point with its own PutMetricData call
+
+    Returns:
+        The metrics mode
+    """
+    mode = os.environ.get('METRICS_MODE', MODE_BUFFERED).lower()
+    if mode not in VALID_MODES:
+        logger.warning(f"Invalid METRICS_MODE '{mode}', using '{MODE_BUFFERED}'")
+        mode = MODE_BUFFERED
+    return mode
+
+def _get_buffer() -> MetricsBuffer:
+    """Get the shared metrics buffer configured from the environment."""
+    flush_interval = float(os.environ.get('METRICS_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL))
+    return get_metrics_buffer(get_metrics_mode(), flush_interval, lambda: get_cloudwatch_client())
+
+def flush_metrics() -> int:
+    """
+    Publish all buffered metrics. Call this before a Lambda handler returns.
+
+    Returns:
+        Number of data points flushed
+    """
+    if get_metrics_mode() == MODE_DIRECT:
+        return 0
+    return _get_buffer().flush()
+
+def flush_on_exit(handler):
+    """
+    Decorator for Lambda handlers that flushes buffered metrics when the handler
+    returns or raises, so no data points stay buffered while the environment is frozen.
+    """
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            try:
+                flush_metrics()
+            except Exception as e:
+                logger.error(f"Error flushing metrics on handler exit: {e}")
+    return wrapper
+
 def get_cloudwatch_client():
     """
-    Get or initialize the CloudWatch client in a thread-safe manner
+    Get the shared CloudWatch client
     
     Returns:
         boto3 CloudWatch client
     """
-    global _cloudwatch_client
-    with _client_lock:
-        if _cloudwatch_client is None:
-            _cloudwatch_client = boto3.client('cloudwatch')
-        return _cloudwatch_client
+    return get_client('cloudwatch')
 
 def put_metric(name: str, value: float, unit: str = 'Count', 
               dimensions: Optional[List[Dict[str, str]]] = None,
@@ -46,6 +101,11 @@ def put_metric(name: str, value: float, unit: str = 'Count',
     if namespace is None:
         namespace = os.environ.get('METRIC_NAMESPACE', 'GENAIDP')
     
+    if get_metrics_mode() != MODE_DIRECT:
+        logger.debug(f"Buffering metric {name}: {value}")
+        _get_buffer().add(name, value, unit, dimensions, namespace)
+        return
+
     # Use thread lock to ensure thread safety when publishing metrics
     with _metric_lock:
         logger.debug(f"Publishing metric {name}: {value}")
@@ -75,6 +135,16 @@ def create_client_performance_metrics(name: str, duration_ms: float,
         is_success: Whether the operation succeeded
         error_type: Optional error type for failures
     """
+    if get_metrics_mode() != MODE_DIRECT:
+        put_metric(f"{name}Latency", duration_ms, 'Milliseconds')
+        if is_success:
+            put_metric(f"{name}Success", 1)
+        else:
+            put_metric(f"{name}Failure", 1)
+            if error_type:
+                put_metric(f"{name}Error.{error_type}", 1)
+        return
+
     # Use a single lock for all metrics to ensure they are published as a group
     with _metric_lock:
         # Get namespace from environment
@@ -123,4 +193,4 @@ def create_client_performance_metrics(name: str, duration_ms: float,
             )
             logger.debug(f"Published {len(metric_data)} metrics for {name}")
         except Exception as e:
-            logger.error(f"Error publishing performance metrics for {name}: {e}")
\ No newline at end of file
+            logger.error(f"Error publishing performance metrics for {name}: {e}")
@@ -0,0 +1,303 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Buffered CloudWatch metrics sink.
+
+Metric data points are aggregated in memory per (namespace, name, unit,
+dimensions) and published in batches, either from a background flusher
+thread or explicitly at Lambda handler exit. In EMF mode the batches are
+written to stdout using the CloudWatch Embedded Metric Format, so no
+PutMetricData API calls are made at all.
+"""
+
+import atexit
+import json
+import logging
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Metric modes
+MODE_DIRECT = "direct"
+MODE_BUFFERED = "buffered"
+MODE_EMF = "emf"
+VALID_MODES = (MODE_DIRECT, MODE_BUFFERED, MODE_EMF)
+
+# CloudWatch PutMetricData limits
+MAX_DATUMS_PER_REQUEST = 1000
+MAX_VALUES_PER_DATUM = 150
+
+# Embedded Metric Format limits
+MAX_EMF_METRICS_PER_EVENT = 100
+MAX_EMF_VALUES_PER_METRIC = 100
+
+# Number of buffered values that triggers an early flush
+DEFAULT_MAX_BUFFERED_VALUES = 1000
+DEFAULT_FLUSH_INTERVAL = 5.0  # seconds
+
+# (namespace, name, unit, ((dim_name, dim_value), ...))
+MetricKey = Tuple[str, str, str, Tuple[Tuple[str, str], ...]]
+
+
+class MetricsBuffer:
+    """
+    Thread-safe in-memory aggregator for CloudWatch metrics.
+
+    Recording a data point only takes a short lock and a dictionary update;
+    network I/O happens during flush, outside of the recording lock.
+    """
+
+    def __init__(
+        self,
+        mode: str = MODE_BUFFERED,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_buffered_values: int = DEFAULT_MAX_BUFFERED_VALUES,
+        client_factory: Optional[Callable[[], Any]] = None,
+        emf_stream: Optional[Any] = None,
+    ):
+        """
+        Initialize the metrics buffer.
+
+        Args:
+            mode: 'buffered' to publish with PutMetricData, or 'emf' to write
+                Embedded Metric Format records to stdout
+            flush_interval: Seconds between background flushes (0 disables the
+                background thread; flush() must then be called explicitly)
+            max_buffered_values: Number of buffered values that triggers an early flush
+            client_factory: Callable returning a CloudWatch client (buffered mode only)
+            emf_stream: Stream for EMF records (defaults to sys.stdout)
+        """
+        if mode not in (MODE_BUFFERED, MODE_EMF):
+            raise ValueError(f"Unsupported metrics buffer mode: {mode}")
+
+        self.mode = mode
+        self.flush_interval = flush_interval
+        self.max_buffered_values = max_buffered_values
+        self._client_factory = client_factory
+        self._emf_stream = emf_stream
+
+        # key -> {value: count}
+        self._buffer: Dict[MetricKey, Dict[float, int]] = {}
+        self._buffered_values = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def add(
+        self,
+        name: str,
+        value: float,
+        unit: str = "Count",
+        dimensions: Optional[List[Dict[str, str]]] = None,
+        namespace: str = "GENAIDP",
+    ) -> None:
+        """
+        Record a single metric data point.
+
+        Args:
+            name: The name of the metric
+            value: The value of the metric
+            unit: The unit of the metric
+            dimensions: Optional list of {'Name': ..., 'Value': ...} dimensions
+            namespace: The metric namespace
+        """
+        dims = tuple(
+            sorted((str(d["Name"]), str(d["Value"])) for d in (dimensions or []))
+        )
+        key = (namespace, name, unit, dims)
+        value = float(value)
+
+        with self._lock:
+            values = self._buffer.get(key)
+            if values is None:
+                values = self._buffer[key] = {}
+            values[value] = values.get(value, 0) + 1
+            self._buffered_values += 1
+            should_flush = self._buffered_values >= self.max_buffered_values
+
+        self._ensure_flusher()
+        if should_flush:
+            self._wakeup.set()
+
+    def pending_count(self) -> int:
+        """Return the number of data points waiting to be flushed."""
+        with self._lock:
+            return self._buffered_values
+
+    def flush(self) -> int:
+        """
+        Publish all buffered data points.
+
+        Returns:
+            Number of data points flushed
+        """
+        with self._flush_lock:
+            with self._lock:
+                buffer = self._buffer
+                count = self._buffered_values
+                self._buffer = {}
+                self._buffered_values = 0
+
+            if not buffer:
+                return 0
+
+            try:
+                if self.mode == MODE_EMF:
+                    self._write_emf(buffer)
+                else:
+                    self._put_metric_data(buffer)
+                logger.debug(f"Flushed {count} buffered metric values")
+            except Exception as e:
+                logger.error(f"Error flushing {count} buffered metric values: {e}")
+            return count
+
+    def close(self) -> None:
+        """Stop the background flusher and publish any remaining data points."""
+        self._stopped = True
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.flush_interval + 1)
+        self.flush()
+
+    def _ensure_flusher(self) -> None:
+        """Start the background flusher thread on first use."""
+        if self._thread is not None or self._stopped or self.flush_interval <= 0:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="idp-metrics-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Background flush loop."""
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._stopped:
+                break
+            self.flush()
+
+    def _put_metric_data(self, buffer: Dict[MetricKey, Dict[float, int]]) -> None:
+        """Publish aggregated data points with PutMetricData, grouped by namespace."""
+        by_namespace: Dict[str, List[Dict[str, Any]]] = {}
+        for (namespace, name, unit, dims), values in buffer.items():
+            dimensions = [{"Name": n, "Value": v} for n, v in dims]
+            items = list(values.items())
+            for i in range(0, len(items), MAX_VALUES_PER_DATUM):
+                chunk = items[i : i + MAX_VALUES_PER_DATUM]
+                by_namespace.setdefault(namespace, []).append(
+                    {
+                        "MetricName": name,
+                        "Unit": unit,
+                        "Dimensions": dimensions,
+                        "Values": [v for v, _ in chunk],
+                        "Counts": [float(c) for _, c in chunk],
+                    }
+                )
+
+        client = self._client_factory()
+        for namespace, metric_data in by_namespace.items():
+            for i in range(0, len(metric_data), MAX_DATUMS_PER_REQUEST):
+                batch = metric_data[i : i + MAX_DATUMS_PER_REQUEST]
+                try:
+                    client.put_metric_data(Namespace=namespace, MetricData=batch)
+                except Exception as e:
+                    logger.error(
+                        f"Error publishing {len(batch)} metrics to namespace {namespace}: {e}"
+                    )
+
+    def _write_emf(self, buffer: Dict[MetricKey, Dict[float, int]]) -> None:
+        """Write aggregated data points as Embedded Metric Format records."""
+        stream = self._emf_stream or sys.stdout
+        timestamp = int(time.time() * 1000)
+
+        # EMF records share one dimension set, so group by namespace + dimensions
+        groups: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], List[Tuple[str, str, List[float]]]] = {}
+        for (namespace, name, unit, dims), values in buffer.items():
+            expanded = [v for v, c in values.items() for _ in range(c)]
+            groups.setdefault((namespace, dims), []).append((name, unit, expanded))
+
+        lines = []
+        for (namespace, dims), metrics in groups.items():
+            # Split each metric's values into chunks, then pack chunks into records
+            pending = []
+            for name, unit, values in metrics:
+                for i in range(0, len(values), MAX_EMF_VALUES_PER_METRIC):
+                    pending.append((name, unit, values[i : i + MAX_EMF_VALUES_PER_METRIC]))
+
+            while pending:
+                record: Dict[str, Any] = {dim_name: dim_value for dim_name, dim_value in dims}
+                definitions = []
+                remaining = []
+                for name, unit, values in pending:
+                    if name in record or len(definitions) >= MAX_EMF_METRICS_PER_EVENT:
+                        remaining.append((name, unit, values))
+                        continue
+                    definitions.append({"Name": name, "Unit": unit})
+                    record[name] = values if len(values) > 1 else values[0]
+                record["_aws"] = {
+                    "Timestamp": timestamp,
+                    "CloudWatchMetrics": [
+                        {
+                            "Namespace": namespace,
+                            "Dimensions": [[dim_name for dim_name, _ in dims]],
+                            "Metrics": definitions,
+                        }
+                    ],
+                }
+                lines.append(json.dumps(record))
+                pending = remaining
+
+        stream.write("\n".join(lines) + "\n")
+        stream.flush()
+
+
+_buffer_instance: Optional[MetricsBuffer] = None
+_buffer_lock = threading.Lock()
+
+
+def get_metrics_buffer(
+    mode: str, flush_interval: float, client_factory: Callable[[], Any]
+) -> MetricsBuffer:
+    """
+    Get or create the process-wide metrics buffer.
+
+    Args:
+        mode: Buffer mode ('buffered' or 'emf')
+        flush_interval: Seconds between background flushes
+        client_factory: Callable returning a CloudWatch client
+
+    Returns:
+        The shared MetricsBuffer instance
+    """
+    global _buffer_instance
+    if _buffer_instance is not None:
+        return _buffer_instance
+    with _buffer_lock:
+        if _buffer_instance is None:
+            _buffer_instance = MetricsBuffer(
+                mode=mode,
+                flush_interval=flush_interval,
+                client_factory=client_factory,
+            )
+            atexit.register(_buffer_instance.close)
+        return _buffer_instance
+
+
+def reset_metrics_buffer() -> None:
+    """Flush and discard the process-wide metrics buffer (mainly for tests)."""
+    global _buffer_instance
+    with _buffer_lock:
+        if _buffer_instance is not None:
+            _buffer_instance.close()
+            _buffer_instance = None
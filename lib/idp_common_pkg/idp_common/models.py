@@ -8,13 +8,23 @@ This module defines the Document class that represents the state of a document
 as it moves through the processing pipeline.
 """
 
+import hashlib
 import json
-import time
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
 
+def _fingerprint(value: Any, digest_size: int = 8) -> str:
+    """Short stable hash of a JSON-serializable value."""
+    data = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=digest_size).hexdigest()
+
+
+# Digest size of list element fingerprints, which are stored concatenated
+ELEMENT_FINGERPRINT_SIZE = 4
+
+
 class Status(Enum):
     """Document processing status."""
 
@@ -207,6 +217,71 @@ class Document:
     # HITL metadata
     hitl_metadata: List[HitlMetadata] = field(default_factory=list)
 
+    # Fingerprints of the tracking attributes last written to the document
+    # tracking store (DynamoDB or AppSync), used to send only changed attributes
+    persisted_state: Dict[str, str] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    # Stored state this document was loaded from or last saved to (base
+    # snapshot, deltas and fingerprints), used to store only the changes
+    state_origin: Dict[str, Any] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    def changed_attributes(self, attributes: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get the tracking attributes whose values differ from the last persisted values.
+
+        Args:
+            attributes: Tracking store attributes (e.g. {"ObjectStatus": "OCR", "Pages": [...]})
+
+        Returns:
+            Subset of attributes that have changed or were never persisted
+        """
+        return {
+            name: value
+            for name, value in attributes.items()
+            if self.persisted_state.get(name) != _fingerprint(value)
+        }
+
+    def changed_elements(self, name: str, elements: List[Any]) -> Optional[List[int]]:
+        """
+        Get the indexes of the elements of a list attribute that have changed.
+
+        Args:
+            name: Tracking attribute name (e.g. "Pages")
+            elements: Current list value
+
+        Returns:
+            Indexes of changed elements, or None if the list was not persisted
+            with the same length and must be written whole
+        """
+        persisted = self.persisted_state.get(f"{name}[]")
+        width = ELEMENT_FINGERPRINT_SIZE * 2
+        if persisted is None or len(persisted) != len(elements) * width:
+            return None
+        return [
+            index
+            for index, element in enumerate(elements)
+            if persisted[index * width : (index + 1) * width]
+            != _fingerprint(element, ELEMENT_FINGERPRINT_SIZE)
+        ]
+
+    def mark_persisted(self, attributes: Dict[str, Any]) -> None:
+        """
+        Record tracking attributes as written to the tracking store.
+
+        Args:
+            attributes: Tracking store attributes that were written
+        """
+        for name, value in attributes.items():
+            self.persisted_state[name] = _fingerprint(value)
+            if isinstance(value, list):
+                self.persisted_state[f"{name}[]"] = "".join(
+                    _fingerprint(element, ELEMENT_FINGERPRINT_SIZE) for element in value
+                )
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert document to dictionary representation."""
         # First convert basic attributes
@@ -269,6 +344,18 @@ class Document:
 
         return result
 
+    def _state_dict(self) -> Dict[str, Any]:
+        """
+        Dictionary stored as the document state between workflow steps.
+
+        Extends to_dict() with the tracking fingerprints, which are internal
+        and kept out of payloads, tracking store items and outputs.
+        """
+        result = self.to_dict()
+        if self.persisted_state:
+            result["persisted_state"] = dict(self.persisted_state)
+        return result
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Document":
         """Create a Document from a dictionary representation."""
@@ -289,6 +376,7 @@ class Document:
             summary_report_uri=data.get("summary_report_uri"),
             metering=data.get("metering", {}),
             errors=data.get("errors", []),
+            persisted_state=dict(data.get("persisted_state", {})),
         )
 
         # Convert status from string to enum
@@ -381,13 +469,12 @@ class Document:
         """
         import logging
 
-        import boto3
-
+        from idp_common.clients import get_client
         from idp_common.s3 import get_json_content
         from idp_common.utils import build_s3_uri
 
         logger = logging.getLogger(__name__)
-        s3_client = boto3.client("s3")
+        s3_client = get_client("s3")
 
         # Create a basic document structure
         document = cls(
@@ -521,6 +608,11 @@ class Document:
         """
         Store full document in S3 and return lightweight wrapper for Step Functions.
 
+        The document is stored with idp_common.state_store: as a base snapshot,
+        or as a delta with only the changes since it was loaded from a stored
+        state. Snapshots and deltas use the versioned, compressed state format
+        of idp_common.state_codec (gzip by default, see DOCUMENT_STATE_CODEC).
+
         Args:
             bucket: S3 bucket to store the full document
             step_name: Name of the processing step (for unique S3 key)
@@ -528,44 +620,26 @@ class Document:
         Returns:
             Lightweight wrapper containing essential fields and section IDs for Map step
         """
+        return self._compress(bucket, step_name, self._state_dict())
+
+    def _compress(
+        self,
+        bucket: str,
+        step_name: str,
+        document_dict: Dict[str, Any],
+        document_json: Optional[bytes] = None,
+    ) -> Dict[str, Any]:
+        """Store the document state in S3 and return the lightweight wrapper."""
         import logging
 
-        import boto3
+        from idp_common.state_store import DocumentStateStore
 
         logger = logging.getLogger(__name__)
-        s3_client = boto3.client("s3")
-
-        # Generate unique S3 key with timestamp
-        timestamp = str(int(time.time() * 1000))  # milliseconds for uniqueness
-        s3_key = f"compressed_documents/{self.id}/{timestamp}_{step_name}_state.json"
 
         try:
-            # Store full document in S3
-            full_document_json = self.to_json()
-            s3_client.put_object(
-                Bucket=bucket,
-                Key=s3_key,
-                Body=full_document_json,
-                ContentType="application/json",
+            return DocumentStateStore(bucket).save(
+                self, step_name, document_dict, document_json
             )
-
-            s3_uri = f"s3://{bucket}/{s3_key}"
-            logger.info(f"Compressed document {self.id} to {s3_uri}")
-
-            # Create lightweight wrapper with just section IDs for Map step
-            # This significantly reduces payload size for large documents
-            sections_for_map = [section.section_id for section in self.sections]
-
-            return {
-                "document_id": self.id,
-                "s3_uri": s3_uri,
-                "timestamp": timestamp,
-                "status": self.status.value,
-                "num_pages": self.num_pages,
-                "sections": sections_for_map,  # For Step Functions Map state
-                "compressed": True,
-            }
-
         except Exception as e:
             logger.error(f"Error compressing document {self.id}: {str(e)}")
             raise
@@ -575,6 +649,10 @@ class Document:
         """
         Restore full Document from S3 using compressed wrapper data.
 
+        The deltas referenced by the wrapper are applied to its base snapshot.
+        The state format is detected from the stored bytes, so documents
+        stored as plain JSON by earlier versions are restored as well.
+
         Args:
             bucket: S3 bucket containing the compressed document
             compressed_data: Lightweight wrapper from compress() method
@@ -583,32 +661,13 @@ class Document:
             Full Document object with all content restored
         """
         import logging
-        from urllib.parse import urlparse
 
-        import boto3
+        from idp_common.state_store import DocumentStateStore
 
         logger = logging.getLogger(__name__)
-        s3_client = boto3.client("s3")
 
         try:
-            # Extract S3 key from URI
-            s3_uri = compressed_data.get("s3_uri")
-            if not s3_uri:
-                raise ValueError("No s3_uri found in compressed data")
-
-            parsed_uri = urlparse(s3_uri)
-            s3_key = parsed_uri.path.lstrip("/")
-
-            # Retrieve full document from S3
-            response = s3_client.get_object(Bucket=bucket, Key=s3_key)
-            document_json = response["Body"].read().decode("utf-8")
-
-            # Restore full document
-            document = cls.from_json(document_json)
-
-            logger.info(f"Decompressed document {document.id} from {s3_uri}")
-            return document
-
+            return DocumentStateStore(bucket).load(compressed_data)
         except Exception as e:
             logger.error(f"Error decompressing document: {str(e)}")
             raise
@@ -671,8 +730,12 @@ class Document:
         Returns:
             dict: Response data with either compressed reference or document dict
         """
-        document_json = json.dumps(self.to_dict(), default=str)
-        document_size = len(document_json.encode("utf-8"))
+        from idp_common.state_codec import dumps_document
+
+        # Serialized once: the size is measured on the JSON that is stored
+        document_dict = self._state_dict()
+        document_json = dumps_document(document_dict)
+        document_size = len(document_json)
         threshold_bytes = size_threshold_kb * 1024
 
         if logger:
@@ -684,11 +747,15 @@ class Document:
                 logger.info(
                     f"Document size ({document_size} bytes) exceeds {size_threshold_kb}KB threshold, compressing to S3"
                 )
-            compressed_data = self.compress(working_bucket, step_name)
+            compressed_data = self._compress(
+                working_bucket, step_name, document_dict, document_json
+            )
             return compressed_data
         else:
             if logger:
                 logger.info(
                     f"Document size ({document_size} bytes) is under {size_threshold_kb}KB threshold, returning as JSON"
                 )
-            return self.to_dict()
+            # Tracking fingerprints are only carried in stored state
+            document_dict.pop("persisted_state", None)
+            return document_dict
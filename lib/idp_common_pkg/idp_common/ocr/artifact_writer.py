@@ -0,0 +1,145 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Asynchronous S3 artifact writer for OCR page results.
+
+Page workers hand their artifacts (page image, raw OCR response, text
+confidence and parsed text) to the writer and continue with the next step
+instead of waiting for each PutObject call. Uploads run on a dedicated thread
+pool using a shared S3 client whose connection pool matches the thread count,
+and the number of uploads in flight is bounded so that pending page images
+cannot exhaust memory.
+"""
+
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from idp_common import s3
+from idp_common.clients import get_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_UPLOAD_WORKERS = 20
+DEFAULT_MAX_PENDING_UPLOADS = 80
+
+
+class ArtifactWriter:
+    """Bounded, thread-safe background uploader for S3 artifacts."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_UPLOAD_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING_UPLOADS,
+        region: Optional[str] = None,
+    ):
+        """
+        Initialize the artifact writer.
+
+        Args:
+            max_workers: Number of concurrent uploads
+            max_pending: Maximum number of queued or running uploads; submit()
+                blocks while this many uploads are outstanding
+            region: AWS region for the S3 client
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(self.max_workers, max_pending)
+        self.region = region
+        self.s3_client = None  # Created with the upload threads on first use
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[Any, str, concurrent.futures.Future]] = []
+
+    def submit(
+        self,
+        content: Union[str, bytes, Dict[str, Any], List[Any]],
+        bucket: str,
+        key: str,
+        content_type: Optional[str] = None,
+        tag: Any = None,
+    ) -> concurrent.futures.Future:
+        """
+        Queue content for upload to S3.
+
+        Args:
+            content: Content to write (see s3.write_content)
+            bucket: S3 bucket
+            key: S3 key
+            content_type: Optional content type for the S3 object
+            tag: Optional value identifying the upload in wait() failures
+                (e.g. the page ID)
+
+        Returns:
+            Future completing when the object has been written
+        """
+        self._slots.acquire()
+        try:
+            executor = self._get_executor()
+            future = executor.submit(
+                s3.write_content,
+                content,
+                bucket,
+                key,
+                content_type=content_type,
+                s3_client=self.s3_client,
+            )
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        with self._lock:
+            self._pending.append((tag, f"s3://{bucket}/{key}", future))
+        return future
+
+    def wait(self) -> List[Tuple[Any, str, BaseException]]:
+        """
+        Wait for all outstanding uploads to finish.
+
+        Returns:
+            List of (tag, s3_uri, exception) for every failed upload
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+
+        failures = []
+        for tag, uri, future in pending:
+            error = future.exception()
+            if error is not None:
+                failures.append((tag, uri, error))
+        if pending:
+            logger.debug(
+                f"Completed {len(pending)} artifact uploads, {len(failures)} failed"
+            )
+        return failures
+
+    def close(self) -> None:
+        """
+        Wait for outstanding uploads and release the upload threads.
+
+        The writer can still be used afterwards; a new thread pool is created
+        on the next submit() and the S3 client is reused.
+        """
+        self.wait()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Create the upload thread pool and S3 client on first use."""
+        with self._lock:
+            if self._executor is None:
+                if self.s3_client is None:
+                    self.s3_client = get_client(
+                        "s3",
+                        region_name=self.region,
+                        max_pool_connections=self.max_workers,
+                    )
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="ocr-artifact-writer",
+                )
+            return self._executor
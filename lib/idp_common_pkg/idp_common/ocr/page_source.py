@@ -0,0 +1,241 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Page source for OCR input documents.
+
+Large input objects are streamed from S3 to a spool file in /tmp instead of
+being read into memory; MuPDF then reads the file on demand. Pages are
+rendered by producer threads, each with its own fitz.Document handle (fitz
+documents are not safe to share between threads), into a bounded queue so
+that only a fixed number of rendered page images exist at any time,
+regardless of the page count.
+"""
+
+import logging
+import os
+import queue
+import tempfile
+import threading
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+# Objects larger than this are spooled to disk rather than held in memory
+DEFAULT_SPOOL_THRESHOLD = 32 * 1024 * 1024
+SPOOL_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Number of bytes returned by head() for file type detection of spooled files
+HEAD_SIZE = 64 * 1024
+
+DEFAULT_MAX_BUFFERED_PAGES = 10
+DEFAULT_RENDER_WORKERS = 2
+
+# (page_index, image_bytes, error)
+RenderedPage = Tuple[int, Optional[bytes], Optional[Exception]]
+
+
+class PageSource:
+    """Input document held either in memory (small objects) or in a spool file."""
+
+    def __init__(self, data: Optional[bytes] = None, path: Optional[str] = None):
+        """
+        Initialize the page source. Exactly one of data or path must be given.
+
+        Args:
+            data: In-memory document content
+            path: Path of a spool file owned (and deleted on close) by this source
+        """
+        if (data is None) == (path is None):
+            raise ValueError("Exactly one of data or path must be provided")
+        self.data = data
+        self.path = path
+
+    @classmethod
+    def from_s3(
+        cls,
+        s3_client: Any,
+        bucket: str,
+        key: str,
+        spool_threshold: int = DEFAULT_SPOOL_THRESHOLD,
+        spool_dir: Optional[str] = None,
+    ) -> "PageSource":
+        """
+        Fetch an S3 object, spooling it to disk if it is larger than spool_threshold.
+
+        Args:
+            s3_client: boto3 S3 client
+            bucket: S3 bucket
+            key: S3 key
+            spool_threshold: Size in bytes above which the object is spooled
+            spool_dir: Directory for spool files (defaults to the system temp dir, /tmp on Lambda)
+
+        Returns:
+            PageSource for the object
+        """
+        response = s3_client.get_object(Bucket=bucket, Key=key)
+        body = response["Body"]
+        content_length = response.get("ContentLength")
+
+        if not isinstance(content_length, int) or content_length <= spool_threshold:
+            return cls(data=body.read())
+
+        fd, path = tempfile.mkstemp(prefix="ocr-input-", dir=spool_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while True:
+                    chunk = body.read(SPOOL_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+        except Exception:
+            os.remove(path)
+            raise
+        logger.info(f"Spooled s3://{bucket}/{key} ({content_length} bytes) to {path}")
+        return cls(path=path)
+
+    @property
+    def is_spooled(self) -> bool:
+        """Whether the document content is in a spool file rather than in memory."""
+        return self.path is not None
+
+    def head(self, size: int = HEAD_SIZE) -> bytes:
+        """
+        Get content for file type detection.
+
+        Returns the full content for in-memory sources, and the first size
+        bytes for spooled sources.
+        """
+        if self.data is not None:
+            return self.data
+        with open(self.path, "rb") as f:
+            return f.read(size)
+
+    def read_bytes(self) -> bytes:
+        """Get the full document content (used for formats that are converted in memory)."""
+        if self.data is not None:
+            return self.data
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def open_document(self, filetype: str) -> fitz.Document:
+        """
+        Open a new fitz.Document handle. Each thread must use its own handle.
+
+        Args:
+            filetype: File type passed to PyMuPDF (e.g. 'pdf', 'png')
+
+        Returns:
+            fitz.Document; the caller is responsible for closing it
+        """
+        if self.path is not None:
+            return fitz.open(self.path, filetype=filetype)
+        return fitz.open(stream=self.data, filetype=filetype)
+
+    def render_pages(
+        self,
+        filetype: str,
+        num_pages: int,
+        render: Callable[[fitz.Page, bool, int], bytes],
+        max_buffered: int = DEFAULT_MAX_BUFFERED_PAGES,
+        num_renderers: int = DEFAULT_RENDER_WORKERS,
+    ) -> Iterator[RenderedPage]:
+        """
+        Render pages in background threads into a bounded queue.
+
+        Renderer k opens its own document handle and renders pages k, k+n, k+2n...
+        At most max_buffered rendered pages wait in the queue; renderers block
+        until the consumer takes pages off it.
+
+        Args:
+            filetype: File type passed to PyMuPDF
+            num_pages: Number of pages to render
+            render: Callable(page, is_pdf, page_id) returning image bytes
+            max_buffered: Maximum number of rendered pages waiting to be consumed
+            num_renderers: Number of renderer threads
+
+        Yields:
+            (page_index, image_bytes, error) in completion order; error is set
+            (and image_bytes is None) if a page could not be rendered
+        """
+        num_renderers = max(1, min(num_renderers, num_pages))
+        rendered: "queue.Queue[Optional[RenderedPage]]" = queue.Queue(
+            maxsize=max(1, max_buffered)
+        )
+        stop = threading.Event()
+
+        def put(item: Optional[RenderedPage]) -> bool:
+            # Blocks while the queue is full, but gives up once the consumer stops
+            while not stop.is_set():
+                try:
+                    rendered.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def renderer(offset: int) -> None:
+            try:
+                pdf_document = self.open_document(filetype)
+            except Exception as e:
+                for page_index in range(offset, num_pages, num_renderers):
+                    if not put((page_index, None, e)):
+                        return
+                put(None)
+                return
+            try:
+                is_pdf = pdf_document.is_pdf
+                for page_index in range(offset, num_pages, num_renderers):
+                    try:
+                        page = pdf_document.load_page(page_index)
+                        item = (page_index, render(page, is_pdf, page_index + 1), None)
+                    except Exception as e:
+                        item = (page_index, None, e)
+                    if not put(item):
+                        return
+            finally:
+                pdf_document.close()
+                put(None)
+
+        threads = [
+            threading.Thread(
+                target=renderer,
+                args=(offset,),
+                name=f"ocr-page-renderer-{offset}",
+                daemon=True,
+            )
+            for offset in range(num_renderers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            finished = 0
+            while finished < num_renderers:
+                item = rendered.get()
+                if item is None:
+                    finished += 1
+                else:
+                    yield item
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    def close(self) -> None:
+        """Release the content and delete the spool file, if any."""
+        self.data = None
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+    def __enter__(self) -> "PageSource":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
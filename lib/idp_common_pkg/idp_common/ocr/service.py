@@ -12,16 +12,23 @@ processing of multiple pages.
 import concurrent.futures
 import logging
 import os
+import threading
 import time
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-import boto3
 import fitz  # PyMuPDF
-from botocore.config import Config
 
-from idp_common import bedrock, image, s3, utils
+from idp_common import bedrock, image, utils
+from idp_common.clients import get_client
 from idp_common.models import Document, Page, Status
+from idp_common.ocr.artifact_writer import ArtifactWriter
 from idp_common.ocr.document_converter import DocumentConverter
+from idp_common.ocr.page_source import (
+    DEFAULT_MAX_BUFFERED_PAGES,
+    DEFAULT_RENDER_WORKERS,
+    DEFAULT_SPOOL_THRESHOLD,
+    PageSource,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +48,9 @@ class OcrService:
         preprocessing_config: Optional[
             Dict[str, Any]
         ] = None,  # New parameter for preprocessing
+        max_buffered_pages: int = DEFAULT_MAX_BUFFERED_PAGES,
+        render_workers: int = DEFAULT_RENDER_WORKERS,
+        spool_threshold: int = DEFAULT_SPOOL_THRESHOLD,
     ):
         """
         Initialize the OCR service.
@@ -57,6 +67,12 @@ class OcrService:
                           with 'target_width' and 'target_height' keys
             backend: OCR backend to use ("textract" or "bedrock")
             bedrock_config: Optional dictionary containing bedrock configuration if backend is "bedrock"
+            preprocessing_config: Optional dictionary controlling adaptive binarization before OCR,
+                          with 'enabled' and optional 'block_size' and 'c' keys
+            max_buffered_pages: Maximum number of rendered pages waiting for a page worker
+            render_workers: Number of threads rendering pages, each with its own document handle
+            spool_threshold: Input objects larger than this many bytes are spooled to /tmp
+                          instead of being held in memory
             config: Configuration dictionary
 
         Raises:
@@ -70,6 +86,9 @@ class OcrService:
         self.backend = backend.lower()
         self.bedrock_config = bedrock_config
         self.preprocessing_config = preprocessing_config
+        self.max_buffered_pages = max_buffered_pages
+        self.render_workers = render_workers
+        self.spool_threshold = spool_threshold
 
         # Log DPI setting for debugging
         logger.info(f"OCR Service initialized with DPI: {self.dpi}")
@@ -112,12 +131,11 @@ class OcrService:
             self.enhanced_features = enhanced_features
 
             # Initialize Textract client with adaptive retries
-            adaptive_config = Config(
-                retries={"max_attempts": 100, "mode": "adaptive"},
+            self.textract_client = get_client(
+                "textract",
+                region_name=self.region,
                 max_pool_connections=max_workers * 3,
-            )
-            self.textract_client = boto3.client(
-                "textract", region_name=self.region, config=adaptive_config
+                retries={"max_attempts": 100, "mode": "adaptive"},
             )
 
             logger.info("OCR Service initialized with Textract backend")
@@ -152,7 +170,14 @@ class OcrService:
             )
 
         # Initialize S3 client (used by all backends for image storage)
-        self.s3_client = boto3.client("s3")
+        self.s3_client = get_client("s3", max_pool_connections=max_workers)
+
+        # Page artifacts are uploaded in the background, overlapping OCR calls.
+        # Outstanding uploads are limited to the upload threads, so at most
+        # max_workers page images wait on S3 after their page worker finished.
+        self.artifact_writer = ArtifactWriter(
+            max_workers=max_workers, max_pending=max_workers, region=self.region
+        )
 
         # Initialize document converter for non-PDF formats
         self.document_converter = DocumentConverter(dpi=self.dpi or 150)
@@ -170,12 +195,14 @@ class OcrService:
         """
         t0 = time.time()
 
-        # Get the document from S3
+        # Get the document from S3; large objects are spooled to /tmp
         try:
-            response = self.s3_client.get_object(
-                Bucket=document.input_bucket, Key=document.input_key
+            source = PageSource.from_s3(
+                self.s3_client,
+                document.input_bucket,
+                document.input_key,
+                spool_threshold=self.spool_threshold,
             )
-            file_content = response["Body"].read()
             t1 = time.time()
             logger.debug(f"Time taken for S3 GetObject: {t1 - t0:.6f} seconds")
         except Exception as e:
@@ -190,12 +217,14 @@ class OcrService:
 
         # Detect file type and process accordingly
         try:
-            file_type = self._detect_file_type(document.input_key, file_content)
+            file_type = self._detect_file_type(document.input_key, source.head())
             logger.info(f"Detected file type: {file_type}")
 
             if file_type in ["txt", "csv", "xlsx", "docx"]:
                 # Process non-PDF documents
-                pages_data = self._process_non_pdf_document(file_type, file_content)
+                pages_data = self._process_non_pdf_document(
+                    file_type, source.read_bytes()
+                )
                 document.num_pages = len(pages_data)
 
                 # Process each page
@@ -232,24 +261,47 @@ class OcrService:
                         logger.error(f"{error_msg}\nStack trace:\n{stack_trace}")
                         document.errors.append(f"{error_msg} (see logs for full trace)")
             else:
-                # Process PDF/image documents using existing logic
-                pdf_document = fitz.open(stream=file_content, filetype=file_type)
+                # Process PDF/image documents. Pages are rendered by background
+                # renderers (each with its own document handle) into a bounded
+                # queue, and at most max_workers rendered pages are being processed.
+                # Rendered page images held in memory are bounded by
+                # render_workers + max_buffered_pages + 2 * max_workers (rendering,
+                # queued, being processed, and waiting for their image upload).
+                pdf_document = source.open_document(file_type)
                 num_pages = len(pdf_document)
+                pdf_document.close()
                 document.num_pages = num_pages
 
+                in_flight = threading.BoundedSemaphore(self.max_workers)
                 with concurrent.futures.ThreadPoolExecutor(
                     max_workers=self.max_workers
                 ) as executor:
-                    future_to_page = {
-                        executor.submit(
+                    future_to_page = {}
+                    for page_index, img_bytes, render_error in source.render_pages(
+                        file_type,
+                        num_pages,
+                        self._extract_page_image,
+                        max_buffered=self.max_buffered_pages,
+                        num_renderers=self.render_workers,
+                    ):
+                        if render_error is not None:
+                            error_msg = f"Error processing page {page_index + 1}: {str(render_error)}"
+                            logger.error(error_msg, exc_info=render_error)
+                            document.errors.append(
+                                f"{error_msg} (see logs for full trace)"
+                            )
+                            continue
+
+                        in_flight.acquire()
+                        future = executor.submit(
                             self._process_single_page,
-                            i,
-                            pdf_document,
+                            page_index,
+                            img_bytes,
                             document.output_bucket,
                             document.input_key,
-                        ): i
-                        for i in range(num_pages)
-                    }
+                        )
+                        future.add_done_callback(lambda _: in_flight.release())
+                        future_to_page[future] = page_index
 
                     for future in concurrent.futures.as_completed(future_to_page):
                         page_index = future_to_page[future]
@@ -283,7 +335,8 @@ class OcrService:
                                 f"{error_msg} (see logs for full trace)"
                             )
 
-                pdf_document.close()
+            # Wait for all queued page artifacts to reach S3
+            self._wait_for_artifacts(document)
 
             # Sort the pages dictionary by ascending page number
             logger.info(f"Sorting {len(document.pages)} pages by page number")
@@ -308,6 +361,10 @@ class OcrService:
             logger.error(f"{error_msg}\nStack trace:\n{stack_trace}")
             document.errors.append(f"{error_msg} (see logs for full trace)")
             document.status = Status.FAILED
+            # Never leave uploads from this document running after returning
+            self._wait_for_artifacts(document)
+        finally:
+            source.close()
 
         t2 = time.time()
         logger.info(f"OCR processing completed in {t2 - t0:.2f} seconds")
@@ -316,6 +373,30 @@ class OcrService:
         )
         return document
 
+    def _wait_for_artifacts(self, document: Document) -> None:
+        """
+        Wait for all queued page artifact uploads and record failed uploads as page errors.
+
+        Args:
+            document: Document being processed
+        """
+        t0 = time.time()
+        failures = self.artifact_writer.wait()
+        # Release the idle upload threads; they are recreated for the next document
+        self.artifact_writer.close()
+        logger.debug(
+            f"Time waiting for page artifact uploads: {time.time() - t0:.6f} seconds"
+        )
+
+        for page_id, uri, error in failures:
+            error_msg = (
+                f"Error processing page {page_id}: failed to write {uri}: {str(error)}"
+            )
+            logger.error(error_msg)
+            document.errors.append(error_msg)
+        if failures:
+            document.status = Status.FAILED
+
     def _feature_combo(self):
         """Return the pricing feature combination string based on enhanced_features.
 
@@ -360,19 +441,32 @@ class OcrService:
             return "-Signatures"
         return ""
 
+    def _get_binarization_params(self) -> Dict[str, int]:
+        """Return adaptive binarization parameters set in preprocessing_config.
+
+        Only explicitly configured values are returned, so unset values fall
+        back to the defaults of image.apply_adaptive_binarization.
+        """
+        params = {}
+        for key in ("block_size", "c"):
+            value = (self.preprocessing_config or {}).get(key)
+            if value is not None and value != "":
+                params[key] = int(value)
+        return params
+
     def _process_single_page(
         self,
         page_index: int,
-        pdf_document: fitz.Document,
+        img_bytes: bytes,
         output_bucket: str,
         prefix: str,
     ) -> Tuple[Dict[str, str], Dict[str, Any]]:
         """
-        Process a single page of a document (PDF or image).
+        Process a single rendered page of a document (PDF or image).
 
         Args:
             page_index: Zero-based index of the page
-            pdf_document: PyMuPDF document object
+            img_bytes: Rendered page image (JPEG)
             output_bucket: S3 bucket to store results
             prefix: S3 prefix for storing results
 
@@ -382,22 +476,22 @@ class OcrService:
         # Use the appropriate backend
         if self.backend == "none":
             return self._process_single_page_none(
-                page_index, pdf_document, output_bucket, prefix
+                page_index, img_bytes, output_bucket, prefix
             )
         elif self.backend == "bedrock":
             return self._process_single_page_bedrock(
-                page_index, pdf_document, output_bucket, prefix
+                page_index, img_bytes, output_bucket, prefix
             )
         else:
             # Textract backend (default)
             return self._process_single_page_textract(
-                page_index, pdf_document, output_bucket, prefix
+                page_index, img_bytes, output_bucket, prefix
             )
 
     def _process_single_page_textract(
         self,
         page_index: int,
-        pdf_document: fitz.Document,
+        img_bytes: bytes,
         output_bucket: str,
         prefix: str,
     ) -> Tuple[Dict[str, str], Dict[str, Any]]:
@@ -406,7 +500,7 @@ class OcrService:
 
         Args:
             page_index: Zero-based index of the page
-            pdf_document: PyMuPDF document object
+            img_bytes: Rendered page image (JPEG)
             output_bucket: S3 bucket to store results
             prefix: S3 prefix for storing results
 
@@ -416,17 +510,10 @@ class OcrService:
         t0 = time.time()
         page_id = page_index + 1
 
-        # Extract page image - use DPI only for PDF files to prevent upscaling of images
-        page = pdf_document.load_page(page_index)
-        img_bytes = self._extract_page_image(page, pdf_document.is_pdf, page_id)
-
-        # Upload original image to S3
+        # Queue original image upload; it overlaps the OCR call below
         image_key = f"{prefix}/pages/{page_id}/image.jpg"
-        s3.write_content(img_bytes, output_bucket, image_key, content_type="image/jpeg")
-
-        t1 = time.time()
-        logger.debug(
-            f"Time for image conversion (page {page_id}): {t1 - t0:.6f} seconds"
+        self.artifact_writer.submit(
+            img_bytes, output_bucket, image_key, content_type="image/jpeg", tag=page_id
         )
 
         # Resize image for OCR processing if configured
@@ -446,7 +533,9 @@ class OcrService:
         if self.preprocessing_config and self.preprocessing_config.get("enabled"):
             from idp_common.image import apply_adaptive_binarization
 
-            ocr_img_bytes = apply_adaptive_binarization(ocr_img_bytes)
+            ocr_img_bytes = apply_adaptive_binarization(
+                ocr_img_bytes, **self._get_binarization_params()
+            )
             logger.debug(
                 f"Applied adaptive binarization preprocessing for OCR processing (page {page_id})"
             )
@@ -469,35 +558,38 @@ class OcrService:
 
         # Store raw Textract response
         raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-        s3.write_content(
+        self.artifact_writer.submit(
             textract_result,
             output_bucket,
             raw_text_key,
             content_type="application/json",
+            tag=page_id,
         )
 
         # Generate and store text confidence data for efficient assessment
         text_confidence_data = self._generate_text_confidence_data(textract_result)
         text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-        s3.write_content(
+        self.artifact_writer.submit(
             text_confidence_data,
             output_bucket,
             text_confidence_key,
             content_type="application/json",
+            tag=page_id,
         )
 
         # Parse and store text content with markdown
         parsed_result = self._parse_textract_response(textract_result, page_id)
         parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-        s3.write_content(
+        self.artifact_writer.submit(
             parsed_result,
             output_bucket,
             parsed_text_key,
             content_type="application/json",
+            tag=page_id,
         )
 
-        t2 = time.time()
-        logger.debug(f"Time for Textract (page {page_id}): {t2 - t1:.6f} seconds")
+        t1 = time.time()
+        logger.debug(f"Time for Textract (page {page_id}): {t1 - t0:.6f} seconds")
 
         # Create and return page result
         result = {
@@ -535,7 +627,7 @@ class OcrService:
     def _process_single_page_bedrock(
         self,
         page_index: int,
-        pdf_document: fitz.Document,
+        img_bytes: bytes,
         output_bucket: str,
         prefix: str,
     ) -> Tuple[Dict[str, str], Dict[str, Any]]:
@@ -544,7 +636,7 @@ class OcrService:
 
         Args:
             page_index: Zero-based index of the page
-            pdf_document: PyMuPDF document object
+            img_bytes: Rendered page image (JPEG)
             output_bucket: S3 bucket to store results
             prefix: S3 prefix for storing results
 
@@ -554,17 +646,10 @@ class OcrService:
         t0 = time.time()
         page_id = page_index + 1
 
-        # Extract page image at specified DPI (consistent with Textract)
-        page = pdf_document.load_page(page_index)
-        img_bytes = self._extract_page_image(page, pdf_document.is_pdf, page_id)
-
-        # Upload image to S3
+        # Queue image upload; it overlaps the OCR call below
         image_key = f"{prefix}/pages/{page_id}/image.jpg"
-        s3.write_content(img_bytes, output_bucket, image_key, content_type="image/jpeg")
-
-        t1 = time.time()
-        logger.debug(
-            f"Time for image conversion (page {page_id}): {t1 - t0:.6f} seconds"
+        self.artifact_writer.submit(
+            img_bytes, output_bucket, image_key, content_type="image/jpeg", tag=page_id
         )
 
         # Apply resize config if provided (consistent with Textract)
@@ -582,7 +667,9 @@ class OcrService:
         if self.preprocessing_config and self.preprocessing_config.get("enabled"):
             from idp_common.image import apply_adaptive_binarization
 
-            ocr_img_bytes = apply_adaptive_binarization(ocr_img_bytes)
+            ocr_img_bytes = apply_adaptive_binarization(
+                ocr_img_bytes, **self._get_binarization_params()
+            )
             logger.debug(
                 f"Applied adaptive binarization preprocessing for Bedrock OCR processing (page {page_id})"
             )
@@ -609,16 +696,17 @@ class OcrService:
         extracted_text = bedrock.extract_text_from_response(response_with_metering)
         metering = response_with_metering.get("metering", {})
 
-        t2 = time.time()
-        logger.debug(f"Time for Bedrock OCR (page {page_id}): {t2 - t1:.6f} seconds")
+        t1 = time.time()
+        logger.debug(f"Time for Bedrock OCR (page {page_id}): {t1 - t0:.6f} seconds")
 
         # Store raw Bedrock response
         raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-        s3.write_content(
+        self.artifact_writer.submit(
             response_with_metering["response"],
             output_bucket,
             raw_text_key,
             content_type="application/json",
+            tag=page_id,
         )
 
         # Generate and store text confidence data
@@ -629,21 +717,23 @@ class OcrService:
         }
 
         text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-        s3.write_content(
+        self.artifact_writer.submit(
             text_confidence_data,
             output_bucket,
             text_confidence_key,
             content_type="application/json",
+            tag=page_id,
         )
 
         # Store parsed text result
         parsed_result = {"text": extracted_text}
         parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-        s3.write_content(
+        self.artifact_writer.submit(
             parsed_result,
             output_bucket,
             parsed_text_key,
             content_type="application/json",
+            tag=page_id,
         )
 
         # Create and return page result
@@ -659,7 +749,7 @@ class OcrService:
     def _process_single_page_none(
         self,
         page_index: int,
-        pdf_document: fitz.Document,
+        img_bytes: bytes,
         output_bucket: str,
         prefix: str,
     ) -> Tuple[Dict[str, str], Dict[str, Any]]:
@@ -668,7 +758,7 @@ class OcrService:
 
         Args:
             page_index: Zero-based index of the page
-            pdf_document: PyMuPDF document object
+            img_bytes: Rendered page image (JPEG)
             output_bucket: S3 bucket to store results
             prefix: S3 prefix for storing results
 
@@ -678,17 +768,10 @@ class OcrService:
         t0 = time.time()
         page_id = page_index + 1
 
-        # Extract page image at specified DPI (consistent with other backends)
-        page = pdf_document.load_page(page_index)
-        img_bytes = self._extract_page_image(page, pdf_document.is_pdf, page_id)
-
-        # Upload image to S3
+        # Queue image upload
         image_key = f"{prefix}/pages/{page_id}/image.jpg"
-        s3.write_content(img_bytes, output_bucket, image_key, content_type="image/jpeg")
-
-        t1 = time.time()
-        logger.debug(
-            f"Time for image conversion (page {page_id}): {t1 - t0:.6f} seconds"
+        self.artifact_writer.submit(
+            img_bytes, output_bucket, image_key, content_type="image/jpeg", tag=page_id
         )
 
         # Create empty OCR response structure for compatibility
@@ -696,37 +779,40 @@ class OcrService:
 
         # Store empty raw OCR response
         raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-        s3.write_content(
+        self.artifact_writer.submit(
             empty_ocr_response,
             output_bucket,
             raw_text_key,
             content_type="application/json",
+            tag=page_id,
         )
 
         # Generate minimal text confidence data (empty)
         text_confidence_data = {"page_count": 1, "text_blocks": []}
 
         text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-        s3.write_content(
+        self.artifact_writer.submit(
             text_confidence_data,
             output_bucket,
             text_confidence_key,
             content_type="application/json",
+            tag=page_id,
         )
 
         # Store empty parsed text result
         parsed_result = {"text": ""}
         parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-        s3.write_content(
+        self.artifact_writer.submit(
             parsed_result,
             output_bucket,
             parsed_text_key,
             content_type="application/json",
+            tag=page_id,
         )
 
-        t2 = time.time()
+        t1 = time.time()
         logger.debug(
-            f"Time for image-only processing (page {page_id}): {t2 - t1:.6f} seconds"
+            f"Time for image-only processing (page {page_id}): {t1 - t0:.6f} seconds"
         )
 
         # No metering data for image-only processing
@@ -1040,10 +1126,14 @@ class OcrService:
         t0 = time.time()
         page_id = page_index + 1
 
-        # Upload image to S3
+        # Queue image upload
         image_key = f"{prefix}/pages/{page_id}/image.jpg"
-        s3.write_content(
-            image_bytes, output_bucket, image_key, content_type="image/jpeg"
+        self.artifact_writer.submit(
+            image_bytes,
+            output_bucket,
+            image_key,
+            content_type="image/jpeg",
+            tag=page_id,
         )
 
         # Create OCR response structure for compatibility
@@ -1063,11 +1153,12 @@ class OcrService:
 
         # Store raw OCR response
         raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-        s3.write_content(
+        self.artifact_writer.submit(
             ocr_response,
             output_bucket,
             raw_text_key,
             content_type="application/json",
+            tag=page_id,
         )
 
         # Generate text confidence data
@@ -1081,21 +1172,23 @@ class OcrService:
         }
 
         text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-        s3.write_content(
+        self.artifact_writer.submit(
             text_confidence_data,
             output_bucket,
             text_confidence_key,
             content_type="application/json",
+            tag=page_id,
         )
 
         # Store parsed text result
         parsed_result = {"text": page_text}
         parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-        s3.write_content(
+        self.artifact_writer.submit(
             parsed_result,
             output_bucket,
             parsed_text_key,
             content_type="application/json",
+            tag=page_id,
         )
 
         t1 = time.time()
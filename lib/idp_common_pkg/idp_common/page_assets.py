@@ -0,0 +1,643 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Page asset loading shared by the classification, extraction and assessment
+services.
+
+Each service reads the text and image of the pages it processes, and each
+image is downloaded, decoded and resized to the configured target size. The
+page asset cache keeps the results keyed by (S3 URI, ETag, target size):
+
+- An in-process LRU bounded by bytes serves repeated reads in the same
+  process, e.g. a warm Lambda container processing sections of one document.
+- An optional disk tier (e.g. under /tmp) keeps more assets than fit in memory.
+- Resized images are stored back next to the original image in S3
+  ('image.jpg' -> 'image.951x1268.jpg') with the ETag of the original, so later
+  steps and reprocessing download the small variant and skip decoding and
+  resizing entirely.
+
+Entries are validated against the current ETag of the S3 object with a
+conditional request, so a rewritten page is never served from the cache.
+
+The cache is enabled with the PAGE_ASSET_CACHE environment variable. When it
+is disabled, page assets are read with s3.get_text_content and
+image.prepare_image as before. Either way, the pages of a section are read
+concurrently on a bounded worker pool (PAGE_FETCH_MAX_WORKERS):
+prefetch_section_pages starts the reads in the background, so the services
+prepare the rest of the request while the pages load, and returns the page
+inputs in page order.
+"""
+
+import hashlib
+import logging
+import os
+import posixpath
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from botocore.exceptions import ClientError
+
+from idp_common import image, s3
+from idp_common.utils import parse_s3_uri
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARGET_WIDTH = 951
+DEFAULT_TARGET_HEIGHT = 1268
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_WORKERS = 10
+
+SOURCE_ETAG_METADATA = "source-etag"
+_NOT_MODIFIED_CODES = {"304", "NotModified"}
+_MISSING_CODES = {"404", "NoSuchKey", "NotFound"}
+
+
+def _error_code(error: ClientError) -> str:
+    return str(error.response.get("Error", {}).get("Code", ""))
+
+
+def _target_size(
+    target_width: Optional[Any], target_height: Optional[Any]
+) -> Tuple[int, int]:
+    """Target size as used by image.prepare_image (defaults unless both are set)."""
+    if target_width is not None and target_height is not None:
+        return int(target_width), int(target_height)
+    return DEFAULT_TARGET_WIDTH, DEFAULT_TARGET_HEIGHT
+
+
+def variant_key(key: str, target_width: int, target_height: int) -> str:
+    """S3 key of the resized variant stored next to an image."""
+    root, _ = posixpath.splitext(key)
+    return f"{root}.{target_width}x{target_height}.jpg"
+
+
+class PageAssetCache:
+    """Cache of page text and resized page images, keyed by URI, ETag and size."""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+        store_variants: bool = True,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Maximum size of the in-process tier
+            directory: Directory of the disk tier, or None to keep assets in memory only
+            max_disk_bytes: Maximum size of the disk tier
+            store_variants: Whether to read and write resized images next to the
+                originals in S3
+        """
+        self.max_bytes = max(0, max_bytes)
+        self.directory = directory
+        self.max_disk_bytes = max(0, max_disk_bytes)
+        self.store_variants = store_variants
+        self._entries: "OrderedDict[Tuple[str, str, str], bytes]" = OrderedDict()
+        self._size = 0
+        # Last ETag seen per URI, for conditional requests
+        self._etags: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "variant_hits": 0,
+            "misses": 0,
+        }
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get_text(self, uri: str) -> str:
+        """
+        Get the text of a page, with the same result as s3.get_text_content.
+
+        Args:
+            uri: S3 URI of the page text
+
+        Returns:
+            Page text
+        """
+        bucket, key = parse_s3_uri(uri)
+        etag = self._etags.get(uri)
+        cached = self._lookup((uri, etag, "text")) if etag else None
+
+        params = {"Bucket": bucket, "Key": key}
+        if cached is not None:
+            params["IfNoneMatch"] = etag
+        try:
+            response = s3.get_s3_client().get_object(**params)
+        except ClientError as e:
+            if cached is not None and _error_code(e) in _NOT_MODIFIED_CODES:
+                return cached.decode("utf-8")
+            logger.error(f"Error reading text from {uri}: {e}")
+            raise
+
+        text = s3.parse_text_content(uri, response["Body"].read().decode("utf-8"))
+        self._count("misses")
+        self._store(uri, response["ETag"], "text", text.encode("utf-8"))
+        return text
+
+    def get_image(
+        self,
+        uri: str,
+        target_width: Optional[Any] = None,
+        target_height: Optional[Any] = None,
+    ) -> bytes:
+        """
+        Get a page image resized to the target size, as image.prepare_image does.
+
+        Args:
+            uri: S3 URI of the page image
+            target_width: Target width in pixels (defaults unless both are set)
+            target_height: Target height in pixels
+
+        Returns:
+            Resized image as JPEG bytes
+        """
+        width, height = _target_size(target_width, target_height)
+        size = f"{width}x{height}"
+        bucket, key = parse_s3_uri(uri)
+
+        etag = self._current_etag(bucket, key, uri, size)
+        cached = self._lookup((uri, etag, size))
+        if cached is not None:
+            return cached
+
+        data = self._get_variant(bucket, key, etag, width, height)
+        if data is not None:
+            self._count("variant_hits")
+        else:
+            # Read the original with its ETag, so a concurrent rewrite is not
+            # cached under the old ETag
+            response = s3.get_s3_client().get_object(Bucket=bucket, Key=key)
+            etag = response["ETag"]
+            data = image.resize_image(response["Body"].read(), width, height)
+            self._count("misses")
+            self._put_variant(bucket, key, etag, width, height, data)
+
+        self._store(uri, etag, size, data)
+        return data
+
+    def stats(self) -> Dict[str, int]:
+        """Get the hit and miss counts and the size of the in-process tier."""
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "bytes": self._size}
+
+    def clear(self) -> None:
+        """Remove all entries from the in-process tier."""
+        with self._lock:
+            self._entries.clear()
+            self._etags.clear()
+            self._size = 0
+
+    def _current_etag(self, bucket: str, key: str, uri: str, size: str) -> str:
+        """Get the ETag of an object, with a conditional request if it is cached."""
+        etag = self._etags.get(uri)
+        params = {"Bucket": bucket, "Key": key}
+        if etag and self._lookup((uri, etag, size), count=False) is not None:
+            params["IfNoneMatch"] = etag
+        try:
+            return s3.get_s3_client().head_object(**params)["ETag"]
+        except ClientError as e:
+            if "IfNoneMatch" in params and _error_code(e) in _NOT_MODIFIED_CODES:
+                return etag
+            raise
+
+    def _get_variant(
+        self, bucket: str, key: str, etag: str, width: int, height: int
+    ) -> Optional[bytes]:
+        if not self.store_variants:
+            return None
+        try:
+            response = s3.get_s3_client().get_object(
+                Bucket=bucket, Key=variant_key(key, width, height)
+            )
+        except ClientError as e:
+            if _error_code(e) not in _MISSING_CODES:
+                logger.warning(
+                    f"Failed to read resized image of s3://{bucket}/{key}: {e}"
+                )
+            return None
+        if response.get("Metadata", {}).get(SOURCE_ETAG_METADATA) != etag:
+            # Stale variant of an earlier version of the image
+            return None
+        return response["Body"].read()
+
+    def _put_variant(
+        self, bucket: str, key: str, etag: str, width: int, height: int, data: bytes
+    ) -> None:
+        if not self.store_variants:
+            return
+        try:
+            s3.get_s3_client().put_object(
+                Bucket=bucket,
+                Key=variant_key(key, width, height),
+                Body=data,
+                ContentType="image/jpeg",
+                Metadata={SOURCE_ETAG_METADATA: etag},
+            )
+        except ClientError as e:
+            logger.warning(f"Failed to store resized image of s3://{bucket}/{key}: {e}")
+
+    def _lookup(
+        self, cache_key: Tuple[str, Optional[str], str], count: bool = True
+    ) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(cache_key)
+            if data is not None:
+                self._entries.move_to_end(cache_key)
+                if count:
+                    self._stats["memory_hits"] += 1
+                return data
+
+        data = self._read_disk(cache_key)
+        if data is not None:
+            if count:
+                self._count("disk_hits")
+            self._store_memory(cache_key, data)
+        return data
+
+    def _store(self, uri: str, etag: str, variant: str, data: bytes) -> None:
+        with self._lock:
+            self._etags[uri] = etag
+        self._store_memory((uri, etag, variant), data)
+        self._write_disk((uri, etag, variant), data)
+
+    def _store_memory(self, cache_key: Tuple[str, str, str], data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(cache_key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[cache_key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def _disk_path(self, cache_key: Tuple[str, Optional[str], str]) -> str:
+        digest = hashlib.sha256("|".join(map(str, cache_key)).encode("utf-8"))
+        return os.path.join(self.directory, digest.hexdigest())
+
+    def _read_disk(self, cache_key: Tuple[str, Optional[str], str]) -> Optional[bytes]:
+        if not self.directory or cache_key[1] is None:
+            return None
+        path = self._disk_path(cache_key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Touch the file so eviction is least recently used
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def _write_disk(self, cache_key: Tuple[str, str, str], data: bytes) -> None:
+        if not self.directory:
+            return
+        path = self._disk_path(cache_key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write page asset cache file: {e}")
+            return
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        with self._lock:
+            try:
+                entries = [
+                    (entry.stat(), entry.path)
+                    for entry in os.scandir(self.directory)
+                    if not entry.name.endswith(".tmp")
+                ]
+            except OSError:
+                return
+            total = sum(stat.st_size for stat, _ in entries)
+            for stat, path in sorted(entries, key=lambda entry: entry[0].st_mtime):
+                if total <= self.max_disk_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= stat.st_size
+                except OSError:
+                    pass
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+
+_cache: Optional[PageAssetCache] = None
+_cache_lock = threading.Lock()
+
+
+def page_asset_cache_enabled() -> bool:
+    """Check the PAGE_ASSET_CACHE environment variable (default: false)."""
+    return os.environ.get("PAGE_ASSET_CACHE", "false").lower() == "true"
+
+
+def get_page_asset_cache() -> PageAssetCache:
+    """
+    Get the process-wide page asset cache, configured from the environment.
+
+    Environment variables:
+        PAGE_ASSET_CACHE_MAX_BYTES: Size of the in-process tier (default: 256 MiB)
+        PAGE_ASSET_CACHE_DIRECTORY: Directory of the disk tier (default: none)
+        PAGE_ASSET_CACHE_MAX_DISK_BYTES: Size of the disk tier (default: 256 MiB)
+        PAGE_ASSET_CACHE_STORE_VARIANTS: 'false' disables storing resized images in S3
+
+    Returns:
+        Shared PageAssetCache
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PageAssetCache(
+                max_bytes=int(
+                    os.environ.get("PAGE_ASSET_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+                ),
+                directory=os.environ.get("PAGE_ASSET_CACHE_DIRECTORY") or None,
+                max_disk_bytes=int(
+                    os.environ.get(
+                        "PAGE_ASSET_CACHE_MAX_DISK_BYTES", DEFAULT_MAX_DISK_BYTES
+                    )
+                ),
+                store_variants=os.environ.get(
+                    "PAGE_ASSET_CACHE_STORE_VARIANTS", "true"
+                ).lower()
+                != "false",
+            )
+        return _cache
+
+
+def reset_page_asset_cache() -> None:
+    """Discard the shared cache and its entries (mainly for tests)."""
+    global _cache
+    with _cache_lock:
+        _cache = None
+
+
+def get_page_text(uri: str) -> str:
+    """
+    Read the text of a page, from the page asset cache if it is enabled.
+
+    Args:
+        uri: S3 URI of the page text
+
+    Returns:
+        Page text
+    """
+    if page_asset_cache_enabled():
+        return get_page_asset_cache().get_text(uri)
+    return s3.get_text_content(uri)
+
+
+def get_page_image(
+    uri: str, target_width: Optional[Any] = None, target_height: Optional[Any] = None
+) -> bytes:
+    """
+    Read a page image resized to the target size, from the page asset cache if
+    it is enabled.
+
+    Args:
+        uri: S3 URI of the page image
+        target_width: Target width in pixels (image.prepare_image defaults unless
+            both are set)
+        target_height: Target height in pixels
+
+    Returns:
+        Resized image as JPEG bytes
+    """
+    if page_asset_cache_enabled():
+        return get_page_asset_cache().get_image(uri, target_width, target_height)
+    if target_width is not None and target_height is not None:
+        # Cast to int in case config values are strings
+        return image.prepare_image(uri, int(target_width), int(target_height))
+    return image.prepare_image(uri)  # Uses function defaults
+
+
+def default_max_workers() -> int:
+    """Concurrent page reads per section, from PAGE_FETCH_MAX_WORKERS (default: 10)."""
+    try:
+        workers = int(os.environ.get("PAGE_FETCH_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+    except ValueError:
+        return DEFAULT_MAX_WORKERS
+    return max(1, workers)
+
+
+class _Prefetch:
+    """Reads run on a bounded worker pool; results are collected in task order."""
+
+    def __init__(
+        self,
+        tasks: Sequence[Optional[Tuple[Callable, Tuple]]],
+        max_workers: Optional[int],
+    ):
+        self._executor = None
+        if sum(1 for task in tasks if task) <= 1:
+            # Nothing to overlap: read when the result is requested
+            self._tasks = list(tasks)
+            self._futures = None
+            return
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers or default_max_workers()),
+            thread_name_prefix="page-prefetch",
+        )
+        self._futures = [
+            self._executor.submit(task[0], *task[1]) if task else None for task in tasks
+        ]
+
+    def results(self) -> List[Any]:
+        """Wait for all reads; raises the error of the first failed read in order."""
+        try:
+            if self._futures is None:
+                return [task[0](*task[1]) if task else None for task in self._tasks]
+            return [future.result() if future else None for future in self._futures]
+        finally:
+            self.cancel()
+
+    def cancel(self) -> None:
+        """Discard reads that have not started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _page_tasks(
+    text_uri: Optional[str],
+    image_uri: Optional[str],
+    target_width: Optional[Any],
+    target_height: Optional[Any],
+) -> List[Optional[Tuple[Callable, Tuple]]]:
+    return [
+        (get_page_text, (text_uri,)) if text_uri else None,
+        (
+            (get_page_image, (image_uri, target_width, target_height))
+            if image_uri
+            else None
+        ),
+    ]
+
+
+def fetch_pages(
+    pages: Sequence[Tuple[Optional[str], Optional[str]]],
+    target_width: Optional[Any] = None,
+    target_height: Optional[Any] = None,
+    max_workers: Optional[int] = None,
+) -> List[Tuple[Optional[str], Optional[bytes]]]:
+    """
+    Read the text and images of several pages concurrently.
+
+    Args:
+        pages: (text URI, image URI) of each page; either may be None to skip it
+        target_width: Target image width in pixels
+        target_height: Target image height in pixels
+        max_workers: Maximum number of concurrent reads (default:
+            PAGE_FETCH_MAX_WORKERS)
+
+    Returns:
+        (text, image) of each page, in the order of the pages
+
+    Raises:
+        Exception: The first error encountered reading an asset
+    """
+    tasks = []
+    for text_uri, image_uri in pages:
+        tasks.extend(_page_tasks(text_uri, image_uri, target_width, target_height))
+    results = _Prefetch(tasks, max_workers).results()
+    return list(zip(results[0::2], results[1::2]))
+
+
+@dataclass
+class SectionPages:
+    """Page inputs of a section, in page order."""
+
+    page_ids: List[str]
+    texts: List[Optional[str]]
+    images: List[Optional[bytes]]
+    # Results of the page_loader passed to prefetch_section_pages, if any
+    extras: List[Any] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """Text of all pages, joined by line breaks."""
+        return "\n".join(text for text in self.texts if text is not None)
+
+
+class SectionPrefetch:
+    """Page inputs of a section being read in the background."""
+
+    def __init__(self, page_ids: List[str], prefetch: _Prefetch, has_extras: bool):
+        self.page_ids = page_ids
+        self._prefetch = prefetch
+        self._has_extras = has_extras
+        self._result: Optional[SectionPages] = None
+
+    def result(self) -> SectionPages:
+        """
+        Wait for the page inputs.
+
+        Returns:
+            SectionPages with the text, image and extra of each page in order
+
+        Raises:
+            Exception: The first error encountered reading a page
+        """
+        if self._result is None:
+            results = self._prefetch.results()
+            width = 3 if self._has_extras else 2
+            self._result = SectionPages(
+                page_ids=self.page_ids,
+                texts=results[0::width],
+                images=results[1::width],
+                extras=results[2::width] if self._has_extras else [],
+            )
+        return self._result
+
+    def cancel(self) -> None:
+        """Discard the reads that have not started, e.g. when the section is skipped."""
+        self._prefetch.cancel()
+
+
+def prefetch_section_pages(
+    document: Any,
+    page_ids: Sequence[str],
+    target_width: Optional[Any] = None,
+    target_height: Optional[Any] = None,
+    page_loader: Optional[Callable[[Any], Any]] = None,
+    max_workers: Optional[int] = None,
+) -> SectionPrefetch:
+    """
+    Start reading the page inputs of a section in the background.
+
+    The caller can prepare the rest of the request (configuration, extraction
+    results, prompt templates) while the pages are read, and call result()
+    when it needs them.
+
+    Pages missing from the document are logged and recorded in
+    document.errors, and left out of the result.
+
+    Args:
+        document: Document containing the pages
+        page_ids: IDs of the pages, in the order of the result
+        target_width: Target image width in pixels
+        target_height: Target image height in pixels
+        page_loader: Optional function reading additional input of a page (e.g. OCR
+            text confidence data), called with the Page on the same worker pool
+        max_workers: Maximum number of concurrent reads (default:
+            PAGE_FETCH_MAX_WORKERS)
+
+    Returns:
+        SectionPrefetch of the pages
+    """
+    present_page_ids = []
+    tasks = []
+    for page_id in page_ids:
+        page = document.pages.get(page_id)
+        if page is None:
+            error_msg = f"Page {page_id} not found in document"
+            logger.error(error_msg)
+            document.errors.append(error_msg)
+            continue
+        present_page_ids.append(page_id)
+        tasks.extend(
+            _page_tasks(
+                page.parsed_text_uri, page.image_uri, target_width, target_height
+            )
+        )
+        if page_loader is not None:
+            tasks.append((page_loader, (page,)))
+    return SectionPrefetch(
+        present_page_ids, _Prefetch(tasks, max_workers), page_loader is not None
+    )
+
+
+def load_section_pages(
+    document: Any,
+    page_ids: Sequence[str],
+    target_width: Optional[Any] = None,
+    target_height: Optional[Any] = None,
+    page_loader: Optional[Callable[[Any], Any]] = None,
+    max_workers: Optional[int] = None,
+) -> SectionPages:
+    """
+    Read the page inputs of a section concurrently; see prefetch_section_pages.
+
+    Returns:
+        SectionPages with the text, image and extra of each page in order
+    """
+    return prefetch_section_pages(
+        document, page_ids, target_width, target_height, page_loader, max_workers
+    ).result()
@@ -5,6 +5,13 @@
 Reporting module for saving document data to reporting storage.
 """
 
+from .compaction import BufferedParquetWriter, ParquetCompactor
 from .save_reporting_data import SaveReportingData
+from .schema_registry import SectionSchemaRegistry
 
-__all__ = ["SaveReportingData"]
+__all__ = [
+    "BufferedParquetWriter",
+    "ParquetCompactor",
+    "SaveReportingData",
+    "SectionSchemaRegistry",
+]
@@ -0,0 +1,614 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Compaction of small reporting Parquet files.
+
+SaveReportingData writes one small Parquet file per document (metering and
+evaluation metrics) or per section (document sections). Athena and Glue pay a
+per-object cost for every one of them, so this module provides:
+
+- ParquetCompactor, which rolls the small files of a date= partition into a
+  few large files with merged schemas and large row groups, then deletes the
+  originals. It is meant to run as a scheduled job over closed partitions.
+- BufferedParquetWriter, which accumulates records across documents and
+  writes one file per partition on flush, for callers that save many
+  documents in one process.
+
+SaveReportingData writes per-document files under deterministic keys, so
+reprocessing a document overwrites its earlier rows. Once those rows live in
+a merged file, a per-document file written after the merged file's input was
+read supersedes them instead. The compactor resolves this when it next runs
+over the partition: it drops the document's rows from every merged file that
+is older than the per-document file, so saving a document never rewrites
+merged files. Until then Athena sees both the old and the new rows.
+"""
+
+import datetime
+import io
+import logging
+import posixpath
+import uuid
+from typing import Any, Dict, Iterator, List, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from botocore.exceptions import ClientError
+
+from idp_common.clients import get_client
+
+logger = logging.getLogger(__name__)
+
+# Tables with a fixed location; document_sections has one table per section type
+DEFAULT_TABLE_PREFIXES = (
+    "metering/",
+    "evaluation_metrics/document_metrics/",
+    "evaluation_metrics/section_metrics/",
+    "evaluation_metrics/attribute_metrics/",
+)
+DOCUMENT_SECTIONS_PREFIX = "document_sections/"
+
+# Files smaller than this are compacted
+DEFAULT_SMALL_FILE_SIZE = 16 * 1024 * 1024
+# Approximate size of the input read into one compacted file
+DEFAULT_TARGET_FILE_SIZE = 128 * 1024 * 1024
+DEFAULT_ROW_GROUP_SIZE = 256 * 1024
+# Partitions with fewer small files than this are left alone
+DEFAULT_MIN_FILES = 2
+
+COMPACTED_FILE_PREFIX = "compacted-"
+BATCH_FILE_PREFIX = "batch-"
+# Files holding rows of many documents; all other files hold one document's rows
+MERGED_FILE_PREFIXES = (COMPACTED_FILE_PREFIX, BATCH_FILE_PREFIX)
+DOCUMENT_ID_COLUMN = "document_id"
+# Object metadata of compacted files: the last write time of the files they were read from
+AS_OF_METADATA_KEY = "compacted-through"
+
+# Attempts to rewrite a merged file that is concurrently being rewritten
+_REWRITE_ATTEMPTS = 5
+
+# S3 DeleteObjects accepts at most 1000 keys per request
+_DELETE_BATCH_SIZE = 1000
+
+
+def merge_tables(tables: List[pa.Table]) -> pa.Table:
+    """
+    Concatenate tables whose schemas may differ.
+
+    Missing columns are filled with nulls and compatible types are promoted.
+    Columns whose types cannot be reconciled (e.g. a timestamp in one file
+    and a string in another) are converted to strings, matching the
+    conservative string typing used for dynamic section schemas.
+
+    Args:
+        tables: Tables to concatenate
+
+    Returns:
+        Single table with the merged schema
+    """
+    if len(tables) == 1:
+        return tables[0]
+    try:
+        return pa.concat_tables(tables, promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        pass
+
+    types: Dict[str, set] = {}
+    for table in tables:
+        for field in table.schema:
+            types.setdefault(field.name, set()).add(field.type)
+    conflicting = {name for name, field_types in types.items() if len(field_types) > 1}
+    logger.info(
+        f"Converting columns with conflicting types to string: {sorted(conflicting)}"
+    )
+
+    converted = []
+    for table in tables:
+        for name in conflicting & set(table.column_names):
+            index = table.schema.get_field_index(name)
+            column = pc.cast(table.column(name), pa.string())
+            table = table.set_column(index, pa.field(name, pa.string()), column)
+        converted.append(table)
+    return pa.concat_tables(converted, promote_options="permissive")
+
+
+def is_merged_file(key: str) -> bool:
+    """Check whether a key is a compacted or batch file holding many documents."""
+    return posixpath.basename(key).startswith(MERGED_FILE_PREFIXES)
+
+
+def document_ids(table: pa.Table) -> set:
+    """Get the document IDs of a table's rows, if it has a document_id column."""
+    if DOCUMENT_ID_COLUMN not in table.column_names:
+        return set()
+    return set(pc.unique(table.column(DOCUMENT_ID_COLUMN)).to_pylist()) - {None}
+
+
+def drop_documents(table: pa.Table, ids: set) -> pa.Table:
+    """
+    Remove the rows of the given documents from a table.
+
+    Args:
+        table: Table with a document_id column
+        ids: Document IDs whose rows are removed
+
+    Returns:
+        Table without those rows (the table itself if none match)
+    """
+    if not ids or DOCUMENT_ID_COLUMN not in table.column_names:
+        return table
+    column = pc.cast(table.column(DOCUMENT_ID_COLUMN), pa.string())
+    keep = pc.invert(pc.is_in(column, value_set=pa.array(sorted(ids), pa.string())))
+    return table.filter(keep)
+
+
+def write_parquet_bytes(
+    table: pa.Table, row_group_size: int = DEFAULT_ROW_GROUP_SIZE
+) -> bytes:
+    """Serialize a table to Parquet with snappy compression."""
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, compression="snappy", row_group_size=row_group_size)
+    return buffer.getvalue()
+
+
+def _output_key(partition_prefix: str, file_prefix: str) -> str:
+    timestamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d_%H%M%S")
+    unique = uuid.uuid4().hex[:8]
+    return f"{partition_prefix}{file_prefix}{timestamp}_{unique}.parquet"
+
+
+def _newer_than(written: Dict[str, datetime.datetime], as_of: datetime.datetime) -> set:
+    """Get the documents written after the given time."""
+    return {document_id for document_id, time in written.items() if time > as_of}
+
+
+class ParquetCompactor:
+    """Rolls small Parquet files in reporting partitions into large files."""
+
+    def __init__(
+        self,
+        reporting_bucket: str,
+        small_file_size: int = DEFAULT_SMALL_FILE_SIZE,
+        target_file_size: int = DEFAULT_TARGET_FILE_SIZE,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        min_files: int = DEFAULT_MIN_FILES,
+        s3_client: Any = None,
+    ):
+        """
+        Initialize the compactor.
+
+        Args:
+            reporting_bucket: S3 bucket name for reporting data
+            small_file_size: Files smaller than this (bytes) are compacted
+            target_file_size: Approximate input size (bytes) per compacted file
+            row_group_size: Maximum rows per Parquet row group
+            min_files: Minimum number of small files for a partition to be compacted
+            s3_client: Optional S3 client
+        """
+        self.reporting_bucket = reporting_bucket
+        self.small_file_size = small_file_size
+        self.target_file_size = target_file_size
+        self.row_group_size = row_group_size
+        self.min_files = max(2, min_files)
+        self.s3_client = s3_client or get_client("s3")
+
+    def _list_objects(self, prefix: str) -> Iterator[Dict[str, Any]]:
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.reporting_bucket, Prefix=prefix):
+            yield from page.get("Contents", [])
+
+    def _list_subprefixes(self, prefix: str) -> List[str]:
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        subprefixes = []
+        for page in paginator.paginate(
+            Bucket=self.reporting_bucket, Prefix=prefix, Delimiter="/"
+        ):
+            subprefixes.extend(p["Prefix"] for p in page.get("CommonPrefixes", []))
+        return subprefixes
+
+    def table_prefixes(self) -> List[str]:
+        """
+        List the table prefixes in the reporting bucket.
+
+        Returns:
+            The fixed table prefixes followed by one prefix per document
+            section type
+        """
+        return list(DEFAULT_TABLE_PREFIXES) + self._list_subprefixes(
+            DOCUMENT_SECTIONS_PREFIX
+        )
+
+    def compact_date(self, date: str) -> Dict[str, Any]:
+        """
+        Compact the date= partition of every reporting table.
+
+        Args:
+            date: Partition date (YYYY-MM-DD)
+
+        Returns:
+            Summary with per-partition results and totals
+        """
+        partitions = []
+        for table_prefix in self.table_prefixes():
+            try:
+                partitions.append(self.compact_partition(f"{table_prefix}date={date}/"))
+            except Exception as e:
+                logger.error(f"Error compacting {table_prefix}date={date}/: {str(e)}")
+                partitions.append(
+                    {"partition": f"{table_prefix}date={date}/", "error": str(e)}
+                )
+
+        return {
+            "date": date,
+            "partitions": partitions,
+            "files_compacted": sum(p.get("files_compacted", 0) for p in partitions),
+            "files_written": sum(p.get("files_written", 0) for p in partitions),
+            "files_rewritten": sum(p.get("files_rewritten", 0) for p in partitions),
+            "errors": sum(1 for p in partitions if "error" in p),
+        }
+
+    def compact_partition(self, partition_prefix: str) -> Dict[str, Any]:
+        """
+        Compact the small files of one partition.
+
+        Each group of small files (up to target_file_size of input) is merged
+        into one file, which is written before the group's files are deleted,
+        so an interrupted run can leave duplicates but never lose rows.
+
+        Rows in merged files of documents that have a newer per-document file
+        in the partition are dropped, whether or not the merged file is small
+        enough to be compacted again: files outside the compacted groups are
+        rewritten without those rows.
+
+        Args:
+            partition_prefix: Partition prefix ending with '/',
+                e.g. 'metering/date=2025-01-31/'
+
+        Returns:
+            Summary of the files read and written
+        """
+        if not partition_prefix.endswith("/"):
+            partition_prefix += "/"
+
+        files = [
+            obj
+            for obj in self._list_objects(partition_prefix)
+            if obj["Key"].endswith(".parquet")
+            and "/" not in obj["Key"][len(partition_prefix) :]
+        ]
+        result = {
+            "partition": partition_prefix,
+            "files_compacted": 0,
+            "files_written": 0,
+            "files_rewritten": 0,
+            "rows": 0,
+        }
+        if not files:
+            return result
+
+        # Compacted files hold everything written up to the newest file listed here
+        as_of = max(obj["LastModified"] for obj in files)
+        merged = {
+            obj["Key"]: self._merged_as_of(obj)
+            for obj in files
+            if is_merged_file(obj["Key"])
+        }
+        superseded = self._superseded_documents(files, merged)
+
+        small_files = [obj for obj in files if obj["Size"] < self.small_file_size]
+        compacted = set()
+        if len(small_files) >= self.min_files:
+            for group in self._group_files(small_files):
+                if len(group) < 2:
+                    continue
+                key, rows = self._compact_group(
+                    partition_prefix, group, superseded, merged, as_of
+                )
+                compacted.update(obj["Key"] for obj in group)
+                result["files_compacted"] += len(group)
+                result["files_written"] += 1
+                result["rows"] += rows
+        else:
+            logger.debug(
+                f"Not compacting {partition_prefix}: {len(small_files)} small files"
+            )
+
+        for key, merged_as_of in merged.items():
+            ids = _newer_than(superseded, merged_as_of)
+            if key not in compacted and ids:
+                if self._remove_from_file(key, ids, merged_as_of):
+                    result["files_rewritten"] += 1
+
+        logger.info(
+            f"Compacted {result['files_compacted']} files into "
+            f"{result['files_written']} files and rewrote {result['files_rewritten']} "
+            f"files in s3://{self.reporting_bucket}/{partition_prefix}"
+        )
+        return result
+
+    def _merged_as_of(self, obj: Dict[str, Any]) -> datetime.datetime:
+        """Get the last write time of the files a merged file was read from."""
+        if posixpath.basename(obj["Key"]).startswith(COMPACTED_FILE_PREFIX):
+            response = self.s3_client.head_object(
+                Bucket=self.reporting_bucket, Key=obj["Key"]
+            )
+            as_of = response.get("Metadata", {}).get(AS_OF_METADATA_KEY)
+            if as_of:
+                return datetime.datetime.fromisoformat(as_of)
+        # Batch files are written straight from the buffered records
+        return obj["LastModified"]
+
+    def _superseded_documents(
+        self, files: List[Dict[str, Any]], merged: Dict[str, datetime.datetime]
+    ) -> Dict[str, datetime.datetime]:
+        """
+        Find the documents with a per-document file newer than some merged file.
+
+        Returns:
+            Last write time of each such document's per-document files
+        """
+        superseded: Dict[str, datetime.datetime] = {}
+        if not merged:
+            return superseded
+        oldest = min(merged.values())
+        for obj in files:
+            if is_merged_file(obj["Key"]) or obj["LastModified"] <= oldest:
+                continue
+            response = self.s3_client.get_object(
+                Bucket=self.reporting_bucket, Key=obj["Key"]
+            )
+            table = pq.read_table(io.BytesIO(response["Body"].read()))
+            for document_id in document_ids(table):
+                if obj["LastModified"] > superseded.get(document_id, oldest):
+                    superseded[document_id] = obj["LastModified"]
+        return superseded
+
+    def _group_files(
+        self, files: List[Dict[str, Any]]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Split files into consecutive groups of up to target_file_size bytes."""
+        group: List[Dict[str, Any]] = []
+        group_size = 0
+        for obj in sorted(files, key=lambda o: o["Key"]):
+            if group and group_size + obj["Size"] > self.target_file_size:
+                yield group
+                group, group_size = [], 0
+            group.append(obj)
+            group_size += obj["Size"]
+        if group:
+            yield group
+
+    def _compact_group(
+        self,
+        partition_prefix: str,
+        group: List[Dict[str, Any]],
+        superseded: Dict[str, datetime.datetime],
+        merged: Dict[str, datetime.datetime],
+        as_of: datetime.datetime,
+    ) -> Tuple[str, int]:
+        """
+        Merge a group of files into one file and delete the originals.
+
+        Only originals that are unchanged since they were read are deleted; a
+        file overwritten in the meantime (e.g. a reprocessed document) is kept
+        for the next run.
+
+        Rows in merged files of documents whose per-document files were
+        written later (e.g. by reprocessing) are dropped, since those files
+        replace them.
+        """
+        tables = []
+        etags = {}
+        for obj in group:
+            response = self.s3_client.get_object(
+                Bucket=self.reporting_bucket, Key=obj["Key"]
+            )
+            etags[obj["Key"]] = response["ETag"]
+            table = pq.read_table(io.BytesIO(response["Body"].read()))
+            if obj["Key"] in merged:
+                table = drop_documents(
+                    table, _newer_than(superseded, merged[obj["Key"]])
+                )
+            tables.append(table)
+        table = merge_tables(tables)
+        del tables
+
+        key = _output_key(partition_prefix, COMPACTED_FILE_PREFIX)
+        self.s3_client.put_object(
+            Bucket=self.reporting_bucket,
+            Key=key,
+            Body=write_parquet_bytes(table, self.row_group_size),
+            ContentType="application/octet-stream",
+            Metadata={AS_OF_METADATA_KEY: as_of.isoformat()},
+        )
+
+        keys = self._unchanged_keys(etags)
+        if len(keys) < len(group):
+            logger.info(
+                f"Keeping {len(group) - len(keys)} files of {partition_prefix} "
+                f"that changed while they were compacted"
+            )
+        for start in range(0, len(keys), _DELETE_BATCH_SIZE):
+            response = self.s3_client.delete_objects(
+                Bucket=self.reporting_bucket,
+                Delete={
+                    "Objects": [
+                        {"Key": k} for k in keys[start : start + _DELETE_BATCH_SIZE]
+                    ],
+                    "Quiet": True,
+                },
+            )
+            errors = response.get("Errors", [])
+            if errors:
+                raise RuntimeError(
+                    f"Failed to delete {len(errors)} compacted files from "
+                    f"{partition_prefix}, e.g. {errors[0].get('Key')}: {errors[0].get('Message')}"
+                )
+
+        logger.info(
+            f"Wrote {table.num_rows} rows from {len(group)} files to "
+            f"s3://{self.reporting_bucket}/{key}"
+        )
+        return key, table.num_rows
+
+    def _unchanged_keys(self, etags: Dict[str, str]) -> List[str]:
+        """Get the keys whose objects still have the ETag they were read with."""
+        keys = []
+        for key, etag in etags.items():
+            try:
+                response = self.s3_client.head_object(
+                    Bucket=self.reporting_bucket, Key=key
+                )
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                    continue
+                raise
+            if response["ETag"] == etag:
+                keys.append(key)
+        return keys
+
+    def _remove_from_file(self, key: str, ids: set, as_of: datetime.datetime) -> int:
+        """
+        Rewrite a merged file without the rows of the given documents.
+
+        The file is rewritten with a conditional put, so rows added by a
+        concurrent writer are not lost, and keeps its as-of time so later
+        runs still compare it with the per-document files it predates.
+        """
+        for _ in range(_REWRITE_ATTEMPTS):
+            response = self.s3_client.get_object(Bucket=self.reporting_bucket, Key=key)
+            table = pq.read_table(io.BytesIO(response["Body"].read()))
+            remaining = drop_documents(table, ids)
+            removed = table.num_rows - remaining.num_rows
+            if removed == 0:
+                return 0
+
+            try:
+                if remaining.num_rows:
+                    self.s3_client.put_object(
+                        Bucket=self.reporting_bucket,
+                        Key=key,
+                        Body=write_parquet_bytes(remaining, self.row_group_size),
+                        ContentType="application/octet-stream",
+                        Metadata={AS_OF_METADATA_KEY: as_of.isoformat()},
+                        IfMatch=response["ETag"],
+                    )
+                else:
+                    # Only these documents' rows were left in the file
+                    self.s3_client.delete_object(Bucket=self.reporting_bucket, Key=key)
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") in (
+                    "PreconditionFailed",
+                    "ConditionalRequestConflict",
+                ):
+                    logger.info(f"{key} changed while removing rows, retrying")
+                    continue
+                raise
+
+            logger.info(
+                f"Removed {removed} superseded rows of {sorted(ids)} from "
+                f"s3://{self.reporting_bucket}/{key}"
+            )
+            return removed
+
+        raise RuntimeError(
+            f"Failed to remove rows from s3://{self.reporting_bucket}/{key}: "
+            f"the file kept changing"
+        )
+
+
+class BufferedParquetWriter:
+    """
+    Accumulates reporting records across documents and writes one file per partition.
+
+    Records are grouped by the directory of the key they would have been
+    written to, so buffered data lands in the same table and partition.
+    Because the per-document file names are not used, saving a document
+    twice adds its rows twice instead of overwriting the earlier file.
+    """
+
+    def __init__(
+        self,
+        reporting_bucket: str,
+        max_buffered_rows: int = 100000,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        s3_client: Any = None,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            reporting_bucket: S3 bucket name for reporting data
+            max_buffered_rows: Rows held across all partitions before add()
+                flushes automatically
+            row_group_size: Maximum rows per Parquet row group
+            s3_client: Optional S3 client
+        """
+        self.reporting_bucket = reporting_bucket
+        self.max_buffered_rows = max_buffered_rows
+        self.row_group_size = row_group_size
+        self.s3_client = s3_client or get_client("s3")
+        self._buffers: Dict[str, List[pa.Table]] = {}
+        self._buffered_rows = 0
+
+    @property
+    def buffered_rows(self) -> int:
+        """Number of rows waiting to be written."""
+        return self._buffered_rows
+
+    def add(self, records: List[Dict], s3_key: str, schema: pa.Schema) -> None:
+        """
+        Buffer records that would otherwise be written to s3_key.
+
+        Args:
+            records: List of dictionaries to save
+            s3_key: S3 key the records belong to; its directory selects the partition
+            schema: PyArrow schema for the records
+        """
+        if not records:
+            return
+        self.add_table(pa.Table.from_pylist(records, schema=schema), s3_key)
+
+    def add_table(self, table: pa.Table, s3_key: str) -> None:
+        """
+        Buffer a table that would otherwise be written to s3_key.
+
+        Args:
+            table: Table to save
+            s3_key: S3 key the table belongs to; its directory selects the partition
+        """
+        if table.num_rows == 0:
+            return
+        partition_prefix = posixpath.dirname(s3_key) + "/"
+        self._buffers.setdefault(partition_prefix, []).append(table)
+        self._buffered_rows += table.num_rows
+        if self._buffered_rows >= self.max_buffered_rows:
+            self.flush()
+
+    def flush(self) -> List[str]:
+        """
+        Write all buffered records, one file per partition.
+
+        Returns:
+            S3 keys of the files written
+        """
+        keys = []
+        for partition_prefix, tables in list(self._buffers.items()):
+            table = merge_tables(tables)
+            key = _output_key(partition_prefix, BATCH_FILE_PREFIX)
+            self.s3_client.put_object(
+                Bucket=self.reporting_bucket,
+                Key=key,
+                Body=write_parquet_bytes(table, self.row_group_size),
+                ContentType="application/octet-stream",
+            )
+            # Only drop the records once they are written, so a failed flush can be retried
+            del self._buffers[partition_prefix]
+            self._buffered_rows -= table.num_rows
+            logger.info(
+                f"Saved {table.num_rows} buffered records as Parquet to "
+                f"s3://{self.reporting_bucket}/{key}"
+            )
+            keys.append(key)
+        return keys
@@ -18,6 +18,11 @@ import pyarrow as pa
 import pyarrow.parquet as pq
 
 from idp_common.models import Document
+from idp_common.reporting.compaction import BufferedParquetWriter
+from idp_common.reporting.schema_registry import (
+    SectionSchemaRegistry,
+    get_schema_registry,
+)
 from idp_common.s3 import get_json_content
 
 # Configure logging
@@ -32,15 +37,42 @@ class SaveReportingData:
     to a reporting bucket in Parquet format for analytics.
     """
 
-    def __init__(self, reporting_bucket: str):
+    def __init__(
+        self,
+        reporting_bucket: str,
+        buffered_writer: Optional[BufferedParquetWriter] = None,
+        config_version: Optional[str] = None,
+        schema_registry: Optional[SectionSchemaRegistry] = None,
+    ):
         """
         Initialize the SaveReportingData class.
 
         Args:
             reporting_bucket: S3 bucket name for reporting data
+            buffered_writer: Optional writer that accumulates records across
+                documents instead of writing one file per document or section.
+                Call flush() once all documents are saved.
+            config_version: Optional configuration version; section schemas are
+                learned separately per section class and config version
+            schema_registry: Optional schema registry (defaults to the
+                process-wide registry, which persists across warm invocations)
         """
         self.reporting_bucket = reporting_bucket
         self.s3_client = boto3.client("s3")
+        self.buffered_writer = buffered_writer
+        self.config_version = config_version
+        self.schema_registry = schema_registry or get_schema_registry()
+
+    def flush(self) -> List[str]:
+        """
+        Write records held by the buffered writer, if any.
+
+        Returns:
+            S3 keys of the files written
+        """
+        if self.buffered_writer is None:
+            return []
+        return self.buffered_writer.flush()
 
     def _serialize_value(self, value: Any) -> str:
         """
@@ -81,8 +113,25 @@ class SaveReportingData:
             logger.warning("No records to save")
             return
 
+        if self.buffered_writer is not None:
+            self.buffered_writer.add(records, s3_key, schema)
+            return
+
         # Create PyArrow table from records with explicit schema
         table = pa.Table.from_pylist(records, schema=schema)
+        self._save_table_as_parquet(table, s3_key)
+
+    def _save_table_as_parquet(self, table: pa.Table, s3_key: str) -> None:
+        """
+        Save a PyArrow table as a Parquet file to S3.
+
+        Args:
+            table: Table to save
+            s3_key: S3 key path
+        """
+        if self.buffered_writer is not None:
+            self.buffered_writer.add_table(table, s3_key)
+            return
 
         # Create in-memory buffer
         buffer = io.BytesIO()
@@ -99,7 +148,7 @@ class SaveReportingData:
             ContentType="application/octet-stream",
         )
         logger.info(
-            f"Saved {len(records)} records as Parquet to s3://{self.reporting_bucket}/{s3_key}"
+            f"Saved {table.num_rows} records as Parquet to s3://{self.reporting_bucket}/{s3_key}"
         )
 
     def _parse_s3_uri(self, uri: str) -> tuple:
@@ -206,104 +255,92 @@ class SaveReportingData:
 
         return flattened
 
-    def _create_dynamic_schema(self, records: List[Dict[str, Any]]) -> pa.Schema:
-        """
-        Create a PyArrow schema dynamically from a list of records.
-        Uses conservative typing - all fields default to string unless whitelisted.
-        This prevents Athena type compatibility issues.
-
-        Args:
-            records: List of dictionaries to analyze
-
-        Returns:
-            PyArrow schema with conservative string typing
+    def _to_timestamp(self, value: Any) -> Optional[datetime.datetime]:
+        """Convert a value for a timestamp column, or None if it cannot be parsed."""
+        if isinstance(value, datetime.datetime):
+            return value
+        if isinstance(value, str):
+            try:
+                return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+            except ValueError:
+                return None
+        return None
+
+    def _build_section_table(
+        self,
+        rows: List[Dict[str, Any]],
+        section_values: Dict[str, Any],
+        section_class: str,
+    ) -> pa.Table:
         """
-        # Define fields that should maintain specific types
-        TIMESTAMP_FIELDS = {
-            "timestamp",
-            "evaluation_date",
-        }
+        Convert flattened section records into a PyArrow table in one pass.
 
-        if not records:
-            # Return a minimal schema with just section_id
-            return pa.schema([("section_id", pa.string())])
-
-        # Collect all unique field names
-        all_fields = set()
-        for record in records:
-            all_fields.update(record.keys())
-
-        # Create schema with conservative typing
-        schema_fields = []
-        for field_name in sorted(all_fields):  # Sort for consistent ordering
-            if field_name in TIMESTAMP_FIELDS:
-                # Keep timestamps as timestamps for proper time-based queries
-                pa_type = pa.timestamp("ms")
-            else:
-                # Default everything else to string to prevent type conflicts
-                pa_type = pa.string()
-
-            schema_fields.append((field_name, pa_type))
-
-        return pa.schema(schema_fields)
-
-    def _sanitize_records_for_schema(
-        self, records: List[Dict[str, Any]], schema: pa.Schema
-    ) -> List[Dict[str, Any]]:
-        """
-        Sanitize records to ensure they conform to the schema and handle type compatibility issues.
+        Values are appended straight into per-column lists and converted to
+        Arrow arrays column by column, instead of building sanitized record
+        dicts for pa.Table.from_pylist. The schema comes from the schema
+        registry, so it is only rebuilt when new columns appear; columns
+        learned from earlier documents of the same class are filled with nulls.
 
         Args:
-            records: List of record dictionaries
-            schema: PyArrow schema to conform to
+            rows: Flattened records (values already converted to strings)
+            section_values: Values that are the same for every row (section
+                metadata); they take precedence over record values
+            section_class: Section classification used as schema key
 
         Returns:
-            List of sanitized records
+            PyArrow table conforming to the registry schema
         """
-        sanitized_records = []
-
-        for record in records:
-            sanitized_record = {}
-
-            # Process each field in the schema
-            for field in schema:
-                field_name = field.name
-                value = record.get(field_name)
-
-                if value is None:
-                    sanitized_record[field_name] = None
-                elif field.type == pa.string():
-                    # Convert all values to strings for string fields
-                    sanitized_record[field_name] = self._convert_value_to_string(value)
-                elif field.type == pa.timestamp("ms"):
-                    # Handle timestamp fields
-                    if isinstance(value, datetime.datetime):
-                        sanitized_record[field_name] = value
-                    else:
-                        # Try to parse string timestamps
-                        try:
-                            if isinstance(value, str):
-                                sanitized_record[field_name] = (
-                                    datetime.datetime.fromisoformat(
-                                        value.replace("Z", "+00:00")
-                                    )
-                                )
-                            else:
-                                sanitized_record[field_name] = None
-                        except (ValueError, TypeError):
-                            sanitized_record[field_name] = None
+        num_rows = len(rows)
+        columns: Dict[str, List[Any]] = {}
+        for index, row in enumerate(rows):
+            for name, value in row.items():
+                column = columns.get(name)
+                if column is None:
+                    column = columns[name] = []
+                if len(column) < index:
+                    column.extend([None] * (index - len(column)))
+                column.append(value)
+
+        schema = self.schema_registry.resolve(
+            (section_class, self.config_version),
+            list(columns.keys()) + list(section_values.keys()),
+        )
+
+        arrays = []
+        for field in schema:
+            name = field.name
+            if name in section_values:
+                value = section_values[name]
+                if field.type == pa.string():
+                    value = self._convert_value_to_string(value)
                 else:
-                    # For any other types, convert to string as fallback
-                    sanitized_record[field_name] = self._convert_value_to_string(value)
+                    value = self._to_timestamp(value)
+                arrays.append(pa.array([value] * num_rows, type=field.type))
+                continue
 
-            # Add any fields from the record that aren't in the schema (shouldn't happen with dynamic schema)
-            for field_name, value in record.items():
-                if field_name not in sanitized_record:
-                    sanitized_record[field_name] = self._convert_value_to_string(value)
+            column = columns.get(name)
+            if column is None:
+                arrays.append(pa.nulls(num_rows, type=field.type))
+                continue
+            if len(column) < num_rows:
+                column.extend([None] * (num_rows - len(column)))
 
-            sanitized_records.append(sanitized_record)
+            if field.type == pa.string():
+                try:
+                    arrays.append(pa.array(column, type=pa.string()))
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    arrays.append(
+                        pa.array(
+                            [self._convert_value_to_string(v) for v in column],
+                            type=pa.string(),
+                        )
+                    )
+            else:
+                arrays.append(
+                    pa.array([self._to_timestamp(v) for v in column], type=field.type)
+                )
 
-        return sanitized_records
+        return pa.Table.from_arrays(arrays, schema=schema)
 
     def save(self, document: Document, data_to_save: List[str]) -> List[Dict[str, Any]]:
         """
@@ -781,21 +818,19 @@ class SaveReportingData:
                     continue
 
                 # Prepare records for this section
-                section_records = []
+                section_values = {
+                    "section_id": section.section_id,
+                    "document_id": document_id,
+                    "section_classification": section.classification,
+                    "section_confidence": section.confidence,
+                }
+                rows = []
 
                 # Handle different data structures
                 if isinstance(extraction_data, dict):
                     # Flatten the JSON data
-                    flattened_data = self._flatten_json_data(extraction_data)
-
-                    # Add section metadata
-                    flattened_data["section_id"] = section.section_id
-                    flattened_data["document_id"] = document_id
-                    flattened_data["section_classification"] = section.classification
-                    flattened_data["section_confidence"] = section.confidence
-                    flattened_data["timestamp"] = timestamp
-
-                    section_records.append(flattened_data)
+                    rows.append(self._flatten_json_data(extraction_data))
+                    section_values["timestamp"] = timestamp
 
                 elif isinstance(extraction_data, list):
                     # Handle list of records
@@ -805,39 +840,22 @@ class SaveReportingData:
                         else:
                             flattened_item = {"value": str(item)}
 
-                        # Add section metadata and record index
-                        flattened_item["section_id"] = section.section_id
-                        flattened_item["document_id"] = document_id
-                        flattened_item["section_classification"] = (
-                            section.classification
-                        )
-                        flattened_item["section_confidence"] = section.confidence
-                        flattened_item["record_index"] = i
-
-                        section_records.append(flattened_item)
+                        # Add record index
+                        flattened_item["record_index"] = str(i)
+                        rows.append(flattened_item)
                 else:
                     # Handle primitive types
-                    record = {
-                        "section_id": section.section_id,
-                        "document_id": document_id,
-                        "section_classification": section.classification,
-                        "section_confidence": section.confidence,
-                        "value": str(extraction_data),
-                    }
-                    section_records.append(record)
-
-                if not section_records:
+                    rows.append({"value": str(extraction_data)})
+
+                if not rows:
                     logger.warning(
                         f"No records to save for section {section.section_id}"
                     )
                     continue
 
-                # Create dynamic schema for this section's data
-                schema = self._create_dynamic_schema(section_records)
-
-                # Sanitize all records to ensure robust type compatibility
-                section_records = self._sanitize_records_for_schema(
-                    section_records, schema
+                # Convert to a table using the schema learned for this section class
+                table = self._build_section_table(
+                    rows, section_values, section.classification or "unknown"
                 )
 
                 # Create S3 key with separate tables for each section type
@@ -856,13 +874,13 @@ class SaveReportingData:
                 )
 
                 # Save the section data as Parquet
-                self._save_records_as_parquet(section_records, s3_key, schema)
+                self._save_table_as_parquet(table, s3_key)
 
                 sections_processed += 1
-                total_records_saved += len(section_records)
+                total_records_saved += table.num_rows
 
                 logger.info(
-                    f"Saved {len(section_records)} records for section {section.section_id} "
+                    f"Saved {table.num_rows} records for section {section.section_id} "
                     f"to s3://{self.reporting_bucket}/{s3_key}"
                 )
 
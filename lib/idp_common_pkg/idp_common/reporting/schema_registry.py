@@ -0,0 +1,125 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Registry of learned Parquet schemas for document section reporting tables.
+
+Section extraction results have no predefined schema, so the columns of each
+section type are learned from the data. The registry keeps the schema learned
+for each (section class, config version) for the lifetime of the process
+(e.g. across warm Lambda invocations), so the schema is only rebuilt when a
+record introduces new columns. Schemas only ever widen: new columns are added
+and existing columns keep their type, which also keeps the files of a table
+consistent for compaction and the Glue crawler.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Hashable, Iterable, Optional
+
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+# Fields that keep a timestamp type; everything else is stored as string to
+# prevent Athena type conflicts between files
+TIMESTAMP_FIELDS = frozenset({"timestamp", "evaluation_date"})
+
+DEFAULT_MAX_SCHEMAS = 256
+
+
+def field_type(name: str) -> pa.DataType:
+    """Get the PyArrow type used for a dynamic section column."""
+    return pa.timestamp("ms") if name in TIMESTAMP_FIELDS else pa.string()
+
+
+class SectionSchemaRegistry:
+    """Thread-safe LRU cache of learned section schemas."""
+
+    def __init__(self, max_schemas: int = DEFAULT_MAX_SCHEMAS):
+        """
+        Initialize the registry.
+
+        Args:
+            max_schemas: Maximum number of schemas kept; the least recently
+                used schema is dropped beyond this
+        """
+        self.max_schemas = max(1, max_schemas)
+        self._schemas: "OrderedDict[Hashable, pa.Schema]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[pa.Schema]:
+        """Get the schema learned for a key, if any."""
+        with self._lock:
+            schema = self._schemas.get(key)
+            if schema is not None:
+                self._schemas.move_to_end(key)
+            return schema
+
+    def resolve(self, key: Hashable, field_names: Iterable[str]) -> pa.Schema:
+        """
+        Get the schema for a key, widened to include the given fields.
+
+        Args:
+            key: Schema key, typically (section class, config version)
+            field_names: Names of the columns present in the data
+
+        Returns:
+            Schema with the learned columns plus any new ones, sorted by name
+        """
+        with self._lock:
+            schema = self._schemas.get(key)
+            if schema is not None:
+                self._schemas.move_to_end(key)
+                names = set(field_names)
+                if names.issubset(schema.names):
+                    self.hits += 1
+                    return schema
+                names.update(schema.names)
+            else:
+                names = set(field_names)
+
+            self.misses += 1
+            if not names:
+                # Keep the minimal schema used for empty sections
+                names = {"section_id"}
+            widened = pa.schema([(name, field_type(name)) for name in sorted(names)])
+            if schema is not None:
+                logger.debug(
+                    f"Widened schema for {key}: {len(schema)} -> {len(widened)} columns"
+                )
+            self._schemas[key] = widened
+            while len(self._schemas) > self.max_schemas:
+                self._schemas.popitem(last=False)
+            return widened
+
+    def clear(self) -> None:
+        """Discard all learned schemas."""
+        with self._lock:
+            self._schemas.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_registry: Optional[SectionSchemaRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_schema_registry() -> SectionSchemaRegistry:
+    """Get the process-wide section schema registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = SectionSchemaRegistry()
+    return _registry
+
+
+def reset_schema_registry() -> None:
+    """Discard the process-wide registry (mainly for tests)."""
+    global _registry
+    with _registry_lock:
+        _registry = None
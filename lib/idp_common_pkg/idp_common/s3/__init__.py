@@ -1,29 +1,23 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 
-import boto3
 import json
 import logging
 import os
 from typing import Dict, Any, Optional, Union, List
+from ..clients import get_client
 from ..utils import parse_s3_uri
 
 logger = logging.getLogger(__name__)
 
-# Initialize clients
-_s3_client = None
-
 def get_s3_client():
     """
-    Get or initialize the S3 client
+    Get the shared S3 client
     
     Returns:
         boto3 S3 client
     """
-    global _s3_client
-    if _s3_client is None:
-        _s3_client = boto3.client('s3')
-    return _s3_client
+    return get_client('s3')
 
 def get_text_content(s3_uri: str) -> str:
     """
@@ -39,23 +33,34 @@ def get_text_content(s3_uri: str) -> str:
         bucket, key = parse_s3_uri(s3_uri)
         s3 = get_s3_client()
         response = s3.get_object(Bucket=bucket, Key=key)
-        content_str = response['Body'].read().decode('utf-8')
-        
-        # Check if the content is JSON or plain text
-        if s3_uri.endswith('.json'):
-            try:
-                content = json.loads(content_str)
-                return content.get('text', content_str)
-            except json.JSONDecodeError:
-                logger.warning(f"File has .json extension but content is not valid JSON: {s3_uri}")
-                return content_str
-        else:
-            # For non-JSON files (like .md), return the content directly
-            return content_str
+        return parse_text_content(s3_uri, response['Body'].read().decode('utf-8'))
     except Exception as e:
         logger.error(f"Error reading text from {s3_uri}: {e}")
         raise
 
+def parse_text_content(s3_uri: str, content_str: str) -> str:
+    """
+    Get the text of an object read from an S3 URI
+    
+    Args:
+        s3_uri: The S3 URI the content was read from
+        content_str: The decoded object content
+        
+    Returns:
+        The 'text' field of JSON objects, or the content of other objects
+    """
+    # Check if the content is JSON or plain text
+    if s3_uri.endswith('.json'):
+        try:
+            content = json.loads(content_str)
+            return content.get('text', content_str)
+        except json.JSONDecodeError:
+            logger.warning(f"File has .json extension but content is not valid JSON: {s3_uri}")
+            return content_str
+    else:
+        # For non-JSON files (like .md), return the content directly
+        return content_str
+
 def get_json_content(s3_uri: str) -> Dict[str, Any]:
     """
     Read JSON content from an S3 URI
@@ -96,7 +101,8 @@ def get_binary_content(s3_uri: str) -> bytes:
 
 def write_content(content: Union[str, bytes, Dict[str, Any], List[Any]], 
                  bucket: str, key: str, 
-                 content_type: Optional[str] = None) -> None:
+                 content_type: Optional[str] = None,
+                 s3_client: Optional[Any] = None) -> None:
     """
     Write content to S3
     
@@ -105,9 +111,10 @@ def write_content(content: Union[str, bytes, Dict[str, Any], List[Any]],
         bucket: The S3 bucket
         key: The S3 key
         content_type: Optional content type for the S3 object
+        s3_client: Optional S3 client to use instead of the shared client
     """
     try:
-        s3 = get_s3_client()
+        s3 = s3_client or get_s3_client()
         
         # Handle different content types
         if isinstance(content, (dict, list)):
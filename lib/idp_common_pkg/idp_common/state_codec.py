@@ -0,0 +1,197 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Encoding of the document state written to S3 between workflow steps.
+
+Document.compress stores the full document in the working bucket after every
+step, and the next step reads it back. The state is written as compact JSON
+wrapped in a versioned envelope and compressed:
+
+    {"format_version": 1, "document": {...}}
+
+Deltas written by idp_common.state_store use the same encoding with a
+"delta" envelope.
+
+- gzip (default) is in the standard library, so every Lambda can read it.
+- zstd compresses faster and smaller; it is used when DOCUMENT_STATE_CODEC is
+  'zstd' and requires the optional zstandard package (pip install
+  'idp_common[zstd]') in every function that reads the state.
+- 'json' writes the envelope uncompressed.
+
+The codec is detected from the leading bytes on read, and state written as a
+plain JSON document by earlier versions is still read as before.
+"""
+
+import gzip
+import json
+import logging
+import os
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+STATE_FORMAT_VERSION = 1
+
+# Envelope keys of full documents and of deltas
+KIND_DOCUMENT = "document"
+KIND_DELTA = "delta"
+
+CODEC_GZIP = "gzip"
+CODEC_ZSTD = "zstd"
+CODEC_JSON = "json"
+CODECS = (CODEC_GZIP, CODEC_ZSTD, CODEC_JSON)
+DEFAULT_CODEC = CODEC_GZIP
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# S3 key suffix of each codec
+FILE_EXTENSIONS = {
+    CODEC_GZIP: ".json.gz",
+    CODEC_ZSTD: ".json.zst",
+    CODEC_JSON: ".json",
+}
+
+
+def default_codec() -> str:
+    """Get the state codec from the DOCUMENT_STATE_CODEC environment variable."""
+    codec = os.environ.get("DOCUMENT_STATE_CODEC", DEFAULT_CODEC).lower()
+    if codec not in CODECS:
+        logger.warning(f"Unknown document state codec '{codec}', using {DEFAULT_CODEC}")
+        return DEFAULT_CODEC
+    if codec == CODEC_ZSTD and not ZSTD_AVAILABLE:
+        logger.warning("zstandard is not installed, using gzip for document state")
+        return CODEC_GZIP
+    return codec
+
+
+def dumps_document(document_dict: Dict[str, Any]) -> bytes:
+    """
+    Serialize a document dictionary to compact JSON.
+
+    Args:
+        document_dict: Document.to_dict() output
+
+    Returns:
+        UTF-8 encoded JSON without insignificant whitespace
+    """
+    return json.dumps(document_dict, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def encode_state(
+    document_json: bytes, codec: Optional[str] = None, kind: str = KIND_DOCUMENT
+) -> Tuple[bytes, str]:
+    """
+    Encode serialized document JSON as versioned state.
+
+    Args:
+        document_json: Output of dumps_document()
+        codec: 'gzip', 'zstd' or 'json' (default: default_codec())
+        kind: Envelope key, 'document' or 'delta'
+
+    Returns:
+        Tuple of (encoded state, codec used)
+    """
+    codec = codec or default_codec()
+    # The envelope is assembled around the serialized document, so the
+    # document is serialized only once
+    envelope = (
+        b'{"format_version":'
+        + str(STATE_FORMAT_VERSION).encode("ascii")
+        + b',"'
+        + kind.encode("ascii")
+        + b'":'
+        + document_json
+        + b"}"
+    )
+    if codec == CODEC_GZIP:
+        # mtime=0 makes the output deterministic
+        return gzip.compress(envelope, compresslevel=GZIP_LEVEL, mtime=0), codec
+    if codec == CODEC_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise ImportError("zstandard is required for zstd document state")
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(envelope), codec
+    if codec == CODEC_JSON:
+        return envelope, codec
+    raise ValueError(f"Unsupported document state codec: {codec}")
+
+
+def detect_codec(data: bytes) -> str:
+    """Detect the codec of encoded state from its leading bytes."""
+    if data.startswith(_GZIP_MAGIC):
+        return CODEC_GZIP
+    if data.startswith(_ZSTD_MAGIC):
+        return CODEC_ZSTD
+    return CODEC_JSON
+
+
+def decode_envelope(data: bytes) -> Tuple[str, Dict[str, Any]]:
+    """
+    Decode stored state of either kind.
+
+    Args:
+        data: Stored state
+
+    Returns:
+        Tuple of (kind, payload): ('document', document dictionary) for full
+        documents, including plain document JSON written by earlier versions,
+        or ('delta', delta)
+
+    Raises:
+        ValueError: If the state was written with a newer format version
+        ImportError: If the state is zstd compressed and zstandard is not installed
+    """
+    codec = detect_codec(data)
+    if codec == CODEC_GZIP:
+        data = gzip.decompress(data)
+    elif codec == CODEC_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise ImportError("zstandard is required to read zstd document state")
+        data = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+    state = json.loads(data)
+    if isinstance(state, dict) and "format_version" in state:
+        for kind in (KIND_DOCUMENT, KIND_DELTA):
+            if kind in state:
+                version = state["format_version"]
+                if not isinstance(version, int) or version > STATE_FORMAT_VERSION:
+                    raise ValueError(
+                        f"Unsupported document state format version: {version}"
+                    )
+                return kind, state[kind]
+    # Plain document JSON written by earlier versions
+    return KIND_DOCUMENT, state
+
+
+def decode_state(data: bytes, kind: str = KIND_DOCUMENT) -> Dict[str, Any]:
+    """
+    Decode document state written by encode_state or as plain document JSON.
+
+    Args:
+        data: Stored state
+        kind: Expected kind, 'document' or 'delta'
+
+    Returns:
+        Document dictionary for Document.from_dict(), or the delta
+
+    Raises:
+        ValueError: If the state was written with a newer format version, or
+            is not of the expected kind
+        ImportError: If the state is zstd compressed and zstandard is not installed
+    """
+    state_kind, payload = decode_envelope(data)
+    if state_kind != kind:
+        raise ValueError(f"Expected {kind} state but found {state_kind}")
+    return payload
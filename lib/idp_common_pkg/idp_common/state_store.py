@@ -0,0 +1,467 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Snapshot and delta storage of the document state between workflow steps.
+
+Every step passes the document to the next step through the working bucket.
+Writing a full copy at every step makes storage grow with steps x document
+size, although most steps change only a few fields or a single section. The
+state store writes:
+
+- A base snapshot of the full document, e.g. by OCR, which has no stored
+  state to build on.
+- For documents loaded from a stored state, a delta with only the top-level
+  fields, pages and sections that changed since the state was loaded.
+
+Each delta records its base snapshot and the deltas before it, and the
+'s3_uri' of the lightweight wrapper returned to Step Functions is the newest
+snapshot or delta, so the wrapper keeps its format. Loading reads the base
+and applies the deltas in order. A Map iteration over sections therefore
+reads the base plus the deltas of the steps before it and writes only its own
+section delta. Snapshots and deltas are never overwritten, so they are cached
+in-process and a step that loads the results of many Map iterations reads the
+shared base once.
+
+A new snapshot is written instead of a delta (compaction) when the chain
+reaches DOCUMENT_STATE_MAX_DELTAS deltas, when the delta is not much
+smaller than the document, or when the base snapshot is older than
+DOCUMENT_STATE_MAX_BASE_AGE_SECONDS. The working bucket expires objects by
+age, so the age limit keeps every delta within that time of its base and a
+state stays loadable about as long as a full snapshot written at the same
+step would. Set DOCUMENT_STATE_DELTAS to 'false' to always write snapshots.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from idp_common.clients import get_client
+from idp_common.models import Document, _fingerprint
+from idp_common.state_codec import (
+    FILE_EXTENSIONS,
+    KIND_DELTA,
+    KIND_DOCUMENT,
+    decode_envelope,
+    decode_state,
+    dumps_document,
+    encode_state,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_DELTAS = 8
+DEFAULT_MAX_BASE_AGE_SECONDS = 3600
+# A delta larger than this fraction of the document is written as a snapshot
+MAX_DELTA_RATIO = 0.5
+# Size of the in-process cache of stored snapshots and deltas
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def state_deltas_enabled() -> bool:
+    """Check the DOCUMENT_STATE_DELTAS environment variable (default: true)."""
+    return os.environ.get("DOCUMENT_STATE_DELTAS", "true").lower() != "false"
+
+
+def default_max_deltas() -> int:
+    """Get the maximum length of a delta chain from DOCUMENT_STATE_MAX_DELTAS."""
+    try:
+        max_deltas = int(
+            os.environ.get("DOCUMENT_STATE_MAX_DELTAS", DEFAULT_MAX_DELTAS)
+        )
+    except ValueError:
+        return DEFAULT_MAX_DELTAS
+    return max(0, max_deltas)
+
+
+def default_max_base_age() -> float:
+    """Get the maximum age of a base snapshot from DOCUMENT_STATE_MAX_BASE_AGE_SECONDS."""
+    try:
+        max_age = float(
+            os.environ.get(
+                "DOCUMENT_STATE_MAX_BASE_AGE_SECONDS", DEFAULT_MAX_BASE_AGE_SECONDS
+            )
+        )
+    except ValueError:
+        return DEFAULT_MAX_BASE_AGE_SECONDS
+    return max(0.0, max_age)
+
+
+def _state_timestamp(uri: str) -> Optional[int]:
+    """Get the write time in milliseconds from a stored state's key, if present."""
+    name = urlparse(uri).path.rsplit("/", 1)[-1]
+    timestamp = name.split("_", 1)[0]
+    return int(timestamp) if timestamp.isdigit() else None
+
+
+def state_fingerprints(document_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fingerprint the top-level fields, pages and sections of a document.
+
+    Args:
+        document_dict: Document.to_dict() output
+
+    Returns:
+        Fingerprints used by compute_delta to find the parts that changed
+    """
+    sections = document_dict.get("sections", [])
+    return {
+        "fields": {
+            name: _fingerprint(value)
+            for name, value in document_dict.items()
+            if name not in ("pages", "sections")
+        },
+        "pages": {
+            page_id: _fingerprint(page)
+            for page_id, page in document_dict.get("pages", {}).items()
+        },
+        "page_ids": list(document_dict.get("pages", {})),
+        "sections": {
+            section.get("section_id"): _fingerprint(section) for section in sections
+        },
+        "section_ids": [section.get("section_id") for section in sections],
+    }
+
+
+def compute_delta(
+    fingerprints: Dict[str, Any], document_dict: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Compute the changes of a document since it had the given fingerprints.
+
+    Args:
+        fingerprints: state_fingerprints() of the loaded state
+        document_dict: Document.to_dict() output of the current document
+
+    Returns:
+        Delta with the changed top-level fields, the names of removed fields,
+        the changed or added pages and sections, and the page and section IDs
+        if pages or sections were added, removed or reordered. An empty
+        dictionary means the document is unchanged.
+    """
+    current = state_fingerprints(document_dict)
+    delta: Dict[str, Any] = {}
+
+    fields = {
+        name: document_dict[name]
+        for name, fingerprint in current["fields"].items()
+        if fingerprints["fields"].get(name) != fingerprint
+    }
+    if fields:
+        delta["fields"] = fields
+    removed_fields = [
+        name for name in fingerprints["fields"] if name not in current["fields"]
+    ]
+    if removed_fields:
+        delta["removed_fields"] = removed_fields
+
+    pages = {
+        page_id: document_dict["pages"][page_id]
+        for page_id, fingerprint in current["pages"].items()
+        if fingerprints["pages"].get(page_id) != fingerprint
+    }
+    if pages:
+        delta["pages"] = pages
+    if current["page_ids"] != fingerprints["page_ids"]:
+        delta["page_ids"] = current["page_ids"]
+
+    sections = {
+        section["section_id"]: section
+        for section in document_dict.get("sections", [])
+        if fingerprints["sections"].get(section.get("section_id"))
+        != current["sections"][section.get("section_id")]
+    }
+    if sections:
+        delta["sections"] = sections
+    if current["section_ids"] != fingerprints["section_ids"]:
+        delta["section_ids"] = current["section_ids"]
+
+    return delta
+
+
+def apply_delta(document_dict: Dict[str, Any], delta: Dict[str, Any]) -> None:
+    """
+    Apply a delta from compute_delta to a document dictionary in place.
+
+    Args:
+        document_dict: Dictionary of the document the delta was computed from
+        delta: Delta to apply
+    """
+    for name in delta.get("removed_fields", []):
+        document_dict.pop(name, None)
+    document_dict.update(delta.get("fields", {}))
+
+    pages = document_dict.setdefault("pages", {})
+    pages.update(delta.get("pages", {}))
+    if "page_ids" in delta:
+        document_dict["pages"] = {
+            page_id: pages[page_id] for page_id in delta["page_ids"]
+        }
+
+    sections = {
+        section.get("section_id"): section
+        for section in document_dict.get("sections", [])
+    }
+    sections.update(delta.get("sections", {}))
+    section_ids = delta.get(
+        "section_ids",
+        [section.get("section_id") for section in document_dict.get("sections", [])],
+    )
+    document_dict["sections"] = [sections[section_id] for section_id in section_ids]
+
+
+class _ObjectCache:
+    """LRU of stored snapshots and deltas by S3 URI, bounded by bytes."""
+
+    def __init__(self, max_bytes: int = MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, uri: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(uri)
+            if data is not None:
+                self._entries.move_to_end(uri)
+            return data
+
+    def put(self, uri: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(uri, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[uri] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+
+_cache: Optional[_ObjectCache] = None
+_cache_lock = threading.Lock()
+
+
+def _get_cache() -> _ObjectCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = _ObjectCache()
+        return _cache
+
+
+def reset_state_cache() -> None:
+    """Discard the cached snapshots and deltas (mainly for tests)."""
+    global _cache
+    with _cache_lock:
+        _cache = None
+
+
+class DocumentStateStore:
+    """Stores document state in S3 as base snapshots and chains of deltas."""
+
+    def __init__(
+        self,
+        bucket: str,
+        max_deltas: Optional[int] = None,
+        deltas_enabled: Optional[bool] = None,
+        max_base_age: Optional[float] = None,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            bucket: S3 bucket of the document state (the working bucket)
+            max_deltas: Maximum number of deltas on a snapshot (default:
+                DOCUMENT_STATE_MAX_DELTAS or 8)
+            deltas_enabled: Whether to write deltas (default:
+                DOCUMENT_STATE_DELTAS)
+            max_base_age: Maximum age in seconds of the base snapshot a delta
+                is written on (default: DOCUMENT_STATE_MAX_BASE_AGE_SECONDS
+                or 3600)
+        """
+        self.bucket = bucket
+        self.max_deltas = default_max_deltas() if max_deltas is None else max_deltas
+        self.deltas_enabled = (
+            state_deltas_enabled() if deltas_enabled is None else deltas_enabled
+        )
+        self.max_base_age = (
+            default_max_base_age() if max_base_age is None else max_base_age
+        )
+
+    def save(
+        self,
+        document: Document,
+        step_name: str,
+        document_dict: Optional[Dict[str, Any]] = None,
+        document_json: Optional[bytes] = None,
+    ) -> Dict[str, Any]:
+        """
+        Store the document state and return the lightweight wrapper.
+
+        A delta is written if the document was loaded from (or last saved to)
+        a stored state with fewer than max_deltas deltas on a base snapshot
+        written less than max_base_age seconds ago, and the delta is small
+        compared to the document; otherwise a new snapshot is written.
+
+        Args:
+            document: Document to store
+            step_name: Name of the processing step (for unique S3 keys)
+            document_dict: Stored document dictionary (Document.to_dict() with
+                the tracking fingerprints), if already computed
+            document_json: dumps_document(document_dict), if already computed
+
+        Returns:
+            Wrapper with the URI of the stored state ('s3_uri') and the section
+            IDs for Step Functions Map states
+        """
+        if document_dict is None:
+            document_dict = document._state_dict()
+        now_ms = int(time.time() * 1000)
+        timestamp = str(now_ms)  # milliseconds for uniqueness
+
+        origin = document.state_origin
+        delta_json = None
+        if (
+            self.deltas_enabled
+            and origin
+            and len(origin["deltas"]) < self.max_deltas
+            and self._base_is_recent(origin["base_uri"], now_ms)
+        ):
+            delta = compute_delta(origin["fingerprints"], document_dict)
+            delta["base"] = origin["base_uri"]
+            delta["parents"] = origin["deltas"]
+            delta_json = dumps_document(delta)
+            if document_json is None:
+                document_json = dumps_document(document_dict)
+            if len(delta_json) > MAX_DELTA_RATIO * len(document_json):
+                # The delta saves little, compact the chain into a new snapshot
+                delta_json = None
+
+        if delta_json is None:
+            if document_json is None:
+                document_json = dumps_document(document_dict)
+            s3_uri = self._write(
+                document.id, step_name, timestamp, document_json, KIND_DOCUMENT
+            )
+            base_uri, delta_uris = s3_uri, []
+            logger.info(f"Stored snapshot of document {document.id} to {s3_uri}")
+        else:
+            s3_uri = self._write(
+                document.id, step_name, timestamp, delta_json, KIND_DELTA
+            )
+            base_uri, delta_uris = origin["base_uri"], origin["deltas"] + [s3_uri]
+            logger.info(
+                f"Stored delta of document {document.id} to {s3_uri} "
+                f"({len(delta_json)} of {len(document_json)} bytes, "
+                f"{len(delta_uris)} deltas on {base_uri})"
+            )
+
+        document.state_origin = {
+            "base_uri": base_uri,
+            "deltas": delta_uris,
+            "fingerprints": state_fingerprints(document_dict),
+        }
+
+        return {
+            "document_id": document.id,
+            "s3_uri": s3_uri,
+            "timestamp": timestamp,
+            "status": document.status.value,
+            "num_pages": document.num_pages,
+            # For Step Functions Map state
+            "sections": [section.section_id for section in document.sections],
+            "compressed": True,
+        }
+
+    def load(self, wrapper: Dict[str, Any]) -> Document:
+        """
+        Restore a document from a wrapper returned by save().
+
+        Args:
+            wrapper: Lightweight wrapper, including wrappers of full documents
+                stored by earlier versions
+
+        Returns:
+            Document with the deltas applied to the base snapshot
+        """
+        s3_uri = wrapper.get("s3_uri")
+        if not s3_uri:
+            raise ValueError("No s3_uri found in compressed data")
+
+        kind, state = decode_envelope(self._read(s3_uri))
+        if kind == KIND_DOCUMENT:
+            base_uri, delta_uris, document_dict = s3_uri, [], state
+        else:
+            base_uri = state["base"]
+            delta_uris = state["parents"] + [s3_uri]
+            document_dict = decode_state(self._read(base_uri), KIND_DOCUMENT)
+            for delta_uri in state["parents"]:
+                apply_delta(
+                    document_dict, decode_state(self._read(delta_uri), KIND_DELTA)
+                )
+            apply_delta(document_dict, state)
+
+        document = Document.from_dict(document_dict)
+        document.state_origin = {
+            "base_uri": base_uri,
+            "deltas": delta_uris,
+            "fingerprints": state_fingerprints(document_dict),
+        }
+        logger.info(
+            f"Loaded document {document.id} from {base_uri} "
+            f"with {len(delta_uris)} deltas"
+        )
+        return document
+
+    def _base_is_recent(self, base_uri: str, now_ms: int) -> bool:
+        """Check whether a delta can still be written on a base snapshot."""
+        base_ms = _state_timestamp(base_uri)
+        if base_ms is None:
+            return False
+        if now_ms - base_ms > self.max_base_age * 1000:
+            logger.info(
+                f"Base snapshot {base_uri} is older than {self.max_base_age:.0f}s, "
+                "writing a new snapshot"
+            )
+            return False
+        return True
+
+    def _write(
+        self,
+        document_id: str,
+        step_name: str,
+        timestamp: str,
+        payload_json: bytes,
+        kind: str,
+    ) -> str:
+        body, codec = encode_state(payload_json, kind=kind)
+        key = (
+            f"compressed_documents/{document_id}/{timestamp}_{step_name}_state"
+            f"{FILE_EXTENSIONS[codec]}"
+        )
+        get_client("s3").put_object(
+            Bucket=self.bucket, Key=key, Body=body, ContentType="application/json"
+        )
+        uri = f"s3://{self.bucket}/{key}"
+        _get_cache().put(uri, body)
+        return uri
+
+    def _read(self, uri: str) -> bytes:
+        cache = _get_cache()
+        data = cache.get(uri)
+        if data is not None:
+            return data
+        parsed_uri = urlparse(uri)
+        response = get_client("s3").get_object(
+            Bucket=self.bucket, Key=parsed_uri.path.lstrip("/")
+        )
+        data = response["Body"].read()
+        cache.put(uri, data)
+        return data
@@ -7,7 +7,16 @@ Document summarization module for IDP Common Package.
 This module provides functionality for summarizing documents using LLMs.
 """
 
-from idp_common.summarization.models import DocumentSummary
+from idp_common.summarization.models import (
+    DocumentSummary,
+    SectionSummaryResult,
+    SectionView,
+)
 from idp_common.summarization.service import SummarizationService
 
-__all__ = ["SummarizationService", "DocumentSummary"]
+__all__ = [
+    "SummarizationService",
+    "DocumentSummary",
+    "SectionView",
+    "SectionSummaryResult",
+]
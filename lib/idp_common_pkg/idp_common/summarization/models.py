@@ -8,7 +8,7 @@ This module provides data models for document summarization results.
 """
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 
 @dataclass
@@ -130,3 +130,62 @@ class DocumentSummarizationResult:
         sections.append(f"Execution time: {self.execution_time:.2f} seconds")
 
         return "\n".join(sections)
+
+
+@dataclass(frozen=True)
+class SectionView:
+    """
+    Immutable, lightweight view of a document section used for summarization.
+
+    Holds only what a section summarization task needs, so sections can be
+    processed in parallel without copying the whole Document.
+    """
+
+    section_id: str
+    classification: Optional[str]
+    page_ids: Tuple[str, ...]
+    """Page IDs sorted by page number."""
+
+    text_uris: Tuple[Optional[str], ...]
+    """Parsed text URI for each page ID (None if the page is missing from the document)."""
+
+    output_bucket: Optional[str]
+    output_prefix: Optional[str]
+
+    @classmethod
+    def from_document(cls, document: Any, section: Any) -> "SectionView":
+        """Create a view of a section of a Document."""
+        page_ids = tuple(sorted(section.page_ids or [], key=int))
+        text_uris = tuple(
+            document.pages[page_id].parsed_text_uri
+            if page_id in document.pages
+            else None
+            for page_id in page_ids
+        )
+        return cls(
+            section_id=section.section_id,
+            classification=section.classification,
+            page_ids=page_ids,
+            text_uris=text_uris,
+            output_bucket=document.output_bucket,
+            output_prefix=document.input_key,
+        )
+
+
+@dataclass
+class SectionSummaryResult:
+    """Plain-value result of summarizing a single section."""
+
+    section_id: str
+    summary_content: Optional[Dict[str, Any]] = None
+    summary_uri: Optional[str] = None
+    summary_md_uri: Optional[str] = None
+    metering: Dict[str, Any] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+    no_text: bool = False
+    """True if none of the section's pages had text content."""
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether a summary was generated and stored for the section."""
+        return self.summary_uri is not None
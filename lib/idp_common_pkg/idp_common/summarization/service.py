@@ -20,13 +20,20 @@ import time
 from typing import Any, Dict, List, Optional, Tuple
 
 from idp_common import bedrock, s3, utils
-from idp_common.models import Document, Status
+from idp_common.models import Document, Section, Status
 from idp_common.summarization.markdown_formatter import SummaryMarkdownFormatter
-from idp_common.summarization.models import DocumentSummarizationResult, DocumentSummary
+from idp_common.summarization.models import (
+    DocumentSummarizationResult,
+    DocumentSummary,
+    SectionSummaryResult,
+    SectionView,
+)
 from idp_common.utils import extract_json_from_text
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_WORKERS = 20
+
 
 class SummarizationService:
     """Service for summarizing documents using various backends."""
@@ -51,6 +58,11 @@ class SummarizationService:
         )
         self.backend = backend.lower()
 
+        # Maximum number of sections summarized concurrently
+        self.max_workers = int(
+            self.config.get("summarization", {}).get("max_workers", DEFAULT_MAX_WORKERS)
+        )
+
         # Validate backend choice
         if self.backend != "bedrock":
             logger.warning(f"Invalid backend '{backend}', falling back to 'bedrock'")
@@ -225,155 +237,168 @@ class SummarizationService:
             logger.error(f"Error summarizing text: {str(e)}")
             raise
 
-    def process_document_section(
-        self, document: Document, section_id: str
-    ) -> Tuple[Document, Dict[str, Any]]:
+    def _summarize_section(self, view: SectionView) -> SectionSummaryResult:
         """
-        Summarize a specific section of a document and update the Document object with the summary.
+        Summarize a single section described by a lightweight section view.
+
+        This method does not touch the Document, so it can run concurrently for
+        many sections; the caller merges the returned values into the Document.
 
         Args:
-            document: Document object containing the section to summarize
-            section_id: ID of the section to summarize
+            view: Immutable view of the section to summarize
 
         Returns:
-            Tuple[Document, Dict[str, Any]]: Updated Document object with section summary and section-specific metering data
+            SectionSummaryResult with summary content, URIs, metering data and errors
         """
-        # Validate input document
-        if not document:
-            logger.error("No document provided")
-            return document, {}
-
-        if not document.sections:
-            logger.error("Document has no sections to process")
-            document.errors.append("Document has no sections to process")
-            return document, {}
-
-        # Find the section with the given ID
-        section = None
-        for s in document.sections:
-            if s.section_id == section_id:
-                section = s
-                break
-
-        if not section:
-            error_msg = f"Section {section_id} not found in document"
-            logger.error(error_msg)
-            document.errors.append(error_msg)
-            return document, {}
-
-        # Extract information about the section
-        class_label = section.classification
-        output_bucket = document.output_bucket
-        output_prefix = document.input_key
-        output_key = f"{output_prefix}/sections/{section.section_id}/summary.json"
-        output_md_key = f"{output_prefix}/sections/{section.section_id}/summary.md"
-        output_uri = f"s3://{output_bucket}/{output_key}"
-        output_md_uri = f"s3://{output_bucket}/{output_md_key}"
+        section_id = view.section_id
+        result = SectionSummaryResult(section_id=section_id)
 
         # Check if the section has required pages
-        if not section.page_ids:
+        if not view.page_ids:
             error_msg = f"Section {section_id} has no page IDs"
             logger.error(error_msg)
-            document.errors.append(error_msg)
-            return document, {}
+            result.errors.append(error_msg)
+            return result
 
-        # Sort pages by page number
-        sorted_page_ids = sorted(section.page_ids, key=int)
-        start_page = int(sorted_page_ids[0])
-        end_page = int(sorted_page_ids[-1])
+        output_key = f"{view.output_prefix}/sections/{section_id}/summary.json"
+        output_md_key = f"{view.output_prefix}/sections/{section_id}/summary.md"
         logger.info(
-            f"Summarizing section {section_id}, class {class_label}: pages {start_page}-{end_page}"
+            f"Summarizing section {section_id}, class {view.classification}: "
+            f"pages {view.page_ids[0]}-{view.page_ids[-1]}"
         )
 
         try:
-            # TODO: Uncomment this when needed
-            # Start timing
-            # start_time = time.time()
-
             # Read document text from all pages in order
             all_text = ""
-            for page_id in sorted_page_ids:
-                if page_id not in document.pages:
+            for page_id, text_path in zip(view.page_ids, view.text_uris):
+                if text_path is None:
                     error_msg = f"Page {page_id} not found in document"
                     logger.error(error_msg)
-                    document.errors.append(error_msg)
+                    result.errors.append(error_msg)
                     continue
 
-                page = document.pages[page_id]
-                text_path = page.parsed_text_uri
                 page_text = s3.get_text_content(text_path)
                 all_text += f"<page-number>{page_id}</page-number>\n{page_text}\n\n"
 
             if not all_text:
-                logger.warning(f"No text content found in section {section_id}")
-                document = self._update_document_status(
-                    document,
-                    success=False,
-                    error_message=f"No text content found in section {section_id}",
-                )
-                return document, {}
+                error_msg = f"No text content found in section {section_id}"
+                logger.warning(error_msg)
+                result.errors.append(error_msg)
+                result.no_text = True
+                return result
 
             # Generate summary
             summary = self.process_text(all_text)
 
-            # TODO: Uncomment this when needed
-            # Calculate execution time
-            # execution_time = time.time() - start_time
-
-            # TODO: Uncomment this when needed
-            # Create summarization result object
-            # summarization_result = DocumentSummarizationResult(
-            #     document_id=document.id, summary=summary, execution_time=execution_time
-            # )
-
-            # Store results in S3
             # Store JSON result
             s3.write_content(
                 content=summary.content,
-                bucket=output_bucket,
+                bucket=view.output_bucket,
                 key=output_key,
                 content_type="application/json",
             )
 
-            # Generate and store markdown report using our custom formatter
-            # Create a single-section document for the formatter
-            single_section = {section_id: summary.content}
+            # Generate and store markdown report using our custom formatter.
+            # The formatter only needs the section's ID and classification, and
+            # rewrites the content it is given, so it gets its own copy.
+            single_section = {section_id: copy.deepcopy(summary.content)}
             formatter = SummaryMarkdownFormatter(
-                document, single_section, is_section=True, include_toc=True
+                Document(
+                    sections=[
+                        Section(
+                            section_id=section_id,
+                            classification=view.classification,
+                        )
+                    ]
+                ),
+                single_section,
+                is_section=True,
+                include_toc=True,
             )
             markdown_report = formatter.format_all()
 
             s3.write_content(
                 content=markdown_report,
-                bucket=output_bucket,
+                bucket=view.output_bucket,
                 key=output_md_key,
                 content_type="text/markdown",
             )
 
-            # Update section with summary URI
-            # Initialize attributes if it's None
-            if section.attributes is None:
-                section.attributes = {}
-
-            section.attributes["summary_uri"] = output_uri
-            section.attributes["summary_md_uri"] = output_md_uri
-
-            # Extract metering data to return separately
-            section_metering = {}
-            if "metering" in summary.metadata:
-                section_metering = summary.metadata["metering"]
+            result.summary_content = summary.content
+            result.summary_uri = f"s3://{view.output_bucket}/{output_key}"
+            result.summary_md_uri = f"s3://{view.output_bucket}/{output_md_key}"
+            result.metering = summary.metadata.get("metering", {})
 
             logger.info(
-                f"Section {section_id} summarized successfully. Summary stored at: {output_uri}"
+                f"Section {section_id} summarized successfully. Summary stored at: {result.summary_uri}"
             )
 
         except Exception as e:
             error_msg = f"Error summarizing section {section_id}: {str(e)}"
             logger.error(error_msg)
+            result.errors.append(error_msg)
+
+        return result
+
+    @staticmethod
+    def _apply_section_result(section: Section, result: SectionSummaryResult) -> None:
+        """Record the summary URIs of a successfully summarized section."""
+        if section.attributes is None:
+            section.attributes = {}
+        section.attributes["summary_uri"] = result.summary_uri
+        section.attributes["summary_md_uri"] = result.summary_md_uri
+
+    def process_document_section(
+        self, document: Document, section_id: str
+    ) -> Tuple[Document, Dict[str, Any]]:
+        """
+        Summarize a specific section of a document and update the Document object with the summary.
+
+        Args:
+            document: Document object containing the section to summarize
+            section_id: ID of the section to summarize
+
+        Returns:
+            Tuple[Document, Dict[str, Any]]: Updated Document object with section summary and section-specific metering data
+        """
+        # Validate input document
+        if not document:
+            logger.error("No document provided")
+            return document, {}
+
+        if not document.sections:
+            logger.error("Document has no sections to process")
+            document.errors.append("Document has no sections to process")
+            return document, {}
+
+        # Find the section with the given ID
+        section = None
+        for s in document.sections:
+            if s.section_id == section_id:
+                section = s
+                break
+
+        if not section:
+            error_msg = f"Section {section_id} not found in document"
+            logger.error(error_msg)
             document.errors.append(error_msg)
             return document, {}
 
-        return document, section_metering
+        result = self._summarize_section(SectionView.from_document(document, section))
+
+        if result.no_text:
+            document.errors.extend(result.errors[:-1])
+            document = self._update_document_status(
+                document, success=False, error_message=result.errors[-1]
+            )
+            return document, {}
+
+        document.errors.extend(result.errors)
+        if not result.succeeded:
+            return document, {}
+
+        self._apply_section_result(section, result)
+        return document, result.metering
 
     def process_document(
         self, document: Document, store_results: bool = True
@@ -381,8 +406,10 @@ class SummarizationService:
         """
         Summarize a document and update the Document object with the summary.
 
-        This method processes each section in parallel using ThreadPoolExecutor with 20 workers
-        and then combines the results into a single document summary.
+        This method summarizes sections in parallel (up to summarization.max_workers
+        concurrent sections) and then combines the results into a single document
+        summary. Each task only receives an immutable SectionView, and the returned
+        values are merged into the Document once.
 
         If no sections are defined, falls back to summarizing the entire document at once.
 
@@ -415,8 +442,7 @@ class SummarizationService:
             combined_metadata = {"section_summaries": {}}
             section_markdowns = {}  # Use dictionary instead of list for section markdowns
 
-            # Create a thread pool with 20 workers for parallel processing
-            max_workers = 20
+            max_workers = max(1, min(self.max_workers, len(document.sections)))
             logger.info(
                 f"Processing document sections in parallel with {max_workers} workers"
             )
@@ -436,103 +462,55 @@ class SummarizationService:
                     logger.info(
                         f"Submitting section {section.section_id} with classification {section.classification} for processing"
                     )
-                    # Create a deep copy of the document for thread safety, excluding metering data
-                    thread_document = copy.deepcopy(document)
-                    # Reset metering data in the copy to avoid double-counting
-                    thread_document.metering = {}
-
                     future = executor.submit(
-                        self.process_document_section,
-                        thread_document,
-                        section.section_id,
+                        self._summarize_section,
+                        SectionView.from_document(document, section),
                     )
                     future_to_section[future] = section
 
-                # Process results as they complete
+                # Merge results as they complete
                 for future in concurrent.futures.as_completed(future_to_section):
                     section = future_to_section[future]
                     try:
-                        # Get the result (updated document with processed section and section-specific metering)
-                        updated_document, section_metering = future.result()
+                        result = future.result()
+
+                        for error in result.errors:
+                            if error not in document.errors:
+                                document.errors.append(error)
+
+                        if not result.succeeded:
+                            continue
 
                         # Store section-specific metering data
-                        if section_metering:
-                            section_key = f"section_{section.section_id}"
-                            all_section_metering[section_key] = section_metering
-
-                        # Find the processed section in the updated document
-                        processed_section = None
-                        for s in updated_document.sections:
-                            if s.section_id == section.section_id:
-                                processed_section = s
-                                break
-
-                        if (
-                            processed_section
-                            and processed_section.attributes
-                            and "summary_uri" in processed_section.attributes
-                        ):
-                            # Get the section summary from S3
-                            summary_uri = processed_section.attributes["summary_uri"]
-                            summary_md_uri = processed_section.attributes.get(
-                                "summary_md_uri"
+                        if result.metering:
+                            all_section_metering[f"section_{section.section_id}"] = (
+                                result.metering
                             )
 
-                            # Update the original document's section with the processed section's attributes
-                            for s in document.sections:
-                                if s.section_id == section.section_id:
-                                    s.attributes = processed_section.attributes
-                                    break
-
-                            # Merge any errors from the processed document
-                            for error in updated_document.errors:
-                                if error not in document.errors:
-                                    document.errors.append(error)
-
-                            # Load the summary content
-                            try:
-                                summary_content = s3.get_json_content(summary_uri)
-
-                                # Add to combined content under a unique key that includes section ID
-                                section_key = (
-                                    f"{section.classification}_{section.section_id}"
-                                    if section.classification
-                                    else f"section_{section.section_id}"
-                                )
-                                combined_content[section_key] = summary_content
-
-                                # Store section summary reference in metadata
-                                combined_metadata["section_summaries"][section_key] = {
-                                    "section_id": section.section_id,
-                                    "classification": section.classification,
-                                    "summary_uri": summary_uri,
-                                    "summary_md_uri": summary_md_uri,
-                                }
-
-                                # Get markdown content for combined markdown report
-                                if summary_md_uri:
-                                    try:
-                                        # Generate clean markdown directly from the summary content
-                                        section_title = (
-                                            section.classification
-                                            or f"Section {section.section_id}"
-                                        )
-                                        # Store section content with metadata
-                                        section_markdowns[section.section_id] = {
-                                            "content": summary_content,
-                                            "title": section_title,
-                                        }
-                                    except Exception as e:
-                                        logger.warning(
-                                            f"Failed to generate markdown for section {section.section_id}: {e}"
-                                        )
-                            except Exception as e:
-                                logger.warning(
-                                    f"Failed to load section summary from {summary_uri}: {e}"
-                                )
-                                document.errors.append(
-                                    f"Failed to load section summary: {str(e)}"
-                                )
+                        self._apply_section_result(section, result)
+
+                        # Add to combined content under a unique key that includes section ID
+                        section_key = (
+                            f"{section.classification}_{section.section_id}"
+                            if section.classification
+                            else f"section_{section.section_id}"
+                        )
+                        combined_content[section_key] = result.summary_content
+
+                        # Store section summary reference in metadata
+                        combined_metadata["section_summaries"][section_key] = {
+                            "section_id": section.section_id,
+                            "classification": section.classification,
+                            "summary_uri": result.summary_uri,
+                            "summary_md_uri": result.summary_md_uri,
+                        }
+
+                        # Store section content with metadata for the combined markdown report
+                        section_markdowns[section.section_id] = {
+                            "content": copy.deepcopy(result.summary_content),
+                            "title": section.classification
+                            or f"Section {section.section_id}",
+                        }
                     except Exception as e:
                         error_msg = (
                             f"Error processing section {section.section_id}: {str(e)}"
@@ -49,6 +49,10 @@ extras_require = {
     "reporting": [
         "pyarrow==20.0.0",  # For Parquet conversion
     ],
+    # Faster document state compression (gzip is used without it)
+    "zstd": [
+        "zstandard>=0.22.0",
+    ],
     # Appsync module dependencies
     "appsync": [
         "requests==2.32.4",
@@ -86,6 +90,7 @@ extras_require = {
         "pyarrow==20.0.0",
         "openpyxl==3.1.5",
         "python-docx==1.2.0",
+        "zstandard>=0.22.0",
     ],
 }
 
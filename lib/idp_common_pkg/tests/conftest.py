@@ -8,3 +8,99 @@ Pytest configuration file for the IDP Common package tests.
 
 # PIL module is now used directly for document conversion functionality
 # No mocking needed as PIL is a required dependency for the OCR module
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _reset_boto3_clients():
+    """Tests patch boto3 and expect services to create new clients, so clear the shared registry."""
+    from idp_common.clients import clear_clients
+
+    clear_clients()
+    yield
+    clear_clients()
+
+
+@pytest.fixture(autouse=True)
+def _reset_bedrock_retry_scheduler():
+    """Throttling state is shared per model across the process, so start each test without it."""
+    from idp_common.bedrock.retry import reset_retry_scheduler
+
+    reset_retry_scheduler()
+    yield
+    reset_retry_scheduler()
+
+
+@pytest.fixture(autouse=True)
+def _reset_bedrock_cachepoint_planner():
+    """Prompt prefixes are compared across requests in the process, so start each test without history."""
+    from idp_common.bedrock.cachepoint import reset_cachepoint_planner
+
+    reset_cachepoint_planner()
+    yield
+    reset_cachepoint_planner()
+
+
+@pytest.fixture(autouse=True)
+def _reset_reporting_schema_registry():
+    """Learned section schemas must not leak between tests."""
+    try:
+        from idp_common.reporting.schema_registry import reset_schema_registry
+    except ImportError:  # reporting dependencies not installed
+        yield
+        return
+
+    reset_schema_registry()
+    yield
+    reset_schema_registry()
+
+
+@pytest.fixture(autouse=True)
+def _reset_criteria_validation_chunking():
+    """Calibrated token estimates and cached chunk plans must not leak between tests."""
+    from idp_common.criteria_validation.chunking import reset_chunking_state
+
+    reset_chunking_state()
+    yield
+    reset_chunking_state()
+
+
+@pytest.fixture(autouse=True)
+def _reset_bda_duration_history():
+    """Learned BDA job durations must not leak between tests."""
+    from idp_common.bda.completion import reset_duration_history
+
+    reset_duration_history()
+    yield
+    reset_duration_history()
+
+
+@pytest.fixture(autouse=True)
+def _reset_classification_page_cache():
+    """Cached page classifications must not leak between tests."""
+    from idp_common.classification.page_cache import reset_memory_backend
+
+    reset_memory_backend()
+    yield
+    reset_memory_backend()
+
+
+@pytest.fixture(autouse=True)
+def _reset_page_asset_cache():
+    """Cached page text and images must not leak between tests."""
+    from idp_common.page_assets import reset_page_asset_cache
+
+    reset_page_asset_cache()
+    yield
+    reset_page_asset_cache()
+
+
+@pytest.fixture(autouse=True)
+def _reset_document_state_cache():
+    """Cached document snapshots and deltas must not leak between tests."""
+    from idp_common.state_store import reset_state_cache
+
+    reset_state_cache()
+    yield
+    reset_state_cache()
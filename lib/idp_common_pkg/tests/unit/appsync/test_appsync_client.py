@@ -5,12 +5,21 @@
 Unit tests for the AppSyncClient class.
 """
 
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
 from botocore.awsrequest import AWSRequest
-from idp_common.appsync.client import AppSyncClient, AppSyncError
+from idp_common.appsync.client import (
+    AppSyncClient,
+    AppSyncError,
+    _combine_mutations,
+    _get_http_session,
+)
+from idp_common.appsync.mutations import CREATE_DOCUMENT, UPDATE_DOCUMENT
 
 
 @pytest.mark.unit
@@ -80,7 +89,7 @@ class TestAppSyncClient:
         assert "X-Amz-Date" in headers
         assert "Authorization" in headers
 
-    @patch("idp_common.appsync.client.requests.post")
+    @patch("idp_common.appsync.client.requests.Session.post")
     @patch("idp_common.appsync.client.AppSyncClient._sign_request")
     def test_execute_mutation_success(self, mock_sign_request, mock_post):
         """Test successful mutation execution."""
@@ -112,13 +121,13 @@ class TestAppSyncClient:
         mock_sign_request.assert_called_once()
         mock_post.assert_called_once_with(
             "https://test-api.com/graphql",
-            json={"query": mutation, "variables": variables},
+            data=json.dumps({"query": mutation, "variables": variables}).encode(),
             headers=mock_sign_request.return_value,
             timeout=30,
         )
         assert result == {"createDocument": {"ObjectKey": "test-document.pdf"}}
 
-    @patch("idp_common.appsync.client.requests.post")
+    @patch("idp_common.appsync.client.requests.Session.post")
     @patch("idp_common.appsync.client.AppSyncClient._sign_request")
     def test_execute_mutation_graphql_error(self, mock_sign_request, mock_post):
         """Test handling of GraphQL errors in mutation response."""
@@ -158,7 +167,7 @@ class TestAppSyncClient:
         assert len(excinfo.value.errors) == 2
         assert excinfo.value.errors[0]["message"] == "Invalid input format"
 
-    @patch("idp_common.appsync.client.requests.post")
+    @patch("idp_common.appsync.client.requests.Session.post")
     @patch("idp_common.appsync.client.AppSyncClient._sign_request")
     def test_execute_mutation_http_error(self, mock_sign_request, mock_post):
         """Test handling of HTTP errors in mutation request."""
@@ -187,7 +196,7 @@ class TestAppSyncClient:
         # Verify
         assert "Connection error" in str(excinfo.value)
 
-    @patch("idp_common.appsync.client.requests.post")
+    @patch("idp_common.appsync.client.requests.Session.post")
     @patch("idp_common.appsync.client.AppSyncClient._sign_request")
     def test_execute_mutation_no_data(self, mock_sign_request, mock_post):
         """Test handling of response with no data."""
@@ -218,7 +227,7 @@ class TestAppSyncClient:
         # Verify
         assert "No data returned from AppSync" in str(excinfo.value)
 
-    @patch("idp_common.appsync.client.requests.post")
+    @patch("idp_common.appsync.client.requests.Session.post")
     @patch("idp_common.appsync.client.AppSyncClient._sign_request")
     def test_execute_mutation_null_result(self, mock_sign_request, mock_post):
         """Test handling of null mutation result."""
@@ -248,3 +257,97 @@ class TestAppSyncClient:
 
         # Verify
         assert "Mutation createDocument returned null" in str(excinfo.value)
+
+    @patch("idp_common.appsync.client.requests.Session.post")
+    def test_signs_exact_request_body(self, mock_post):
+        """Test that the signed payload is the payload that is sent."""
+        client = AppSyncClient(
+            api_url="https://test-api.com/graphql", region="us-west-2"
+        )
+        signed_bodies = []
+
+        def add_auth(request):
+            signed_bodies.append(request.data)
+            request.headers["Authorization"] = "AWS4-HMAC-SHA256 Credential=..."
+
+        client._signer = MagicMock()
+        client._signer.add_auth.side_effect = add_auth
+        mock_post.return_value.json.return_value = {
+            "data": {"updateDocument": {"ObjectKey": "doc.pdf"}}
+        }
+
+        client.execute_mutation(UPDATE_DOCUMENT, {"input": {"ObjectKey": "doc.pdf"}})
+
+        sent = mock_post.call_args[1]
+        assert sent["data"] == signed_bodies[0]
+        assert sent["headers"]["Authorization"].startswith("AWS4-HMAC-SHA256")
+
+    def test_http_session_is_shared(self):
+        """Test that all clients share one keep-alive HTTP session."""
+        assert _get_http_session() is _get_http_session()
+
+    def test_combine_mutations(self):
+        """Test combining mutations into one aliased operation."""
+        combined = _combine_mutations(
+            [
+                (UPDATE_DOCUMENT, {"input": {"ObjectKey": "a.pdf"}}),
+                (CREATE_DOCUMENT, {"input": {"ObjectKey": "b.pdf"}}),
+            ]
+        )
+
+        mutation, variables, aliases = combined
+        assert aliases == [("m0", "updateDocument"), ("m1", "createDocument")]
+        assert variables == {
+            "input_0": {"ObjectKey": "a.pdf"},
+            "input_1": {"ObjectKey": "b.pdf"},
+        }
+        assert "$input_0: UpdateDocumentInput!" in mutation
+        assert "m0: updateDocument(input: $input_0)" in mutation
+        assert "m1: createDocument(input: $input_1)" in mutation
+        assert "$input)" not in mutation
+
+    def test_combine_mutations_rejects_multiple_fields(self):
+        """Test that operations with several top-level fields are not combined."""
+        mutation = "mutation M { a(x: 1) { id } b(x: 2) { id } }"
+        assert _combine_mutations([(mutation, {}), (mutation, {})]) is None
+
+    @patch("idp_common.appsync.client._get_credentials", return_value=None)
+    @patch("idp_common.appsync.client.requests.Session.post")
+    def test_concurrent_mutations_are_coalesced(self, mock_post, _):
+        """Test that concurrent mutations are sent in one request with per-mutation results."""
+        client = AppSyncClient(
+            api_url="https://test-api.com/graphql",
+            region="us-west-2",
+            batch_window_ms=1000,
+            max_batch_size=3,
+        )
+        client._sign_request = MagicMock(return_value={})
+        mock_post.return_value.json.return_value = {
+            "data": {
+                "m0": {"ObjectKey": "0.pdf"},
+                "m1": None,
+                "m2": {"ObjectKey": "2.pdf"},
+            },
+            "errors": [{"message": "Invalid input", "path": ["m1"]}],
+        }
+
+        def update(key):
+            return client.execute_mutation(
+                UPDATE_DOCUMENT, {"input": {"ObjectKey": key}}
+            )
+
+        # Submit one at a time so that the batch order is deterministic
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = []
+            for i in range(3):
+                futures.append(executor.submit(update, f"{i}.pdf"))
+                time.sleep(0.05)
+
+            assert futures[0].result() == {"updateDocument": {"ObjectKey": "0.pdf"}}
+            with pytest.raises(AppSyncError, match="Invalid input"):
+                futures[1].result()
+            assert futures[2].result() == {"updateDocument": {"ObjectKey": "2.pdf"}}
+
+        mock_post.assert_called_once()
+        sent = json.loads(mock_post.call_args[1]["data"])
+        assert sent["variables"]["input_2"] == {"ObjectKey": "2.pdf"}
@@ -9,9 +9,11 @@ import datetime
 import json
 from unittest.mock import MagicMock, patch
 
+import boto3
 import pytest
 from idp_common.appsync.service import DocumentAppSyncService
 from idp_common.models import Document, Page, Section, Status
+from moto import mock_aws
 
 
 @pytest.mark.unit
@@ -496,6 +498,102 @@ class TestDocumentAppSyncService:
         )
         assert result == updated_doc
 
+    def _tracked_document(self):
+        doc = Document(
+            id="test-doc",
+            input_key="test-document.pdf",
+            status=Status.CLASSIFYING,
+            num_pages=2,
+            workflow_execution_arn="arn:aws:states:execution",
+        )
+        doc.pages = {
+            "1": Page(
+                page_id="1", image_uri="s3://bucket/1.jpg", classification="invoice"
+            ),
+            "2": Page(
+                page_id="2", image_uri="s3://bucket/2.jpg", classification="invoice"
+            ),
+        }
+        doc.sections = [
+            Section(section_id="1", classification="invoice", page_ids=["1", "2"])
+        ]
+        doc.metering = {"bedrock": {"inputTokens": 100}}
+        return doc
+
+    def _service(self):
+        mock_client = MagicMock()
+        mock_client.execute_mutation.return_value = {
+            "updateDocument": {
+                "ObjectKey": "test-document.pdf",
+                "ObjectStatus": "EXTRACTING",
+            }
+        }
+        return DocumentAppSyncService(appsync_client=mock_client), mock_client
+
+    def test_update_document_sends_only_changed_fields(self):
+        """Test that a second update sends only fields that changed since the first."""
+        service, mock_client = self._service()
+        doc = self._tracked_document()
+
+        service.update_document(doc)
+        first_input = mock_client.execute_mutation.call_args[0][1]["input"]
+        assert {"Pages", "Sections", "Metering", "PageCount"} <= set(first_input)
+
+        doc.status = Status.EXTRACTING
+        doc.sections[0].extraction_result_uri = "s3://bucket/result.json"
+        service.update_document(doc)
+        second_input = mock_client.execute_mutation.call_args[0][1]["input"]
+
+        assert set(second_input) == {
+            "ObjectKey",
+            "ObjectStatus",
+            "WorkflowStatus",
+            "Sections",
+        }
+        assert second_input["ObjectStatus"] == "EXTRACTING"
+        assert second_input["Sections"][0]["OutputJSONUri"] == "s3://bucket/result.json"
+
+    @mock_aws
+    def test_tracking_state_survives_serialization(self):
+        """Test that persisted fingerprints are carried to the next workflow step."""
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="working")
+        service, mock_client = self._service()
+        doc = self._tracked_document()
+        service.update_document(doc)
+        assert "persisted_state" not in doc.to_dict()
+
+        payload = doc.serialize_document("working", "ocr")
+        next_step_doc = Document.load_document(payload, "working")
+        next_step_doc.status = Status.EXTRACTING
+        service.update_document(next_step_doc)
+
+        input_data = mock_client.execute_mutation.call_args[0][1]["input"]
+        assert set(input_data) == {"ObjectKey", "ObjectStatus", "WorkflowStatus"}
+
+    def test_update_document_status(self):
+        """Test the status-only update path."""
+        service, mock_client = self._service()
+        doc = self._tracked_document()
+        doc.status = Status.EXTRACTING
+
+        with patch.object(service, "_document_to_attributes") as mock_to_attributes:
+            service.update_document_status(doc)
+
+        mock_to_attributes.assert_not_called()
+        input_data = mock_client.execute_mutation.call_args[0][1]["input"]
+        assert input_data == {
+            "ObjectKey": "test-document.pdf",
+            "ObjectStatus": "EXTRACTING",
+            "WorkflowExecutionArn": "arn:aws:states:execution",
+            "WorkflowStatus": "RUNNING",
+        }
+
+        # Pages and sections were never sent, so a full update still includes them
+        service.update_document(doc)
+        input_data = mock_client.execute_mutation.call_args[0][1]["input"]
+        assert "Pages" in input_data
+        assert "WorkflowExecutionArn" not in input_data
+
     def test_calculate_ttl(self):
         """Test TTL calculation for document expiration."""
         # Setup
@@ -540,3 +540,23 @@ class TestAssessmentService:
         # Should return without error but log warning
         assert len(result.errors) == 0
         mock_get_json_content.assert_called_once()
+
+    @patch("idp_common.page_assets.prefetch_section_pages")
+    @patch("idp_common.s3.get_json_content")
+    @patch("idp_common.metrics.put_metric")
+    def test_process_document_section_read_error_cancels_prefetch(
+        self,
+        mock_put_metric,
+        mock_get_json_content,
+        mock_prefetch,
+        service,
+        sample_document_with_extraction,
+    ):
+        """Test that page reads are discarded when reading extraction results fails."""
+        mock_get_json_content.side_effect = Exception("Access denied")
+
+        with pytest.raises(Exception, match="Access denied"):
+            service.process_document_section(sample_document_with_extraction, "1")
+
+        mock_prefetch.return_value.cancel.assert_called_once()
+        mock_prefetch.return_value.result.assert_not_called()
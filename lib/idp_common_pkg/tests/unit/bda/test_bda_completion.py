@@ -0,0 +1,205 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for BDA completion tracking.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from idp_common.bda.bda_service import BdaService
+from idp_common.bda.completion import (
+    AdaptivePollPolicy,
+    BdaCompletionTracker,
+    JobDurationHistory,
+)
+
+ARN_PREFIX = "arn:aws:bedrock:us-east-1:123456789012:data-automation-invocation/"
+
+
+class FakeBdaClient:
+    """Returns InProgress for each invocation until it has been checked N times."""
+
+    def __init__(self, checks_until_done):
+        self.checks_until_done = dict(checks_until_done)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get_data_automation_status(self, invocationArn):
+        with self._lock:
+            self.calls.append(invocationArn)
+            done = self.calls.count(invocationArn) >= self.checks_until_done.get(
+                invocationArn, 1
+            )
+        return {"status": "Success" if done else "InProgress"}
+
+
+def _status_calls(delays, duration):
+    """Number of status checks until a job of the given duration is seen done."""
+    elapsed = 0
+    for calls, delay in enumerate(delays, start=1):
+        elapsed += delay
+        if elapsed >= duration:
+            return calls
+
+
+@pytest.mark.unit
+class TestAdaptivePollPolicy:
+    def test_without_history_polls_at_max_interval(self):
+        policy = AdaptivePollPolicy(min_interval=1, max_interval=10, jitter=0)
+
+        delays = list(itertools.islice(policy.delays(), 7))
+
+        assert delays == [10] * 7
+
+    def test_with_history_first_check_is_near_expected_completion(self):
+        policy = AdaptivePollPolicy(min_interval=1, max_interval=10, jitter=0)
+
+        delays = list(itertools.islice(policy.delays(expected=30, elapsed=4), 3))
+
+        assert delays == [20, 6, 10]
+
+    def test_status_calls_do_not_exceed_fixed_interval_polling(self):
+        policy = AdaptivePollPolicy(min_interval=1, max_interval=10, jitter=0)
+        durations = range(1, 600, 3)
+        baseline = [_status_calls(itertools.repeat(10), d) for d in durations]
+
+        without_history = [_status_calls(policy.delays(), d) for d in durations]
+        assert all(a <= b for a, b in zip(without_history, baseline))
+
+        # Estimates that are off by up to 20% still save calls overall
+        for factor in (0.8, 1.0, 1.2):
+            calls = sum(
+                _status_calls(policy.delays(expected=factor * d), d) for d in durations
+            )
+            assert calls <= sum(baseline)
+
+    def test_jitter_stays_within_bounds(self):
+        policy = AdaptivePollPolicy(min_interval=10, max_interval=10, jitter=0.1)
+
+        delays = list(itertools.islice(policy.delays(), 50))
+
+        assert all(9 <= delay <= 11 for delay in delays)
+
+
+@pytest.mark.unit
+class TestJobDurationHistory:
+    def test_expected_duration_by_key_and_page_count(self):
+        history = JobDurationHistory()
+
+        history.record("blueprint", 1, 10)
+        history.record("blueprint", 1, 20)
+        history.record("blueprint", 40, 100)
+
+        assert history.expected("blueprint", 1) == pytest.approx(13)
+        assert history.expected("blueprint", 50) == pytest.approx(100)
+        # Unknown page count bucket falls back to all jobs for the key
+        assert history.expected("blueprint", 8) is not None
+        assert history.expected("other", 1) is None
+
+
+@pytest.mark.unit
+class TestBdaCompletionTracker:
+    def _tracker(self, client, **kwargs):
+        policy = AdaptivePollPolicy(min_interval=0.01, max_interval=0.05, jitter=0)
+        return BdaCompletionTracker(
+            client, policy=policy, history=JobDurationHistory(), **kwargs
+        )
+
+    def test_wait_all_tracks_many_invocations(self):
+        arns = [f"{ARN_PREFIX}job-{i}" for i in range(200)]
+        client = FakeBdaClient({arn: 1 + i % 3 for i, arn in enumerate(arns)})
+        tracker = self._tracker(client, max_concurrent_polls=20)
+
+        results = asyncio.run(tracker.wait_all(arns, timeout=10))
+
+        assert set(results) == set(arns)
+        assert all(r["status"] == "Success" for r in results.values())
+        assert len(client.calls) == sum(1 + i % 3 for i in range(200))
+
+    def test_wait_all_times_out(self):
+        client = FakeBdaClient({f"{ARN_PREFIX}slow": 10**6})
+        tracker = self._tracker(client)
+
+        with pytest.raises(TimeoutError):
+            asyncio.run(tracker.wait_all([f"{ARN_PREFIX}slow"], timeout=0.1))
+
+    def test_completion_event_wakes_waiter(self):
+        arn = f"{ARN_PREFIX}job-1"
+        client = FakeBdaClient({arn: 2})
+        tracker = self._tracker(client, event_driven=True, event_fallback_interval=30)
+        tracker.register(arn)
+
+        timer = threading.Timer(
+            0.05,
+            tracker.notify_event,
+            args=({"detail": {"job_id": "job-1", "job_status": "SUCCESS"}},),
+        )
+        start = time.time()
+        timer.start()
+        # First check happens on the event, before the fallback interval
+        with pytest.raises(TimeoutError):
+            asyncio.run(tracker.wait_all([arn], timeout=0.5))
+        assert client.calls == [arn]
+
+        tracker.notify_event({"detail": {"job_id": "job-1"}})
+        results = asyncio.run(tracker.wait_all([arn], timeout=5))
+
+        assert results[arn]["status"] == "Success"
+        assert client.calls == [arn, arn]
+        assert time.time() - start < 5
+
+    def test_unknown_event_is_ignored(self):
+        tracker = self._tracker(FakeBdaClient({}))
+        tracker.register(f"{ARN_PREFIX}job-1")
+
+        assert tracker.notify_event({"detail": {"job_id": "job-2"}}) is None
+
+    def test_completion_records_duration(self):
+        arn = f"{ARN_PREFIX}job-1"
+        tracker = self._tracker(FakeBdaClient({}))
+        tracker.register(arn, key="blueprint", page_count=3)
+
+        asyncio.run(tracker.wait_all([arn], timeout=5))
+
+        assert tracker.history.expected("blueprint", 3) > 0
+
+
+@pytest.mark.unit
+@patch("idp_common.bda.bda_service.time")
+@patch("idp_common.bda.bda_service.boto3")
+def test_wait_uses_duration_history(mock_boto3, mock_time):
+    """Adaptive waits schedule the first check from earlier job durations."""
+    mock_bda_client = MagicMock()
+    mock_boto3.client.return_value = mock_bda_client
+    mock_bda_client.invoke_data_automation_async.return_value = {
+        "invocationArn": f"{ARN_PREFIX}job-1"
+    }
+    mock_bda_client.get_data_automation_status.side_effect = [
+        {"status": "InProgress"},
+        {"status": "Success"},
+    ]
+
+    service = BdaService(
+        output_s3_uri="s3://output-bucket/output-path",
+        dataAutomationProjectArn="project-arn",
+        dataAutomationProfileArn="profile-arn",
+    )
+    service.completion_tracker.policy.jitter = 0
+    service.completion_tracker.history.record("project-arn", 2, 50)
+
+    service.invoke_data_automation_async(input_s3_uri="s3://input-bucket/doc.pdf")
+    result = service.wait_data_automation_invocation(
+        invocationArn=f"{ARN_PREFIX}job-1", page_count=2
+    )
+
+    assert result == {"status": "Success"}
+    delays = [c.args[0] for c in mock_time.sleep.call_args_list]
+    assert len(delays) == 2
+    assert delays[0] == pytest.approx(40, abs=0.5)
+    assert delays[1] == 10
@@ -0,0 +1,170 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for automatic cache point placement.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from idp_common.bedrock.cachepoint import CachePointPlanner
+from idp_common.bedrock.client import BedrockClient
+
+MODEL_ID = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+KEY = f"Extraction/bedrock/{MODEL_ID}"
+STATIC = "".join(f"- attribute_{i}: description of attribute {i}\n" for i in range(150))
+IMAGE = {"image": {"format": "png", "source": {"bytes": b"example"}}}
+
+
+def _content(document_text):
+    return [{"text": f"{STATIC}<document>\n{document_text}\n</document>"}]
+
+
+def converse_response(usage):
+    return {"output": {"message": {"content": [{"text": "ok"}]}}, "usage": usage}
+
+
+@pytest.mark.unit
+class TestCachePointPlanner:
+    def test_first_request_is_unchanged(self):
+        planner = CachePointPlanner()
+
+        content = _content("Invoice 1")
+        assert planner.plan(KEY, MODEL_ID, "system", content) is content
+
+    def test_cachepoint_after_common_prefix_at_line_break(self):
+        planner = CachePointPlanner()
+        planner.plan(KEY, MODEL_ID, "system", _content("Invoice 1"))
+
+        planned = planner.plan(KEY, MODEL_ID, "system", _content("Invoice 2"))
+
+        assert planned == [
+            {"text": f"{STATIC}<document>\n"},
+            {"cachePoint": {"type": "default"}},
+            {"text": "Invoice 2\n</document>"},
+        ]
+        assert planner.get_stats(KEY)["planned_requests"] == 1
+
+    def test_identical_items_and_images_belong_to_prefix(self):
+        planner = CachePointPlanner()
+        planner.plan(KEY, MODEL_ID, "system", [{"text": STATIC}, IMAGE, {"text": "a"}])
+
+        planned = planner.plan(
+            KEY, MODEL_ID, "system", [{"text": STATIC}, IMAGE, {"text": "b"}]
+        )
+
+        assert planned[2] == {"cachePoint": {"type": "default"}}
+        assert planned[3] == {"text": "b"}
+
+    def test_short_prefix_is_not_cached(self):
+        planner = CachePointPlanner()
+        planner.plan(KEY, MODEL_ID, "system", [{"text": "Classify:\nInvoice 1"}])
+
+        content = [{"text": "Classify:\nInvoice 2"}]
+        assert planner.plan(KEY, MODEL_ID, "system", content) is content
+
+    def test_prefix_is_matched_against_recent_templates(self):
+        planner = CachePointPlanner()
+        other = "".join(f"- field_{i}: other class field {i}\n" for i in range(150))
+        planner.plan(KEY, MODEL_ID, "system", _content("Invoice 1"))
+        planner.plan(KEY, MODEL_ID, "system", [{"text": f"{other}Letter 1"}])
+
+        planned = planner.plan(KEY, MODEL_ID, "system", _content("Invoice 2"))
+
+        assert planned[0] == {"text": f"{STATIC}<document>\n"}
+
+    def test_different_system_prompt_is_not_compared(self):
+        planner = CachePointPlanner()
+        planner.plan(KEY, MODEL_ID, "system", _content("Invoice 1"))
+
+        content = _content("Invoice 2")
+        assert planner.plan(KEY, MODEL_ID, "other system", content) is content
+
+    def test_identical_request_is_unchanged(self):
+        planner = CachePointPlanner()
+        planner.plan(KEY, MODEL_ID, "system", _content("Invoice 1"))
+
+        content = _content("Invoice 1")
+        assert planner.plan(KEY, MODEL_ID, "system", content) is content
+
+    def test_read_and_write_ratios(self):
+        planner = CachePointPlanner()
+        planner.record_usage(KEY, {"inputTokens": 100, "cacheWriteInputTokens": 1900})
+        planner.record_usage(KEY, {"inputTokens": 100, "cacheReadInputTokens": 1900})
+
+        stats = planner.get_stats()[KEY]
+
+        assert stats["requests"] == 2
+        assert stats["cache_read_ratio"] == pytest.approx(0.475)
+        assert stats["cache_write_ratio"] == pytest.approx(0.475)
+
+
+@pytest.mark.unit
+class TestBedrockClientAutoCachepoint:
+    def _client(self, **kwargs):
+        client = BedrockClient(
+            region="us-west-2",
+            metrics_enabled=False,
+            cachepoint_planner=CachePointPlanner(),
+            **kwargs,
+        )
+        client._client = MagicMock()
+        client._client.converse.return_value = converse_response(
+            {"inputTokens": 10, "cacheReadInputTokens": 90}
+        )
+        return client
+
+    def _sent_content(self, client):
+        return client._client.converse.call_args.kwargs["messages"][0]["content"]
+
+    def test_repeated_template_gets_cachepoint(self):
+        client = self._client()
+        for text in ["Invoice 1", "Invoice 2"]:
+            client.invoke_model(
+                MODEL_ID, "system", _content(text), context="Extraction"
+            )
+
+        assert {"cachePoint": {"type": "default"}} in self._sent_content(client)
+        assert client.cachepoint_planner.get_stats(KEY)["cache_read_ratio"] == 0.9
+
+    def test_ratios_are_published_per_template(self):
+        client = self._client()
+        client.metrics_enabled = True
+
+        with patch("idp_common.metrics.put_metric") as mock_put_metric:
+            client.invoke_model(
+                MODEL_ID, "system", _content("Invoice 1"), context="Extraction"
+            )
+
+        published = {
+            call.args[0]: call.args[1:]
+            for call in mock_put_metric.call_args_list
+            if call.args[0].startswith("BedrockCache")
+        }
+        dimensions = [{"Name": "Template", "Value": KEY}]
+        assert published["BedrockCacheReadRatio"] == (90.0, "Percent", dimensions)
+        assert published["BedrockCacheWriteRatio"] == (0.0, "Percent", dimensions)
+
+    def test_unsupported_model_and_disabled_planner_are_unchanged(self):
+        for client, model_id in [
+            (self._client(), "anthropic.claude-3-sonnet-20240229-v1:0"),
+            (self._client(auto_cachepoint=False), MODEL_ID),
+        ]:
+            for text in ["Invoice 1", "Invoice 2"]:
+                client.invoke_model(model_id, "system", _content(text))
+
+            assert self._sent_content(client) == _content("Invoice 2")
+
+    def test_explicit_tags_take_precedence(self):
+        client = self._client()
+        client.invoke_model(MODEL_ID, "system", _content("Invoice 1"))
+        client.invoke_model(
+            MODEL_ID, "system", [{"text": "Static<<CACHEPOINT>>Invoice 2"}]
+        )
+
+        assert self._sent_content(client) == [
+            {"text": "Static"},
+            {"cachePoint": {"type": "default"}},
+            {"text": "Invoice 2"},
+        ]
@@ -0,0 +1,270 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the Bedrock retry scheduler.
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+from idp_common.bedrock.client import BedrockClient
+from idp_common.bedrock.retry import (
+    AdaptiveRateLimiter,
+    CircuitBreaker,
+    RetryScheduler,
+    full_jitter_backoff,
+)
+
+MODEL_ID = "us.amazon.nova-lite-v1:0"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def throttling_error():
+    return ClientError(
+        {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+        "Converse",
+    )
+
+
+def converse_response():
+    return {
+        "output": {"message": {"content": [{"text": "ok"}]}},
+        "usage": {"inputTokens": 10, "outputTokens": 2, "totalTokens": 12},
+    }
+
+
+@pytest.mark.unit
+class TestFullJitterBackoff:
+    def test_backoff_is_within_exponential_cap(self):
+        for retry_count in range(6):
+            cap = min(30, 2 * 2**retry_count)
+            for _ in range(20):
+                assert 0 <= full_jitter_backoff(retry_count, 2, 30) <= cap
+
+    def test_backoff_is_spread_out(self):
+        delays = {round(full_jitter_backoff(3, 2, 300), 3) for _ in range(50)}
+        assert len(delays) > 40
+
+
+@pytest.mark.unit
+class TestAdaptiveRateLimiter:
+    def test_inactive_until_throttled(self):
+        limiter = AdaptiveRateLimiter(clock=FakeClock())
+        assert [limiter.reserve() for _ in range(5)] == [0.0] * 5
+        assert not limiter.enabled
+
+    def test_throttle_reduces_measured_rate_and_spaces_slots(self):
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(clock=clock)
+        for _ in range(15):  # 10 requests/s
+            limiter.reserve()
+            clock.now += 0.1
+
+        limiter.on_throttle()
+
+        assert limiter.enabled
+        assert limiter.measured_rate == pytest.approx(10, rel=0.15)
+        assert limiter.rate == pytest.approx(limiter.measured_rate * 0.7)
+        waits = [limiter.reserve() for _ in range(4)]
+        assert waits[0] == 0.0
+        # Each caller gets its own slot instead of all retrying at once
+        assert waits == sorted(waits)
+        assert waits[3] == pytest.approx(3 / limiter.rate)
+
+    def test_concurrent_throttles_reduce_rate_once(self):
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(clock=clock)
+        limiter.on_throttle()
+        rate = limiter.rate
+
+        for _ in range(20):
+            limiter.on_throttle()
+
+        assert limiter.rate == rate
+
+    def test_success_increases_rate(self):
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(min_rate=0.1, clock=clock)
+        limiter.on_throttle()
+        rate = limiter.rate
+
+        clock.now += 10
+        limiter.on_success()
+
+        assert limiter.rate > rate
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_throttles(self):
+        breaker = CircuitBreaker(
+            failure_threshold=3, reset_timeout=10, clock=FakeClock()
+        )
+
+        assert not breaker.on_throttle()
+        assert not breaker.on_throttle()
+        breaker.on_success()  # resets the run
+        assert not breaker.on_throttle()
+        assert not breaker.on_throttle()
+        assert breaker.on_throttle()
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_single_probe_after_cooldown(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.on_throttle()
+
+        assert breaker.wait_until_closed() > 0
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+        # A second caller waits for the probe result
+        released = threading.Event()
+
+        def waiter():
+            breaker.wait_until_closed()
+            released.set()
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        assert not released.wait(0.1)
+
+        breaker.on_success()
+        thread.join(timeout=1)
+        assert released.is_set()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_throttled_probe_doubles_open_period(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.on_throttle()
+        clock.now += 10
+        breaker.wait_until_closed()  # probe
+
+        assert breaker.on_throttle()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker._open_until == pytest.approx(clock.now + 20)
+
+    def test_disabled_breaker_never_opens(self):
+        breaker = CircuitBreaker(failure_threshold=0)
+        for _ in range(50):
+            assert not breaker.on_throttle()
+        assert breaker.wait_until_closed() == 0.0
+
+
+@pytest.mark.unit
+class TestBedrockClientRetries:
+    def _client(self, scheduler):
+        client = BedrockClient(
+            region="us-west-2",
+            max_retries=3,
+            metrics_enabled=False,
+            retry_scheduler=scheduler,
+        )
+        client._client = MagicMock()
+        return client
+
+    def test_throttled_request_is_retried_with_recorded_waits(self):
+        sleeps = []
+        scheduler = RetryScheduler(failure_threshold=0, sleep=sleeps.append)
+        client = self._client(scheduler)
+        client._client.converse.side_effect = [
+            throttling_error(),
+            throttling_error(),
+            converse_response(),
+        ]
+
+        result = client.invoke_model(MODEL_ID, "system", [{"text": "hi"}])
+
+        assert result["response"]["usage"]["totalTokens"] == 12
+        assert client._client.converse.call_count == 3
+        stats = scheduler.get_stats(MODEL_ID)
+        assert stats["attempts"] == 3
+        assert stats["throttles"] == 2
+        assert stats["backoff_wait_seconds"] + stats[
+            "rate_limit_wait_seconds"
+        ] == pytest.approx(sum(sleeps))
+
+    def test_max_retries_exceeded_raises(self):
+        scheduler = RetryScheduler(
+            rate_limiting=False, failure_threshold=0, sleep=lambda _: None
+        )
+        client = self._client(scheduler)
+        client._client.converse.side_effect = throttling_error()
+
+        with pytest.raises(ClientError):
+            client.invoke_model(MODEL_ID, "system", [{"text": "hi"}])
+
+        assert client._client.converse.call_count == 4  # first attempt + 3 retries
+
+    def test_botocore_does_not_retry_underneath_the_scheduler(self):
+        client = BedrockClient(region="us-west-2", metrics_enabled=False)
+
+        with patch("idp_common.bedrock.client.get_client") as mock_get_client:
+            client.client
+
+        retries = mock_get_client.call_args.kwargs["retries"]
+        assert retries == {"mode": "standard", "max_attempts": 1}
+
+    def test_non_retryable_error_is_not_retried(self):
+        scheduler = RetryScheduler(sleep=lambda _: None)
+        client = self._client(scheduler)
+        client._client.converse.side_effect = ClientError(
+            {"Error": {"Code": "ValidationException", "Message": "bad"}}, "Converse"
+        )
+
+        with pytest.raises(ClientError):
+            client.invoke_model(MODEL_ID, "system", [{"text": "hi"}])
+
+        assert client._client.converse.call_count == 1
+        assert scheduler.get_stats(MODEL_ID)["throttles"] == 0
+
+    def test_open_breaker_reports_circuit_metrics(self):
+        scheduler = RetryScheduler(
+            rate_limiting=False,
+            failure_threshold=2,
+            reset_timeout=0.01,
+            sleep=lambda _: None,
+        )
+        client = self._client(scheduler)
+        client.metrics_enabled = True
+        client._client.converse.side_effect = [
+            throttling_error(),
+            throttling_error(),
+            converse_response(),
+        ]
+
+        with patch.object(client, "_put_metric") as mock_put_metric:
+            client.invoke_model(MODEL_ID, "system", [{"text": "hi"}])
+
+        metric_names = [call.args[0] for call in mock_put_metric.call_args_list]
+        assert "BedrockCircuitBreakerOpened" in metric_names
+        assert "BedrockCircuitBreakerWaitTime" in metric_names
+        assert "BedrockRetryBackoffTime" in metric_names
+        assert scheduler.get_stats(MODEL_ID)["circuit_opened"] == 1
+
+    def test_embedding_retries_share_model_state(self):
+        scheduler = RetryScheduler(failure_threshold=0, sleep=lambda _: None)
+        client = self._client(scheduler)
+        body = MagicMock()
+        body.read.return_value = b'{"embedding": [0.1, 0.2]}'
+        client._client.invoke_model.side_effect = [
+            ClientError(
+                {"Error": {"Code": "ThrottlingException", "Message": "slow"}},
+                "InvokeModel",
+            ),
+            {"body": body},
+        ]
+
+        assert client.generate_embedding(
+            "text", model_id="amazon.titan-embed-text-v1"
+        ) == [0.1, 0.2]
+        assert scheduler.get_stats("amazon.titan-embed-text-v1")["throttles"] == 1
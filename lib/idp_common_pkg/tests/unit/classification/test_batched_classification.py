@@ -0,0 +1,178 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for batched multi-page classification.
+"""
+
+import json
+import re
+import threading
+from unittest.mock import patch
+
+import pytest
+from idp_common.classification.service import ClassificationService
+from idp_common.models import Document, Page, Status
+
+SERVICE = "idp_common.classification.service.ClassificationService"
+PAGE_TAG = re.compile(r'<page number="(\d+)">\n(.*)', re.S)
+
+
+def _response(text, tokens=100):
+    return {
+        "response": {"output": {"message": {"content": [{"text": text}]}}},
+        "metering": {
+            "Classification/bedrock/model": {
+                "inputTokens": tokens,
+                "totalTokens": tokens,
+            }
+        },
+    }
+
+
+class FakeModel:
+    """Classifies pages by the first word of their text ("invoice 3" -> invoice)."""
+
+    def __init__(
+        self, drop_labels=(), fail_batches_larger_than=None, fail_single_pages=False
+    ):
+        self.drop_labels = set(drop_labels)
+        self.fail_batches_larger_than = fail_batches_larger_than
+        self.fail_single_pages = fail_single_pages
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, content, config):
+        texts = [item["text"] for item in content if "text" in item]
+        pages = [m.groups() for m in map(PAGE_TAG.match, texts) if m]
+        with self._lock:
+            self.calls.append({"content": content, "pages": len(pages)})
+
+        if not pages:
+            if self.fail_single_pages:
+                raise Exception("ThrottlingException")
+            # Page-level prompt: the page text follows "Text:"
+            page_text = texts[-1].split("Text:", 1)[1].strip()
+            return _response(json.dumps({"class": page_text.split()[0]}))
+
+        if (
+            self.fail_batches_larger_than is not None
+            and len(pages) > self.fail_batches_larger_than
+        ):
+            raise Exception("ThrottlingException")
+        answers = [
+            {"page": label, "class": text.split()[0]}
+            for label, text in pages
+            if text not in self.drop_labels
+        ]
+        return _response(json.dumps({"pages": answers}), tokens=100 * len(pages))
+
+
+@pytest.mark.unit
+class TestBatchedClassification:
+    @pytest.fixture
+    def config(self):
+        return {
+            "classes": [
+                {"name": "invoice", "description": "An invoice"},
+                {"name": "letter", "description": "A letter"},
+            ],
+            "classification": {
+                "model": "us.anthropic.claude-3-7-sonnet-20250219-v1:0",
+                "classificationMethod": "multimodalBatchedPageClassification",
+                "batch_size": 10,
+                "system_prompt": "You classify documents.",
+                "task_prompt": "{CLASS_NAMES_AND_DESCRIPTIONS}\nText: {DOCUMENT_TEXT}",
+            },
+        }
+
+    def _document(self, num_pages):
+        document = Document(id="doc", input_key="doc.pdf", status=Status.CLASSIFYING)
+        for i in range(1, num_pages + 1):
+            document.pages[str(i)] = Page(
+                page_id=str(i), parsed_text_uri=f"s3://bucket/{i}.txt"
+            )
+        return document
+
+    def _texts(self, num_pages):
+        return {
+            f"s3://bucket/{i}.txt": f"{'invoice' if i <= num_pages // 2 else 'letter'} {i}"
+            for i in range(1, num_pages + 1)
+        }
+
+    def _classify(self, config, document, model, texts):
+        service = ClassificationService(region="us-west-2", config=config)
+        with (
+            patch("idp_common.s3.get_text_content", side_effect=texts.get),
+            patch(f"{SERVICE}._invoke_bedrock_model", side_effect=model),
+        ):
+            return service.classify_document(document)
+
+    def test_pages_are_classified_in_batches(self, config):
+        model = FakeModel()
+        document = self._classify(config, self._document(25), model, self._texts(25))
+
+        assert sorted(call["pages"] for call in model.calls) == [5, 10, 10]
+        assert document.status == Status.CLASSIFYING
+        assert not document.errors
+        assert [s.classification for s in document.sections] == ["invoice", "letter"]
+        assert document.sections[0].page_ids == [str(i) for i in range(1, 13)]
+        # Each page's share of the calls is counted once
+        assert document.metering["Classification/bedrock/model"]["totalTokens"] == 2500
+
+    def test_shared_prefix_is_cached_for_supported_models(self, config):
+        model = FakeModel()
+        self._classify(config, self._document(3), model, self._texts(3))
+
+        content = model.calls[0]["content"]
+        texts = [item.get("text", "") for item in content]
+        prefix = next(i for i, text in enumerate(texts) if "<<CACHEPOINT>>" in text)
+        assert "invoice" in texts[0]
+        assert not any(PAGE_TAG.match(text) for text in texts[:prefix])
+        assert all(
+            PAGE_TAG.match(text) or text == "</page>" for text in texts[prefix + 1 :]
+        )
+
+    def test_pages_without_answer_are_retried(self, config):
+        model = FakeModel(drop_labels={"letter 7"})
+        document = self._classify(config, self._document(8), model, self._texts(8))
+
+        assert [call["pages"] for call in model.calls] == [8, 0]
+        assert document.pages["7"].classification == "letter"
+        assert not document.errors
+
+    def test_failed_batches_are_split(self, config):
+        model = FakeModel(fail_batches_larger_than=2)
+        document = self._classify(config, self._document(8), model, self._texts(8))
+
+        sizes = sorted(call["pages"] for call in model.calls)
+        assert sizes == [2, 2, 2, 2, 4, 4, 8]
+        assert all(page.classification for page in document.pages.values())
+        assert not document.errors
+
+    def test_batches_without_classified_pages_are_metered(self, config):
+        texts = self._texts(4)
+        model = FakeModel(drop_labels=set(texts.values()), fail_single_pages=True)
+        document = self._classify(config, self._document(4), model, texts)
+
+        assert len(document.errors) == 4
+        # One call of 4 pages and two of 2 pages answered no page
+        assert document.metering["Classification/bedrock/model"]["totalTokens"] == 800
+
+    def test_batch_size_is_configurable(self, config):
+        config["classification"]["batch_size"] = 4
+        model = FakeModel()
+        self._classify(config, self._document(10), model, self._texts(10))
+
+        assert sorted(call["pages"] for call in model.calls) == [2, 4, 4]
+
+    def test_sagemaker_backend_falls_back_to_page_level(self, config):
+        with (
+            patch.dict("os.environ", {"SAGEMAKER_ENDPOINT_NAME": "endpoint"}),
+            patch("idp_common.classification.service.get_client"),
+        ):
+            service = ClassificationService(
+                region="us-west-2", config=config, backend="sagemaker"
+            )
+
+        assert service.classification_method == service.MULTIMODAL_PAGE_LEVEL
@@ -123,7 +123,7 @@ class TestClassificationService:
             assert service.backend == "sagemaker"
             assert service.sagemaker_endpoint == "test-endpoint"
             mock_client.assert_called_once_with(
-                "sagemaker-runtime", region_name="us-west-2"
+                "sagemaker-runtime", region_name="us-west-2", config=ANY
             )
 
     def test_init_with_invalid_backend(self, mock_config):
@@ -0,0 +1,221 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the content-addressed page classification cache.
+"""
+
+import io
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from idp_common.classification.page_cache import (
+    DiskCacheBackend,
+    DynamoDBCacheBackend,
+    MemoryCacheBackend,
+    PageClassificationCache,
+    image_hash,
+    make_cache_key,
+)
+from idp_common.classification.service import ClassificationService
+
+
+@pytest.fixture
+def real_pil(monkeypatch):
+    """Undo PIL mocks installed at import time by other test modules."""
+    for name in ("PIL", "PIL.Image", "PIL.ImageDraw"):
+        if isinstance(sys.modules.get(name), MagicMock):
+            monkeypatch.delitem(sys.modules, name)
+
+
+def _page_image(size=(200, 260), fmt="PNG"):
+    from PIL import Image, ImageDraw
+
+    img = Image.new("L", size, 255)
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([0, 0, size[0] // 2, size[1] // 3], fill=0)
+    draw.ellipse([size[0] // 2, size[1] // 2, size[0], size[1]], fill=96)
+    buffer = io.BytesIO()
+    img.save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+@pytest.mark.unit
+class TestCacheKey:
+    def test_image_hash_is_stable_across_encodings(self, real_pil):
+        assert image_hash(_page_image()) == image_hash(
+            _page_image(size=(400, 520), fmt="JPEG")
+        )
+        assert image_hash(_page_image()) != image_hash(_page_image(size=(520, 200)))
+
+    def test_key_ignores_whitespace_and_depends_on_model_and_config(self):
+        key = make_cache_key("Terms  and\nconditions", None, "model", "cfg")
+
+        assert key == make_cache_key("Terms and conditions ", None, "model", "cfg")
+        assert key != make_cache_key("Terms and conditions", None, "other", "cfg")
+        assert key != make_cache_key("Terms and conditions", None, "model", "cfg2")
+        assert key.startswith("pagecache#")
+
+
+@pytest.mark.unit
+class TestBackends:
+    def test_memory_backend_evicts_least_recently_used(self):
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.put("a", {"doc_type": "a"}, 60)
+        backend.put("b", {"doc_type": "b"}, 60)
+        backend.get("a")
+        backend.put("c", {"doc_type": "c"}, 60)
+
+        assert backend.get("b") is None
+        assert backend.get("a") == {"doc_type": "a"}
+        assert backend.get("c") == {"doc_type": "c"}
+
+    def test_memory_backend_expires_entries(self):
+        backend = MemoryCacheBackend()
+        backend.put("a", {"doc_type": "a"}, -1)
+
+        assert backend.get("a") is None
+
+    def test_disk_backend_round_trip_and_eviction(self, tmp_path):
+        backend = DiskCacheBackend(str(tmp_path), max_entries=2)
+        for key in ["pagecache#a", "pagecache#b", "pagecache#c"]:
+            backend.put(key, {"doc_type": key}, 60)
+            # Distinct modification times for the eviction order
+            time.sleep(0.01)
+
+        assert backend.get("pagecache#a") is None
+        assert backend.get("pagecache#c") == {"doc_type": "pagecache#c"}
+        assert len(list(tmp_path.glob("*.json"))) == 2
+
+    def test_dynamodb_backend_uses_ttl_attribute(self):
+        table = MagicMock()
+        with patch(
+            "idp_common.classification.page_cache.get_resource"
+        ) as mock_resource:
+            mock_resource.return_value.Table.return_value = table
+            backend = DynamoDBCacheBackend("tracking-table", "us-east-1")
+
+        backend.put("pagecache#a", {"doc_type": "invoice"}, 60)
+        item = table.put_item.call_args.kwargs["Item"]
+        assert item["PK"] == "pagecache#a"
+        assert item["ExpiresAfter"] > time.time()
+
+        table.get_item.return_value = {"Item": item}
+        assert backend.get("pagecache#a") == {"doc_type": "invoice"}
+        table.get_item.return_value = {"Item": dict(item, ExpiresAfter=1)}
+        assert backend.get("pagecache#a") is None
+
+
+@pytest.mark.unit
+class TestPageClassificationCache:
+    def test_disabled_by_default(self):
+        assert PageClassificationCache.from_config({}) is None
+
+    def test_dynamodb_backend_requires_table(self):
+        with pytest.raises(ValueError):
+            PageClassificationCache.from_config(
+                {"enabled": True, "backend": "dynamodb"}
+            )
+
+    def test_counts_hits_and_saved_tokens(self):
+        cache = PageClassificationCache(MemoryCacheBackend())
+        cache.put(
+            "k", "invoice", 1.0, {"Classification/bedrock/m": {"totalTokens": 900}}
+        )
+
+        assert cache.get("missing") is None
+        assert cache.get("k")["doc_type"] == "invoice"
+        assert cache.get("k")["doc_type"] == "invoice"
+        assert cache.stats() == {
+            "hits": 2,
+            "misses": 1,
+            "hit_rate": pytest.approx(2 / 3),
+            "saved_tokens": 1800,
+        }
+
+    def test_backend_errors_are_misses(self):
+        backend = MagicMock()
+        backend.get.side_effect = Exception("unavailable")
+        cache = PageClassificationCache(backend)
+
+        assert cache.get("k") is None
+        assert cache.misses == 1
+
+
+@pytest.mark.unit
+class TestClassificationServicePageCache:
+    @pytest.fixture
+    def config(self):
+        return {
+            "classes": [
+                {"name": "invoice", "description": "An invoice document"},
+                {"name": "terms", "description": "Terms and conditions"},
+            ],
+            "classification": {
+                "model": "anthropic.claude-3-sonnet-20240229-v1:0",
+                "system_prompt": "You are a document classification assistant.",
+                "task_prompt": "{CLASS_NAMES_AND_DESCRIPTIONS}\n{DOCUMENT_TEXT}",
+                "page_cache": {"enabled": True, "backend": "memory"},
+            },
+        }
+
+    def _classify(self, service, page_texts):
+        with (
+            patch("idp_common.s3.get_text_content") as mock_get_text,
+            patch(
+                "idp_common.classification.service.ClassificationService._invoke_bedrock_model"
+            ) as mock_invoke,
+            patch("idp_common.classification.service.metrics") as mock_metrics,
+        ):
+            mock_get_text.side_effect = lambda uri: page_texts[uri]
+            mock_invoke.return_value = {
+                "response": {
+                    "output": {"message": {"content": [{"text": '{"class": "terms"}'}]}}
+                },
+                "metering": {"Classification/bedrock/m": {"totalTokens": 500}},
+            }
+            results = [
+                service.classify_page_bedrock(page_id=str(i), text_uri=uri)
+                for i, uri in enumerate(page_texts)
+            ]
+        return results, mock_invoke, mock_metrics
+
+    def test_identical_pages_skip_bedrock_across_documents(self, config):
+        texts = {
+            "s3://bucket/doc1/1.txt": "Terms and conditions apply.",
+            "s3://bucket/doc2/1.txt": "Terms and conditions apply.",
+            "s3://bucket/doc2/2.txt": "Invoice 42",
+        }
+        results, mock_invoke, mock_metrics = self._classify(
+            ClassificationService(region="us-west-2", config=config), texts
+        )
+
+        assert mock_invoke.call_count == 2
+        assert [r.classification.doc_type for r in results] == ["terms"] * 3
+        assert results[1].classification.metadata == {
+            "metering": {},
+            "page_cache_hit": True,
+        }
+        mock_metrics.put_metric.assert_any_call(
+            "ClassificationPageCacheSavedTokens", 500
+        )
+
+        # A new service instance (e.g. the next Lambda invocation) shares the cache
+        _, mock_invoke, _ = self._classify(
+            ClassificationService(region="us-west-2", config=config),
+            {"s3://bucket/doc3/1.txt": "Terms and conditions apply."},
+        )
+        mock_invoke.assert_not_called()
+
+    def test_config_change_invalidates_cache(self, config):
+        texts = {"s3://bucket/doc1/1.txt": "Terms and conditions apply."}
+        self._classify(ClassificationService(region="us-west-2", config=config), texts)
+
+        config["classification"]["task_prompt"] += "\nRespond in JSON."
+        _, mock_invoke, _ = self._classify(
+            ClassificationService(region="us-west-2", config=config), texts
+        )
+
+        mock_invoke.assert_called_once()
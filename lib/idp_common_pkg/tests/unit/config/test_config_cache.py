@@ -0,0 +1,228 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the configuration cache.
+"""
+
+import copy
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from idp_common import config as config_module
+from idp_common.config.cache import ConfigurationCache, FrozenDict, FrozenList, freeze
+
+
+def _make_reader(versions, merged):
+    reader = MagicMock()
+    reader.get_configuration_versions.side_effect = lambda: dict(versions)
+    reader.get_merged_configuration.side_effect = lambda: copy.deepcopy(merged)
+    return reader
+
+
+@pytest.mark.unit
+class TestFreeze:
+    """Tests for read-only configuration values."""
+
+    def test_frozen_values_reject_mutation(self):
+        """Test that nested dicts and lists cannot be modified."""
+        frozen = freeze({"classification": {"classes": [{"name": "invoice"}]}})
+
+        assert isinstance(frozen, dict)
+        assert isinstance(frozen["classification"]["classes"], list)
+        with pytest.raises(TypeError, match="read-only"):
+            frozen["classification"]["model"] = "x"
+        with pytest.raises(TypeError, match="read-only"):
+            frozen["classification"]["classes"].append({})
+        with pytest.raises(TypeError, match="read-only"):
+            frozen.update({"a": 1})
+
+    def test_copies_are_mutable(self):
+        """Test that copies of frozen values are ordinary containers."""
+        frozen = freeze({"ocr": {"features": [{"name": "LAYOUT"}]}})
+
+        deep = copy.deepcopy(frozen)
+        assert type(deep) is dict
+        assert type(deep["ocr"]["features"]) is list
+        deep["ocr"]["features"].append({"name": "TABLES"})
+
+        shallow = frozen.copy()
+        shallow["sagemaker_endpoint_name"] = "endpoint"
+        assert "sagemaker_endpoint_name" not in frozen
+
+    def test_json_serializable(self):
+        """Test that frozen values serialize like regular dicts."""
+        frozen = freeze({"a": [1, {"b": "c"}]})
+        assert json.loads(json.dumps(frozen)) == {"a": [1, {"b": "c"}]}
+        assert isinstance(frozen, FrozenDict)
+        assert isinstance(frozen["a"], FrozenList)
+
+
+@pytest.mark.unit
+class TestConfigurationCache:
+    """Tests for the ConfigurationCache class."""
+
+    def test_cache_hit_within_ttl(self):
+        """Test that no DynamoDB reads happen before the TTL expires."""
+        reader = _make_reader({"Default": "v1"}, {"a": 1})
+        cache = ConfigurationCache(lambda table: reader)
+
+        first = cache.get("table", ttl=60)
+        second = cache.get("table", ttl=60)
+
+        assert first is second
+        assert reader.get_configuration_versions.call_count == 1
+        assert reader.get_merged_configuration.call_count == 1
+
+    def test_unchanged_versions_skip_reload(self):
+        """Test that an expired entry with unchanged versions is reused."""
+        reader = _make_reader({"Default": "v1", "Custom": "c1"}, {"a": 1})
+        cache = ConfigurationCache(lambda table: reader)
+
+        first = cache.get("table", ttl=0)
+        second = cache.get("table", ttl=0)
+
+        assert first is second
+        assert reader.get_configuration_versions.call_count == 2
+        assert reader.get_merged_configuration.call_count == 1
+
+    def test_changed_version_reloads(self):
+        """Test that a new version triggers a full reload."""
+        versions = {"Default": "v1", "Custom": "c1"}
+        reader = _make_reader(versions, {"a": 1})
+        cache = ConfigurationCache(lambda table: reader)
+
+        cache.get("table", ttl=0)
+        versions["Custom"] = "c2"
+        reader.get_merged_configuration.side_effect = lambda: {"a": 2}
+
+        assert cache.get("table", ttl=0) == {"a": 2}
+        assert reader.get_merged_configuration.call_count == 2
+
+    def test_missing_version_always_reloads(self):
+        """Test that items without a version attribute are never assumed unchanged."""
+        reader = _make_reader({"Default": None}, {"a": 1})
+        cache = ConfigurationCache(lambda table: reader)
+
+        cache.get("table", ttl=0)
+        cache.get("table", ttl=0)
+
+        assert reader.get_merged_configuration.call_count == 2
+
+    def test_reader_created_once_per_table(self):
+        """Test that readers are reused across refreshes."""
+        factory = MagicMock(
+            side_effect=lambda table: _make_reader({"Default": "v1"}, {})
+        )
+        cache = ConfigurationCache(factory)
+
+        cache.get("table-a", ttl=0)
+        cache.get("table-a", ttl=0)
+        cache.get("table-b", ttl=0)
+
+        assert factory.call_count == 2
+
+
+@pytest.mark.unit
+class TestGetConfig:
+    """Tests for get_config caching behavior."""
+
+    def setup_method(self):
+        config_module.clear_config_cache()
+
+    def teardown_method(self):
+        config_module.clear_config_cache()
+
+    def test_get_config_uses_cache(self, monkeypatch):
+        """Test that repeated get_config calls share one frozen configuration."""
+        monkeypatch.setenv("CONFIGURATION_TABLE_NAME", "config-table")
+        reader = _make_reader({"Default": "v1"}, {"extraction": {"model": "m"}})
+        with patch.object(
+            config_module._config_cache, "_reader_factory", return_value=reader
+        ):
+            first = config_module.get_config()
+            second = config_module.get_config()
+
+        assert first is second
+        assert first["extraction"]["model"] == "m"
+        with pytest.raises(TypeError):
+            first["extraction"]["model"] = "other"
+
+    def test_get_config_without_cache(self, monkeypatch):
+        """Test that a TTL of 0 returns a fresh mutable configuration."""
+        monkeypatch.setenv("CONFIGURATION_TABLE_NAME", "config-table")
+        with patch("idp_common.config.ConfigurationReader") as mock_reader_class:
+            mock_reader_class.return_value.get_merged_configuration.return_value = {
+                "a": 1
+            }
+            result = config_module.get_config(ttl=0)
+
+        assert result == {"a": 1}
+        mock_reader_class.assert_called_once_with(None)
+
+    def test_get_config_requires_table_name(self, monkeypatch):
+        """Test that a missing table name raises ValueError."""
+        monkeypatch.delenv("CONFIGURATION_TABLE_NAME", raising=False)
+        with pytest.raises(ValueError, match="Configuration table name not provided"):
+            config_module.get_config()
+
+    def test_get_config_version(self, monkeypatch):
+        """Test that the version identifier combines the item versions."""
+        monkeypatch.setenv("CONFIGURATION_TABLE_NAME", "config-table")
+        versions = {"Default": "v1", "Custom": "c1"}
+        reader = _make_reader(versions, {"a": 1})
+        with patch.object(
+            config_module._config_cache, "_reader_factory", return_value=reader
+        ):
+            assert config_module.get_config_version() == "Custom:c1,Default:v1"
+            config_module.get_config()
+
+            versions["Custom"] = None
+            config_module.clear_config_cache()
+            assert config_module.get_config_version() is None
+
+        assert reader.get_merged_configuration.call_count == 2
+
+
+@pytest.mark.unit
+class TestConfigurationReaderVersions:
+    """Tests for ConfigurationReader version handling."""
+
+    def _reader(self):
+        with patch("idp_common.config.get_resource"):
+            reader = config_module.ConfigurationReader("config-table")
+        reader.table.name = "config-table"
+        return reader
+
+    def test_get_configuration_versions(self):
+        """Test that versions are read with a single projected batch request."""
+        reader = self._reader()
+        reader.dynamodb.batch_get_item.return_value = {
+            "Responses": {
+                "config-table": [
+                    {"Configuration": "Default", "ConfigVersion": "v1"},
+                    {"Configuration": "Custom"},
+                ]
+            },
+            "UnprocessedKeys": {},
+        }
+
+        assert reader.get_configuration_versions() == {"Default": "v1", "Custom": None}
+        request = reader.dynamodb.batch_get_item.call_args.kwargs["RequestItems"]
+        assert "ProjectionExpression" in request["config-table"]
+
+    def test_merged_configuration_strips_version(self):
+        """Test that the version attribute does not leak into the configuration."""
+        reader = self._reader()
+        items = {
+            "Default": {
+                "Configuration": "Default",
+                "ConfigVersion": "v1",
+                "a": {"b": 1},
+            },
+            "Custom": {"Configuration": "Custom", "ConfigVersion": "c1", "a": {"c": 2}},
+        }
+        reader.get_configuration = lambda config_type: dict(items[config_type])
+
+        assert reader.get_merged_configuration() == {"a": {"b": 1, "c": 2}}
@@ -0,0 +1,182 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the criteria validation chunking module.
+"""
+
+import pytest
+from idp_common.criteria_validation import chunking
+from idp_common.criteria_validation.chunking import (
+    TokenEstimator,
+    chunk_text,
+    get_token_estimator,
+    plan_chunks,
+)
+
+
+def _document(paragraphs=12, sentences=6):
+    return "\n\n".join(
+        " ".join(
+            f"Paragraph {p} sentence {s} describes the patient history."
+            for s in range(sentences)
+        )
+        for p in range(paragraphs)
+    )
+
+
+@pytest.mark.unit
+class TestTokenEstimator:
+    def test_estimate_uses_ratio(self):
+        assert TokenEstimator(4).estimate("x" * 400) == 100
+        assert TokenEstimator(4).chars_for_tokens(100) == 400
+
+    def test_calibrate_moves_towards_observed_ratio(self):
+        estimator = TokenEstimator(4)
+
+        estimator.calibrate(3000, 1000)
+        assert estimator.chars_per_token == pytest.approx(3.0)
+
+        estimator.calibrate(2000, 1000)
+        assert 2.0 < estimator.chars_per_token < 3.0
+
+    def test_calibrate_ignores_empty_and_clamps(self):
+        estimator = TokenEstimator(4)
+
+        estimator.calibrate(100, 0)
+        assert estimator.chars_per_token == 4
+        estimator.calibrate(10000, 1)
+        assert estimator.chars_per_token == chunking.MAX_CHARS_PER_TOKEN
+
+    def test_estimators_are_shared_per_model(self):
+        assert get_token_estimator("model-a") is get_token_estimator("model-a")
+        assert get_token_estimator("model-a") is not get_token_estimator("model-b")
+
+
+@pytest.mark.unit
+class TestPlanChunks:
+    def test_short_text_is_single_chunk(self):
+        assert plan_chunks("short text.", 100, 10) == [(0, 11)]
+
+    def test_chunks_cover_text_within_budget(self):
+        text = _document()
+
+        plan = plan_chunks(text, 1000, 100)
+
+        assert plan[0][0] == 0
+        assert plan[-1][1] == len(text)
+        for (start, end), (next_start, _) in zip(plan, plan[1:]):
+            assert next_start <= end
+            assert next_start > start
+        assert all(end - start <= 1000 for start, end in plan)
+
+    def test_chunks_end_on_sentence_boundaries(self):
+        text = _document()
+
+        plan = plan_chunks(text, 1000, 100)
+
+        for _, end in plan[:-1]:
+            assert text[:end].rstrip().endswith(".")
+
+    def test_prefers_paragraph_boundaries(self):
+        # Paragraphs of ~340 characters: 2 fit in 800, 3 would not
+        text = _document(paragraphs=6)
+
+        plan = plan_chunks(text, 800, 0)
+
+        for _, end in plan[:-1]:
+            assert text[:end].endswith("\n\n")
+
+    def test_overlap_is_whole_sentences_within_budget(self):
+        text = _document()
+
+        plan = plan_chunks(text, 1000, 150)
+
+        for (_, end), (next_start, _) in zip(plan, plan[1:]):
+            overlap = text[next_start:end]
+            assert 0 < len(overlap) <= 150
+            assert overlap.startswith("Paragraph")
+
+    def test_oversized_sentences_are_split(self):
+        text = "word " * 500 + "x" * 250
+
+        plan = plan_chunks(text, 100, 0)
+
+        assert "".join(text[start:end] for start, end in plan) == text
+        assert all(end - start <= 100 for start, end in plan)
+
+    def test_fewer_chunks_than_fixed_window_with_same_overlap(self):
+        text = _document(paragraphs=40)
+        budget, overlap = 2000, 200
+
+        plan = plan_chunks(text, budget, overlap)
+
+        fixed_window_chunks = -(-(len(text) - overlap) // (budget - overlap))
+        assert len(plan) <= fixed_window_chunks
+
+
+@pytest.mark.unit
+class TestChunkText:
+    def test_budget_follows_calibration(self):
+        text = _document(paragraphs=20)
+        estimator = TokenEstimator(4)
+        coarse = chunk_text(text, 250, 0, estimator, use_cache=False)
+
+        estimator.calibrate(2000, 1000)
+        fine = chunk_text(text, 250, 0, estimator, use_cache=False)
+
+        assert len(fine) > len(coarse)
+        assert all(len(chunk) <= 500 for chunk in fine)
+
+    def test_plans_are_cached_per_document(self, monkeypatch):
+        text = _document()
+        calls = []
+        original = chunking.plan_chunks
+
+        def counting_plan(*args):
+            calls.append(args)
+            return original(*args)
+
+        monkeypatch.setattr(chunking, "plan_chunks", counting_plan)
+
+        first = chunk_text(text, 250, 25)
+        second = chunk_text(text, 250, 25)
+        chunk_text(text + " More.", 250, 25)
+
+        assert first == second
+        assert len(calls) == 2
+
+    def test_plans_are_reused_across_calibration(self, monkeypatch):
+        text = _document()
+        estimator = TokenEstimator(4)
+        calls = []
+        original = chunking.plan_chunks
+
+        def counting_plan(*args):
+            calls.append(args)
+            return original(*args)
+
+        monkeypatch.setattr(chunking, "plan_chunks", counting_plan)
+
+        first = chunk_text(text, 250, 25, estimator)
+        # Bedrock reports slightly fewer tokens than estimated
+        estimator.calibrate(4200, 1000)
+        second = chunk_text(text, 250, 25, estimator)
+
+        assert estimator.chars_per_token > 4
+        assert first == second
+        assert len(calls) == 1
+
+        # More tokens than estimated: the cached chunks may no longer fit
+        estimator.calibrate(3000, 1000)
+        chunk_text(text, 250, 25, estimator)
+
+        assert len(calls) == 2
+
+    def test_plans_are_not_shared_between_estimators(self):
+        text = _document(paragraphs=20)
+        coarse = chunk_text(text, 250, 25, TokenEstimator(4))
+        fine = chunk_text(text, 250, 25, TokenEstimator(2))
+
+        assert len(fine) > len(coarse)
+        assert all(len(chunk) <= 500 for chunk in fine)
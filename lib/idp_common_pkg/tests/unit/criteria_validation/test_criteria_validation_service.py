@@ -0,0 +1,130 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the CriteriaValidationService class.
+"""
+
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from idp_common.criteria_validation.service import (
+    CriteriaValidationService,
+)
+
+SERVICE = "idp_common.criteria_validation.service"
+
+
+@pytest.mark.unit
+class TestCriteriaValidationService:
+    """Tests for the concurrent execution plan of CriteriaValidationService."""
+
+    @pytest.fixture
+    def config(self):
+        return {
+            "request_bucket": "request-bucket",
+            "request_history_prefix": "prior-auth",
+            "criteria_bucket": "criteria-bucket",
+            "criteria_types": ["medical_necessity", "administration"],
+            "system_prompt": "system",
+            "task_prompt": "Q={question}|{source_filepath}|{criteria_type}|{content}|{recommendation_options}",
+            "model_id": "test-model",
+            "recommendation_options": "Pass/Fail",
+        }
+
+    def _run(self, service, config, num_files, delay=0.05):
+        """Run validate_request with mocked S3 and Bedrock calls."""
+        state = {"active": 0, "peak": 0}
+        lock = threading.Lock()
+        written = {}
+
+        def invoke_model(model_id, system_prompt, content, *args):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(delay)
+            with lock:
+                state["active"] -= 1
+            question, source = content[0]["text"][2:].split("|")[:2]
+            text = json.dumps({"Recommendation": "Pass", "Reasoning": source})
+            return {
+                "response": {"output": {"message": {"content": [{"text": text}]}}},
+                "metering": {"test-model": {"inputTokens": 10}},
+            }
+
+        def write_content(content, bucket, key, content_type=None):
+            written[key] = content
+
+        files = [
+            f"request-bucket/prior-auth-r1/extracted_text/file{i}.txt"
+            for i in range(num_files)
+        ]
+        with (
+            patch(f"{SERVICE}.s3fs") as mock_s3fs,
+            patch(f"{SERVICE}.bedrock.invoke_model", side_effect=invoke_model),
+            patch(
+                f"{SERVICE}.bedrock.extract_text_from_response",
+                side_effect=lambda r: r["response"]["output"]["message"]["content"][0][
+                    "text"
+                ],
+            ),
+            patch(
+                f"{SERVICE}.s3.get_text_content",
+                side_effect=lambda uri: (time.sleep(delay), f"history of {uri}")[1],
+            ),
+            patch(
+                f"{SERVICE}.s3.get_json_content",
+                side_effect=lambda uri: {"criteria": [f"{uri} q{i}" for i in range(3)]},
+            ),
+            patch(f"{SERVICE}.s3.write_content", side_effect=write_content),
+        ):
+            mock_s3fs.S3FileSystem.return_value.ls.return_value = files + ["other.json"]
+            result = service.validate_request("r1", config)
+
+        return result, written, state["peak"]
+
+    def test_tasks_run_concurrently_under_semaphore(self, config):
+        service = CriteriaValidationService(
+            region="us-east-1", config={"criteria_validation": {"semaphore": 6}}
+        )
+
+        start = time.time()
+        result, written, peak = self._run(service, config, num_files=4)
+        elapsed = time.time() - start
+
+        # 4 files x 2 criteria types x 3 questions = 24 calls of 50ms
+        assert peak == 6
+        assert elapsed < 24 * 0.05 / 2
+        assert result.metering == {"test-model": {"inputTokens": 240}}
+        assert result.metadata["files_processed"] == 4
+
+    def test_results_are_in_deterministic_order(self, config):
+        service = CriteriaValidationService(
+            region="us-east-1", config={"criteria_validation": {"semaphore": 8}}
+        )
+
+        _, written, _ = self._run(service, config, num_files=3)
+
+        responses = written["responses/request_id_r1_medical_necessity_responses.json"]
+        assert list(responses) == [
+            f"s3://criteria-bucket/medical_necessity.json q{i}" for i in range(3)
+        ]
+        for question_responses in responses.values():
+            assert [r["source_file"][0][-9:] for r in question_responses] == [
+                "file0.txt",
+                "file1.txt",
+                "file2.txt",
+            ]
+
+    def test_single_file_responses_keep_question_order(self, config):
+        service = CriteriaValidationService(region="us-east-1", config={})
+
+        _, written, _ = self._run(service, config, num_files=1, delay=0)
+
+        responses = written["responses/request_id_r1_administration_responses.json"]
+        assert [r["question"] for r in responses] == [
+            f"s3://criteria-bucket/administration.json q{i}" for i in range(3)
+        ]
@@ -0,0 +1,146 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the DocumentDynamoDBService class.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from idp_common.dynamodb.service import DocumentDynamoDBService
+from idp_common.models import Document, Page, Section, Status
+
+
+@pytest.mark.unit
+class TestDocumentDynamoDBService:
+    """Tests for delta updates in the DocumentDynamoDBService class."""
+
+    @pytest.fixture
+    def mock_client(self):
+        client = MagicMock()
+        client.update_item.return_value = {
+            "Attributes": {
+                "ObjectKey": "test-document.pdf",
+                "ObjectStatus": "EXTRACTING",
+            }
+        }
+        return client
+
+    @pytest.fixture
+    def service(self, mock_client):
+        return DocumentDynamoDBService(dynamodb_client=mock_client)
+
+    @pytest.fixture
+    def document(self):
+        doc = Document(
+            id="test-doc",
+            input_key="test-document.pdf",
+            status=Status.CLASSIFYING,
+            num_pages=3,
+            workflow_execution_arn="arn:aws:states:execution",
+        )
+        doc.pages = {
+            str(i): Page(
+                page_id=str(i),
+                image_uri=f"s3://bucket/{i}.jpg",
+                classification="invoice",
+            )
+            for i in range(1, 4)
+        }
+        doc.sections = [
+            Section(section_id="1", classification="invoice", page_ids=["1", "2", "3"])
+        ]
+        doc.metering = {"bedrock": {"inputTokens": 100}}
+        return doc
+
+    @staticmethod
+    def _update_kwargs(mock_client):
+        return mock_client.update_item.call_args[1]
+
+    def test_first_update_writes_all_attributes(self, service, mock_client, document):
+        """Test that the first update writes every tracking attribute."""
+        service.update_document(document)
+
+        kwargs = self._update_kwargs(mock_client)
+        assert set(kwargs["expression_attribute_names"].values()) == {
+            "ObjectStatus",
+            "WorkflowExecutionArn",
+            "WorkflowStatus",
+            "PageCount",
+            "Pages",
+            "Sections",
+            "Metering",
+        }
+        assert "#Pages = :Pages" in kwargs["update_expression"]
+        assert kwargs["return_values"] == "ALL_NEW"
+
+    def test_repeat_update_writes_only_status(self, service, mock_client, document):
+        """Test that an unchanged document only rewrites its status attributes."""
+        service.update_document(document)
+        document.status = Status.EXTRACTING
+        service.update_document(document)
+
+        kwargs = self._update_kwargs(mock_client)
+        assert (
+            kwargs["update_expression"]
+            == "SET #ObjectStatus = :ObjectStatus, #WorkflowStatus = :WorkflowStatus"
+        )
+        assert kwargs["expression_attribute_values"] == {
+            ":ObjectStatus": "EXTRACTING",
+            ":WorkflowStatus": "RUNNING",
+        }
+
+    def test_changed_page_is_updated_in_place(self, service, mock_client, document):
+        """Test that a single changed page is written as a list element update."""
+        service.update_document(document)
+        document.pages["2"].classification = "receipt"
+        service.update_document(document)
+
+        kwargs = self._update_kwargs(mock_client)
+        assert "#Pages[1] = :Pages1" in kwargs["update_expression"]
+        assert ":Pages" not in kwargs["expression_attribute_values"]
+        assert kwargs["expression_attribute_values"][":Pages1"]["Class"] == "receipt"
+        assert "#Sections" not in kwargs["expression_attribute_names"]
+
+    def test_resized_list_is_replaced(self, service, mock_client, document):
+        """Test that a list whose length changed is written as a whole."""
+        service.update_document(document)
+        document.sections.append(
+            Section(section_id="2", classification="receipt", page_ids=["3"])
+        )
+        service.update_document(document)
+
+        kwargs = self._update_kwargs(mock_client)
+        assert "#Sections = :Sections" in kwargs["update_expression"]
+        assert len(kwargs["expression_attribute_values"][":Sections"]) == 2
+
+    def test_update_document_status(self, service, mock_client, document):
+        """Test the status-only update path."""
+        result = service.update_document_status(document)
+
+        assert result is document
+        kwargs = self._update_kwargs(mock_client)
+        assert kwargs["return_values"] == "NONE"
+        assert "Pages" not in kwargs["expression_attribute_names"].values()
+        assert "ObjectStatus" in document.persisted_state
+
+        # Pages were never written, so a full update still includes them
+        service.update_document(document)
+        kwargs = self._update_kwargs(mock_client)
+        assert "#Pages = :Pages" in kwargs["update_expression"]
+        assert (
+            "WorkflowExecutionArn" not in kwargs["expression_attribute_names"].values()
+        )
+
+    def test_persisted_state_round_trip(self, service, document):
+        """Test that persisted fingerprints survive the stored state between steps."""
+        service.update_document(document)
+
+        assert "persisted_state" not in document.to_dict()
+        assert "persisted_state" not in document.serialize_document(None, "tracking")
+        restored = Document.from_dict(document._state_dict())
+        assert restored.persisted_state == document.persisted_state
+        assert (
+            restored.changed_attributes(service._document_to_attributes(restored)) == {}
+        )
@@ -0,0 +1,135 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the fuzzy matching engine in the evaluation comparator.
+"""
+
+import random
+import string
+
+import pytest
+from idp_common.evaluation import comparator
+from idp_common.evaluation.comparator import (
+    ExactComparator,
+    FuzzyComparator,
+    compare_hungarian,
+    fuzz_score,
+    levenshtein_distance,
+)
+
+
+def _reference_distance(s1: str, s2: str) -> int:
+    """Full-matrix Levenshtein distance."""
+    d = [[0] * (len(s2) + 1) for _ in range(len(s1) + 1)]
+    for i in range(len(s1) + 1):
+        d[i][0] = i
+    for j in range(len(s2) + 1):
+        d[0][j] = j
+    for i in range(1, len(s1) + 1):
+        for j in range(1, len(s2) + 1):
+            cost = 0 if s1[i - 1] == s2[j - 1] else 1
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + cost)
+    return d[len(s1)][len(s2)]
+
+
+def _random_strings(count, seed=3):
+    rng = random.Random(seed)
+    return [
+        "".join(
+            rng.choice(string.ascii_lowercase[:6] + " ")
+            for _ in range(rng.randint(0, 15))
+        )
+        for _ in range(count)
+    ]
+
+
+BACKENDS = ["python"] + (["rapidfuzz"] if comparator.RAPIDFUZZ_AVAILABLE else [])
+
+
+@pytest.mark.unit
+class TestLevenshtein:
+    """Tests for the two-row Levenshtein implementation."""
+
+    def test_matches_full_matrix(self):
+        """Test that distances match the full-matrix implementation."""
+        values = _random_strings(40)
+        for s1 in values:
+            for s2 in values[:10]:
+                assert levenshtein_distance(s1, s2) == _reference_distance(s1, s2)
+
+    def test_early_exit(self):
+        """Test that distances above max_distance are reported as max_distance + 1."""
+        assert levenshtein_distance("kitten", "sitting") == 3
+        assert levenshtein_distance("kitten", "sitting", max_distance=3) == 3
+        assert levenshtein_distance("kitten", "sitting", max_distance=2) == 3
+        assert levenshtein_distance("abc", "abcdefgh", max_distance=2) == 3
+
+    def test_fuzz_score_cutoff(self):
+        """Test that scores below the cutoff are returned as 0.0."""
+        assert fuzz_score("kitten", "sitting") == pytest.approx(1 - 3 / 7)
+        assert fuzz_score("kitten", "sitting", score_cutoff=0.5) == pytest.approx(
+            1 - 3 / 7
+        )
+        assert fuzz_score("kitten", "sitting", score_cutoff=0.6) == 0.0
+        assert fuzz_score("Hello, World", "hello world", score_cutoff=0.99) == 1.0
+
+
+@pytest.mark.unit
+class TestFuzzyComparator:
+    """Tests for FuzzyComparator backends and batched scoring."""
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_compare_matches_fuzz_score(self, backend):
+        """Test that all backends produce the reference score."""
+        fuzzy = FuzzyComparator(backend=backend)
+        for s1 in _random_strings(15):
+            for s2 in _random_strings(15, seed=4):
+                assert fuzzy.compare(s1, s2) == pytest.approx(fuzz_score(s1, s2))
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    @pytest.mark.parametrize("score_cutoff", [None, 0.6])
+    def test_score_matrix_matches_pairwise(self, backend, score_cutoff):
+        """Test that the batched matrix equals pairwise comparisons."""
+        fuzzy = FuzzyComparator(backend=backend, score_cutoff=score_cutoff)
+        expected = _random_strings(12) + ["Item, A", "item a"]
+        actual = _random_strings(9, seed=5) + ["ITEM A"]
+
+        matrix = fuzzy.score_matrix(expected, actual)
+
+        assert len(matrix) == len(expected)
+        for i, exp_val in enumerate(expected):
+            for j, act_val in enumerate(actual):
+                assert matrix[i][j] == pytest.approx(
+                    fuzz_score(exp_val, act_val, score_cutoff)
+                )
+
+    def test_exact_score_matrix(self):
+        """Test the exact comparator's batched matrix."""
+        matrix = ExactComparator().score_matrix(["A.", "b"], ["a", "B", "c"])
+        assert matrix == [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]
+
+    def test_invalid_backend(self):
+        """Test that unknown backends are rejected."""
+        with pytest.raises(ValueError, match="Unknown fuzzy matching backend"):
+            FuzzyComparator(backend="native")
+
+    def test_rapidfuzz_unavailable(self, monkeypatch):
+        """Test that auto falls back to Python and explicit rapidfuzz fails without it."""
+        monkeypatch.setattr(comparator, "RAPIDFUZZ_AVAILABLE", False)
+        assert FuzzyComparator().backend == "python"
+        with pytest.raises(ValueError, match="rapidfuzz is not installed"):
+            FuzzyComparator(backend="rapidfuzz")
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_compare_hungarian_uses_score_matrix(self, backend):
+        """Test Hungarian matching of list values with the fuzzy comparator."""
+        fuzzy = FuzzyComparator(threshold=0.8, backend=backend)
+        tp, fp, avg = compare_hungarian(
+            ["Widget A", "Gadget B", "Thing C"],
+            ["gadget b", "widget a", "other"],
+            comparator=fuzzy,
+            threshold=0.8,
+        )
+        assert (tp, fp) == (2, 1)
+        assert avg == pytest.approx((1.0 + 1.0 + fuzz_score("Thing C", "other")) / 3)
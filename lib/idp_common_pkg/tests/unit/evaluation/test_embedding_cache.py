@@ -0,0 +1,154 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the semantic evaluation embedding cache.
+"""
+
+import threading
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from idp_common.evaluation.comparator import SemanticComparator, compare_semantic
+from idp_common.evaluation.embedding_cache import (
+    EmbeddingCache,
+    cosine_similarity_matrix,
+)
+
+EMBEDDINGS = {
+    "apple": [1.0, 0.0, 0.0],
+    "apple inc": [0.9, 0.1, 0.0],
+    "banana": [0.0, 1.0, 0.0],
+    "cherry": [0.0, 0.0, 1.0],
+}
+
+
+class _FakeEmbedder:
+    """Thread-safe stand-in for bedrock.generate_embedding that counts calls."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, text, model_id):
+        with self._lock:
+            self.calls.append(text)
+        return EMBEDDINGS.get(text, [])
+
+
+@pytest.fixture
+def embedder():
+    fake = _FakeEmbedder()
+    with patch(
+        "idp_common.evaluation.embedding_cache.bedrock.generate_embedding", new=fake
+    ):
+        yield fake
+
+
+@pytest.mark.unit
+class TestEmbeddingCache:
+    def test_hit_after_miss_and_text_normalization(self, embedder):
+        cache = EmbeddingCache()
+
+        assert cache.get_embedding("apple") == EMBEDDINGS["apple"]
+        assert cache.get_embedding("  apple\n") == EMBEDDINGS["apple"]
+        assert embedder.calls == ["apple"]
+        assert cache.hits == 1
+
+    def test_keyed_by_model(self, embedder):
+        cache = EmbeddingCache()
+
+        cache.get_embedding("apple", "model-a")
+        cache.get_embedding("apple", "model-b")
+
+        assert embedder.calls == ["apple", "apple"]
+
+    def test_lru_eviction(self, embedder):
+        cache = EmbeddingCache(max_entries=2)
+
+        cache.get_embedding("apple")
+        cache.get_embedding("banana")
+        cache.get_embedding("apple")  # apple becomes most recently used
+        cache.get_embedding("cherry")  # evicts banana
+
+        assert len(cache) == 2
+        cache.get_embedding("apple")
+        cache.get_embedding("banana")
+        assert embedder.calls == ["apple", "banana", "cherry", "banana"]
+
+    def test_empty_embeddings_are_not_cached(self, embedder):
+        cache = EmbeddingCache()
+
+        assert cache.get_embedding("unknown") == []
+        assert cache.get_embedding("unknown") == []
+        assert cache.get_embedding("   ") == []
+        assert embedder.calls == ["unknown", "unknown"]
+
+    def test_prefetch_embeds_distinct_missing_values_once(self, embedder):
+        cache = EmbeddingCache()
+        cache.get_embedding("apple")
+
+        cache.prefetch(["apple", "banana", "banana ", "cherry", ""], max_workers=4)
+
+        assert sorted(embedder.calls) == ["apple", "banana", "cherry"]
+        assert len(cache) == 3
+
+    def test_persistent_tier_shared_across_instances(self, embedder, tmp_path):
+        EmbeddingCache(persistent_uri=str(tmp_path)).get_embedding("banana")
+
+        second = EmbeddingCache(persistent_uri=str(tmp_path))
+        assert second.get_embedding("banana") == EMBEDDINGS["banana"]
+        assert embedder.calls == ["banana"]
+        assert len(list(tmp_path.rglob("*.json"))) == 1
+
+
+@pytest.mark.unit
+class TestCosineSimilarityMatrix:
+    def test_matches_pairwise_cosine(self):
+        rows = [EMBEDDINGS["apple"], EMBEDDINGS["apple inc"]]
+        cols = [EMBEDDINGS["apple"], EMBEDDINGS["banana"], EMBEDDINGS["cherry"]]
+
+        matrix = cosine_similarity_matrix(rows, cols)
+
+        for i, a in enumerate(rows):
+            for j, b in enumerate(cols):
+                expected = np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+                assert matrix[i][j] == pytest.approx(expected)
+
+    def test_missing_embeddings_are_nan(self):
+        matrix = cosine_similarity_matrix([[], [1.0, 0.0]], [[1.0, 0.0], [0.0, 0.0]])
+
+        assert np.isnan(matrix[0]).all()
+        assert np.isnan(matrix[:, 1]).all()
+        assert matrix[1][0] == pytest.approx(1.0)
+
+
+@pytest.mark.unit
+class TestSemanticComparator:
+    def test_score_matrix_with_fuzzy_fallback(self, embedder):
+        comparator = SemanticComparator(embedding_cache=EmbeddingCache())
+
+        matrix = comparator.score_matrix(["apple", "pear"], ["apple inc", "pear"])
+
+        assert matrix[0][0] == pytest.approx(0.9 / np.linalg.norm([0.9, 0.1]))
+        # "pear" has no embedding, so fuzzy matching is used
+        assert matrix[1][1] == pytest.approx(1.0)
+        assert sorted(embedder.calls) == [
+            "apple",
+            "apple inc",
+            "pear",
+            "pear",
+        ]  # prefetch + lookup
+
+    def test_compare_semantic_uses_cache(self, embedder):
+        cache = EmbeddingCache()
+
+        matched, score = compare_semantic(
+            "apple", "apple inc", 0.8, embedding_cache=cache
+        )
+        compare_semantic("apple", "apple inc", 0.8, embedding_cache=cache)
+
+        assert matched
+        assert score > 0.9
+        assert embedder.calls == ["apple", "apple inc"]
@@ -469,6 +469,21 @@ class TestExtractionService:
         assert len(result.errors) == 1
         assert "Section 2 has no page IDs" in result.errors[0]
 
+    @patch("idp_common.page_assets.prefetch_section_pages")
+    @patch("idp_common.metrics.put_metric")
+    def test_process_document_section_setup_error_cancels_prefetch(
+        self, mock_put_metric, mock_prefetch, service, sample_document
+    ):
+        """Test that page reads are discarded when preparing the request fails."""
+        with patch.object(
+            service, "_get_class_attributes", side_effect=Exception("Bad config")
+        ):
+            with pytest.raises(Exception, match="Bad config"):
+                service.process_document_section(sample_document, "1")
+
+        mock_prefetch.return_value.cancel.assert_called()
+        mock_prefetch.return_value.result.assert_not_called()
+
     @pytest.mark.skip(reason="Temporarily disabled due to S3 credential issues")
     @patch("idp_common.s3.get_text_content")
     @patch("idp_common.image.prepare_image")
@@ -0,0 +1,152 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the buffered metrics sink.
+"""
+
+import io
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from idp_common import metrics
+from idp_common.metrics.buffer import MAX_VALUES_PER_DATUM, MetricsBuffer
+
+
+@pytest.mark.unit
+class TestMetricsBuffer:
+    """Tests for the MetricsBuffer class."""
+
+    def test_aggregates_values_per_metric_and_dimensions(self):
+        """Test that identical values are aggregated into Values/Counts."""
+        client = MagicMock()
+        buffer = MetricsBuffer(flush_interval=0, client_factory=lambda: client)
+
+        buffer.add("InputTokens", 10, namespace="NS")
+        buffer.add("InputTokens", 10, namespace="NS")
+        buffer.add("InputTokens", 25, namespace="NS")
+        buffer.add(
+            "InputTokens",
+            5,
+            dimensions=[{"Name": "Model", "Value": "nova"}],
+            namespace="NS",
+        )
+
+        assert buffer.pending_count() == 4
+        assert buffer.flush() == 4
+        assert buffer.pending_count() == 0
+
+        client.put_metric_data.assert_called_once()
+        kwargs = client.put_metric_data.call_args.kwargs
+        assert kwargs["Namespace"] == "NS"
+        data = {
+            tuple(d["Name"] for d in datum["Dimensions"]): datum
+            for datum in kwargs["MetricData"]
+        }
+        assert data[()]["Values"] == [10.0, 25.0]
+        assert data[()]["Counts"] == [2.0, 1.0]
+        assert data[("Model",)]["Values"] == [5.0]
+
+    def test_splits_large_value_sets(self):
+        """Test that a datum never exceeds the per-datum distinct value limit."""
+        client = MagicMock()
+        buffer = MetricsBuffer(flush_interval=0, client_factory=lambda: client)
+
+        for i in range(MAX_VALUES_PER_DATUM + 10):
+            buffer.add("Latency", i, unit="Milliseconds", namespace="NS")
+        buffer.flush()
+
+        metric_data = client.put_metric_data.call_args.kwargs["MetricData"]
+        assert len(metric_data) == 2
+        assert len(metric_data[0]["Values"]) == MAX_VALUES_PER_DATUM
+        assert len(metric_data[1]["Values"]) == 10
+
+    def test_flush_errors_are_logged_not_raised(self):
+        """Test that publishing errors do not propagate to callers."""
+        client = MagicMock()
+        client.put_metric_data.side_effect = Exception("throttled")
+        buffer = MetricsBuffer(flush_interval=0, client_factory=lambda: client)
+
+        buffer.add("Metric", 1)
+        assert buffer.flush() == 1
+
+    def test_emf_mode_writes_records_without_api_calls(self):
+        """Test that EMF mode writes structured log records."""
+        client_factory = MagicMock()
+        stream = io.StringIO()
+        buffer = MetricsBuffer(
+            mode="emf",
+            flush_interval=0,
+            client_factory=client_factory,
+            emf_stream=stream,
+        )
+
+        buffer.add("Pages", 3, namespace="NS")
+        buffer.add("Pages", 3, namespace="NS")
+        buffer.add("Latency", 120, unit="Milliseconds", namespace="NS")
+        buffer.flush()
+
+        client_factory.assert_not_called()
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert len(records) == 1
+        record = records[0]
+        assert record["Pages"] == [3.0, 3.0]
+        assert record["Latency"] == 120.0
+        definition = record["_aws"]["CloudWatchMetrics"][0]
+        assert definition["Namespace"] == "NS"
+        assert {m["Name"] for m in definition["Metrics"]} == {"Pages", "Latency"}
+
+    def test_invalid_mode(self):
+        """Test that an unsupported mode is rejected."""
+        with pytest.raises(ValueError, match="Unsupported metrics buffer mode"):
+            MetricsBuffer(mode="direct")
+
+
+@pytest.mark.unit
+class TestPutMetric:
+    """Tests for put_metric mode routing."""
+
+    def setup_method(self):
+        metrics.reset_metrics_buffer()
+
+    def teardown_method(self):
+        metrics.reset_metrics_buffer()
+
+    def test_buffered_mode_defers_publishing(self, monkeypatch):
+        """Test that buffered mode only publishes on flush."""
+        monkeypatch.setenv("METRICS_MODE", "buffered")
+        monkeypatch.setenv("METRICS_FLUSH_INTERVAL", "0")
+        client = MagicMock()
+        with patch("idp_common.metrics.get_cloudwatch_client", return_value=client):
+            metrics.put_metric("BedrockRequestsTotal", 1)
+            metrics.put_metric("BedrockRequestsTotal", 1)
+            client.put_metric_data.assert_not_called()
+
+            assert metrics.flush_metrics() == 2
+            client.put_metric_data.assert_called_once()
+
+    def test_direct_mode_publishes_immediately(self, monkeypatch):
+        """Test that direct mode keeps the one-call-per-point behavior."""
+        monkeypatch.setenv("METRICS_MODE", "direct")
+        client = MagicMock()
+        with patch("idp_common.metrics.get_cloudwatch_client", return_value=client):
+            metrics.put_metric("BedrockRequestsTotal", 1)
+            client.put_metric_data.assert_called_once()
+            assert metrics.flush_metrics() == 0
+
+    def test_flush_on_exit_decorator(self, monkeypatch):
+        """Test that the handler decorator flushes even when the handler raises."""
+        monkeypatch.setenv("METRICS_MODE", "buffered")
+        monkeypatch.setenv("METRICS_FLUSH_INTERVAL", "0")
+        client = MagicMock()
+
+        @metrics.flush_on_exit
+        def handler(event, context):
+            metrics.put_metric("Handled", 1)
+            raise RuntimeError("boom")
+
+        with patch("idp_common.metrics.get_cloudwatch_client", return_value=client):
+            with pytest.raises(RuntimeError):
+                handler({}, None)
+            client.put_metric_data.assert_called_once()
@@ -12,6 +12,8 @@ import pytest
 
 # Import standard library modules first
 import sys
+import threading
+import time
 from io import BytesIO
 from unittest.mock import ANY, MagicMock, patch
 
@@ -22,6 +24,8 @@ sys.modules["textractor.parsers"] = MagicMock()
 sys.modules["textractor.parsers.response_parser"] = MagicMock()
 
 from idp_common.models import Document, Status
+from idp_common.ocr.artifact_writer import ArtifactWriter
+from idp_common.ocr.page_source import PageSource
 from idp_common.ocr.service import OcrService
 
 
@@ -111,7 +115,7 @@ class TestOcrService:
             # Verify both Textract and S3 clients were created
             assert mock_client.call_count == 2
             mock_client.assert_any_call("textract", region_name="us-west-2", config=ANY)
-            mock_client.assert_any_call("s3")
+            mock_client.assert_any_call("s3", region_name=None, config=ANY)
 
     def test_init_textract_with_enhanced_features(self):
         """Test initialization with enhanced Textract features."""
@@ -233,9 +237,64 @@ class TestOcrService:
             assert "2" in result.pages
             assert result.status != Status.FAILED
 
-            # Verify PDF was opened and closed
-            mock_fitz_open.assert_called_once()
-            mock_pdf_doc.close.assert_called_once()
+            # Verify PDF was opened and closed: once to count pages, then once
+            # per renderer thread (each renderer uses its own document handle)
+            assert mock_fitz_open.call_count == 1 + service.render_workers
+            assert mock_pdf_doc.close.call_count == mock_fitz_open.call_count
+            assert mock_process.call_count == 2
+
+    @patch("boto3.client")
+    @patch("idp_common.s3.write_content")
+    @patch("fitz.open")
+    def test_process_document_waits_for_artifact_uploads(
+        self,
+        mock_fitz_open,
+        mock_write_content,
+        mock_boto_client,
+        mock_document,
+        mock_pdf_content,
+    ):
+        """Test that queued uploads finish before returning and failures fail the page."""
+        mock_s3_client = MagicMock()
+        mock_s3_client.get_object.return_value = {"Body": BytesIO(mock_pdf_content)}
+        mock_boto_client.return_value = mock_s3_client
+
+        mock_pdf_doc = MagicMock()
+        mock_pdf_doc.__len__.return_value = 2
+        mock_fitz_open.return_value = mock_pdf_doc
+
+        def write(content, bucket, key, **kwargs):
+            if key == "prefix/pages/2/image.jpg":
+                raise Exception("upload failed")
+
+        mock_write_content.side_effect = write
+
+        service = OcrService()
+
+        def process_page(page_index, img_bytes, output_bucket, prefix):
+            page_id = page_index + 1
+            image_key = f"prefix/pages/{page_id}/image.jpg"
+            service.artifact_writer.submit(
+                b"image", output_bucket, image_key, tag=page_id
+            )
+            return (
+                {
+                    "raw_text_uri": "s3://output/raw.json",
+                    "parsed_text_uri": "s3://output/parsed.json",
+                    "text_confidence_uri": "s3://output/confidence.json",
+                    "image_uri": f"s3://{output_bucket}/{image_key}",
+                },
+                {},
+            )
+
+        with patch.object(service, "_process_single_page", side_effect=process_page):
+            result = service.process_document(mock_document)
+
+        assert mock_write_content.call_count == 2
+        assert result.status == Status.FAILED
+        assert len(result.errors) == 1
+        assert result.errors[0].startswith("Error processing page 2: failed to write")
+        assert "upload failed" in result.errors[0]
 
     @patch("boto3.client")
     def test_process_document_s3_error(self, mock_boto_client, mock_document):
@@ -329,20 +388,9 @@ class TestOcrService:
         mock_textract_client.detect_document_text.return_value = mock_textract_response
         mock_boto_client.return_value = mock_textract_client
 
-        # Mock page image extraction
-        mock_page_obj = MagicMock()
-        mock_pixmap = MagicMock()
-        mock_pixmap.tobytes.return_value = b"image_data"
-        mock_page_obj.get_pixmap.return_value = mock_pixmap
-
-        # Mock PDF document
-        mock_pdf_doc = MagicMock()
-        mock_pdf_doc.load_page.return_value = mock_page_obj
-        mock_pdf_doc.is_pdf = True
-
         service = OcrService()
         result, metering = service._process_single_page_textract(
-            0, mock_pdf_doc, "output-bucket", "test-prefix"
+            0, b"image_data", "output-bucket", "test-prefix"
         )
 
         # Verify results
@@ -355,7 +403,8 @@ class TestOcrService:
         # Verify Textract was called
         mock_textract_client.detect_document_text.assert_called_once()
 
-        # Verify S3 writes
+        # Verify S3 writes (uploads are queued, so wait for them first)
+        assert service.artifact_writer.wait() == []
         assert mock_write_content.call_count == 4  # image, raw, confidence, parsed
 
     @patch("boto3.client")
@@ -376,17 +425,6 @@ class TestOcrService:
         mock_bedrock_response,
     ):
         """Test single page processing with Bedrock."""
-        # Mock page image extraction
-        mock_page_obj = MagicMock()
-        mock_pixmap = MagicMock()
-        mock_pixmap.tobytes.return_value = b"image_data"
-        mock_page_obj.get_pixmap.return_value = mock_pixmap
-
-        # Mock PDF document
-        mock_pdf_doc = MagicMock()
-        mock_pdf_doc.load_page.return_value = mock_page_obj
-        mock_pdf_doc.is_pdf = True
-
         # Mock Bedrock functions
         mock_prepare_image.return_value = {"image": "base64_image"}
         mock_invoke_model.return_value = mock_bedrock_response
@@ -394,7 +432,7 @@ class TestOcrService:
 
         service = OcrService(backend="bedrock", bedrock_config=mock_bedrock_config)
         result, metering = service._process_single_page_bedrock(
-            0, mock_pdf_doc, "output-bucket", "test-prefix"
+            0, b"image_data", "output-bucket", "test-prefix"
         )
 
         # Verify results
@@ -408,7 +446,8 @@ class TestOcrService:
         mock_invoke_model.assert_called_once()
         mock_extract_text.assert_called_once()
 
-        # Verify S3 writes
+        # Verify S3 writes (uploads are queued, so wait for them first)
+        assert service.artifact_writer.wait() == []
         assert mock_write_content.call_count == 4  # image, raw, confidence, parsed
 
     @patch("boto3.client")
@@ -418,20 +457,9 @@ class TestOcrService:
         self, mock_page, mock_write_content, mock_boto_client
     ):
         """Test single page processing with 'none' backend."""
-        # Mock page image extraction
-        mock_page_obj = MagicMock()
-        mock_pixmap = MagicMock()
-        mock_pixmap.tobytes.return_value = b"image_data"
-        mock_page_obj.get_pixmap.return_value = mock_pixmap
-
-        # Mock PDF document
-        mock_pdf_doc = MagicMock()
-        mock_pdf_doc.load_page.return_value = mock_page_obj
-        mock_pdf_doc.is_pdf = True
-
         service = OcrService(backend="none")
         result, metering = service._process_single_page_none(
-            0, mock_pdf_doc, "output-bucket", "test-prefix"
+            0, b"image_data", "output-bucket", "test-prefix"
         )
 
         # Verify results
@@ -441,7 +469,8 @@ class TestOcrService:
         assert "image_uri" in result
         assert metering == {}  # No metering data for 'none' backend
 
-        # Verify S3 writes (empty content)
+        # Verify S3 writes (empty content; uploads are queued, so wait for them first)
+        assert service.artifact_writer.wait() == []
         assert mock_write_content.call_count == 4  # image, raw, confidence, parsed
 
     @patch("fitz.Page")
@@ -648,17 +677,6 @@ class TestOcrService:
         mock_textract_client.detect_document_text.return_value = mock_textract_response
         mock_boto_client.return_value = mock_textract_client
 
-        # Mock page image extraction
-        mock_page_obj = MagicMock()
-        mock_pixmap = MagicMock()
-        mock_pixmap.tobytes.return_value = b"original_image_data"
-        mock_page_obj.get_pixmap.return_value = mock_pixmap
-
-        # Mock PDF document
-        mock_pdf_doc = MagicMock()
-        mock_pdf_doc.load_page.return_value = mock_page_obj
-        mock_pdf_doc.is_pdf = True
-
         # Mock resize
         mock_resize_image.return_value = b"resized_image_data"
 
@@ -667,7 +685,7 @@ class TestOcrService:
 
         with patch("idp_common.s3.write_content"):
             result, metering = service._process_single_page_textract(
-                0, mock_pdf_doc, "output-bucket", "test-prefix"
+                0, b"original_image_data", "output-bucket", "test-prefix"
             )
 
             # Verify resize was called
@@ -678,6 +696,17 @@ class TestOcrService:
                 Document={"Bytes": b"resized_image_data"}
             )
 
+    @patch("boto3.client")
+    def test_binarization_params_from_preprocessing_config(self, mock_boto_client):
+        """Test that only configured binarization parameters are passed through."""
+        service = OcrService(preprocessing_config={"enabled": True})
+        assert service._get_binarization_params() == {}
+
+        service = OcrService(
+            preprocessing_config={"enabled": True, "block_size": "21", "c": 8}
+        )
+        assert service._get_binarization_params() == {"block_size": 21, "c": 8}
+
     @patch("boto3.client")
     @patch("idp_common.image.apply_adaptive_binarization")
     @patch("fitz.Page")
@@ -694,17 +723,6 @@ class TestOcrService:
         mock_textract_client.detect_document_text.return_value = mock_textract_response
         mock_boto_client.return_value = mock_textract_client
 
-        # Mock page image extraction
-        mock_page_obj = MagicMock()
-        mock_pixmap = MagicMock()
-        mock_pixmap.tobytes.return_value = b"original_image_data"
-        mock_page_obj.get_pixmap.return_value = mock_pixmap
-
-        # Mock PDF document
-        mock_pdf_doc = MagicMock()
-        mock_pdf_doc.load_page.return_value = mock_page_obj
-        mock_pdf_doc.is_pdf = True
-
         # Mock preprocessing
         mock_preprocessing.return_value = b"preprocessed_image_data"
 
@@ -713,7 +731,7 @@ class TestOcrService:
 
         with patch("idp_common.s3.write_content"):
             result, metering = service._process_single_page_textract(
-                0, mock_pdf_doc, "output-bucket", "test-prefix"
+                0, b"original_image_data", "output-bucket", "test-prefix"
             )
 
             # Verify preprocessing was called
@@ -770,3 +788,189 @@ class TestOcrService:
 
                 mock_none.assert_called_once_with(0, ANY, "bucket", "prefix")
                 assert result == ("result", "metering")
+
+
+@pytest.mark.unit
+class TestArtifactWriter:
+    """Tests for the ArtifactWriter class."""
+
+    @patch("boto3.client")
+    @patch("idp_common.s3.write_content")
+    def test_uploads_use_own_client(self, mock_write_content, mock_boto_client):
+        """Test that uploads are written with the writer's pooled client."""
+        writer = ArtifactWriter(max_workers=2)
+
+        writer.submit({"text": "hello"}, "bucket", "key.json", "application/json")
+
+        assert writer.wait() == []
+        mock_boto_client.assert_called_once_with("s3", region_name=None, config=ANY)
+        mock_write_content.assert_called_once_with(
+            {"text": "hello"},
+            "bucket",
+            "key.json",
+            content_type="application/json",
+            s3_client=mock_boto_client.return_value,
+        )
+        writer.close()
+
+    @patch("boto3.client")
+    @patch("idp_common.s3.write_content")
+    def test_wait_reports_failures_with_tag(self, mock_write_content, mock_boto_client):
+        """Test that failed uploads are returned by wait() with their tag."""
+
+        def write(content, bucket, key, **kwargs):
+            if key == "bad":
+                raise Exception("access denied")
+
+        mock_write_content.side_effect = write
+        writer = ArtifactWriter(max_workers=2)
+
+        writer.submit(b"ok", "bucket", "good", tag=1)
+        writer.submit(b"bad", "bucket", "bad", tag=2)
+
+        failures = writer.wait()
+        assert [(tag, uri, str(e)) for tag, uri, e in failures] == [
+            (2, "s3://bucket/bad", "access denied")
+        ]
+        # Failures are reported only once
+        assert writer.wait() == []
+        writer.close()
+
+    @patch("boto3.client")
+    @patch("idp_common.s3.write_content")
+    def test_pending_uploads_are_bounded(self, mock_write_content, mock_boto_client):
+        """Test that submit() blocks while max_pending uploads are outstanding."""
+        release = threading.Event()
+        mock_write_content.side_effect = lambda *args, **kwargs: release.wait(5)
+        writer = ArtifactWriter(max_workers=1, max_pending=2)
+
+        writer.submit(b"1", "bucket", "1")
+        writer.submit(b"2", "bucket", "2")
+
+        third_submitted = threading.Event()
+
+        def submit_third():
+            writer.submit(b"3", "bucket", "3")
+            third_submitted.set()
+
+        thread = threading.Thread(target=submit_third)
+        thread.start()
+        time.sleep(0.1)
+        assert not third_submitted.is_set()
+
+        release.set()
+        thread.join(5)
+        assert third_submitted.is_set()
+        assert writer.wait() == []
+        assert mock_write_content.call_count == 3
+        writer.close()
+
+
+@pytest.mark.unit
+class TestPageSource:
+    """Tests for the PageSource class."""
+
+    @staticmethod
+    def _s3_client(content):
+        client = MagicMock()
+        client.get_object.return_value = {
+            "Body": BytesIO(content),
+            "ContentLength": len(content),
+        }
+        return client
+
+    def test_small_object_stays_in_memory(self):
+        """Test that objects below the spool threshold are read into memory."""
+        source = PageSource.from_s3(
+            self._s3_client(b"%PDF-small"), "bucket", "key", spool_threshold=100
+        )
+
+        assert not source.is_spooled
+        assert source.head() == b"%PDF-small"
+        assert source.read_bytes() == b"%PDF-small"
+
+    def test_large_object_is_spooled_and_removed_on_close(self, tmp_path):
+        """Test that large objects are streamed to a spool file."""
+        content = b"%PDF-" + b"x" * 1000
+        with PageSource.from_s3(
+            self._s3_client(content),
+            "bucket",
+            "key",
+            spool_threshold=100,
+            spool_dir=str(tmp_path),
+        ) as source:
+            assert source.is_spooled
+            assert source.path.startswith(str(tmp_path))
+            assert source.head(5) == b"%PDF-"
+            assert source.read_bytes() == content
+            with patch("fitz.open") as mock_fitz_open:
+                source.open_document("pdf")
+                mock_fitz_open.assert_called_once_with(source.path, filetype="pdf")
+
+        assert list(tmp_path.iterdir()) == []
+
+    @patch("fitz.open")
+    def test_render_pages_uses_handle_per_renderer(self, mock_fitz_open):
+        """Test that each renderer thread opens and closes its own document handle."""
+        handles = []
+
+        def open_document(*args, **kwargs):
+            handle = MagicMock()
+            handle.is_pdf = True
+            handle.load_page.side_effect = lambda index: (handle, index)
+            handles.append(handle)
+            return handle
+
+        mock_fitz_open.side_effect = open_document
+        render_threads = {}
+
+        def render(page, is_pdf, page_id):
+            handle, index = page
+            render_threads.setdefault(id(handle), set()).add(
+                threading.current_thread().name
+            )
+            if page_id == 3:
+                raise ValueError("bad page")
+            return f"page-{page_id}".encode()
+
+        source = PageSource(data=b"%PDF")
+        rendered = sorted(
+            source.render_pages("pdf", 5, render, max_buffered=1, num_renderers=2),
+            key=lambda item: item[0],
+        )
+
+        assert [(index, image) for index, image, _ in rendered] == [
+            (0, b"page-1"),
+            (1, b"page-2"),
+            (2, None),
+            (3, b"page-4"),
+            (4, b"page-5"),
+        ]
+        assert isinstance(rendered[2][2], ValueError)
+        assert len(handles) == 2
+        assert all(handle.close.called for handle in handles)
+        # Each handle is only ever used by a single thread
+        assert all(len(names) == 1 for names in render_threads.values())
+
+    @patch("fitz.open")
+    def test_render_pages_bounds_buffered_pages(self, mock_fitz_open):
+        """Test that renderers stop rendering while the queue is full."""
+        handle = MagicMock()
+        mock_fitz_open.return_value = handle
+        rendered_count = []
+
+        def render(page, is_pdf, page_id):
+            rendered_count.append(page_id)
+            return b"image"
+
+        source = PageSource(data=b"%PDF")
+        pages = source.render_pages("pdf", 10, render, max_buffered=2, num_renderers=1)
+
+        next(pages)
+        time.sleep(0.2)
+        # One page consumed, two buffered, and at most one more rendered and waiting
+        assert len(rendered_count) <= 4
+
+        # Abandoning the iterator stops the renderer
+        pages.close()
+        assert handle.close.called
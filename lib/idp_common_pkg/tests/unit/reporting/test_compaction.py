@@ -0,0 +1,453 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for reporting Parquet compaction and buffered writing.
+"""
+
+import datetime
+import io
+from unittest.mock import MagicMock, patch
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from botocore.exceptions import ClientError
+from idp_common.models import Document
+from idp_common.reporting.compaction import (
+    BufferedParquetWriter,
+    ParquetCompactor,
+    merge_tables,
+    write_parquet_bytes,
+)
+from idp_common.reporting.save_reporting_data import SaveReportingData
+
+
+class FakeS3:
+    """Minimal in-memory S3 client supporting the calls used by compaction."""
+
+    # Write time of objects added to the objects dict directly
+    CREATED = datetime.datetime(2025, 1, 31, tzinfo=datetime.timezone.utc)
+
+    def __init__(self):
+        self.objects = {}
+        self.etags = {}
+        self.modified = {}
+        self.metadata = {}
+
+    def put_object(self, Bucket, Key, Body, IfMatch=None, Metadata=None, **kwargs):
+        if IfMatch is not None and self.etags.get(Key) != IfMatch:
+            raise ClientError(
+                {"Error": {"Code": "PreconditionFailed", "Message": "If-Match"}},
+                "PutObject",
+            )
+        self.objects[Key] = Body
+        self.etags[Key] = f'"{len(self.etags)}-{len(Body)}"'
+        # Every write is one second after the previous one
+        self.modified[Key] = self.CREATED + datetime.timedelta(seconds=len(self.etags))
+        self.metadata[Key] = Metadata or {}
+
+    def get_object(self, Bucket, Key):
+        body = MagicMock()
+        body.read.return_value = self.objects[Key]
+        return {
+            "Body": body,
+            "ETag": self.etags.get(Key),
+            "Metadata": self.metadata.get(Key, {}),
+        }
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError(
+                {"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject"
+            )
+        return {
+            "ETag": self.etags.get(Key),
+            "LastModified": self.modified.get(Key, self.CREATED),
+            "Metadata": self.metadata.get(Key, {}),
+        }
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+    def delete_objects(self, Bucket, Delete):
+        for obj in Delete["Objects"]:
+            self.objects.pop(obj["Key"], None)
+        return {}
+
+    def get_paginator(self, name):
+        paginator = MagicMock()
+
+        def paginate(Bucket, Prefix, Delimiter=None):
+            keys = sorted(k for k in self.objects if k.startswith(Prefix))
+            if Delimiter:
+                prefixes = set()
+                for key in keys:
+                    rest = key[len(Prefix) :]
+                    if Delimiter in rest:
+                        prefixes.add(Prefix + rest.split(Delimiter)[0] + Delimiter)
+                return [{"CommonPrefixes": [{"Prefix": p} for p in sorted(prefixes)]}]
+            contents = [
+                {
+                    "Key": k,
+                    "Size": len(self.objects[k]),
+                    "LastModified": self.modified.get(k, self.CREATED),
+                }
+                for k in keys
+            ]
+            return [{"Contents": contents}]
+
+        paginator.paginate.side_effect = paginate
+        return paginator
+
+    def read_table(self, key):
+        return pq.read_table(io.BytesIO(self.objects[key]))
+
+
+def _parquet(records, schema=None):
+    return write_parquet_bytes(pa.Table.from_pylist(records, schema=schema))
+
+
+@pytest.mark.unit
+class TestMergeTables:
+    """Tests for schema merging."""
+
+    def test_missing_columns_are_filled_with_nulls(self):
+        merged = merge_tables(
+            [
+                pa.Table.from_pylist([{"a": "1", "b": "x"}]),
+                pa.Table.from_pylist([{"a": "2", "c": "y"}]),
+            ]
+        )
+        assert merged.num_rows == 2
+        assert set(merged.column_names) == {"a", "b", "c"}
+        assert merged.column("c").to_pylist() == [None, "y"]
+
+    def test_conflicting_types_become_strings(self):
+        timestamp = datetime.datetime(2025, 1, 31, 12, 0)
+        merged = merge_tables(
+            [
+                pa.Table.from_pylist(
+                    [{"timestamp": timestamp}],
+                    schema=pa.schema([("timestamp", pa.timestamp("ms"))]),
+                ),
+                pa.Table.from_pylist([{"timestamp": "unknown"}]),
+            ]
+        )
+        assert merged.schema.field("timestamp").type == pa.string()
+        assert merged.column("timestamp").to_pylist()[1] == "unknown"
+
+
+@pytest.mark.unit
+class TestParquetCompactor:
+    """Tests for the ParquetCompactor class."""
+
+    @pytest.fixture
+    def s3(self):
+        s3 = FakeS3()
+        for i in range(5):
+            s3.objects[f"metering/date=2025-01-31/doc{i}_results.parquet"] = _parquet(
+                [{"document_id": f"doc{i}", "value": float(i)}]
+            )
+        s3.objects["metering/date=2025-02-01/doc9_results.parquet"] = _parquet(
+            [{"document_id": "doc9", "value": 9.0}]
+        )
+        s3.objects[
+            "document_sections/invoice/date=2025-01-31/doc1_section_1.parquet"
+        ] = _parquet([{"document_id": "doc1", "total": "10"}])
+        s3.objects[
+            "document_sections/invoice/date=2025-01-31/doc2_section_1.parquet"
+        ] = _parquet([{"document_id": "doc2", "vendor": "ACME"}])
+        return s3
+
+    def test_compact_partition(self, s3):
+        compactor = ParquetCompactor("bucket", s3_client=s3)
+
+        result = compactor.compact_partition("metering/date=2025-01-31/")
+
+        assert result["files_compacted"] == 5
+        assert result["files_written"] == 1
+        assert result["rows"] == 5
+        keys = [k for k in s3.objects if k.startswith("metering/date=2025-01-31/")]
+        assert len(keys) == 1
+        assert keys[0].split("/")[-1].startswith("compacted-")
+        table = s3.read_table(keys[0])
+        assert sorted(table.column("document_id").to_pylist()) == [
+            f"doc{i}" for i in range(5)
+        ]
+        # Other partitions are untouched
+        assert "metering/date=2025-02-01/doc9_results.parquet" in s3.objects
+
+    def test_compact_partition_respects_target_size(self, s3):
+        size = len(s3.objects["metering/date=2025-01-31/doc0_results.parquet"])
+        compactor = ParquetCompactor("bucket", target_file_size=size * 2, s3_client=s3)
+
+        result = compactor.compact_partition("metering/date=2025-01-31/")
+
+        # Groups of 2, 2 and 1; the single-file group is left as is
+        assert result["files_compacted"] == 4
+        assert result["files_written"] == 2
+        keys = [k for k in s3.objects if k.startswith("metering/date=2025-01-31/")]
+        assert len(keys) == 3
+
+    def test_partition_below_min_files_is_skipped(self, s3):
+        compactor = ParquetCompactor("bucket", s3_client=s3)
+
+        result = compactor.compact_partition("metering/date=2025-02-01/")
+
+        assert result["files_compacted"] == 0
+        assert "metering/date=2025-02-01/doc9_results.parquet" in s3.objects
+
+    def test_compact_date_covers_section_tables(self, s3):
+        compactor = ParquetCompactor("bucket", s3_client=s3)
+
+        summary = compactor.compact_date("2025-01-31")
+
+        assert summary["files_compacted"] == 7
+        assert summary["files_written"] == 2
+        assert summary["errors"] == 0
+        section_keys = [
+            k for k in s3.objects if k.startswith("document_sections/invoice/")
+        ]
+        assert len(section_keys) == 1
+        table = s3.read_table(section_keys[0])
+        assert set(table.column_names) == {"document_id", "total", "vendor"}
+
+    def test_file_changed_during_compaction_is_kept(self, s3):
+        changed = "metering/date=2025-01-31/doc1_results.parquet"
+        get_object = s3.get_object
+
+        def racing_get_object(Bucket, Key):
+            response = get_object(Bucket=Bucket, Key=Key)
+            if Key == changed:
+                # The document is reprocessed after its file was read
+                s3.put_object(
+                    Bucket=Bucket,
+                    Key=Key,
+                    Body=_parquet([{"document_id": "doc1", "value": 10.0}]),
+                )
+            return response
+
+        s3.get_object = racing_get_object
+        compactor = ParquetCompactor("bucket", s3_client=s3)
+
+        compactor.compact_partition("metering/date=2025-01-31/")
+
+        keys = sorted(
+            k for k in s3.objects if k.startswith("metering/date=2025-01-31/")
+        )
+        assert len(keys) == 2
+        assert keys[1] == changed
+        assert s3.read_table(changed).column("value").to_pylist() == [10.0]
+
+        # The next run replaces the document's compacted row with the new one
+        s3.get_object = get_object
+        compactor.compact_partition("metering/date=2025-01-31/")
+
+        keys = [k for k in s3.objects if k.startswith("metering/date=2025-01-31/")]
+        assert len(keys) == 1
+        assert sorted(s3.read_table(keys[0]).column("value").to_pylist()) == [
+            0.0,
+            2.0,
+            3.0,
+            4.0,
+            10.0,
+        ]
+
+    def test_failed_delete_is_reported(self, s3):
+        s3.delete_objects = MagicMock(
+            return_value={"Errors": [{"Key": "k", "Message": "Access Denied"}]}
+        )
+        compactor = ParquetCompactor("bucket", s3_client=s3)
+
+        summary = compactor.compact_date("2025-01-31")
+
+        assert summary["errors"] == 2
+
+
+@pytest.mark.unit
+class TestSupersededRows:
+    """Tests for documents rewritten after their partition was compacted."""
+
+    PARTITION = "metering/date=2025-01-31/"
+
+    @pytest.fixture
+    def s3(self):
+        s3 = FakeS3()
+        for i in range(3):
+            s3.put_object(
+                Bucket="bucket",
+                Key=f"{self.PARTITION}doc{i}_results.parquet",
+                Body=_parquet([{"document_id": f"doc{i}", "value": float(i)}]),
+            )
+        ParquetCompactor("bucket", s3_client=s3).compact_partition(self.PARTITION)
+        return s3
+
+    def _rows(self, s3):
+        rows = []
+        for key in sorted(s3.objects):
+            if key.startswith(self.PARTITION):
+                rows.extend(s3.read_table(key).to_pylist())
+        return sorted(rows, key=lambda row: row["document_id"])
+
+    def _rewrite(self, s3, document_id, value):
+        s3.put_object(
+            Bucket="bucket",
+            Key=f"{self.PARTITION}{document_id}_results.parquet",
+            Body=_parquet([{"document_id": document_id, "value": value}]),
+        )
+
+    def test_rewritten_document_replaces_compacted_rows(self, s3):
+        compacted = dict(s3.objects)
+        with patch("boto3.client", return_value=s3):
+            reporter = SaveReportingData("bucket")
+        document = Document(
+            id="doc1",
+            input_key="doc1.pdf",
+            initial_event_time="2025-01-31T12:00:00Z",
+            num_pages=1,
+        )
+        document.metering = {"Extraction/bedrock/model": {"inputTokens": 500}}
+
+        reporter.save_metering_data(document)
+
+        # Saving a document does not rewrite merged files
+        assert {k: s3.objects[k] for k in compacted} == compacted
+        assert [row["document_id"] for row in self._rows(s3)] == [
+            "doc0",
+            "doc1",
+            "doc1",
+            "doc2",
+        ]
+
+        ParquetCompactor("bucket", s3_client=s3).compact_partition(self.PARTITION)
+
+        rows = self._rows(s3)
+        assert [row["document_id"] for row in rows] == ["doc0", "doc1", "doc2"]
+        assert rows[1]["value"] == 500.0
+
+    def test_compaction_keeps_rows_of_per_document_files(self, s3):
+        self._rewrite(s3, "doc1", 10.0)
+
+        result = ParquetCompactor("bucket", s3_client=s3).compact_partition(
+            self.PARTITION
+        )
+
+        assert result["rows"] == 3
+        assert [row["value"] for row in self._rows(s3)] == [0.0, 10.0, 2.0]
+
+    def test_merged_files_outside_compacted_groups_are_rewritten(self, s3):
+        self._rewrite(s3, "doc1", 10.0)
+        compactor = ParquetCompactor("bucket", min_files=10, s3_client=s3)
+
+        result = compactor.compact_partition(self.PARTITION)
+
+        assert result["files_compacted"] == 0
+        assert result["files_rewritten"] == 1
+        assert [row["value"] for row in self._rows(s3)] == [0.0, 10.0, 2.0]
+
+    def test_older_per_document_files_are_kept_with_merged_rows(self, s3):
+        # Written before the compacted file's input was read, e.g. another
+        # section of a document that was left out of a compacted group
+        s3.objects[f"{self.PARTITION}doc1_section_2.parquet"] = _parquet(
+            [{"document_id": "doc1", "value": 5.0}]
+        )
+        compactor = ParquetCompactor("bucket", min_files=10, s3_client=s3)
+
+        result = compactor.compact_partition(self.PARTITION)
+
+        assert result["files_rewritten"] == 0
+        assert [row["value"] for row in self._rows(s3)] == [0.0, 1.0, 5.0, 2.0]
+
+    def test_concurrent_rewrite_is_retried(self, s3):
+        compacted = next(k for k in s3.objects if k.startswith(self.PARTITION))
+        self._rewrite(s3, "doc2", 20.0)
+        put_object = s3.put_object
+        calls = []
+
+        def racing_put_object(**kwargs):
+            if not calls:
+                # Another run removes doc0 between our read and write
+                calls.append(kwargs["Key"])
+                put_object(
+                    Bucket="bucket",
+                    Key=compacted,
+                    Body=write_parquet_bytes(
+                        s3.read_table(compacted).slice(1)  # rows are sorted by key
+                    ),
+                    Metadata=s3.metadata[compacted],
+                )
+            return put_object(**kwargs)
+
+        s3.put_object = racing_put_object
+        compactor = ParquetCompactor("bucket", min_files=10, s3_client=s3)
+
+        assert compactor.compact_partition(self.PARTITION)["files_rewritten"] == 1
+        assert [row["document_id"] for row in self._rows(s3)] == ["doc1", "doc2"]
+        assert s3.read_table(compacted).column("document_id").to_pylist() == ["doc1"]
+
+    def test_file_is_deleted_when_no_rows_remain(self, s3):
+        compacted = next(k for k in s3.objects if k.startswith(self.PARTITION))
+        for i in range(3):
+            self._rewrite(s3, f"doc{i}", 10.0 * i)
+        compactor = ParquetCompactor("bucket", min_files=10, s3_client=s3)
+
+        compactor.compact_partition(self.PARTITION)
+
+        assert compacted not in s3.objects
+        assert [row["value"] for row in self._rows(s3)] == [0.0, 10.0, 20.0]
+
+
+@pytest.mark.unit
+class TestBufferedParquetWriter:
+    """Tests for buffered writing through SaveReportingData."""
+
+    def test_records_are_buffered_across_documents(self):
+        s3 = FakeS3()
+        writer = BufferedParquetWriter("bucket", s3_client=s3)
+        with patch("boto3.client"):
+            reporter = SaveReportingData("bucket", buffered_writer=writer)
+
+        for i in range(3):
+            document = Document(
+                id=f"doc{i}",
+                input_key=f"doc{i}.pdf",
+                initial_event_time="2025-01-31T12:00:00Z",
+                num_pages=1,
+            )
+            document.metering = {"Extraction/bedrock/model": {"inputTokens": 100 * i}}
+            reporter.save_metering_data(document)
+
+        assert s3.objects == {}
+        assert writer.buffered_rows == 3
+
+        keys = reporter.flush()
+
+        assert len(keys) == 1
+        assert keys[0].startswith("metering/date=2025-01-31/batch-")
+        assert s3.read_table(keys[0]).num_rows == 3
+        assert writer.buffered_rows == 0
+
+    def test_auto_flush_at_row_limit(self):
+        s3 = FakeS3()
+        writer = BufferedParquetWriter("bucket", max_buffered_rows=2, s3_client=s3)
+        schema = pa.schema([("a", pa.string())])
+
+        writer.add([{"a": "1"}], "t/date=2025-01-31/x.parquet", schema)
+        assert s3.objects == {}
+        writer.add([{"a": "2"}], "t/date=2025-01-31/y.parquet", schema)
+
+        assert len(s3.objects) == 1
+        assert writer.buffered_rows == 0
+
+    def test_failed_flush_keeps_records(self):
+        s3 = FakeS3()
+        writer = BufferedParquetWriter("bucket", s3_client=s3)
+        schema = pa.schema([("a", pa.string())])
+        writer.add([{"a": "1"}], "t/date=2025-01-31/x.parquet", schema)
+        s3.put_object = MagicMock(side_effect=Exception("S3 unavailable"))
+
+        with pytest.raises(Exception, match="S3 unavailable"):
+            writer.flush()
+
+        assert writer.buffered_rows == 1
@@ -280,29 +280,6 @@ class TestSaveReportingDataSections:
 
         assert flattened == expected
 
-    def test_create_dynamic_schema(self, mock_s3_client):
-        """Test the _create_dynamic_schema method."""
-        reporter = SaveReportingData("test-bucket")
-
-        # Test with empty records
-        schema = reporter._create_dynamic_schema([])
-        assert len(schema) == 1
-        assert schema[0].name == "section_id"
-
-        # Test with mixed type records
-        records = [
-            {"name": "John", "age": 30, "active": True, "score": 95.5},
-            {"name": "Jane", "age": 25, "active": False, "score": 87.2},
-        ]
-
-        schema = reporter._create_dynamic_schema(records)
-        field_names = [field.name for field in schema]
-
-        assert "name" in field_names
-        assert "age" in field_names
-        assert "active" in field_names
-        assert "score" in field_names
-
     def test_save_document_sections_no_sections(
         self, mock_s3_client, document_without_sections
     ):
@@ -0,0 +1,146 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the section schema registry and columnar section conversion.
+"""
+
+import datetime
+from unittest.mock import patch
+
+import pyarrow as pa
+import pytest
+from idp_common.reporting.save_reporting_data import SaveReportingData
+from idp_common.reporting.schema_registry import SectionSchemaRegistry
+
+
+@pytest.mark.unit
+class TestSectionSchemaRegistry:
+    """Tests for the SectionSchemaRegistry class."""
+
+    def test_schema_is_reused(self):
+        registry = SectionSchemaRegistry()
+
+        first = registry.resolve(("invoice", None), ["b", "a", "timestamp"])
+        second = registry.resolve(("invoice", None), ["a"])
+
+        assert second is first
+        assert first.names == ["a", "b", "timestamp"]
+        assert first.field("timestamp").type == pa.timestamp("ms")
+        assert first.field("a").type == pa.string()
+        assert (registry.hits, registry.misses) == (1, 1)
+
+    def test_schema_widens_with_new_columns(self):
+        registry = SectionSchemaRegistry()
+        registry.resolve(("invoice", None), ["a", "b"])
+
+        widened = registry.resolve(("invoice", None), ["c"])
+
+        assert widened.names == ["a", "b", "c"]
+        assert registry.get(("invoice", None)) is widened
+
+    def test_schemas_are_separate_per_class_and_config_version(self):
+        registry = SectionSchemaRegistry()
+        registry.resolve(("invoice", "v1"), ["a"])
+
+        assert registry.resolve(("invoice", "v2"), ["b"]).names == ["b"]
+        assert registry.resolve(("receipt", "v1"), ["c"]).names == ["c"]
+
+    def test_least_recently_used_schema_is_evicted(self):
+        registry = SectionSchemaRegistry(max_schemas=2)
+        registry.resolve("a", ["x"])
+        registry.resolve("b", ["x"])
+        registry.get("a")
+        registry.resolve("c", ["x"])
+
+        assert registry.get("b") is None
+        assert registry.get("a") is not None
+
+
+@pytest.mark.unit
+class TestBuildSectionTable:
+    """Tests for SaveReportingData._build_section_table."""
+
+    @pytest.fixture
+    def reporter(self):
+        with patch("boto3.client"):
+            return SaveReportingData("test-bucket")
+
+    @staticmethod
+    def _line_items(count):
+        return [
+            {
+                "item": f"Product {i}",
+                "price": i * 1.5,
+                "details": {"sku": f"SKU-{i}", "tags": ["a", "b"]},
+                **({"discount": 0.1} if i % 2 else {}),
+            }
+            for i in range(count)
+        ]
+
+    def test_columns_are_typed_like_athena_tables(self, reporter):
+        """Values become strings, missing values nulls, columns sorted by name."""
+        items = self._line_items(3)
+        section_values = {
+            "section_id": "1",
+            "document_id": "doc",
+            "section_classification": "invoice",
+            "section_confidence": 0.95,
+        }
+        rows = [
+            {**reporter._flatten_json_data(item), "record_index": str(i)}
+            for i, item in enumerate(items)
+        ]
+
+        table = reporter._build_section_table(rows, section_values, "invoice")
+
+        assert table.column_names == sorted(table.column_names)
+        assert all(field.type == pa.string() for field in table.schema)
+        assert table.to_pylist()[1] == {
+            "details.sku": "SKU-1",
+            "details.tags": '["a", "b"]',
+            "discount": "0.1",
+            "document_id": "doc",
+            "item": "Product 1",
+            "price": "1.5",
+            "record_index": "1",
+            "section_classification": "invoice",
+            "section_confidence": "0.95",
+            "section_id": "1",
+        }
+        assert table.column("discount").to_pylist() == [None, "0.1", None]
+
+    def test_schemas_are_learned_per_config_version(self):
+        registry = SectionSchemaRegistry()
+        with patch("boto3.client"):
+            v1 = SaveReportingData(
+                "bucket", config_version="v1", schema_registry=registry
+            )
+            v2 = SaveReportingData(
+                "bucket", config_version="v2", schema_registry=registry
+            )
+
+        v1._build_section_table([{"total": "10"}], {}, "invoice")
+        table = v2._build_section_table([{"vendor": "ACME"}], {}, "invoice")
+
+        assert table.column_names == ["vendor"]
+        assert registry.get(("invoice", "v1")).names == ["total"]
+
+    def test_timestamps_and_learned_columns(self, reporter):
+        timestamp = datetime.datetime(2025, 1, 31, 12, 0, tzinfo=datetime.timezone.utc)
+        reporter._build_section_table(
+            [{"total": "10", "vendor": "ACME"}], {"timestamp": timestamp}, "invoice"
+        )
+
+        table = reporter._build_section_table(
+            [{"total": "20", "evaluation_date": "not a date"}],
+            {"timestamp": timestamp},
+            "invoice",
+        )
+
+        assert table.column_names == ["evaluation_date", "timestamp", "total", "vendor"]
+        row = table.to_pylist()[0]
+        assert row["evaluation_date"] is None
+        assert row["timestamp"] == timestamp.replace(tzinfo=None)
+        assert row["total"] == "20"
+        assert row["vendor"] is None
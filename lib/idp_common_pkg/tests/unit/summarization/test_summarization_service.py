@@ -19,7 +19,11 @@ import json
 
 # Import application modules
 from idp_common.summarization.service import SummarizationService
-from idp_common.summarization.models import DocumentSummary
+from idp_common.summarization.models import (
+    DocumentSummary,
+    SectionSummaryResult,
+    SectionView,
+)
 from idp_common.models import Document, Page, Section, Status
 
 
@@ -414,41 +418,42 @@ class TestSummarizationService:
         mock_executor_instance = MagicMock()
         mock_executor.return_value.__enter__.return_value = mock_executor_instance
 
-        # Mock the future results
+        # Configure the futures to return plain section results
         future1 = MagicMock()
+        future1.result.return_value = SectionSummaryResult(
+            section_id="1",
+            summary_content={"summary": "Section 1 summary"},
+            summary_uri="s3://output-bucket/test-document.pdf/sections/1/summary.json",
+            summary_md_uri="s3://output-bucket/test-document.pdf/sections/1/summary.md",
+            metering={"bedrock/model": {"inputTokens": 100, "outputTokens": 50}},
+        )
         future2 = MagicMock()
-
-        # Configure the futures to return (document, metering) tuples
-        doc1 = sample_document
-        doc1.sections[0].attributes = {
-            "summary_uri": "s3://output-bucket/test-document.pdf/sections/1/summary.json"
-        }
-        section1_metering = {"input_tokens": 100, "output_tokens": 50}
-        future1.result.return_value = (doc1, section1_metering)
-
-        doc2 = sample_document
-        doc2.sections[1].attributes = {
-            "summary_uri": "s3://output-bucket/test-document.pdf/sections/2/summary.json"
-        }
-        section2_metering = {"input_tokens": 150, "output_tokens": 75}
-        future2.result.return_value = (doc2, section2_metering)
+        future2.result.return_value = SectionSummaryResult(
+            section_id="2",
+            summary_content={"summary": "Section 2 summary"},
+            summary_uri="s3://output-bucket/test-document.pdf/sections/2/summary.json",
+            summary_md_uri="s3://output-bucket/test-document.pdf/sections/2/summary.md",
+            metering={"bedrock/model": {"inputTokens": 150, "outputTokens": 75}},
+        )
 
         # Configure the executor to return the futures
         mock_executor_instance.submit.side_effect = [future1, future2]
 
         # Mock as_completed to return our futures in order
         with patch("concurrent.futures.as_completed", return_value=[future1, future2]):
-            # Mock get_json_content to return summary content
-            mock_get_json_content.side_effect = [
-                {"summary": "Section 1 summary"},
-                {"summary": "Section 2 summary"},
-            ]
-
             # Process document
             result = service.process_document(sample_document)
 
             # Verify executor was used to process sections in parallel
             assert mock_executor_instance.submit.call_count == 2
+            mock_executor.assert_called_once_with(max_workers=2)
+
+            # Each task receives a section view, not a copy of the document
+            for call in mock_executor_instance.submit.call_args_list:
+                assert isinstance(call.args[1], SectionView)
+
+            # Summaries are merged from the results without reading them back from S3
+            mock_get_json_content.assert_not_called()
 
             # Verify write_content was called for combined results
             assert mock_write_content.call_count == 2
@@ -456,6 +461,63 @@ class TestSummarizationService:
             # Verify document has summarization_result
             assert result.summarization_result is not None
             assert result.summary_report_uri is not None
+            assert result.errors == []
+            assert result.summarization_result.summary.content == {
+                "invoice_1": {"summary": "Section 1 summary"},
+                "receipt_2": {"summary": "Section 2 summary"},
+            }
+            assert (
+                result.sections[0]
+                .attributes["summary_uri"]
+                .endswith("sections/1/summary.json")
+            )
+            assert result.metering == {
+                "bedrock/model": {"inputTokens": 250, "outputTokens": 125}
+            }
+
+    @patch("idp_common.s3.get_text_content")
+    @patch("idp_common.s3.write_content")
+    @patch("idp_common.summarization.service.SummarizationService.process_text")
+    def test_process_document_section_failures_are_merged(
+        self,
+        mock_process_text,
+        mock_write_content,
+        mock_get_text_content,
+        mock_config,
+        sample_document,
+    ):
+        """Test that errors from failed sections are merged into the document."""
+        mock_config["summarization"]["max_workers"] = "1"
+        service = SummarizationService(region="us-west-2", config=mock_config)
+        mock_get_text_content.return_value = "Page text"
+        mock_process_text.side_effect = [
+            DocumentSummary(content={"summary": "ok"}, metadata={}),
+            Exception("model error"),
+        ]
+
+        result = service.process_document(sample_document)
+
+        assert service.max_workers == 1
+        assert "Error summarizing section 2: model error" in result.errors
+        assert "summary_uri" in result.sections[0].attributes
+        assert result.sections[1].attributes is None
+        assert list(result.summarization_result.summary.content) == ["invoice_1"]
+
+    def test_section_view_from_document(self, sample_document):
+        """Test building an immutable section view."""
+        sample_document.sections[0].page_ids = ["2", "1", "10"]
+
+        view = SectionView.from_document(sample_document, sample_document.sections[0])
+
+        assert view.page_ids == ("1", "2", "10")
+        assert view.text_uris == (
+            "s3://input-bucket/test-document.pdf/pages/1/text.txt",
+            "s3://input-bucket/test-document.pdf/pages/2/text.txt",
+            None,
+        )
+        assert view.output_prefix == "test-document.pdf"
+        with pytest.raises(Exception):
+            view.section_id = "2"
 
     @patch("idp_common.s3.get_text_content")
     @patch("idp_common.s3.write_content")
@@ -0,0 +1,101 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the shared boto3 client registry.
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from idp_common import clients
+
+
+@pytest.mark.unit
+class TestClientRegistry:
+    @patch("boto3.client")
+    def test_client_is_created_once(self, mock_client):
+        mock_client.side_effect = lambda *args, **kwargs: MagicMock()
+
+        first = clients.get_client("s3")
+        second = clients.get_client("s3")
+
+        assert first is second
+        assert mock_client.call_count == 1
+        config = mock_client.call_args.kwargs["config"]
+        assert config.max_pool_connections == clients.DEFAULT_MAX_POOL_CONNECTIONS
+        assert config.retries["mode"] == "adaptive"
+
+    @patch("boto3.client")
+    def test_clients_keyed_by_region_and_config(self, mock_client):
+        mock_client.side_effect = lambda *args, **kwargs: MagicMock()
+
+        default = clients.get_client("bedrock-runtime", region_name="us-east-1")
+        other_region = clients.get_client("bedrock-runtime", region_name="us-west-2")
+        long_timeout = clients.get_client(
+            "bedrock-runtime", region_name="us-east-1", read_timeout=300
+        )
+
+        assert len({id(default), id(other_region), id(long_timeout)}) == 3
+        assert mock_client.call_args.kwargs["config"].read_timeout == 300
+
+    @patch("boto3.client")
+    def test_larger_pool_replaces_client(self, mock_client):
+        mock_client.side_effect = lambda *args, **kwargs: MagicMock()
+        pool_size = clients.DEFAULT_MAX_POOL_CONNECTIONS + 10
+
+        small = clients.get_client("textract")
+        large = clients.get_client("textract", max_pool_connections=pool_size)
+
+        assert small is not large
+        assert mock_client.call_args.kwargs["config"].max_pool_connections == pool_size
+        # A smaller request is served by the larger pool
+        assert clients.get_client("textract") is large
+
+    @patch("boto3.client")
+    def test_concurrent_callers_share_one_client(self, mock_client):
+        mock_client.side_effect = lambda *args, **kwargs: MagicMock()
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda: results.append(clients.get_client("s3")))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert mock_client.call_count == 1
+        assert all(result is results[0] for result in results)
+
+    @patch("boto3.resource")
+    def test_resources_are_cached_per_thread(self, mock_resource):
+        mock_resource.side_effect = lambda *args, **kwargs: MagicMock()
+        other_thread = []
+
+        main = clients.get_resource("dynamodb")
+        assert clients.get_resource("dynamodb") is main
+
+        thread = threading.Thread(
+            target=lambda: other_thread.append(clients.get_resource("dynamodb"))
+        )
+        thread.start()
+        thread.join()
+
+        assert other_thread[0] is not main
+        assert mock_resource.call_count == 2
+
+    @patch("boto3.resource")
+    @patch("boto3.client")
+    def test_clear_clients(self, mock_client, mock_resource):
+        mock_client.side_effect = lambda *args, **kwargs: MagicMock()
+        mock_resource.side_effect = lambda *args, **kwargs: MagicMock()
+        client = clients.get_client("s3")
+        resource = clients.get_resource("dynamodb")
+
+        clients.clear_clients()
+
+        assert clients.get_client("s3") is not client
+        assert clients.get_resource("dynamodb") is not resource
@@ -11,6 +11,7 @@ from unittest.mock import Mock, patch
 import boto3
 import pytest
 from idp_common.models import Document, Page, Section, Status
+from idp_common.state_codec import decode_state
 from moto import mock_aws
 
 
@@ -94,7 +95,7 @@ class TestDocumentCompression:
         # Verify document was stored in S3
         s3_key = compressed_data["s3_uri"].replace(f"s3://{self.bucket}/", "")
         response = s3_client.get_object(Bucket=self.bucket, Key=s3_key)
-        stored_document = json.loads(response["Body"].read().decode("utf-8"))
+        stored_document = decode_state(response["Body"].read())
 
         # Verify stored document contains all original data
         assert stored_document["id"] == "test-doc-123"
@@ -0,0 +1,73 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the image module.
+"""
+
+import io
+import random
+
+import pytest
+from idp_common.image import apply_adaptive_binarization
+from PIL import Image, ImageFilter
+
+
+def _reference_binarization(image_data: bytes, block_size: int, c: int) -> bytes:
+    """Per-pixel reference implementation of adaptive mean thresholding."""
+    pil_image = Image.open(io.BytesIO(image_data)).convert("L")
+    blurred = pil_image.filter(ImageFilter.BoxBlur(block_size // 2))
+    pixels = [
+        255 if orig > blur - c else 0
+        for orig, blur in zip(pil_image.getdata(), blurred.getdata())
+    ]
+    binary_image = Image.new("L", pil_image.size)
+    binary_image.putdata(pixels)
+    output = io.BytesIO()
+    binary_image.save(output, format="JPEG")
+    return output.getvalue()
+
+
+@pytest.fixture
+def noisy_page():
+    """Small RGB page with random noise and a lighting gradient."""
+    rng = random.Random(7)
+    width, height = 120, 90
+    image = Image.new("RGB", (width, height))
+    image.putdata(
+        [
+            tuple(min(255, x + rng.randint(0, 120)) for _ in range(3))
+            for y in range(height)
+            for x in range(width)
+        ]
+    )
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+    return output.getvalue()
+
+
+@pytest.mark.unit
+class TestAdaptiveBinarization:
+    """Tests for apply_adaptive_binarization."""
+
+    @pytest.mark.parametrize(
+        "block_size,c", [(15, 10), (31, 5), (7, 1), (15, 0), (11, -4)]
+    )
+    def test_matches_reference(self, noisy_page, block_size, c):
+        """Test that output is identical to the per-pixel implementation."""
+        expected = _reference_binarization(noisy_page, block_size, c)
+        assert apply_adaptive_binarization(noisy_page, block_size, c) == expected
+
+    def test_defaults(self, noisy_page):
+        """Test that defaults are block_size=15 and c=10."""
+        assert apply_adaptive_binarization(noisy_page) == _reference_binarization(
+            noisy_page, 15, 10
+        )
+
+    def test_invalid_parameters_fall_back_to_original(self, noisy_page):
+        """Test that invalid parameters return the original image."""
+        assert apply_adaptive_binarization(noisy_page, block_size=0) == noisy_page
+
+    def test_invalid_image_falls_back_to_original(self):
+        """Test that undecodable input is returned unchanged."""
+        assert apply_adaptive_binarization(b"not an image") == b"not an image"
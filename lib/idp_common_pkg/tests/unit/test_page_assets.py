@@ -0,0 +1,257 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the shared page asset cache.
+"""
+
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import boto3
+import pytest
+from idp_common import page_assets
+from idp_common.models import Document, Page
+from idp_common.page_assets import PageAssetCache, variant_key
+from moto import mock_aws
+
+BUCKET = "page-assets"
+
+
+def _resize(data, width, height):
+    return f"{width}x{height}:".encode("utf-8") + data
+
+
+@pytest.fixture(autouse=True)
+def mock_resize():
+    with patch("idp_common.image.resize_image", side_effect=_resize) as mock_resize:
+        yield mock_resize
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        client.put_object(
+            Bucket=BUCKET, Key="doc/1/result.json", Body=b'{"text": "one"}'
+        )
+        client.put_object(Bucket=BUCKET, Key="doc/1/image.png", Body=b"original")
+        yield client
+
+
+@pytest.mark.unit
+class TestPageAssetCache:
+    def test_variant_key(self):
+        assert variant_key("doc/1/image.jpg", 951, 1268) == "doc/1/image.951x1268.jpg"
+
+    def test_text_is_revalidated_with_etag(self, s3_client):
+        cache = PageAssetCache()
+        uri = f"s3://{BUCKET}/doc/1/result.json"
+
+        assert cache.get_text(uri) == "one"
+        assert cache.get_text(uri) == "one"
+        assert cache.stats()["memory_hits"] == 1
+
+        s3_client.put_object(
+            Bucket=BUCKET, Key="doc/1/result.json", Body=b'{"text": "two"}'
+        )
+        assert cache.get_text(uri) == "two"
+
+    def test_resized_variant_is_stored_and_reused(self, s3_client, mock_resize):
+        uri = f"s3://{BUCKET}/doc/1/image.png"
+        data = PageAssetCache().get_image(uri, 500, 500)
+
+        assert data == b"500x500:original"
+        variant = s3_client.get_object(Bucket=BUCKET, Key="doc/1/image.500x500.jpg")
+        source = s3_client.head_object(Bucket=BUCKET, Key="doc/1/image.png")
+        assert variant["Metadata"]["source-etag"] == source["ETag"]
+
+        # A new process reads the small variant instead of resizing again
+        cache = PageAssetCache()
+        assert cache.get_image(uri, "500", "500") == data
+        assert mock_resize.call_count == 1
+        assert cache.stats()["variant_hits"] == 1
+
+    def test_stale_variant_is_replaced(self, s3_client):
+        uri = f"s3://{BUCKET}/doc/1/image.png"
+        PageAssetCache().get_image(uri, 500, 500)
+
+        s3_client.put_object(Bucket=BUCKET, Key="doc/1/image.png", Body=b"rewritten")
+        cache = PageAssetCache()
+
+        assert cache.get_image(uri, 500, 500) == b"500x500:rewritten"
+        assert cache.stats()["misses"] == 1
+
+    def test_memory_tier_is_bounded_by_bytes(self, s3_client):
+        for i in range(2, 5):
+            s3_client.put_object(
+                Bucket=BUCKET,
+                Key=f"doc/{i}/result.json",
+                Body=b'{"text": "0123456789"}',
+            )
+        cache = PageAssetCache(max_bytes=25)
+
+        for i in range(2, 5):
+            cache.get_text(f"s3://{BUCKET}/doc/{i}/result.json")
+
+        stats = cache.stats()
+        assert stats["entries"] == 2
+        assert stats["bytes"] == 20
+
+    def test_disk_tier_serves_evicted_entries(self, s3_client, tmp_path):
+        uri = f"s3://{BUCKET}/doc/1/image.png"
+        cache = PageAssetCache(
+            max_bytes=0, directory=str(tmp_path), store_variants=False
+        )
+
+        assert cache.get_image(uri) == b"951x1268:original"
+        assert cache.get_image(uri) == b"951x1268:original"
+        assert cache.stats()["disk_hits"] == 1
+        assert cache.stats()["entries"] == 0
+
+    def test_disk_tier_is_bounded_by_bytes(self, s3_client, tmp_path):
+        uri = f"s3://{BUCKET}/doc/1/image.png"
+        cache = PageAssetCache(
+            max_bytes=0,
+            directory=str(tmp_path),
+            max_disk_bytes=8,
+            store_variants=False,
+        )
+
+        cache.get_image(uri)
+
+        assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.unit
+class TestFetchPages:
+    def test_disabled_cache_reads_assets_directly(self):
+        with (
+            patch(
+                "idp_common.s3.get_text_content", side_effect=lambda uri: f"text {uri}"
+            ),
+            patch("idp_common.image.prepare_image", return_value=b"img") as mock_image,
+        ):
+            pages = page_assets.fetch_pages([("t1", "i1"), ("t2", None)])
+
+        assert pages == [("text t1", b"img"), ("text t2", None)]
+        mock_image.assert_called_once_with("i1")
+
+    def test_pages_keep_their_order(self, s3_client, monkeypatch):
+        monkeypatch.setenv("PAGE_ASSET_CACHE", "true")
+        monkeypatch.setenv("PAGE_ASSET_CACHE_STORE_VARIANTS", "false")
+        for i in range(2, 12):
+            s3_client.put_object(
+                Bucket=BUCKET,
+                Key=f"doc/{i}/result.json",
+                Body=json.dumps({"text": f"page {i}"}).encode("utf-8"),
+            )
+
+        pages = page_assets.fetch_pages(
+            [(f"s3://{BUCKET}/doc/{i}/result.json", None) for i in range(2, 12)]
+            + [(None, f"s3://{BUCKET}/doc/1/image.png")],
+            300,
+            300,
+            max_workers=4,
+        )
+
+        assert [text for text, _ in pages[:-1]] == [f"page {i}" for i in range(2, 12)]
+        assert pages[-1] == (None, b"300x300:original")
+        assert page_assets.get_page_asset_cache().stats()["misses"] == 11
+
+
+class SlowReader:
+    """Reads page text slowly and records the largest number of concurrent reads."""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, uri):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        with self._lock:
+            self.active -= 1
+        return f"text {uri}"
+
+
+@pytest.mark.unit
+class TestSectionPrefetch:
+    def _document(self, num_pages):
+        document = Document(id="doc")
+        for i in range(1, num_pages + 1):
+            document.pages[str(i)] = Page(
+                page_id=str(i),
+                parsed_text_uri=f"s3://bucket/{i}.json",
+                image_uri=f"s3://bucket/{i}.jpg",
+                text_confidence_uri=f"s3://bucket/{i}-confidence.json",
+            )
+        return document
+
+    def test_pages_are_read_in_order_with_bounded_concurrency(self, monkeypatch):
+        monkeypatch.setenv("PAGE_FETCH_MAX_WORKERS", "3")
+        reader = SlowReader()
+        page_ids = [str(i) for i in range(1, 21)]
+        with (
+            patch("idp_common.s3.get_text_content", side_effect=reader),
+            patch("idp_common.image.prepare_image", side_effect=lambda uri, *size: uri),
+        ):
+            pages = page_assets.load_section_pages(self._document(20), page_ids)
+
+        assert pages.page_ids == page_ids
+        assert pages.texts == [f"text s3://bucket/{i}.json" for i in range(1, 21)]
+        assert pages.images == [f"s3://bucket/{i}.jpg" for i in range(1, 21)]
+        assert pages.text.startswith("text s3://bucket/1.json\ntext s3://bucket/2")
+        assert reader.max_active <= 3
+
+    def test_missing_pages_are_recorded_and_skipped(self):
+        document = self._document(2)
+        with (
+            patch("idp_common.s3.get_text_content", return_value="text"),
+            patch("idp_common.image.prepare_image", return_value=b"img"),
+        ):
+            pages = page_assets.load_section_pages(document, ["1", "5", "2"])
+
+        assert pages.page_ids == ["1", "2"]
+        assert document.errors == ["Page 5 not found in document"]
+
+    def test_page_loader_results_are_returned_as_extras(self):
+        with (
+            patch("idp_common.s3.get_text_content", return_value="text"),
+            patch("idp_common.image.prepare_image", return_value=b"img"),
+        ):
+            prefetch = page_assets.prefetch_section_pages(
+                self._document(3),
+                ["1", "2", "3"],
+                951,
+                1268,
+                page_loader=lambda page: page.text_confidence_uri,
+                max_workers=2,
+            )
+            pages = prefetch.result()
+
+        assert pages.extras == [f"s3://bucket/{i}-confidence.json" for i in (1, 2, 3)]
+        assert pages.images == [b"img"] * 3
+
+    def test_first_error_is_raised_from_result(self):
+        def read(uri):
+            if uri.endswith("2.json"):
+                raise ValueError("missing text")
+            return "text"
+
+        with (
+            patch("idp_common.s3.get_text_content", side_effect=read),
+            patch("idp_common.image.prepare_image", return_value=b"img"),
+        ):
+            prefetch = page_assets.prefetch_section_pages(
+                self._document(3), ["1", "2", "3"]
+            )
+            with pytest.raises(ValueError, match="missing text"):
+                prefetch.result()
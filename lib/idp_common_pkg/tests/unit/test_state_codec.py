@@ -0,0 +1,127 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the document state format.
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import boto3
+import pytest
+from idp_common import state_codec
+from idp_common.models import Document, Page, Section, Status
+from moto import mock_aws
+
+BUCKET = "working-bucket"
+
+
+def _document():
+    document = Document(id="doc", input_key="doc.pdf", status=Status.EXTRACTING)
+    for i in range(1, 51):
+        document.pages[str(i)] = Page(
+            page_id=str(i),
+            image_uri=f"s3://output/doc.pdf/pages/{i}/image.jpg",
+            parsed_text_uri=f"s3://output/doc.pdf/pages/{i}/result.json",
+            classification="invoice",
+        )
+    document.sections = [
+        Section(section_id="1", classification="invoice", page_ids=["1", "2"])
+    ]
+    return document
+
+
+@pytest.mark.unit
+class TestStateCodec:
+    def test_gzip_round_trip_is_smaller_than_json(self):
+        document_json = state_codec.dumps_document(_document().to_dict())
+
+        body, codec = state_codec.encode_state(document_json, "gzip")
+
+        assert codec == "gzip"
+        assert len(body) < len(document_json) / 5
+        assert state_codec.decode_state(body) == json.loads(document_json)
+
+    def test_envelope_is_versioned(self):
+        body, _ = state_codec.encode_state(b'{"id":"doc"}', "json")
+
+        assert json.loads(body) == {"format_version": 1, "document": {"id": "doc"}}
+
+    def test_plain_document_json_is_read(self):
+        legacy = json.dumps(_document().to_dict()).encode("utf-8")
+
+        assert state_codec.decode_state(legacy)["id"] == "doc"
+
+    def test_newer_format_version_is_rejected(self):
+        body = json.dumps({"format_version": 99, "document": {}}).encode("utf-8")
+
+        with pytest.raises(ValueError, match="format version: 99"):
+            state_codec.decode_state(body)
+
+    def test_codec_is_configurable(self, monkeypatch):
+        monkeypatch.setenv("DOCUMENT_STATE_CODEC", "json")
+        assert state_codec.default_codec() == "json"
+
+        monkeypatch.setenv("DOCUMENT_STATE_CODEC", "brotli")
+        assert state_codec.default_codec() == "gzip"
+
+    def test_zstd_falls_back_to_gzip_without_zstandard(self, monkeypatch):
+        monkeypatch.setenv("DOCUMENT_STATE_CODEC", "zstd")
+        monkeypatch.setattr(state_codec, "ZSTD_AVAILABLE", False)
+
+        assert state_codec.default_codec() == "gzip"
+        with pytest.raises(ImportError):
+            state_codec.decode_state(b"\x28\xb5\x2f\xfd" + b"\x00" * 8)
+
+    @pytest.mark.skipif(not state_codec.ZSTD_AVAILABLE, reason="zstandard missing")
+    def test_zstd_round_trip(self):
+        document_json = state_codec.dumps_document(_document().to_dict())
+
+        body, codec = state_codec.encode_state(document_json, "zstd")
+
+        assert codec == "zstd"
+        assert state_codec.decode_state(body) == json.loads(document_json)
+
+
+@pytest.mark.unit
+class TestDocumentState:
+    @mock_aws
+    def test_compressed_state_round_trip(self):
+        s3_client = boto3.client("s3", region_name="us-east-1")
+        s3_client.create_bucket(Bucket=BUCKET)
+        document = _document()
+
+        wrapper = document.serialize_document(BUCKET, "extraction")
+
+        assert wrapper["s3_uri"].endswith("_extraction_state.json.gz")
+        restored = Document.decompress(BUCKET, wrapper)
+        assert restored.to_dict() == document.to_dict()
+
+    @mock_aws
+    def test_legacy_json_state_is_restored(self):
+        s3_client = boto3.client("s3", region_name="us-east-1")
+        s3_client.create_bucket(Bucket=BUCKET)
+        document = _document()
+        key = "compressed_documents/doc/1_ocr_state.json"
+        s3_client.put_object(Bucket=BUCKET, Key=key, Body=document.to_json())
+
+        restored = Document.load_document(
+            {"compressed": True, "s3_uri": f"s3://{BUCKET}/{key}"}, BUCKET
+        )
+
+        assert restored.to_dict() == document.to_dict()
+
+    def test_document_is_serialized_once(self):
+        document = _document()
+        with (
+            patch("idp_common.state_store.get_client", return_value=MagicMock()),
+            patch(
+                "idp_common.state_codec.dumps_document",
+                wraps=state_codec.dumps_document,
+            ) as mock_dumps,
+            patch("idp_common.state_store.dumps_document", new=mock_dumps),
+        ):
+            document.serialize_document(BUCKET, "classification")
+
+        assert mock_dumps.call_count == 1
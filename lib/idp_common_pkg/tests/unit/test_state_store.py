@@ -0,0 +1,242 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the snapshot and delta document state store.
+"""
+
+import boto3
+import pytest
+from idp_common import state_store
+from idp_common.models import Document, HitlMetadata, Page, Section, Status
+from idp_common.state_codec import KIND_DELTA, decode_envelope
+from idp_common.state_store import (
+    DocumentStateStore,
+    apply_delta,
+    compute_delta,
+    state_fingerprints,
+)
+from moto import mock_aws
+
+BUCKET = "working-bucket"
+
+
+def _document(num_pages=40, num_sections=4):
+    document = Document(
+        id="doc", input_key="doc.pdf", status=Status.CLASSIFYING, num_pages=num_pages
+    )
+    for i in range(1, num_pages + 1):
+        document.pages[str(i)] = Page(
+            page_id=str(i),
+            image_uri=f"s3://output/doc.pdf/pages/{i}/image.jpg",
+            parsed_text_uri=f"s3://output/doc.pdf/pages/{i}/result.json",
+            raw_text_uri=f"s3://output/doc.pdf/pages/{i}/rawText.json",
+            classification="invoice",
+        )
+    size = num_pages // num_sections
+    document.sections = [
+        Section(
+            section_id=str(s),
+            classification="invoice",
+            page_ids=[str(i) for i in range(s * size - size + 1, s * size + 1)],
+        )
+        for s in range(1, num_sections + 1)
+    ]
+    return document
+
+
+def _section_document(document, section_id):
+    """What the extraction function passes on for one Map iteration."""
+    section = next(s for s in document.sections if s.section_id == section_id)
+    document.sections = [section]
+    document.metering = {}
+    document.pages = {page_id: document.pages[page_id] for page_id in section.page_ids}
+    section.extraction_result_uri = f"s3://output/doc.pdf/sections/{section_id}.json"
+    section.attributes = {"total": section_id}
+    document.metering = {"Extraction/bedrock/model": {"inputTokens": 100}}
+    return document
+
+
+@pytest.fixture
+def s3_client():
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def _kind(s3_client, wrapper):
+    key = wrapper["s3_uri"].replace(f"s3://{BUCKET}/", "")
+    body = s3_client.get_object(Bucket=BUCKET, Key=key)["Body"].read()
+    return decode_envelope(body)[0], len(body)
+
+
+@pytest.mark.unit
+class TestDelta:
+    def test_delta_round_trip(self):
+        base = _document().to_dict()
+        fingerprints = state_fingerprints(base)
+
+        document = Document.from_dict(base)
+        document.status = Status.EXTRACTING
+        document.pages["3"].classification = "letter"
+        del document.pages["40"]
+        document.sections.reverse()
+        document.hitl_metadata = [HitlMetadata(execution_id="hitl")]
+        current = document.to_dict()
+
+        delta = compute_delta(fingerprints, current)
+        assert set(delta["pages"]) == {"3"}
+        assert "sections" not in delta
+        assert set(delta["fields"]) == {"status", "hitl_metadata"}
+
+        merged = _document().to_dict()
+        apply_delta(merged, delta)
+        assert merged == current
+
+    def test_unchanged_document_has_empty_delta(self):
+        document_dict = _document().to_dict()
+
+        assert compute_delta(state_fingerprints(document_dict), document_dict) == {}
+
+    def test_removed_fields_are_removed(self):
+        document = _document()
+        document.hitl_metadata = [HitlMetadata(execution_id="hitl")]
+        base = document.to_dict()
+        document.hitl_metadata = []
+
+        delta = compute_delta(state_fingerprints(base), document.to_dict())
+        apply_delta(base, delta)
+
+        assert delta["removed_fields"] == ["hitl_metadata"]
+        assert base == document.to_dict()
+
+
+@pytest.mark.unit
+class TestDocumentStateStore:
+    def test_first_save_is_snapshot_and_later_saves_are_deltas(self, s3_client):
+        store = DocumentStateStore(BUCKET)
+        ocr = store.save(_document(), "ocr")
+        assert ocr["s3_uri"].endswith("_ocr_state.json.gz")
+
+        document = store.load(ocr)
+        document.status = Status.EXTRACTING
+        wrapper = store.save(document, "classification")
+
+        ocr_kind, ocr_size = _kind(s3_client, ocr)
+        kind, size = _kind(s3_client, wrapper)
+        assert (ocr_kind, kind) == ("document", KIND_DELTA)
+        assert size < ocr_size / 4
+        assert store.load(wrapper).to_dict() == document.to_dict()
+
+    def test_map_iterations_write_section_deltas(self, s3_client):
+        store = DocumentStateStore(BUCKET)
+        classification = store.save(_document(), "classification")
+
+        section_wrappers = []
+        for section_id in ["1", "2", "3", "4"]:
+            document = store.load(classification)
+            section_document = _section_document(document, section_id)
+            section_wrappers.append(
+                store.save(section_document, f"extraction_{section_id}")
+            )
+            assert _kind(s3_client, section_wrappers[-1])[0] == KIND_DELTA
+
+        restored = store.load(section_wrappers[1])
+        assert [s.section_id for s in restored.sections] == ["2"]
+        assert list(restored.pages) == [str(i) for i in range(11, 21)]
+        assert restored.sections[0].attributes == {"total": "2"}
+        assert restored.metering == {"Extraction/bedrock/model": {"inputTokens": 100}}
+
+    def test_shared_base_is_read_once(self, s3_client):
+        store = DocumentStateStore(BUCKET)
+        classification = store.save(_document(), "classification")
+        wrappers = [
+            store.save(
+                _section_document(store.load(classification), section_id),
+                f"extraction_{section_id}",
+            )
+            for section_id in ["1", "2", "3"]
+        ]
+
+        # A new process (e.g. process results) loads the Map iteration results
+        state_store.reset_state_cache()
+        reads = []
+        client = state_store.get_client("s3")
+        original = client.get_object
+
+        def get_object(**kwargs):
+            reads.append(kwargs["Key"])
+            return original(**kwargs)
+
+        client.get_object = get_object
+        try:
+            for wrapper in wrappers:
+                store.load(wrapper)
+        finally:
+            client.get_object = original
+
+        assert len(reads) == 4
+        assert len(set(reads)) == 4
+
+    def test_chain_is_compacted_after_max_deltas(self, s3_client):
+        store = DocumentStateStore(BUCKET, max_deltas=2)
+        wrapper = store.save(_document(), "ocr")
+        kinds = []
+        for step in ["classification", "extraction", "assessment", "summarization"]:
+            document = store.load(wrapper)
+            document.metering = {step: {"invocations": 1}}
+            wrapper = store.save(document, step)
+            kinds.append(_kind(s3_client, wrapper)[0])
+
+        assert kinds == [KIND_DELTA, KIND_DELTA, "document", KIND_DELTA]
+        assert store.load(wrapper).metering == {"summarization": {"invocations": 1}}
+
+    def test_old_base_is_compacted(self, s3_client, monkeypatch):
+        now = [1_700_000_000.0]
+        monkeypatch.setattr(state_store.time, "time", lambda: now[0])
+        store = DocumentStateStore(BUCKET, max_base_age=3600)
+        wrapper = store.save(_document(), "ocr")
+        kinds = []
+        # e.g. a document waiting for human review before the next steps
+        for step, wait in [("classification", 60), ("hitl", 2 * 3600), ("summary", 60)]:
+            now[0] += wait
+            document = store.load(wrapper)
+            document.metering = {step: {"invocations": 1}}
+            wrapper = store.save(document, step)
+            kinds.append(_kind(s3_client, wrapper)[0])
+
+        assert kinds == [KIND_DELTA, "document", KIND_DELTA]
+        assert store.load(wrapper).metering == {"summary": {"invocations": 1}}
+
+    def test_large_delta_is_written_as_snapshot(self, s3_client):
+        store = DocumentStateStore(BUCKET)
+        document = store.load(store.save(_document(), "ocr"))
+        for page in document.pages.values():
+            page.classification = "letter"
+
+        wrapper = store.save(document, "classification")
+
+        assert _kind(s3_client, wrapper)[0] == "document"
+        assert store.load(wrapper).to_dict() == document.to_dict()
+
+    def test_deltas_can_be_disabled(self, s3_client, monkeypatch):
+        monkeypatch.setenv("DOCUMENT_STATE_DELTAS", "false")
+        store = DocumentStateStore(BUCKET)
+        document = store.load(store.save(_document(), "ocr"))
+
+        wrapper = store.save(document, "classification")
+
+        assert _kind(s3_client, wrapper)[0] == "document"
+
+    def test_serialize_and_load_document_use_deltas(self, s3_client):
+        wrapper = _document().serialize_document(BUCKET, "ocr")
+        document = Document.load_document(wrapper, BUCKET)
+        document.status = Status.EXTRACTING
+
+        wrapper = document.serialize_document(BUCKET, "extraction")
+
+        assert wrapper["s3_uri"].endswith("_extraction_state.json.gz")
+        assert _kind(s3_client, wrapper)[0] == KIND_DELTA
+        assert wrapper["sections"] == ["1", "2", "3", "4"]
+        assert Document.load_document(wrapper, BUCKET).status == Status.EXTRACTING
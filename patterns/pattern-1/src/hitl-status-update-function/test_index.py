@@ -0,0 +1,65 @@
+"""
+Unit tests for the HITL status update Lambda function.
+"""
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from idp_common import state_store
+from idp_common.models import Document, HitlMetadata, Page, Status
+
+from index import handler
+
+BUCKET = "working-bucket"
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setenv("WORKING_BUCKET", BUCKET)
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        state_store.reset_state_cache()
+        yield client
+        state_store.reset_state_cache()
+
+
+def _stored_objects(s3_client):
+    objects = s3_client.list_objects_v2(Bucket=BUCKET).get("Contents", [])
+    return {
+        obj["Key"]: s3_client.get_object(Bucket=BUCKET, Key=obj["Key"])["Body"].read()
+        for obj in objects
+    }
+
+
+@pytest.mark.unit
+def test_hitl_completion_is_saved_as_new_state(s3_client):
+    """Test the hand-off from process results through HITL to summarization."""
+    document = Document(id="doc", input_key="doc.pdf", status=Status.POSTPROCESSING)
+    for i in range(1, 4):
+        document.pages[str(i)] = Page(page_id=str(i), classification="invoice")
+    document.hitl_metadata = [
+        HitlMetadata(execution_id="exec", record_number=1, hitl_triggered=True)
+    ]
+    base = document.serialize_document(BUCKET, "processresults")
+
+    # A later state that only stores a delta on the snapshot with the HITL metadata
+    document = Document.load_document(base, BUCKET)
+    document.status = Status.HITL_IN_PROGRESS
+    wrapper = document.serialize_document(BUCKET, "processresults")
+    stored = _stored_objects(s3_client)
+
+    result = handler({"document": wrapper, "HITLWaitResult": {}}, None)
+
+    assert result["hitl_status_updated"] is True
+    assert result["document"]["s3_uri"] != wrapper["s3_uri"]
+    # Stored states are never rewritten
+    after = _stored_objects(s3_client)
+    assert {key: after[key] for key in stored} == stored
+
+    state_store.reset_state_cache()
+    updated = Document.load_document(result["document"], BUCKET)
+    assert updated.status == Status.HITL_IN_PROGRESS
+    assert [item.hitl_completed for item in updated.hitl_metadata] == [True]
+    assert Document.load_document(wrapper, BUCKET).hitl_metadata[0].hitl_completed is False
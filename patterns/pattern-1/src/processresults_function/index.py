@@ -8,6 +8,8 @@ import logging
 import os
 import random
 import string
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from urllib.parse import urlparse
 
@@ -15,10 +17,11 @@ import boto3
 import fitz  # PyMuPDF
 from botocore.exceptions import ClientError
 from idp_common import metrics
+from idp_common.clients import get_client
 from idp_common.docs_service import create_document_service
 from idp_common.config import get_config
 from idp_common.models import Document, HitlMetadata, Page, Section, Status
-from idp_common.s3 import get_s3_client, write_content
+from idp_common.s3 import write_content
 from idp_common.utils import build_s3_uri
 
 logger = logging.getLogger()
@@ -26,8 +29,13 @@ logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_LOG_LEVEL", "INFO"))
 # Get LOG_LEVEL from environment variable with INFO as default
 
-# Use the common S3 client
-s3_client = get_s3_client()
+# Number of concurrent S3 transfers and page uploads
+MAX_WORKERS = int(os.environ.get('MAX_WORKERS', 20))
+# Number of threads rendering PDF pages to images, each with its own document handle
+RENDER_WORKERS = max(1, int(os.environ.get('RENDER_WORKERS', min(4, os.cpu_count() or 1))))
+
+# Use the common S3 client, with a pooled connection per worker
+s3_client = get_client('s3', max_pool_connections=MAX_WORKERS)
 ssm_client = boto3.client('ssm')
 bedrock_client = boto3.client('bedrock-data-automation')
 SAGEMAKER_A2I_REVIEW_PORTAL_URL = os.environ.get('SAGEMAKER_A2I_REVIEW_PORTAL_URL', '')
@@ -106,36 +114,72 @@ def create_metadata_file(file_uri, class_type, file_type=None):
     except Exception as e:
         logger.error(f"Error creating metadata file for {file_uri}: {str(e)}")
 
+def map_concurrently(func, items):
+    """
+    Apply a function to each item on a bounded pool of worker threads.
+    
+    Args:
+        func: Function to apply
+        items: Items to process
+        
+    Returns:
+        list: Results in the order of the items
+    """
+    items = list(items)
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(items))) as executor:
+        return list(executor.map(func, items))
+
+def list_s3_objects(bucket, prefix, delimiter=None):
+    """
+    List all objects (and common prefixes, if a delimiter is given) under a prefix.
+    
+    Args:
+        bucket (str): The bucket
+        prefix (str): The key prefix
+        delimiter (str, optional): Delimiter used to group keys into common prefixes
+        
+    Returns:
+        tuple: (list of object keys, list of common prefixes)
+    """
+    paginator = s3_client.get_paginator('list_objects_v2')
+    params = {'Bucket': bucket, 'Prefix': prefix}
+    if delimiter:
+        params['Delimiter'] = delimiter
+
+    keys = []
+    prefixes = []
+    for page in paginator.paginate(**params):
+        keys.extend(obj['Key'] for obj in page.get('Contents', []))
+        prefixes.extend(p['Prefix'] for p in page.get('CommonPrefixes', []) if p.get('Prefix'))
+    return keys, prefixes
+
+def copy_s3_object(src_bucket, src_key, dest_bucket, dest_key, content_type='application/json'):
+    """
+    Copy an object server-side, without downloading it.
+    """
+    s3_client.copy_object(
+        CopySource={'Bucket': src_bucket, 'Key': src_key},
+        Bucket=dest_bucket,
+        Key=dest_key,
+        ContentType=content_type,
+        MetadataDirective='REPLACE'
+    )
+
 def copy_s3_objects(bda_result_bucket, bda_result_prefix, output_bucket, object_key):
     """
     Copy objects from a source S3 location to a destination S3 location.
     """
-    copied_files = 0
     try:
-        # List all objects in source location using pagination
-        paginator = s3_client.get_paginator('list_objects_v2')
-        page_iterator = paginator.paginate(
-            Bucket=bda_result_bucket,
-            Prefix=bda_result_prefix
-        )
+        bda_result_keys, _ = list_s3_objects(bda_result_bucket, bda_result_prefix)
 
-        # Process each object in the pages
-        for page in page_iterator:
-            if not page.get('Contents'):
-                continue
-                
-            for obj in page['Contents']:
-                bda_result_key = obj['Key']
-                relative_path = bda_result_key[len(bda_result_prefix):].lstrip('/')
-                dest_key = f"{object_key}/{relative_path}"
-                s3_client.copy_object(
-                    CopySource={'Bucket': bda_result_bucket, 'Key': bda_result_key},
-                    Bucket=output_bucket,
-                    Key=dest_key,
-                    ContentType='application/json',
-                    MetadataDirective='REPLACE'
-                )
-                copied_files += 1
+        def copy(bda_result_key):
+            relative_path = bda_result_key[len(bda_result_prefix):].lstrip('/')
+            copy_s3_object(bda_result_bucket, bda_result_key, output_bucket, f"{object_key}/{relative_path}")
+
+        map_concurrently(copy, bda_result_keys)
+        copied_files = len(bda_result_keys)
                 
         logger.info(f"Successfully copied {copied_files} files")
         return copied_files
@@ -147,43 +191,122 @@ def copy_s3_objects(bda_result_bucket, bda_result_prefix, output_bucket, object_
 def create_pdf_page_images(bda_result_bucket, output_bucket, object_key):
     """
     Create images for each page of a PDF document and upload them to S3.
+    
+    PyMuPDF documents are not safe to share between threads, so each of up to
+    RENDER_WORKERS renderer threads opens its own document handle and renders
+    pages k, k+n, k+2n..., while the rendered images are uploaded concurrently.
+    At most 2 * MAX_WORKERS rendered images wait for upload at any time.
     """
     try:
         # Download the PDF from S3
         pdf_content = s3_client.get_object(Bucket=bda_result_bucket, Key=object_key)['Body'].read()
-        pdf_stream = io.BytesIO(pdf_content)
 
-        # Open the PDF using PyMuPDF
-        pdf_document = fitz.open(stream=pdf_stream, filetype="pdf")
+        with fitz.open(stream=pdf_content, filetype="pdf") as pdf_document:
+            page_count = len(pdf_document)
+        if page_count == 0:
+            return 0
+        num_renderers = min(RENDER_WORKERS, page_count)
 
-        # Process each page
-        for page_num in range(len(pdf_document)):
-            # Render page to an image (pixmap)
-            pix = pdf_document[page_num].get_pixmap()
+        upload_slots = threading.BoundedSemaphore(2 * MAX_WORKERS)
+        uploads = []
 
-            # Save the image to a BytesIO object
-            img_bytes = pix.tobytes("jpeg")
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as upload_executor:
 
-            # Upload the image to S3 using the common library
-            image_key = f"{object_key}/pages/{page_num}/image.jpg"
-            s3_client.upload_fileobj(
-                io.BytesIO(img_bytes),
-                output_bucket,
-                image_key,
-                ExtraArgs={'ContentType': 'image/jpeg'}
-            ) 
+            def upload_page_image(page_num, img_bytes):
+                try:
+                    s3_client.put_object(
+                        Bucket=output_bucket,
+                        Key=f"{object_key}/pages/{page_num}/image.jpg",
+                        Body=img_bytes,
+                        ContentType='image/jpeg'
+                    )
+                finally:
+                    upload_slots.release()
+
+            def render_pages(offset):
+                # Each renderer opens its own handle on the downloaded PDF
+                with fitz.open(stream=pdf_content, filetype="pdf") as pdf_document:
+                    for page_num in range(offset, page_count, num_renderers):
+                        # Render page to an image (pixmap) and encode it as JPEG
+                        img_bytes = pdf_document[page_num].get_pixmap().tobytes("jpeg")
+
+                        # Bound the number of rendered images waiting for upload
+                        upload_slots.acquire()
+                        uploads.append(upload_executor.submit(upload_page_image, page_num, img_bytes))
 
-        logger.info(f"Successfully created and uploaded {len(pdf_document)} images to S3")
-        return len(pdf_document)
+            with ThreadPoolExecutor(max_workers=num_renderers) as render_executor:
+                renderers = [render_executor.submit(render_pages, offset) for offset in range(num_renderers)]
+            for future in renderers:
+                future.result()
+
+            for future in uploads:
+                future.result()
+
+        logger.info(f"Successfully created and uploaded {page_count} images to S3 using {num_renderers} renderers")
+        return page_count
 
     except Exception as e:
         logger.error(f"Error creating page images: {str(e)}")
         raise
 
+def ingest_section_file(bda_result_bucket, src_key, output_bucket, target_key, confidence_threshold):
+    """
+    Copy a BDA section output file to the output bucket.
+    
+    result.json files are transformed to add confidence thresholds to their
+    explainability_info; all other files are copied server-side.
+    
+    Returns:
+        dict: The written result.json data, or None for other files and failed transforms
+    """
+    file_name = src_key.split('/')[-1]
+
+    if file_name != 'result.json':
+        # Regular copy for non-result.json files
+        copy_s3_object(
+            bda_result_bucket, src_key, output_bucket, target_key,
+            'application/json' if file_name.endswith('.json') else 'application/octet-stream'
+        )
+        logger.info(f"Copied {src_key} to {target_key}")
+        return None
+
+    # Special handling for result.json files to add confidence thresholds
+    try:
+        # Parse the result.json file directly from the response stream
+        result_obj = s3_client.get_object(Bucket=bda_result_bucket, Key=src_key)
+        result_data = json.load(result_obj['Body'])
+        
+        # Add confidence thresholds to explainability_info if present
+        if 'explainability_info' in result_data:
+            result_data['explainability_info'] = add_confidence_thresholds_to_explainability(
+                result_data['explainability_info'], confidence_threshold
+            )
+            logger.info(f"Added confidence threshold {confidence_threshold} to explainability_info in {src_key}")
+        
+        # Write the modified result.json to the target location
+        write_content(
+            result_data,
+            output_bucket,
+            target_key,
+            content_type='application/json'
+        )
+        logger.info(f"Processed and copied {src_key} to {target_key}")
+        return result_data
+        
+    except Exception as e:
+        logger.error(f"Error processing result.json {src_key}: {str(e)}")
+        # Fallback to regular copy if processing fails
+        copy_s3_object(bda_result_bucket, src_key, output_bucket, target_key)
+        logger.info(f"Fallback copied {src_key} to {target_key}")
+        return None
+
 def process_bda_sections(bda_result_bucket, bda_result_prefix, output_bucket, object_key, document, confidence_threshold=0.8):
     """
     Process BDA sections and build sections for the Document object
     
+    The files of all sections are copied concurrently, so the processing time
+    depends on the slowest file rather than on the number of files.
+    
     Args:
         bda_result_bucket (str): The BDA result bucket
         bda_result_prefix (str): The BDA result prefix
@@ -202,123 +325,86 @@ def process_bda_sections(bda_result_bucket, bda_result_prefix, output_bucket, ob
     
     try:
         # List all section folders in the BDA result bucket
-        response = s3_client.list_objects_v2(
-            Bucket=bda_result_bucket,
-            Prefix=bda_custom_output_prefix,
-            Delimiter='/'
-        )
+        _, section_paths = list_s3_objects(bda_result_bucket, bda_custom_output_prefix, delimiter='/')
         
-        # Process each section folder
-        for prefix in response.get('CommonPrefixes', []):
-            section_path = prefix.get('Prefix')
-            if not section_path:
-                continue
-                
-            # Extract section ID from path
-            section_id = section_path.rstrip('/').split('/')[-1]
-            target_section_path = f"{sections_output_prefix}{section_id}/"
-            
-            # List all files in the section folder
-            section_files = s3_client.list_objects_v2(
-                Bucket=bda_result_bucket,
-                Prefix=section_path
-            )
-            
-            # Copy each file to the output bucket
-            for file_obj in section_files.get('Contents', []):
-                src_key = file_obj['Key']
-                file_name = src_key.split('/')[-1]
-                target_key = f"{target_section_path}{file_name}"
-                
-                # Special handling for result.json files to add confidence thresholds
-                if file_name == 'result.json':
-                    try:
-                        # Download the result.json file
-                        result_obj = s3_client.get_object(Bucket=bda_result_bucket, Key=src_key)
-                        result_data = json.loads(result_obj['Body'].read().decode('utf-8'))
-                        
-                        # Add confidence thresholds to explainability_info if present
-                        if 'explainability_info' in result_data:
-                            result_data['explainability_info'] = add_confidence_thresholds_to_explainability(
-                                result_data['explainability_info'], confidence_threshold
-                            )
-                            logger.info(f"Added confidence threshold {confidence_threshold} to explainability_info in section {section_id}")
-                        
-                        # Write the modified result.json to the target location
-                        write_content(
-                            result_data,
-                            output_bucket,
-                            target_key,
-                            content_type='application/json'
-                        )
-                        logger.info(f"Processed and copied {src_key} to {target_key}")
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing result.json {src_key}: {str(e)}")
-                        # Fallback to regular copy if processing fails
-                        s3_client.copy_object(
-                            CopySource={'Bucket': bda_result_bucket, 'Key': src_key},
-                            Bucket=output_bucket,
-                            Key=target_key,
-                            ContentType='application/json',
-                            MetadataDirective='REPLACE'
-                        )
-                        logger.info(f"Fallback copied {src_key} to {target_key}")
-                else:
-                    # Regular copy for non-result.json files
-                    s3_client.copy_object(
-                        CopySource={'Bucket': bda_result_bucket, 'Key': src_key},
-                        Bucket=output_bucket,
-                        Key=target_key,
-                        ContentType='application/json' if file_name.endswith('.json') else 'application/octet-stream',
-                        MetadataDirective='REPLACE'
-                    )
-                    logger.info(f"Copied {src_key} to {target_key}")
-            
-            # Get the result.json file
-            result_path = f"{target_section_path}result.json"
-            try:
+        # List the files of all section folders
+        section_keys = map_concurrently(
+            lambda section_path: list_s3_objects(bda_result_bucket, section_path)[0],
+            section_paths
+        )
+
+        # Extract section IDs from paths
+        section_ids = [section_path.rstrip('/').split('/')[-1] for section_path in section_paths]
+
+        # Copy all files of all sections to the output bucket
+        file_tasks = [
+            (section_id, src_key, f"{sections_output_prefix}{section_id}/{src_key.split('/')[-1]}")
+            for section_id, keys in zip(section_ids, section_keys)
+            for src_key in keys
+        ]
+        file_results = map_concurrently(
+            lambda task: ingest_section_file(
+                bda_result_bucket, task[1], output_bucket, task[2], confidence_threshold
+            ),
+            file_tasks
+        )
+    except ClientError as e:
+        logger.error(f"Failed to list sections in S3: {e}")
+        document.errors.append(f"Failed to list sections: {str(e)}")
+        return document
+
+    section_results = {
+        section_id: result_data
+        for (section_id, _, _), result_data in zip(file_tasks, file_results)
+        if result_data is not None
+    }
+
+    metadata_files = []
+    for section_id in section_ids:
+        result_path = f"{sections_output_prefix}{section_id}/result.json"
+        try:
+            # Use the transformed result.json, or read the copy if it was copied as is
+            result_data = section_results.get(section_id)
+            if result_data is None:
                 result_obj = s3_client.get_object(
                     Bucket=output_bucket,
                     Key=result_path
                 )
                 result_data = json.loads(result_obj['Body'].read().decode('utf-8'))
-                
-                # Extract required fields
-                doc_class = result_data.get('document_class', {}).get('type', '')
-                page_indices = result_data.get('split_document', {}).get('page_indices', [])
-                page_ids = [str(idx) for idx in (page_indices or [])]
-                
-                # Create the OutputJSONUri using the utility function
-                extraction_result_uri = build_s3_uri(output_bucket, result_path)
-                
-                # Create Section object and add to document
-                section = Section(
-                    section_id=section_id,
-                    classification=doc_class,
-                    confidence=1.0,
-                    page_ids=page_ids,
-                    extraction_result_uri=extraction_result_uri
-                )
-                document.sections.append(section)
-                
-                # Create metadata file for the extraction result URI
-                create_metadata_file(extraction_result_uri, doc_class, 'section')
-                
-            except ClientError as e:
-                logger.error(f"Failed to retrieve result.json for section {section_id}: {e}")
-                continue
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON in result.json for section {section_id}: {e}")
-                continue
-                
-        logger.info(f"Processed {len(document.sections)} sections for document {object_key}")
-        return document
+        except ClientError as e:
+            logger.error(f"Failed to retrieve result.json for section {section_id}: {e}")
+            continue
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON in result.json for section {section_id}: {e}")
+            continue
+
+        # Extract required fields
+        doc_class = result_data.get('document_class', {}).get('type', '')
+        page_indices = result_data.get('split_document', {}).get('page_indices', [])
+        page_ids = [str(idx) for idx in (page_indices or [])]
         
-    except ClientError as e:
-        logger.error(f"Failed to list sections in S3: {e}")
-        document.errors.append(f"Failed to list sections: {str(e)}")
-        return document
+        # Create the OutputJSONUri using the utility function
+        extraction_result_uri = build_s3_uri(output_bucket, result_path)
+        
+        # Create Section object and add to document
+        section = Section(
+            section_id=section_id,
+            classification=doc_class,
+            confidence=1.0,
+            page_ids=page_ids,
+            extraction_result_uri=extraction_result_uri
+        )
+        document.sections.append(section)
+        metadata_files.append((extraction_result_uri, doc_class))
+
+    # Create metadata files for the extraction result URIs
+    map_concurrently(
+        lambda metadata_file: create_metadata_file(metadata_file[0], metadata_file[1], 'section'),
+        metadata_files
+    )
+            
+    logger.info(f"Processed {len(document.sections)} sections for document {object_key}")
+    return document
 
 def extract_markdown_from_json(raw_json):
     """
@@ -387,8 +473,9 @@ def extract_page_from_multipage_json(raw_json, page_index, confidence_threshold=
         dict: A new result JSON with only the specified page
     """
     # Create a copy of the JSON with just metadata
+    # Copy the metadata, which is shared by all pages of the result
     single_page_json = {
-        "metadata": raw_json.get("metadata", {})
+        "metadata": dict(raw_json.get("metadata", {}))
     }
     
     # Update metadata to reflect single page
@@ -450,10 +537,92 @@ def extract_markdown_from_single_page_json(raw_json):
             return page["representation"]["markdown"]
     return ""
 
+def write_page_outputs(raw_json, page_index, output_bucket, pages_output_prefix, doc_class, confidence_threshold):
+    """
+    Write the result.json, parsedResult.json and metadata files of a single page.
+    
+    Args:
+        raw_json (dict): The multi-page BDA result JSON
+        page_index (int): The page index
+        output_bucket (str): The output bucket
+        pages_output_prefix (str): Target path for page files
+        doc_class (str): The class of the section the page belongs to
+        confidence_threshold (float): Confidence threshold to add to explainability data
+        
+    Returns:
+        Page: The page object
+    """
+    page_id = str(page_index)
+    
+    # Extract a single page result.json for this page with confidence threshold
+    single_page_json = extract_page_from_multipage_json(raw_json, page_index, confidence_threshold)
+    
+    # Determine page directory path in output bucket
+    page_path = f"{pages_output_prefix}{page_id}/"
+    page_result_path = f"{page_path}result.json"
+    
+    # Write the single page result.json to the page directory
+    write_content(
+        single_page_json,
+        output_bucket,
+        page_result_path,
+        content_type='application/json'
+    )
+    
+    # Create raw text URI
+    raw_text_uri = build_s3_uri(output_bucket, page_result_path)
+    
+    # Define image path
+    image_path = f"{page_path}image.jpg"
+    
+    # Check if image exists
+    try:
+        s3_client.head_object(Bucket=output_bucket, Key=image_path)
+        image_uri = build_s3_uri(output_bucket, image_path)
+    except ClientError:
+        image_uri = None
+        logger.warning(f"image.jpg not found for page {page_id}")
+    
+    # Extract markdown content for this page
+    markdown_text = extract_markdown_from_single_page_json(single_page_json)
+    
+    # Create parsedResult.json
+    parsed_result = {
+        "text": markdown_text
+    }
+    
+    # Write parsedResult.json to S3
+    parsed_result_path = f"{page_path}parsedResult.json"
+    write_content(
+        parsed_result,
+        output_bucket,
+        parsed_result_path,
+        content_type='application/json'
+    )
+    
+    # Create S3 URI for parsed result
+    parsed_result_uri = build_s3_uri(output_bucket, parsed_result_path)
+    
+    logger.info(f"Created parsedResult.json for page {page_id}")
+    
+    # Create metadata file for the parsed result URI
+    create_metadata_file(parsed_result_uri, doc_class, 'page')
+    
+    return Page(
+        page_id=page_id,
+        image_uri=image_uri,
+        raw_text_uri=raw_text_uri,
+        parsed_text_uri=parsed_result_uri,
+        classification=doc_class
+    )
+
 def process_bda_pages(bda_result_bucket, bda_result_prefix, output_bucket, object_key, document, confidence_threshold=0.8):
     """
     Process BDA page outputs and build pages for the Document object
     
+    The result files are read concurrently, and then the outputs of all pages
+    are written concurrently.
+    
     Args:
         bda_result_bucket (str): The BDA result bucket
         bda_result_prefix (str): The BDA result prefix
@@ -479,121 +648,70 @@ def process_bda_pages(bda_result_bucket, bda_result_prefix, output_bucket, objec
     
     try:
         # List all objects in the standard output directory
-        response = s3_client.list_objects_v2(
-            Bucket=bda_result_bucket,
-            Prefix=standard_output_prefix
-        )
-        
-        # Process all standard_output result.json files which may contain multiple pages
-        for obj in response.get('Contents', []):
-            obj_key = obj['Key']
-            
-            # Only process result.json files
-            if not obj_key.endswith('result.json'):
-                continue
-                
-            try:
-                # Get the raw JSON result from the BDA result bucket
-                result_obj = s3_client.get_object(
-                    Bucket=bda_result_bucket,
-                    Key=obj_key
-                )
-                raw_json = json.loads(result_obj['Body'].read().decode('utf-8'))
-                
-                # Check if this contains pages
-                if 'pages' in raw_json and len(raw_json['pages']) > 0:
-                    # Process each page in the multi-page result
-                    for page in raw_json['pages']:
-                        page_index = page.get('page_index')
-                        if page_index is None:
-                            logger.warning(f"Page in {obj_key} has no page_index")
-                            continue
-                            
-                        page_id = str(page_index)
-                        
-                        # Extract a single page result.json for this page with confidence threshold
-                        single_page_json = extract_page_from_multipage_json(raw_json, page_index, confidence_threshold)
-                        
-                        # Determine page directory path in output bucket
-                        page_path = f"{pages_output_prefix}{page_id}/"
-                        page_result_path = f"{page_path}result.json"
-                        
-                        # Write the single page result.json to the page directory
-                        write_content(
-                            single_page_json,
-                            output_bucket,
-                            page_result_path,
-                            content_type='application/json'
-                        )
-                        
-                        # Create raw text URI
-                        raw_text_uri = build_s3_uri(output_bucket, page_result_path)
-                        
-                        # Define image path
-                        image_path = f"{page_path}image.jpg"
-                        
-                        # Check if image exists
-                        try:
-                            s3_client.head_object(Bucket=output_bucket, Key=image_path)
-                            image_uri = build_s3_uri(output_bucket, image_path)
-                        except ClientError:
-                            image_uri = None
-                            logger.warning(f"image.jpg not found for page {page_id}")
-                        
-                        # Get the class from the section mapping
-                        doc_class = page_to_class_map.get(page_id, '')
-                        
-                        # Extract markdown content for this page
-                        markdown_text = extract_markdown_from_single_page_json(single_page_json)
-                        
-                        # Create parsedResult.json
-                        parsed_result = {
-                            "text": markdown_text
-                        }
-                        
-                        # Write parsedResult.json to S3
-                        parsed_result_path = f"{page_path}parsedResult.json"
-                        write_content(
-                            parsed_result,
-                            output_bucket,
-                            parsed_result_path,
-                            content_type='application/json'
-                        )
-                        
-                        # Create S3 URI for parsed result
-                        parsed_result_uri = build_s3_uri(output_bucket, parsed_result_path)
-                        
-                        logger.info(f"Created parsedResult.json for page {page_id}")
-                        
-                        # Create metadata file for the parsed result URI
-                        create_metadata_file(parsed_result_uri, doc_class, 'page')
-                        
-                        # Create Page object and add to document
-                        page = Page(
-                            page_id=page_id,
-                            image_uri=image_uri,
-                            raw_text_uri=raw_text_uri,
-                            parsed_text_uri=parsed_result_uri,
-                            classification=doc_class
-                        )
-                        document.pages[page_id] = page
-                        
-                    logger.info(f"Processed multi-page result file {obj_key}")
-                
-            except Exception as e:
-                logger.error(f"Error processing result file {obj_key}: {str(e)}")
-                document.errors.append(f"Error processing result file {obj_key}: {str(e)}")
-        
-        # Update document page count
-        document.num_pages = len(document.pages)
-        logger.info(f"Processed {document.num_pages} pages for document {object_key}")
-        return document
-        
+        obj_keys, _ = list_s3_objects(bda_result_bucket, standard_output_prefix)
     except ClientError as e:
         logger.error(f"Failed to list pages in S3: {e}")
         document.errors.append(f"Failed to list pages: {str(e)}")
         return document
 
+    # Only process result.json files, which may contain multiple pages
+    result_keys = [obj_key for obj_key in obj_keys if obj_key.endswith('result.json')]
+
+    def load_result(obj_key):
+        try:
+            # Get the raw JSON result from the BDA result bucket
+            result_obj = s3_client.get_object(
+                Bucket=bda_result_bucket,
+                Key=obj_key
+            )
+            return json.load(result_obj['Body']), None
+        except Exception as e:
+            return None, e
+
+    page_tasks = []
+    for obj_key, (raw_json, error) in zip(result_keys, map_concurrently(load_result, result_keys)):
+        if error is not None:
+            logger.error(f"Error processing result file {obj_key}: {str(error)}")
+            document.errors.append(f"Error processing result file {obj_key}: {str(error)}")
+            continue
+
+        # Process each page in the multi-page result
+        for page in raw_json.get('pages') or []:
+            page_index = page.get('page_index')
+            if page_index is None:
+                logger.warning(f"Page in {obj_key} has no page_index")
+                continue
+            page_tasks.append((obj_key, raw_json, page_index))
+
+    def process_page(task):
+        obj_key, raw_json, page_index = task
+        try:
+            page = write_page_outputs(
+                raw_json,
+                page_index,
+                output_bucket,
+                pages_output_prefix,
+                page_to_class_map.get(str(page_index), ''),
+                confidence_threshold
+            )
+            return page, None
+        except Exception as e:
+            return None, e
+
+    for (obj_key, _, _), (page, error) in zip(page_tasks, map_concurrently(process_page, page_tasks)):
+        if error is not None:
+            logger.error(f"Error processing result file {obj_key}: {str(error)}")
+            document.errors.append(f"Error processing result file {obj_key}: {str(error)}")
+            continue
+        document.pages[page.page_id] = page
+
+    logger.info(f"Processed {len(page_tasks)} pages from {len(result_keys)} result files")
+    
+    # Update document page count
+    document.num_pages = len(document.pages)
+    logger.info(f"Processed {document.num_pages} pages for document {object_key}")
+    return document
+
 def start_human_loop(
     execution_id: str,
     kv_pairs: list,
@@ -977,6 +1095,7 @@ def process_segments(
     
     return document, hitl_triggered
 
+@metrics.flush_on_exit
 def handler(event, context):
     """
     Process the BDA results and build a Document object with pages and sections.
@@ -6,7 +6,7 @@ import json
 import time
 import logging
 
-from idp_common import get_config, assessment
+from idp_common import get_config, assessment, metrics
 from idp_common.models import Document, Status
 from idp_common.docs_service import create_document_service
 
@@ -16,6 +16,7 @@ logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_LOG_LEVEL", "INFO"))
 
+@metrics.flush_on_exit
 def handler(event, context):
     """
     Lambda handler for document assessment.
@@ -55,7 +56,7 @@ def handler(event, context):
     )
     document_service = create_document_service()
     logger.info(f"Updating document status to {docStatus.status}")
-    document_service.update_document(docStatus)
+    document_service.update_document_status(docStatus)
 
     # Initialize assessment service
     assessment_service = assessment.AssessmentService(config=config)
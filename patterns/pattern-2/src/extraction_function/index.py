@@ -20,6 +20,7 @@ logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_LOG_LEVEL", "INFO"))
 
 
+@metrics.flush_on_exit
 def handler(event, context):
     """
     Process a single section of a document for information extraction
@@ -58,7 +59,7 @@ def handler(event, context):
     full_document.status = Status.EXTRACTING
     document_service = create_document_service()
     logger.info(f"Updating document status to {full_document.status}")
-    document_service.update_document(full_document)
+    document_service.update_document_status(full_document)
        
     # Create a section-specific document by modifying the original document
     section_document = full_document
@@ -11,7 +11,7 @@ import logging
 import os
 import time
 
-from idp_common import get_config, ocr
+from idp_common import get_config, ocr, metrics
 from idp_common.models import Document, Status
 from idp_common.docs_service import create_document_service
 
@@ -26,6 +26,7 @@ region = os.environ['AWS_REGION']
 METRIC_NAMESPACE = os.environ.get('METRIC_NAMESPACE')
 MAX_WORKERS = int(os.environ.get('MAX_WORKERS', 20))
 
+@metrics.flush_on_exit
 def handler(event, context): 
     """
     Lambda handler for OCR processing.
@@ -40,7 +41,7 @@ def handler(event, context):
     document.workflow_execution_arn = event.get("execution_arn")
     document_service = create_document_service()
     logger.info(f"Updating document status to {document.status}")
-    document_service.update_document(document)
+    document_service.update_document_status(document)
     
     t0 = time.time()
     
@@ -74,8 +75,12 @@ def handler(event, context):
         preprocessing_value = image_config.get("preprocessing")
         # Handle both boolean and string values
         if preprocessing_value is True or (isinstance(preprocessing_value, str) and preprocessing_value.lower() == 'true'):
-            preprocessing_config = {"enabled": True}
-            logger.info("Image preprocessing (adaptive binarization) enabled")
+            preprocessing_config = {
+                "enabled": True,
+                "block_size": image_config.get("preprocessing_block_size"),
+                "c": image_config.get("preprocessing_c"),
+            }
+            logger.info(f"Image preprocessing (adaptive binarization) enabled: {preprocessing_config}")
         else:
             logger.info("Image preprocessing disabled")
     else:
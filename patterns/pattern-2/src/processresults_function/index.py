@@ -7,7 +7,7 @@ import datetime
 import os
 from urllib.parse import urlparse
 
-from idp_common import s3, utils
+from idp_common import metrics, s3, utils
 from idp_common.models import Document, Page, Section, Status
 from idp_common.docs_service import create_document_service
 
@@ -16,6 +16,7 @@ logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_LOG_LEVEL", "INFO"))
 # Get LOG_LEVEL from environment variable with INFO as default
 
+@metrics.flush_on_exit
 def handler(event, context):
     """
     Consolidates the results from multiple extraction steps into a single output.
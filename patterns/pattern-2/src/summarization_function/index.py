@@ -10,7 +10,7 @@ import logging
 import time
 
 # Import the SummarizationService from idp_common
-from idp_common import get_config, summarization
+from idp_common import get_config, summarization, metrics
 from idp_common.models import Document, Status
 from idp_common.docs_service import create_document_service
 
@@ -20,6 +20,7 @@ logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_LOG_LEVEL", "INFO"))
 
+@metrics.flush_on_exit
 def handler(event, context):
     """
     Lambda handler for document summarization using the SummarizationService.
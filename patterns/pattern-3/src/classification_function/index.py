@@ -24,6 +24,7 @@ logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_LOG_LEVEL", "INFO"))
 
 
+@metrics.flush_on_exit
 def handler(event, context):
     """
     Lambda handler for document classification using SageMaker UDOP model.
@@ -107,6 +108,10 @@ def handler(event, context):
     t1 = time.time()
     logger.info(f"Time taken for classification: {t1-t0:.2f} seconds")
     
+    # Persist page classes and sections now, so that the following steps only
+    # need to send status updates
+    document_service.update_document(document)
+    
     # Prepare output with automatic compression if needed
     response = {
         "document": document.serialize_document(working_bucket, "classification", logger)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Micro-benchmark comparing the previous per-pixel adaptive binarization with the
+vectorized implementation in idp_common.image.
+
+Usage (with idp_common installed, e.g. pip install -e lib/idp_common_pkg):
+    python scripts/benchmark_binarization.py [--image page.jpg] [--dpi 150] [--runs 5]
+
+Without --image, a synthetic letter-size page with text-like noise and an
+uneven lighting gradient is generated at the requested DPI.
+"""
+
+import argparse
+import io
+import random
+import statistics
+import time
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from idp_common.image import apply_adaptive_binarization
+
+
+def legacy_adaptive_binarization(image_data: bytes, block_size: int = 15, c: int = 10) -> bytes:
+    """Previous implementation: per-pixel Python thresholding loop."""
+    pil_image = Image.open(io.BytesIO(image_data))
+    if pil_image.mode != 'L':
+        pil_image = pil_image.convert('L')
+    blurred = pil_image.filter(ImageFilter.BoxBlur(block_size // 2))
+    width, height = pil_image.size
+    original_pixels = list(pil_image.getdata())
+    blurred_pixels = list(blurred.getdata())
+    binary_pixels = []
+    for orig, blur in zip(original_pixels, blurred_pixels):
+        threshold = blur - c
+        binary_pixels.append(255 if orig > threshold else 0)
+    binary_image = Image.new('L', (width, height))
+    binary_image.putdata(binary_pixels)
+    img_byte_array = io.BytesIO()
+    binary_image.save(img_byte_array, format="JPEG")
+    return img_byte_array.getvalue()
+
+
+def synthetic_page(dpi: int) -> bytes:
+    """Generate a letter-size grayscale page with text-like strokes and a lighting gradient."""
+    width, height = int(8.5 * dpi), int(11 * dpi)
+    rng = random.Random(42)
+    gradient = Image.linear_gradient('L').resize((width, height)).point(lambda v: 140 + v // 3)
+    draw = ImageDraw.Draw(gradient)
+    line_height = max(dpi // 6, 8)
+    for y in range(dpi // 2, height - dpi // 2, line_height):
+        x = dpi // 2
+        while x < width - dpi // 2:
+            word = rng.randint(line_height // 2, line_height * 3)
+            draw.rectangle([x, y, x + word, y + line_height // 2], fill=rng.randint(20, 90))
+            x += word + line_height // 2
+    output = io.BytesIO()
+    gradient.save(output, format="JPEG")
+    return output.getvalue()
+
+
+def time_function(func, image_data: bytes, runs: int) -> float:
+    """Return the median wall time in milliseconds over the given number of runs."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(image_data)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark adaptive binarization implementations")
+    parser.add_argument("--image", help="Path to a page image (default: synthetic page)")
+    parser.add_argument("--dpi", type=int, default=150, help="DPI of the synthetic page")
+    parser.add_argument("--runs", type=int, default=5, help="Number of timed runs per implementation")
+    args = parser.parse_args()
+
+    if args.image:
+        with open(args.image, "rb") as f:
+            image_data = f.read()
+    else:
+        image_data = synthetic_page(args.dpi)
+
+    size = Image.open(io.BytesIO(image_data)).size
+    legacy_ms = time_function(legacy_adaptive_binarization, image_data, args.runs)
+    vectorized_ms = time_function(apply_adaptive_binarization, image_data, args.runs)
+    identical = legacy_adaptive_binarization(image_data) == apply_adaptive_binarization(image_data)
+
+    print(f"Page size:          {size[0]}x{size[1]} ({size[0] * size[1]:,} pixels)")
+    print(f"Legacy (per-pixel): {legacy_ms:10.1f} ms/page")
+    print(f"Vectorized:         {vectorized_ms:10.1f} ms/page")
+    print(f"Speedup:            {legacy_ms / vectorized_ms:10.1f}x")
+    print(f"Identical output:   {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 
 import os
 import json
+import uuid
 import boto3
 from botocore.exceptions import ClientError
 import logging
@@ -18,6 +19,9 @@ CONFIGURATION_TABLE_NAME = os.environ['CONFIGURATION_TABLE_NAME']
 dynamodb = boto3.resource('dynamodb')
 table = dynamodb.Table(CONFIGURATION_TABLE_NAME)
 
+# Version attribute read by idp_common.config to detect configuration changes
+CONFIG_VERSION_ATTRIBUTE = 'ConfigVersion'
+
 def get_configuration_item(config_type):
     """
     Retrieve a configuration item from DynamoDB
@@ -123,7 +127,8 @@ def handle_update_configuration(custom_config):
             # For empty config, just store the Configuration key with no other attributes
             response = table.put_item(
                 Item={
-                    'Configuration': 'Custom'
+                    'Configuration': 'Custom',
+                    CONFIG_VERSION_ATTRIBUTE: uuid.uuid4().hex
                 }
             )
             logger.info("Stored empty Custom configuration")
@@ -153,14 +158,16 @@ def handle_update_configuration(custom_config):
             table.put_item(
                 Item={
                     'Configuration': 'Default',
-                    **stringified_default
+                    **stringified_default,
+                    CONFIG_VERSION_ATTRIBUTE: uuid.uuid4().hex
                 }
             )
             
             # Clear custom configuration
             table.put_item(
                 Item={
-                    'Configuration': 'Custom'
+                    'Configuration': 'Custom',
+                    CONFIG_VERSION_ATTRIBUTE: uuid.uuid4().hex
                 }
             )
             
@@ -172,7 +179,8 @@ def handle_update_configuration(custom_config):
             table.put_item(
                 Item={
                     'Configuration': 'Custom',
-                    **stringified_config
+                    **stringified_config,
+                    CONFIG_VERSION_ATTRIBUTE: uuid.uuid4().hex
                 }
             )
             
@@ -192,11 +200,12 @@ def handle_update_configuration(custom_config):
 
 def remove_configuration_key(item):
     """
-    Remove the 'Configuration' key from a DynamoDB item
+    Remove the 'Configuration' key and version attribute from a DynamoDB item
     """
     if not item:
         return {}
     
     result = item.copy()
     result.pop('Configuration', None)
+    result.pop(CONFIG_VERSION_ATTRIBUTE, None)
     return result
\ No newline at end of file
@@ -0,0 +1,75 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Lambda function for compacting small Parquet files in the reporting bucket.
+
+Runs on a schedule and compacts the date= partitions of the previous days.
+Partitions are keyed by the document's initial_event_time, so they keep
+receiving files when documents are reprocessed; those are compacted, and
+replace the documents' earlier rows, the next time their date is compacted.
+"""
+
+import datetime
+import json
+import logging
+import os
+
+from idp_common.reporting import ParquetCompactor
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+REPORTING_BUCKET = os.environ["REPORTING_BUCKET"]
+# Number of days before today to compact (1 = yesterday only)
+COMPACTION_LOOKBACK_DAYS = int(os.environ.get("COMPACTION_LOOKBACK_DAYS", "1"))
+TARGET_FILE_SIZE_MB = int(os.environ.get("COMPACTION_TARGET_FILE_SIZE_MB", "128"))
+
+
+def handler(event, context):
+    """
+    Lambda handler for reporting compaction.
+
+    Args:
+        event: Scheduled event, or {"dates": ["YYYY-MM-DD", ...]} to compact
+            specific partitions
+        context: Lambda context
+
+    Returns:
+        Dict with status and a per-date summary
+    """
+    logger.info(f"Starting reporting compaction with event: {json.dumps(event)}")
+
+    dates = event.get("dates") if isinstance(event, dict) else None
+    if not dates:
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        dates = [
+            (today - datetime.timedelta(days=days)).isoformat()
+            for days in range(1, COMPACTION_LOOKBACK_DAYS + 1)
+        ]
+
+    compactor = ParquetCompactor(
+        REPORTING_BUCKET, target_file_size=TARGET_FILE_SIZE_MB * 1024 * 1024
+    )
+
+    summaries = []
+    for date in dates:
+        summary = compactor.compact_date(date)
+        logger.info(
+            f"Compacted {summary['files_compacted']} files into "
+            f"{summary['files_written']} files and rewrote {summary['files_rewritten']} "
+            f"files for date={date} "
+            f"({summary['errors']} partitions with errors)"
+        )
+        summaries.append(
+            {
+                k: summary[k]
+                for k in ("date", "files_compacted", "files_written", "files_rewritten", "errors")
+            }
+        )
+
+    return {
+        "statusCode": 200 if all(s["errors"] == 0 for s in summaries) else 500,
+        "body": summaries,
+    }
@@ -7,6 +7,7 @@ import logging
 import traceback
 from typing import Dict, Any, List
 
+from idp_common.config import get_config_version
 from idp_common.models import Document
 from idp_common.reporting import SaveReportingData
 
@@ -19,7 +20,8 @@ def handler(event, context):
     Lambda handler for saving document evaluation data to the reporting bucket.
     
     Args:
-        event: Lambda event containing document data, reporting bucket name, and data_to_save
+        event: Lambda event containing document data, reporting bucket name, and data_to_save,
+            and optionally the config_version the document was processed with
         context: Lambda context
         
     Returns:
@@ -60,8 +62,19 @@ def handler(event, context):
         # Convert document dict to Document object
         document = Document.from_dict(document_dict)
         
+        # Section schemas are learned per section class and configuration version.
+        # The caller may pass the version the document was processed with;
+        # otherwise the current configuration version is used.
+        config_version = event.get('config_version')
+        if config_version is None:
+            try:
+                config_version = get_config_version()
+            except Exception as e:
+                logger.warning(f"Could not read configuration version: {str(e)}")
+        logger.info(f"Using configuration version: {config_version}")
+
         # Use the SaveReportingData class to save the data
-        reporter = SaveReportingData(reporting_bucket)
+        reporter = SaveReportingData(reporting_bucket, config_version=config_version)
         results = reporter.save(document, data_to_save)
         
         # If no data was processed, return a warning
@@ -7,9 +7,10 @@ import boto3
 import logging
 from datetime import datetime
 from typing import Dict, Any, List, Optional
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
 from botocore.exceptions import ClientError
 import requests
-from aws_requests_auth.aws_auth import AWSRequestsAuth
 
 logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
@@ -21,6 +22,11 @@ credentials = session.get_credentials()
 
 APPSYNC_API_URL = os.environ['APPSYNC_API_URL']
 
+# Reused across invocations: keeps the connection to AppSync alive and avoids
+# rebuilding the signer for every update
+http_session = requests.Session()
+signer = SigV4Auth(credentials, 'appsync', session.region_name or 'us-west-2')
+
 
 def handler(event: dict, context: Any) -> dict:
     """
@@ -120,30 +126,25 @@ def publish_to_subscription(execution_arn: str, execution_details: Dict[str, Any
             'variables': variables
         }
         
-        # Set up AWS authentication
-        region = session.region_name or 'us-west-2'
-        auth = AWSRequestsAuth(
-            aws_access_key=credentials.access_key,
-            aws_secret_access_key=credentials.secret_key,
-            aws_token=credentials.token,
-            aws_host=APPSYNC_API_URL.replace('https://', '').replace('/graphql', ''),
-            aws_region=region,
-            aws_service='appsync'
+        # Serialize once and sign the exact bytes that are sent
+        body = json.dumps(graphql_request).encode()
+        request = AWSRequest(
+            method='POST',
+            url=APPSYNC_API_URL,
+            data=body,
+            headers={
+                'Content-Type': 'application/json',
+                'Accept': 'application/json'
+            }
         )
-        
-        # Make the GraphQL request
-        headers = {
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        }
+        signer.add_auth(request)
         
         logger.info(f"Publishing Step Functions update to AppSync for execution: {execution_arn}")
         
-        response = requests.post(
+        response = http_session.post(
             APPSYNC_API_URL,
-            json=graphql_request,
-            headers=headers,
-            auth=auth,
+            data=body,
+            headers=dict(request.headers),
             timeout=30
         )
         
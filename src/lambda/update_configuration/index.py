@@ -4,6 +4,7 @@
 import json
 import os
 import logging
+import uuid
 import boto3
 from botocore.exceptions import ClientError
 from typing import Dict, Any, Union
@@ -20,6 +21,9 @@ dynamodb = boto3.resource('dynamodb')
 s3_client = boto3.client('s3')
 table = dynamodb.Table(os.environ['CONFIGURATION_TABLE_NAME'])
 
+# Version attribute read by idp_common.config to detect configuration changes
+CONFIG_VERSION_ATTRIBUTE = 'ConfigVersion'
+
 def fetch_content_from_s3(s3_uri: str) -> Union[Dict[str, Any], str]:
     """
     Fetches content from S3 URI and parses as JSON or YAML if possible
@@ -88,7 +92,8 @@ def update_configuration(configuration_type: str, data: Dict[str, Any]) -> None:
         table.put_item(
             Item={
                 'Configuration': configuration_type,
-                **converted_data
+                **converted_data,
+                CONFIG_VERSION_ATTRIBUTE: uuid.uuid4().hex
             }
         )
     except ClientError as e: